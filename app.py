@@ -7,12 +7,21 @@ import random
 import functools
 from datetime import datetime, timedelta
 from flask import (Flask, render_template, request, jsonify, redirect, 
-                   url_for, flash, send_from_directory, session)
+                   url_for, flash, send_file, send_from_directory, session, Response, stream_with_context)
 from werkzeug.utils import secure_filename
 
 import database as db
 import ga4
-from publisher import publish_to_platform, PublishResult
+import http_client as req
+import thumbnails
+import photo_index
+import jobs
+import leader
+import post_scheduler
+import ratelimit
+import llm
+import llm_cache
+from publisher import publish_many, PublishResult, retry_after_seconds, PUBLISH_TIMEOUT
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'forbidden-command-center-2025')
@@ -107,138 +116,26 @@ def get_api_key(provider):
     platform = db.get_platform(provider)
     return platform.get('api_key', '') if platform else ''
 
-# Ensure upload directory exists
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-# Initialize database and seed content
-db.init_db()
+def _wants_fresh(data):
+    """fresh=true in the JSON body or query string skips the LLM response cache"""
+    value = (data or {}).get('fresh', request.args.get('fresh', ''))
+    return value is True or str(value).lower() in ('1', 'true', 'yes')
 
-# Force-seed blog platforms (may not exist in older databases)
-def ensure_blog_platforms():
-    try:
-        conn = db.get_db()
-        
-        # Ensure blog tables exist
-        if db.USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute('''CREATE TABLE IF NOT EXISTS blog_articles (
-                id SERIAL PRIMARY KEY, title TEXT NOT NULL, content TEXT NOT NULL,
-                excerpt TEXT DEFAULT '', topic TEXT DEFAULT '', keywords TEXT DEFAULT '',
-                status TEXT DEFAULT 'draft', platform TEXT DEFAULT '', platform_url TEXT DEFAULT '',
-                platform_post_id TEXT DEFAULT '', word_count INTEGER DEFAULT 0,
-                ai_generated INTEGER DEFAULT 1, published_at TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-            cur.execute('''CREATE TABLE IF NOT EXISTS blog_topics (
-                id SERIAL PRIMARY KEY, title TEXT NOT NULL, category TEXT DEFAULT 'general',
-                keywords TEXT DEFAULT '', last_used TIMESTAMP, times_used INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-        else:
-            conn.execute('''CREATE TABLE IF NOT EXISTS blog_articles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, content TEXT NOT NULL,
-                excerpt TEXT DEFAULT '', topic TEXT DEFAULT '', keywords TEXT DEFAULT '',
-                status TEXT DEFAULT 'draft', platform TEXT DEFAULT '', platform_url TEXT DEFAULT '',
-                platform_post_id TEXT DEFAULT '', word_count INTEGER DEFAULT 0,
-                ai_generated INTEGER DEFAULT 1, published_at TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-            conn.execute('''CREATE TABLE IF NOT EXISTS blog_topics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, category TEXT DEFAULT 'general',
-                keywords TEXT DEFAULT '', last_used TIMESTAMP, times_used INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-        
-        # Ensure blog platforms in platforms table
-        blog_platforms = [
-            ('medium', 'Medium', '📝'),
-            ('wordpress', 'WordPress', '📰'),
-            ('blogger', 'Blogger', '📢'),
-            ('reddit', 'Reddit', '🤖'),
-            ('pinterest', 'Pinterest', '📌'),
-            ('quora', 'Quora (Manual)', '❓'),
-        ]
-        for name, display_name, icon in blog_platforms:
-            existing = db._fetchone(conn, 'SELECT id FROM platforms WHERE name = ?', (name,))
-            if not existing:
-                if db.USE_POSTGRES:
-                    conn.cursor().execute(
-                        'INSERT INTO platforms (name, display_name, icon) VALUES (%s, %s, %s) ON CONFLICT (name) DO NOTHING',
-                        (name, display_name, icon))
-                else:
-                    conn.execute('INSERT OR IGNORE INTO platforms (name, display_name, icon) VALUES (?, ?, ?)',
-                                (name, display_name, icon))
-        
-        conn.commit()
-        conn.close()
-        print("[Startup] Blog platforms and tables verified")
-    except Exception as e:
-        print(f"Blog platforms seed: {e}")
+def _wants_stream(data):
+    """stream=true in the JSON body, or an Accept: text/event-stream request, gets Server-Sent Events"""
+    value = (data or {}).get('stream')
+    return value is True or str(value).lower() in ('1', 'true', 'yes') or \
+        'text/event-stream' in request.headers.get('Accept', '')
 
-ensure_blog_platforms()
+# Ensure upload directory exists
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Ensure brand_mentions table exists
-try:
-    conn = db.get_db()
-    if db.USE_POSTGRES:
-        conn.cursor().execute('''CREATE TABLE IF NOT EXISTS brand_mentions (
-            id SERIAL PRIMARY KEY, title TEXT NOT NULL, url TEXT DEFAULT '', source TEXT DEFAULT '',
-            source_type TEXT DEFAULT 'article', snippet TEXT DEFAULT '', full_content TEXT DEFAULT '',
-            author TEXT DEFAULT '', sentiment TEXT DEFAULT 'neutral', date_found TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            date_published TEXT DEFAULT '', starred INTEGER DEFAULT 0, notes TEXT DEFAULT '',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-    else:
-        conn.execute('''CREATE TABLE IF NOT EXISTS brand_mentions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, url TEXT DEFAULT '', source TEXT DEFAULT '',
-            source_type TEXT DEFAULT 'article', snippet TEXT DEFAULT '', full_content TEXT DEFAULT '',
-            author TEXT DEFAULT '', sentiment TEXT DEFAULT 'neutral', date_found TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            date_published TEXT DEFAULT '', starred INTEGER DEFAULT 0, notes TEXT DEFAULT '',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-    conn.commit()
-    conn.close()
-    print("[Startup] Brand mentions table verified")
-except Exception as e:
-    print(f"Brand mentions table: {e}")
+# Studio photo library (static/photos + gallery/), indexed once and refreshed when the folders change
+photo_library = photo_index.PhotoIndex(os.path.join(app.static_folder, 'photos'),
+                                       cache_path=os.path.join(UPLOAD_FOLDER, 'photo_index.json'))
 
-# Ensure ai_gallery table exists (with image_data for ephemeral-safe storage)
-try:
-    conn = db.get_db()
-    if db.USE_POSTGRES:
-        cur = conn.cursor()
-        cur.execute('''CREATE TABLE IF NOT EXISTS ai_gallery (
-            id SERIAL PRIMARY KEY,
-            media_type TEXT NOT NULL,
-            url TEXT NOT NULL,
-            prompt TEXT DEFAULT '',
-            revised_prompt TEXT DEFAULT '',
-            saved BOOLEAN DEFAULT FALSE,
-            bottle_type TEXT DEFAULT '',
-            image_data TEXT DEFAULT '',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )''')
-        # Migration: add image_data column if table already existed without it
-        try:
-            cur.execute("ALTER TABLE ai_gallery ADD COLUMN IF NOT EXISTS image_data TEXT DEFAULT ''")
-        except Exception:
-            pass
-    else:
-        conn.execute('''CREATE TABLE IF NOT EXISTS ai_gallery (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            media_type TEXT NOT NULL,
-            url TEXT NOT NULL,
-            prompt TEXT DEFAULT '',
-            revised_prompt TEXT DEFAULT '',
-            saved BOOLEAN DEFAULT 0,
-            bottle_type TEXT DEFAULT '',
-            image_data TEXT DEFAULT '',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )''')
-        # Migration: add image_data column if table already existed without it
-        try:
-            conn.execute("ALTER TABLE ai_gallery ADD COLUMN image_data TEXT DEFAULT ''")
-        except Exception:
-            pass
-    conn.commit()
-    conn.close()
-    print("[Startup] AI gallery table verified")
-except Exception as e:
-    print(f"AI gallery table: {e}")
+# Initialize database: a single fingerprint check when warm, migrations + seed upserts otherwise
+db.init_db()
 
 # Auto-seed content library on first run
 try:
@@ -304,7 +201,7 @@ def caldate_filter(dt_string):
 def dashboard():
     stats = db.get_dashboard_stats()
     recent_posts = db.get_posts(limit=5)
-    scheduled = db.get_scheduled_posts()[:5]
+    scheduled = db.get_scheduled_posts(limit=5)
     activity = db.get_activity(limit=10)
     platforms = db.get_platforms()
     
@@ -376,17 +273,34 @@ def compose():
                          template=template,
                          page='compose')
 
+def _page_args(default_limit, max_limit=500):
+    """(limit, cursor) from ?limit=&cursor= on list pages and APIs"""
+    limit = request.args.get('limit', default_limit, type=int)
+    return max(1, min(limit, max_limit)), request.args.get('cursor') or None
+
+
+def _page_json(key, rows, next_cursor, partial):
+    """JSON for a keyset list API; ?cards=1 adds the rows rendered with the page's card partial (Load More, filters)"""
+    payload = {'success': True, key: rows, 'next_cursor': next_cursor}
+    if request.args.get('cards'):
+        payload['html'] = render_template(partial, **{key: rows})
+    return jsonify(payload)
+
+
 @app.route('/queue')
 def queue():
     status_filter = request.args.get('status', 'all')
-    if status_filter == 'all':
-        posts = db.get_posts(limit=100)
-    else:
-        posts = db.get_posts(status=status_filter, limit=100)
+    limit, cursor = _page_args(100)
+    try:
+        posts, next_cursor = db.get_posts_page(status=None if status_filter == 'all' else status_filter,
+                                               limit=limit, cursor=cursor)
+    except ValueError:
+        return redirect(url_for('queue', status=status_filter))
     
     platforms = db.get_platforms()
     return render_template('queue.html', 
                          posts=posts, 
+                         next_cursor=next_cursor,
                          platforms=platforms,
                          status_filter=status_filter,
                          page='queue')
@@ -465,83 +379,73 @@ def photos_page():
 @app.route('/api/photos/gallery')
 def api_photos_gallery():
     """Return all photos from the gallery folder with metadata"""
-    gallery_dir = os.path.join(app.static_folder, 'photos', 'gallery')
-    photos_dir = os.path.join(app.static_folder, 'photos')
     photos = []
-    
-    # Category mapping based on filename patterns
-    def categorize(fname):
-        fl = fname.lower()
-        if 'lightbg' in fl:
-            return 'Product (Light BG)'
-        elif 'singlebarrel' in fl:
-            if 'dark' in fl:
-                return 'Single Barrel (Dark)'
-            return 'Single Barrel'
-        elif 'smallbatch' in fl:
-            if 'dark' in fl:
-                return 'Small Batch (Dark)'
-            return 'Small Batch'
-        elif 'golden_front' in fl:
-            return 'Product (Light BG)'
-        elif 'black_front' in fl:
-            return 'Product (Light BG)'
-        elif '-edit' in fl or 'edit.' in fl:
-            return 'Lifestyle / Detail'
-        else:
-            return 'Photo Shoot'
-    
-    # Scan gallery folder
-    if os.path.exists(gallery_dir):
-        for fname in sorted(os.listdir(gallery_dir)):
-            if fname.lower().endswith(('.jpg', '.jpeg', '.png', '.webp', '.gif')):
-                fpath = os.path.join(gallery_dir, fname)
-                photos.append({
-                    'filename': fname,
-                    'url': f'/static/photos/gallery/{fname}',
-                    'category': categorize(fname),
-                    'size': os.path.getsize(fpath),
-                    'is_png': fname.lower().endswith('.png'),
-                    'is_hero': 'lightbg' in fname.lower() or 'black_front' in fname.lower()
-                })
-    
-    # Also include root-level photos
-    for fname in sorted(os.listdir(photos_dir)):
-        fpath = os.path.join(photos_dir, fname)
-        if os.path.isfile(fpath) and fname.lower().endswith(('.jpg', '.jpeg', '.png', '.webp')):
-            photos.append({
-                'filename': fname,
-                'url': f'/static/photos/{fname}',
-                'category': 'Brand Assets',
-                'size': os.path.getsize(fpath),
-                'is_png': fname.lower().endswith('.png'),
-                'is_hero': False
-            })
+    for p in photo_library.entries():
+        thumb_base = '/api/thumb' + p['url'][len('/static'):]
+        photos.append({
+            'filename': p['filename'],
+            'url': p['url'],
+            'category': p['category'],
+            'size': p['size'],
+            'width': p['width'],
+            'height': p['height'],
+            'is_png': p['is_png'],
+            'is_hero': p['is_hero'],
+            **thumbnails.variant_urls(thumb_base, f"{p['mtime']}-{p['size']}")
+        })
     
     categories = sorted(set(p['category'] for p in photos))
     return jsonify({'success': True, 'photos': photos, 'categories': categories, 'total': len(photos)})
 
+
+@app.route('/api/thumb/<path:src>')
+def api_thumb(src):
+    """Resized WebP/AVIF copy of an image under /static. ?w= snaps to thumbnails.THUMB_WIDTHS;
+    URLs carrying ?v= (the file version) are cached by the browser for a year."""
+    from werkzeug.security import safe_join
+    path = safe_join(app.static_folder, src)
+    if not path or not os.path.isfile(path) or not src.lower().endswith(('.jpg', '.jpeg', '.png', '.webp', '.gif')):
+        return jsonify({'error': 'Image not found'}), 404
+    fmt = thumbnails.pick_format(request.headers.get('Accept', ''))
+    variant = thumbnails.variant_for_file(path, thumbnails.pick_width(request.args.get('w')), fmt)
+    if not variant:
+        return redirect(f'/static/{src}')
+    resp = send_file(variant, mimetype=thumbnails.MIMETYPES[fmt],
+                     max_age=31536000 if request.args.get('v') else 3600)
+    resp.headers['Vary'] = 'Accept'
+    return resp
+
 @app.route('/guide')
 def guide_page():
     return render_template('guide.html', page='guide')
 
 @app.route('/blog-hub')
 def blog_hub_page():
-    articles = db.get_blog_articles(limit=50)
+    limit, cursor = _page_args(50)
+    try:
+        articles, next_cursor = db.get_blog_articles_page(limit=limit, cursor=cursor)
+    except ValueError:
+        return redirect(url_for('blog_hub_page'))
     topics = db.get_blog_topics()
     stats = db.get_blog_stats()
     return render_template('blog_hub.html', 
                          articles=articles,
+                         next_cursor=next_cursor,
                          topics=topics,
                          stats=stats,
                          page='blog-hub')
 
 @app.route('/brand-intel')
 def brand_intel_page():
-    mentions = db.get_brand_mentions(limit=500)
+    limit, cursor = _page_args(100)
+    try:
+        mentions, next_cursor = db.get_brand_mentions_page(limit=limit, cursor=cursor)
+    except ValueError:
+        return redirect(url_for('brand_intel_page'))
     stats = db.get_brand_mention_stats()
     return render_template('brand_intel.html',
                          mentions=mentions,
+                         next_cursor=next_cursor,
                          stats=stats,
                          page='brand-intel')
 
@@ -554,12 +458,17 @@ def mash_analytics_page():
 
 @app.route('/outreach')
 def outreach_page():
-    contacts = db.get_outreach_contacts(limit=500)
+    limit, cursor = _page_args(100)
+    try:
+        contacts, next_cursor = db.get_outreach_contacts_page(limit=limit, cursor=cursor)
+    except ValueError:
+        return redirect(url_for('outreach_page'))
     stats = db.get_outreach_stats()
     customer_email_count = db.get_customer_email_count()
     apollo_connected = bool(os.environ.get('APOLLO_API_KEY', ''))
     return render_template('outreach.html',
                          contacts=contacts,
+                         next_cursor=next_cursor,
                          stats=stats,
                          customer_email_count=customer_email_count,
                          apollo_connected=apollo_connected,
@@ -582,6 +491,19 @@ def creative_page():
 # API ROUTES - POSTS
 # ============================================================
 
+@app.route('/api/posts', methods=['GET'])
+def api_list_posts():
+    """Queue listing as JSON: ?status=&limit=&cursor="""
+    status = request.args.get('status')
+    limit, cursor = _page_args(50)
+    try:
+        posts, next_cursor = db.get_posts_page(status=None if status in (None, '', 'all') else status,
+                                               limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return _page_json('posts', posts, next_cursor, 'partials/post_cards.html')
+
+
 @app.route('/api/posts', methods=['POST'])
 def api_create_post():
     try:
@@ -659,6 +581,84 @@ def api_delete_post(post_id):
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _platform_publish_config(platform_config):
+    """Config dict for the publisher from a platforms row (credentials + additional_config JSON)"""
+    config = {
+        'api_key': platform_config.get('api_key', ''),
+        'api_secret': platform_config.get('api_secret', ''),
+        'access_token': platform_config.get('access_token', ''),
+        'refresh_token': platform_config.get('refresh_token', ''),
+        'username': platform_config.get('username', ''),
+    }
+    try:
+        config.update(json.loads(platform_config.get('additional_config') or '{}'))
+    except:
+        pass
+    return config
+
+
+# How long the scheduler's claim on a platform row lasts: the publish itself plus a late answer
+PUBLISH_CLAIM_HOLD = 2 * PUBLISH_TIMEOUT
+
+
+def _publish_post(post, platform_lookup, due_only=False):
+    """Publish a post to its platforms concurrently and record every outcome in one write.
+    due_only: only pending platforms whose first try or backed-off retry is due (the scheduler); otherwise all of them.
+    Returns (PublishResults in platform order, the post's new status); unconnected platforms fail without a request."""
+    platform_rows = post.get('platforms', [])
+    if due_only:
+        pending = [pp for pp in platform_rows if pp['status'] == 'pending']
+        if not pending:
+            # No platforms, or all already resolved: just roll the post's status up
+            return [], db.record_publish_results(post['id'], [])
+        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        platform_rows = [pp for pp in pending if str(pp.get('next_attempt_at') or '') <= now]
+        if platform_rows:
+            # Claim the rows first: a process that took over leadership mid-pass sees them as not due
+            claimed = set(db.claim_publish_platforms(post['id'], [pp['platform_name'] for pp in platform_rows],
+                                                     PUBLISH_CLAIM_HOLD))
+            platform_rows = [pp for pp in platform_rows if pp['platform_name'] in claimed]
+        if not platform_rows:
+            return [], None
+    
+    image_full_path = ''
+    if post.get('image_path'):
+        image_full_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       post['image_path'].lstrip('/'))
+    
+    results = {}
+    targets = []
+    for pp in platform_rows:
+        platform_name = pp['platform_name']
+        platform_config = platform_lookup.get(platform_name, {})
+        if not platform_config.get('connected'):
+            results[platform_name] = PublishResult(success=False, platform=platform_name,
+                                                   error=f'{platform_name} is not connected')
+        else:
+            targets.append((platform_name, _platform_publish_config(platform_config)))
+    
+    # A platform that answers after publish_many gave up is stored as it really went (once the
+    # timeout itself is recorded), so the retry queued for it doesn't post it a second time
+    recorded = threading.Event()
+    def record_late(result):
+        recorded.wait(30)
+        try:
+            db.record_publish_results(post['id'], [result])
+            print(f"[Publish] Post #{post['id']}: late answer from {result.platform} recorded")
+        except Exception as e:
+            print(f"[Publish] Post #{post['id']}: could not record late {result.platform} answer: {e}")
+    
+    try:
+        for (platform_name, _), result in zip(targets, publish_many(targets, post['content'], image_full_path,
+                                                                    on_late=record_late)):
+            results[platform_name] = result
+        
+        ordered = [results[pp['platform_name']] for pp in platform_rows]
+        return ordered, db.record_publish_results(post['id'], ordered)
+    finally:
+        recorded.set()
+
+
 @app.route('/api/posts/<int:post_id>/publish', methods=['POST'])
 def api_publish_post(post_id):
     """Publish a post to its selected platforms"""
@@ -667,66 +667,15 @@ def api_publish_post(post_id):
         if not post:
             return jsonify({'success': False, 'error': 'Post not found'}), 404
         
-        results = []
-        all_platforms = db.get_platforms()
-        platform_lookup = {p['name']: p for p in all_platforms}
-        
-        target_platforms = post.get('platforms', [])
-        if not target_platforms:
+        if not post.get('platforms'):
             return jsonify({'success': False, 'error': 'No platforms selected for this post'}), 400
         
-        image_full_path = ''
-        if post.get('image_path'):
-            image_full_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
-                                           post['image_path'].lstrip('/'))
-        
-        for pp in target_platforms:
-            platform_name = pp['platform_name']
-            platform_config = platform_lookup.get(platform_name, {})
-            
-            if not platform_config.get('connected'):
-                results.append({
-                    'platform': platform_name,
-                    'success': False,
-                    'error': f'{platform_name} is not connected'
-                })
-                continue
-            
-            # Build config dict for the publisher
-            config = {
-                'api_key': platform_config.get('api_key', ''),
-                'api_secret': platform_config.get('api_secret', ''),
-                'access_token': platform_config.get('access_token', ''),
-                'refresh_token': platform_config.get('refresh_token', ''),
-                'username': platform_config.get('username', ''),
-            }
-            
-            # Add any additional config
-            try:
-                additional = json.loads(platform_config.get('additional_config', '{}'))
-                config.update(additional)
-            except:
-                pass
-            
-            result = publish_to_platform(platform_name, post['content'], image_full_path, config)
-            results.append(result.to_dict())
-            
-            if result.success:
-                db.mark_post_published(post_id, platform_name, result.post_id)
-            else:
-                db.mark_post_failed(post_id, platform_name, result.error)
-        
-        # Update post status
-        any_success = any(r['success'] for r in results)
-        all_failed = all(not r['success'] for r in results)
-        
-        if all_failed:
-            db.update_post(post_id, status='failed')
-        elif any_success:
-            db.update_post(post_id, status='published', 
-                          published_at=datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'))
+        platform_lookup = {p['name']: p for p in db.get_platforms()}
+        results, status = _publish_post(post, platform_lookup)
+        results = [r.to_dict() for r in results]
         
-        return jsonify({'success': any_success, 'results': results})
+        # Transient failures stay queued; the scheduler retries them with backoff
+        return jsonify({'success': any(r['success'] for r in results), 'results': results, 'status': status})
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -887,6 +836,27 @@ def api_delete_hashtag_group(group_id):
 # API ROUTES - AI CONTENT GENERATION
 # ============================================================
 
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def _sse_response(events):
+    """text/event-stream response; X-Accel-Buffering stops Render's proxy from holding chunks back"""
+    return Response(stream_with_context(events), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _stream_completion(system, messages, max_tokens, finish, **options):
+    """SSE events for one llm.stream() completion: a `delta` event per chunk of text as it arrives,
+    then `done` carrying finish(full_text), or `error`. Cached answers arrive as a single delta."""
+    try:
+        parts = []
+        for chunk in llm.stream(system, messages, max_tokens, **options):
+            parts.append(chunk)
+            yield _sse('delta', {'text': chunk})
+        yield _sse('done', finish(''.join(parts)))
+    except Exception as e:
+        print(f"[Stream] Generation failed: {e}")
+        yield _sse('error', {'success': False, 'error': str(e)})
+
 @app.route('/api/generate', methods=['POST'])
 def api_generate_content():
     """Generate content using Claude API (better writing quality)"""
@@ -898,18 +868,12 @@ def api_generate_content():
         platform = data.get('platform', 'general')
         custom_prompt = data.get('custom_prompt', '')
         
-        anthropic_key = os.environ.get('ANTHROPIC_API_KEY', '')
-        if not anthropic_key:
-            # Fall back to OpenAI if no Anthropic key
-            api_key = get_api_key('openai')
-            if not api_key:
-                return jsonify({
-                    'success': False, 
-                    'error': 'No API key configured. Add ANTHROPIC_API_KEY or OPENAI_API_KEY in Render environment variables.'
-                }), 400
-            use_openai = True
-        else:
-            use_openai = False
+        # Anthropic first, OpenAI as the fallback (llm.PROVIDER_ORDER)
+        if not llm.available():
+            return jsonify({
+                'success': False, 
+                'error': 'No API key configured. Add ANTHROPIC_API_KEY or OPENAI_API_KEY in Render environment variables.'
+            }), 400
         
         system_prompt = """You are a social media content creator for Forbidden Bourbon, 
 a premium wheated bourbon whiskey brand. The bourbon is crafted by Master Distiller Marianne Eaves 
@@ -956,54 +920,15 @@ Be specific about the bourbon's qualities. Match the specified tone and platform
             
             user_message = prompts.get(prompt_type, prompts['social_post'])
         
-        import requests as req
+        messages = [{'role': 'user', 'content': user_message}]
+        if _wants_stream(data):
+            return _sse_response(_stream_completion(
+                system_prompt, messages, 1024, lambda text: {'success': True, 'content': text.strip()},
+                temperature=0.8, cache=True, fresh=_wants_fresh(data)))
         
-        if use_openai:
-            resp = req.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers={
-                    'Authorization': f'Bearer {api_key}',
-                    'Content-Type': 'application/json'
-                },
-                json={
-                    'model': 'gpt-4o-mini',
-                    'messages': [
-                        {'role': 'system', 'content': system_prompt},
-                        {'role': 'user', 'content': user_message}
-                    ],
-                    'max_tokens': 1024,
-                    'temperature': 0.8
-                },
-                timeout=30
-            )
-            if resp.status_code == 200:
-                generated_text = resp.json()['choices'][0]['message']['content']
-                return jsonify({'success': True, 'content': generated_text.strip()})
-        else:
-            resp = req.post(
-                'https://api.anthropic.com/v1/messages',
-                headers={
-                    'x-api-key': anthropic_key,
-                    'anthropic-version': '2023-06-01',
-                    'Content-Type': 'application/json'
-                },
-                json={
-                    'model': 'claude-sonnet-4-6',
-                    'max_tokens': 1024,
-                    'system': system_prompt,
-                    'messages': [{'role': 'user', 'content': user_message}]
-                },
-                timeout=30
-            )
-            if resp.status_code == 200:
-                response_data = resp.json()
-                generated_text = ''
-                for block in response_data.get('content', []):
-                    if block.get('type') == 'text':
-                        generated_text += block['text']
-                return jsonify({'success': True, 'content': generated_text.strip()})
-        
-        return jsonify({'success': False, 'error': f'API Error: {resp.status_code} - {resp.text}'}), 500
+        result = llm.complete(system_prompt, messages, 1024, temperature=0.8, hedge=True,
+                              cache=True, fresh=_wants_fresh(data))
+        return jsonify({'success': True, 'content': result.text.strip(), 'cached': result.cached})
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1060,7 +985,6 @@ def _get_bottle_cutout(source_path, api_key=None):
     """
     from PIL import Image as PILImage
     import io as _io
-    import requests as _req
 
     cache_dir = os.path.join(app.static_folder, 'uploads', 'cutout_cache')
     os.makedirs(cache_dir, exist_ok=True)
@@ -1102,7 +1026,7 @@ def _get_bottle_cutout(source_path, api_key=None):
     removebg_key = os.environ.get('REMOVEBG_API_KEY', '')
     if removebg_key:
         try:
-            resp = _req.post(
+            resp = req.post(
                 'https://api.remove.bg/v1.0/removebg',
                 headers={'X-Api-Key': removebg_key},
                 files={'image_file': ('bottle.png', img_bytes, 'image/png')},
@@ -1157,7 +1081,6 @@ def _rate_composite(image_pil, api_key, prompt=''):
     Rate a composite image 1-10 using GPT-4o vision.
     Returns (score: float, feedback: str). Defaults to 7.0 on failure.
     """
-    import requests as req
     import base64 as b64
     import io
     try:
@@ -1280,7 +1203,6 @@ def _ai_composite_bottle_on_bg(bottle_cutout, background_img, api_key, size='102
     """
     from PIL import Image as PILImage
     import io as _io
-    import requests as _req
     import base64 as _b64
 
     try:
@@ -1342,7 +1264,7 @@ def _ai_composite_bottle_on_bg(bottle_cutout, background_img, api_key, size='102
 
         print(f"[AI Composite] Sending 2-image Edit API call with input_fidelity=high, quality={quality}")
 
-        resp = _req.post(
+        resp = req.post(
             'https://api.openai.com/v1/images/edits',
             headers={'Authorization': f'Bearer {api_key}'},
             files=[
@@ -1387,6 +1309,47 @@ def _ai_composite_bottle_on_bg(bottle_cutout, background_img, api_key, size='102
 
 @app.route('/api/ai/generate-image', methods=['POST'])
 def api_generate_image():
+    """Queue an image generation job. Returns 202 with a job id right away;
+    the client polls /api/jobs/<id> for progress and the finished image."""
+    try:
+        data = request.get_json() or {}
+        if not data.get('prompt'):
+            return jsonify({'success': False, 'error': 'Prompt required'}), 400
+        if not get_api_key('openai'):
+            return jsonify({'success': False, 'error': 'OpenAI API key not configured. Set OPENAI_API_KEY in Render env vars.'}), 400
+        
+        params = {k: data[k] for k in ('prompt', 'size', 'quality', 'use_reference',
+                                       'bottle_position', 'bottle_scale', 'bottle_type') if k in data}
+        job_id = jobs.submit('generate_image', params)
+        return jsonify({'success': True, 'job_id': job_id, 'status': 'queued',
+                        'status_url': f'/api/jobs/{job_id}'}), 202
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Server error: {str(e)}'}), 500
+
+
+@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+def api_job_status(job_id):
+    """Status/progress of a background job; `result` is filled in once it has succeeded"""
+    job = db.get_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({
+        'success': True,
+        'job_id': job['id'],
+        'kind': job['kind'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'message': job['message'],
+        'error': job['error'] or None,
+        'result': job['result'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at'],
+    })
+
+
+@jobs.handler('generate_image')
+def _generate_image_job(data, job):
     """
     TRUE COMPOSITE: 3-step pipeline for pixel-perfect brand accuracy.
     Step 1: remove.bg removes background from hi-res studio photo → exact bottle cutout
@@ -1395,342 +1358,337 @@ def api_generate_image():
     Step 3b: PIL composite fallback if Edit API fails
     Result: 100% accurate bottle/label + beautiful AI backgrounds, social-media ready
     """
-    try:
-        data = request.get_json()
-        prompt = data.get('prompt', '')
-        size = data.get('size', '1024x1536')
-        quality = data.get('quality', 'high')
-        use_reference = data.get('use_reference', True)
-        bottle_position = data.get('bottle_position', 'center')
-        bottle_scale = data.get('bottle_scale', 0.72)
-        bottle_type = data.get('bottle_type', 'small_batch')
-        
-        if not prompt:
-            return jsonify({'success': False, 'error': 'Prompt required'}), 400
-        
-        api_key = get_api_key('openai')
-        if not api_key:
-            return jsonify({'success': False, 'error': 'OpenAI API key not configured. Set OPENAI_API_KEY in Render env vars.'}), 400
-        
-        import base64 as b64
-        import requests as req
-        from PIL import Image as PILImage, ImageFilter
-        import io
-        
-        gpt_size = size if size in ('1024x1024', '1024x1536', '1536x1024') else '1024x1536'
-        image_url = None
-        model_used = None
-        errors = []
-        
-        # =====================================================
-        # STEPS 1 & 2: PARALLEL — cutout + background at same time
-        # Saves ~10-15s by running remove.bg and DALL-E concurrently
-        # =====================================================
-        bottle_cutout = None
-        background_img = None
-        
-        # Prepare cutout source path
-        source_path = None
-        if use_reference:
-            if bottle_type == 'single_barrel':
-                source_candidates = [
-                    os.path.join(app.static_folder, 'photos', 'gallery', 'Golden_Front_57_LightBG_V1.png'),
-                    os.path.join(app.static_folder, 'photos', 'gallery', 'Golden_Front_58_LightBG_V1.png'),
-                    os.path.join(app.static_folder, 'photos', 'gallery', 'SingleBarrel1.jpg'),
-                    os.path.join(app.static_folder, 'photos', 'SingleBarrel1.jpg'),
-                ]
-            else:
-                source_candidates = [
-                    os.path.join(app.static_folder, 'photos', 'gallery', 'Black_Front_LightBG_V1.png'),
-                    os.path.join(app.static_folder, 'photos', 'gallery', 'SmallBatch1.jpg'),
-                    os.path.join(app.static_folder, 'photos', 'SmallBatch1.jpg'),
-                    os.path.join(app.static_folder, 'photos', 'bottle-ref.jpg'),
-                ]
-            
-            for c in source_candidates:
-                print(f"[AI Studio] Checking photo: {os.path.basename(c)} — exists: {os.path.exists(c)}")
-            
-            source_path = next((c for c in source_candidates if os.path.exists(c)), None)
-            
-            if not source_path:
-                all_paths = [os.path.basename(c) for c in source_candidates]
-                errors.append(f"No studio photo found. Tried: {all_paths}")
-                print(f"[AI Studio] No bottle photo found. Candidates: {source_candidates}")
-        
-        # Prepare background prompt
-        if bottle_position == 'left':
-            comp_hint = "Richer background detail on the right side, open negative space on the left third for a product. "
-        elif bottle_position == 'right':
-            comp_hint = "Richer background detail on the left side, open negative space on the right third for a product. "
+    prompt = data.get('prompt', '')
+    size = data.get('size', '1024x1536')
+    quality = data.get('quality', 'high')
+    use_reference = data.get('use_reference', True)
+    bottle_position = data.get('bottle_position', 'center')
+    bottle_scale = data.get('bottle_scale', 0.72)
+    bottle_type = data.get('bottle_type', 'small_batch')
+    
+    api_key = get_api_key('openai')
+    if not api_key:
+        raise RuntimeError('OpenAI API key not configured. Set OPENAI_API_KEY in Render env vars.')
+    
+    import base64 as b64
+    from PIL import Image as PILImage, ImageFilter
+    import io
+    
+    gpt_size = size if size in ('1024x1024', '1024x1536', '1536x1024') else '1024x1536'
+    image_url = None
+    model_used = None
+    errors = []
+    
+    # =====================================================
+    # STEPS 1 & 2: PARALLEL — cutout + background at same time
+    # Saves ~10-15s by running remove.bg and DALL-E concurrently
+    # =====================================================
+    bottle_cutout = None
+    background_img = None
+    
+    # Prepare cutout source path
+    source_path = None
+    if use_reference:
+        if bottle_type == 'single_barrel':
+            source_candidates = [
+                os.path.join(app.static_folder, 'photos', 'gallery', 'Golden_Front_57_LightBG_V1.png'),
+                os.path.join(app.static_folder, 'photos', 'gallery', 'Golden_Front_58_LightBG_V1.png'),
+                os.path.join(app.static_folder, 'photos', 'gallery', 'SingleBarrel1.jpg'),
+                os.path.join(app.static_folder, 'photos', 'SingleBarrel1.jpg'),
+            ]
         else:
-            comp_hint = "Balanced composition with open negative space in the center foreground for a product. "
-
-        bg_scene_prompt = (
-            f"{prompt}. "
-            "Environment only — no bottles, no products, no objects. "
-            "Just the surface, background, and lighting. "
-            "Flat polished surface in the foreground for a luxury product to rest on. "
-            f"{comp_hint}"
-            "High-end spirits advertisement environment. "
-            "Cinematic lighting, rich atmospheric depth. "
-            "Shot with 35mm lens, shallow depth of field, moody and dramatic. "
-            "Photorealistic, commercial photography quality."
-        )
+            source_candidates = [
+                os.path.join(app.static_folder, 'photos', 'gallery', 'Black_Front_LightBG_V1.png'),
+                os.path.join(app.static_folder, 'photos', 'gallery', 'SmallBatch1.jpg'),
+                os.path.join(app.static_folder, 'photos', 'SmallBatch1.jpg'),
+                os.path.join(app.static_folder, 'photos', 'bottle-ref.jpg'),
+            ]
         
-        # --- Define worker functions for parallel execution ---
-        def _do_cutout():
-            if not source_path:
-                return None
-            try:
-                result = _get_bottle_cutout(source_path, api_key=api_key)
-                print(f"[AI Studio] Got bottle cutout: {result.size}")
-                return result
-            except Exception as e:
-                errors.append(f"Cutout: {str(e)[:200]}")
-                print(f"[AI Studio] Cutout failed: {e}")
-                return None
+        source_path = photo_library.first_existing(source_candidates)
+        print(f"[AI Studio] Studio photo: {os.path.basename(source_path) if source_path else None}")
         
-        def _do_background():
-            print(f"[AI Studio] Generating background with gpt-image-1.5...")
+        if not source_path:
+            all_paths = [os.path.basename(c) for c in source_candidates]
+            errors.append(f"No studio photo found. Tried: {all_paths}")
+            print(f"[AI Studio] No bottle photo found. Candidates: {source_candidates}")
+    
+    # Prepare background prompt
+    if bottle_position == 'left':
+        comp_hint = "Richer background detail on the right side, open negative space on the left third for a product. "
+    elif bottle_position == 'right':
+        comp_hint = "Richer background detail on the left side, open negative space on the right third for a product. "
+    else:
+        comp_hint = "Balanced composition with open negative space in the center foreground for a product. "
+
+    bg_scene_prompt = (
+        f"{prompt}. "
+        "Environment only — no bottles, no products, no objects. "
+        "Just the surface, background, and lighting. "
+        "Flat polished surface in the foreground for a luxury product to rest on. "
+        f"{comp_hint}"
+        "High-end spirits advertisement environment. "
+        "Cinematic lighting, rich atmospheric depth. "
+        "Shot with 35mm lens, shallow depth of field, moody and dramatic. "
+        "Photorealistic, commercial photography quality."
+    )
+    
+    # --- Define worker functions for parallel execution ---
+    def _do_cutout():
+        if not source_path:
+            return None
+        try:
+            result = _get_bottle_cutout(source_path, api_key=api_key)
+            print(f"[AI Studio] Got bottle cutout: {result.size}")
+            return result
+        except Exception as e:
+            errors.append(f"Cutout: {str(e)[:200]}")
+            print(f"[AI Studio] Cutout failed: {e}")
+            return None
+    
+    def _do_background():
+        print(f"[AI Studio] Generating background with gpt-image-1.5...")
+        try:
+            resp = req.post(
+                'https://api.openai.com/v1/images/generations',
+                headers={'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'},
+                json={
+                    'model': 'gpt-image-1.5',
+                    'prompt': bg_scene_prompt,
+                    'n': 1,
+                    'size': gpt_size,
+                    'quality': quality if quality in ('low', 'medium', 'high') else 'high',
+                    'output_format': 'png',
+                },
+                timeout=120
+            )
+            
+            if resp.status_code == 200:
+                result = resp.json()
+                img_b64 = result.get('data', [{}])[0].get('b64_json')
+                if img_b64:
+                    bg_bytes = b64.b64decode(img_b64)
+                    bg = PILImage.open(io.BytesIO(bg_bytes)).convert('RGBA')
+                    print(f"[AI Studio] Background generated: {bg.size}")
+                    return bg
+                else:
+                    errors.append("Background generation: no image data")
+            else:
+                err_msg = 'Unknown error'
+                try:
+                    err_msg = resp.json().get('error', {}).get('message', resp.text[:500])
+                except:
+                    err_msg = resp.text[:500]
+                errors.append(f"Background generation: {err_msg}")
+                print(f"[AI Studio] Background generation failed ({resp.status_code}): {err_msg}")
+        except Exception as e:
+            errors.append(f"Background generation: {str(e)[:200]}")
+            print(f"[AI Studio] Background generation exception: {e}")
+        return None
+    
+    # --- Run cutout + background in parallel ---
+    job.progress(5, 'Cutting out bottle and generating background scene' if use_reference and source_path
+                 else 'Generating background scene')
+    if use_reference and source_path:
+        from concurrent.futures import ThreadPoolExecutor
+        print("[AI Studio] Running cutout + background in PARALLEL...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            cutout_future = executor.submit(_do_cutout)
+            bg_future = executor.submit(_do_background)
+            bottle_cutout = cutout_future.result()
+            background_img = bg_future.result()
+    else:
+        # Non-composite: just generate background
+        background_img = _do_background()
+    
+    # =====================================================
+    # STEP 3: AI COMPOSITE with QUALITY GATE (9+ or retry)
+    # Up to 3 attempts: generate composite → rate via GPT-4o → keep if 9+
+    # =====================================================
+    if bottle_cutout and background_img:
+        final = None
+        composite_method = None
+        best_score = 0
+        best_final = None
+        best_method = None
+        best_feedback = ''
+        MAX_ATTEMPTS = 3
+        QUALITY_THRESHOLD = 9.0
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            print(f"[Quality Gate] Attempt {attempt}/{MAX_ATTEMPTS}")
+            job.progress(35 + 20 * (attempt - 1), f'Compositing bottle onto scene (attempt {attempt}/{MAX_ATTEMPTS})')
+            attempt_final = None
+            attempt_method = None
+
+            # If attempt > 1, regenerate background with slightly varied prompt
+            if attempt > 1:
+                print(f"[Quality Gate] Regenerating background for attempt {attempt}...")
+                background_img = _do_background()
+                if not background_img:
+                    errors.append(f"Background regen failed on attempt {attempt}")
+                    continue
+
+            # --- PRIMARY: AI composite via Edit API ---
             try:
-                resp = req.post(
-                    'https://api.openai.com/v1/images/generations',
-                    headers={'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'},
-                    json={
-                        'model': 'gpt-image-1.5',
-                        'prompt': bg_scene_prompt,
-                        'n': 1,
-                        'size': gpt_size,
-                        'quality': quality if quality in ('low', 'medium', 'high') else 'high',
-                        'output_format': 'png',
-                    },
-                    timeout=120
+                attempt_final = _ai_composite_bottle_on_bg(
+                    bottle_cutout, background_img,
+                    api_key=api_key,
+                    size=gpt_size,
+                    quality=quality if quality in ('low', 'medium', 'high') else 'high',
+                    position=bottle_position,
+                    scale=float(bottle_scale or 0.65)
                 )
-                
-                if resp.status_code == 200:
-                    result = resp.json()
-                    img_b64 = result.get('data', [{}])[0].get('b64_json')
-                    if img_b64:
-                        bg_bytes = b64.b64decode(img_b64)
-                        bg = PILImage.open(io.BytesIO(bg_bytes)).convert('RGBA')
-                        print(f"[AI Studio] Background generated: {bg.size}")
-                        return bg
-                    else:
-                        errors.append("Background generation: no image data")
-                else:
-                    err_msg = 'Unknown error'
-                    try:
-                        err_msg = resp.json().get('error', {}).get('message', resp.text[:500])
-                    except:
-                        err_msg = resp.text[:500]
-                    errors.append(f"Background generation: {err_msg}")
-                    print(f"[AI Studio] Background generation failed ({resp.status_code}): {err_msg}")
+                if attempt_final:
+                    attempt_method = f'ai-composite-edit+rembg ({bottle_type})'
             except Exception as e:
-                errors.append(f"Background generation: {str(e)[:200]}")
-                print(f"[AI Studio] Background generation exception: {e}")
-            return None
-        
-        # --- Run cutout + background in parallel ---
-        if use_reference and source_path:
-            from concurrent.futures import ThreadPoolExecutor
-            print("[AI Studio] Running cutout + background in PARALLEL...")
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                cutout_future = executor.submit(_do_cutout)
-                bg_future = executor.submit(_do_background)
-                bottle_cutout = cutout_future.result()
-                background_img = bg_future.result()
-        else:
-            # Non-composite: just generate background
-            background_img = _do_background()
-        
-        # =====================================================
-        # STEP 3: AI COMPOSITE with QUALITY GATE (9+ or retry)
-        # Up to 3 attempts: generate composite → rate via GPT-4o → keep if 9+
-        # =====================================================
-        if bottle_cutout and background_img:
-            final = None
-            composite_method = None
-            best_score = 0
-            best_final = None
-            best_method = None
-            best_feedback = ''
-            MAX_ATTEMPTS = 3
-            QUALITY_THRESHOLD = 9.0
-
-            for attempt in range(1, MAX_ATTEMPTS + 1):
-                print(f"[Quality Gate] Attempt {attempt}/{MAX_ATTEMPTS}")
-                attempt_final = None
-                attempt_method = None
-
-                # If attempt > 1, regenerate background with slightly varied prompt
-                if attempt > 1:
-                    print(f"[Quality Gate] Regenerating background for attempt {attempt}...")
-                    background_img = _do_background()
-                    if not background_img:
-                        errors.append(f"Background regen failed on attempt {attempt}")
-                        continue
+                import traceback
+                errors.append(f"AI Composite attempt {attempt}: {str(e)[:200]}")
+                print(f"[AI Studio] AI composite exception: {traceback.format_exc()}")
 
-                # --- PRIMARY: AI composite via Edit API ---
+            # --- FALLBACK: PIL composite ---
+            if attempt_final is None:
+                print(f"[AI Studio] AI composite failed — falling back to PIL composite")
                 try:
-                    attempt_final = _ai_composite_bottle_on_bg(
+                    attempt_final = _composite_bottle_on_bg(
                         bottle_cutout, background_img,
-                        api_key=api_key,
-                        size=gpt_size,
-                        quality=quality if quality in ('low', 'medium', 'high') else 'high',
                         position=bottle_position,
-                        scale=float(bottle_scale or 0.65)
+                        scale=float(bottle_scale or 0.72)
                     )
-                    if attempt_final:
-                        attempt_method = f'ai-composite-edit+rembg ({bottle_type})'
+                    attempt_method = f'pil-composite-fallback+rembg ({bottle_type})'
                 except Exception as e:
                     import traceback
-                    errors.append(f"AI Composite attempt {attempt}: {str(e)[:200]}")
-                    print(f"[AI Studio] AI composite exception: {traceback.format_exc()}")
-
-                # --- FALLBACK: PIL composite ---
-                if attempt_final is None:
-                    print(f"[AI Studio] AI composite failed — falling back to PIL composite")
-                    try:
-                        attempt_final = _composite_bottle_on_bg(
-                            bottle_cutout, background_img,
-                            position=bottle_position,
-                            scale=float(bottle_scale or 0.72)
-                        )
-                        attempt_method = f'pil-composite-fallback+rembg ({bottle_type})'
-                    except Exception as e:
-                        import traceback
-                        errors.append(f"PIL Composite fallback attempt {attempt}: {str(e)[:200]}")
-                        continue
-
-                if not attempt_final:
+                    errors.append(f"PIL Composite fallback attempt {attempt}: {str(e)[:200]}")
                     continue
 
-                # --- QUALITY GATE: Rate with GPT-4o vision ---
-                score, feedback = _rate_composite(attempt_final, api_key, prompt)
+            if not attempt_final:
+                continue
+
+            # --- QUALITY GATE: Rate with GPT-4o vision ---
+            score, feedback = _rate_composite(attempt_final, api_key, prompt)
 
-                if score > best_score:
-                    best_score = score
-                    best_final = attempt_final
-                    best_method = attempt_method
-                    best_feedback = feedback
+            if score > best_score:
+                best_score = score
+                best_final = attempt_final
+                best_method = attempt_method
+                best_feedback = feedback
 
-                if score >= QUALITY_THRESHOLD:
-                    print(f"[Quality Gate] ✅ Passed on attempt {attempt}: {score}/10")
-                    break
-                else:
-                    print(f"[Quality Gate] ❌ Below threshold on attempt {attempt}: {score}/10 (need {QUALITY_THRESHOLD}+)")
-
-            # Use best result regardless (even if below threshold after 3 tries)
-            final = best_final
-            composite_method = best_method
-            if best_score > 0:
-                composite_method = f'{best_method} [rated {best_score}/10]'
-                if best_score < QUALITY_THRESHOLD:
-                    errors.append(f"Quality gate: best score {best_score}/10 after {MAX_ATTEMPTS} attempts — {best_feedback}")
-
-            if final:
-                filename = f"ai-composite-{int(time_module.time())}.png"
-                filepath = os.path.join(app.static_folder, 'uploads', filename)
-                final.save(filepath, quality=95, optimize=False)
-                image_url = f"/static/uploads/{filename}"
-                model_used = composite_method
-                print(f"[AI Studio] Composite saved ({composite_method}): {filepath}")
-        
-        # If reference failed but we have a background, save that at minimum
-        elif background_img and not bottle_cutout:
-            filename = f"ai-bg-{int(time_module.time())}.png"
+            if score >= QUALITY_THRESHOLD:
+                print(f"[Quality Gate] ✅ Passed on attempt {attempt}: {score}/10")
+                break
+            else:
+                print(f"[Quality Gate] ❌ Below threshold on attempt {attempt}: {score}/10 (need {QUALITY_THRESHOLD}+)")
+
+        # Use best result regardless (even if below threshold after 3 tries)
+        final = best_final
+        composite_method = best_method
+        if best_score > 0:
+            composite_method = f'{best_method} [rated {best_score}/10]'
+            if best_score < QUALITY_THRESHOLD:
+                errors.append(f"Quality gate: best score {best_score}/10 after {MAX_ATTEMPTS} attempts — {best_feedback}")
+
+        if final:
+            filename = f"ai-composite-{int(time_module.time())}.png"
             filepath = os.path.join(app.static_folder, 'uploads', filename)
-            background_img.convert('RGB').save(filepath, quality=95)
+            final.save(filepath, quality=95, optimize=False)
             image_url = f"/static/uploads/{filename}"
-            model_used = 'gpt-image-1.5-background-only'
-        
-        # =====================================================
-        # FALLBACK: Text-only with bottle description
-        # =====================================================
-        if not image_url:
-            print(f"[AI Studio] Falling back to text-only generation...")
-            try:
-                if bottle_type == 'single_barrel':
-                    bottle_desc = (
-                        "Forbidden Bourbon Single Barrel bottle — hexagonal faceted crystal glass, "
-                        "gold/copper label reading 'FORBIDDEN' in ornate serif letters, "
-                        "'SINGLE BARREL STRAIGHT BOURBON WHISKEY', barrel badge emblem, "
-                        "dark wooden stopper cap, rich amber liquid."
-                    )
-                else:
-                    bottle_desc = (
-                        "Forbidden Bourbon bottle — hexagonal faceted crystal glass, "
-                        "black label reading 'FORBIDDEN' in ornate silver serif letters, "
-                        "'STRAIGHT BOURBON WHISKEY', barrel badge emblem, "
-                        "dark wooden stopper cap, rich deep amber liquid."
-                    )
-                
-                text_prompt = (
-                    f"Ultra-premium spirits product photography: {prompt}. "
-                    f"{bottle_desc} "
-                    "Cinematic luxury advertisement. Photorealistic, commercial photography, "
-                    "shot with 35mm lens, dramatic lighting."
+            model_used = composite_method
+            print(f"[AI Studio] Composite saved ({composite_method}): {filepath}")
+    
+    # If reference failed but we have a background, save that at minimum
+    elif background_img and not bottle_cutout:
+        filename = f"ai-bg-{int(time_module.time())}.png"
+        filepath = os.path.join(app.static_folder, 'uploads', filename)
+        background_img.convert('RGB').save(filepath, quality=95)
+        image_url = f"/static/uploads/{filename}"
+        model_used = 'gpt-image-1.5-background-only'
+    
+    # =====================================================
+    # FALLBACK: Text-only with bottle description
+    # =====================================================
+    if not image_url:
+        print(f"[AI Studio] Falling back to text-only generation...")
+        job.progress(80, 'Falling back to text-only generation')
+        try:
+            if bottle_type == 'single_barrel':
+                bottle_desc = (
+                    "Forbidden Bourbon Single Barrel bottle — hexagonal faceted crystal glass, "
+                    "gold/copper label reading 'FORBIDDEN' in ornate serif letters, "
+                    "'SINGLE BARREL STRAIGHT BOURBON WHISKEY', barrel badge emblem, "
+                    "dark wooden stopper cap, rich amber liquid."
                 )
-                
-                resp = req.post(
-                    'https://api.openai.com/v1/images/generations',
-                    headers={'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'},
-                    json={
-                        'model': 'gpt-image-1.5',
-                        'prompt': text_prompt,
-                        'n': 1,
-                        'size': gpt_size,
-                        'quality': quality if quality in ('low', 'medium', 'high') else 'high',
-                    },
-                    timeout=120
+            else:
+                bottle_desc = (
+                    "Forbidden Bourbon bottle — hexagonal faceted crystal glass, "
+                    "black label reading 'FORBIDDEN' in ornate silver serif letters, "
+                    "'STRAIGHT BOURBON WHISKEY', barrel badge emblem, "
+                    "dark wooden stopper cap, rich deep amber liquid."
                 )
-                
-                if resp.status_code == 200:
-                    result = resp.json()
-                    img_data_resp = result['data'][0]
-                    if img_data_resp.get('b64_json'):
-                        img_bytes = b64.b64decode(img_data_resp['b64_json'])
-                        filename = f"ai-gen-{int(time_module.time())}.png"
-                        filepath = os.path.join(app.static_folder, 'uploads', filename)
-                        with open(filepath, 'wb') as f:
-                            f.write(img_bytes)
-                        image_url = f"/static/uploads/{filename}"
-                    model_used = 'gpt-image-1.5 (text-only fallback)'
-                else:
-                    err_msg = resp.json().get('error', {}).get('message', resp.text[:300])
-                    errors.append(f"Text-only fallback: {err_msg}")
-            except Exception as e:
-                errors.append(f"Text-only fallback: {str(e)[:200]}")
-        
-        if not image_url:
-            error_detail = ' | '.join(errors) if errors else 'No image data returned'
-            return jsonify({'success': False, 'error': f'Image generation failed: {error_detail}'}), 500
-        
-        # Read image bytes into base64 — stored in DB so gallery survives Render restarts
-        _image_b64 = ''
-        try:
-            _img_path = app.static_folder + image_url[len('/static'):]
-            with open(_img_path, 'rb') as _f:
-                _image_b64 = b64.b64encode(_f.read()).decode('utf-8')
-        except Exception as _e:
-            print(f"[Gallery] Could not read image for b64 storage: {_e}")
-        
-        _save_gallery_id = _save_to_gallery('image', image_url, prompt, bg_scene_prompt if use_reference else prompt, bottle_type if use_reference else '', image_data=_image_b64)
-        
-        return jsonify({
-            'success': True,
-            'image_url': image_url,
-            'revised_prompt': bg_scene_prompt if use_reference else prompt,
-            'model': model_used,
-            'used_reference': bool(bottle_cutout and background_img),
-            'gallery_id': _save_gallery_id,
-            'quality_score': best_score if use_reference and bottle_cutout and background_img else None,
-            'quality_feedback': best_feedback if use_reference and bottle_cutout and background_img else None,
-            'debug_errors': errors  # visible in browser devtools network tab
-        })
+            
+            text_prompt = (
+                f"Ultra-premium spirits product photography: {prompt}. "
+                f"{bottle_desc} "
+                "Cinematic luxury advertisement. Photorealistic, commercial photography, "
+                "shot with 35mm lens, dramatic lighting."
+            )
+            
+            resp = req.post(
+                'https://api.openai.com/v1/images/generations',
+                headers={'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'},
+                json={
+                    'model': 'gpt-image-1.5',
+                    'prompt': text_prompt,
+                    'n': 1,
+                    'size': gpt_size,
+                    'quality': quality if quality in ('low', 'medium', 'high') else 'high',
+                },
+                timeout=120
+            )
+            
+            if resp.status_code == 200:
+                result = resp.json()
+                img_data_resp = result['data'][0]
+                if img_data_resp.get('b64_json'):
+                    img_bytes = b64.b64decode(img_data_resp['b64_json'])
+                    filename = f"ai-gen-{int(time_module.time())}.png"
+                    filepath = os.path.join(app.static_folder, 'uploads', filename)
+                    with open(filepath, 'wb') as f:
+                        f.write(img_bytes)
+                    image_url = f"/static/uploads/{filename}"
+                model_used = 'gpt-image-1.5 (text-only fallback)'
+            else:
+                err_msg = resp.json().get('error', {}).get('message', resp.text[:300])
+                errors.append(f"Text-only fallback: {err_msg}")
+        except Exception as e:
+            errors.append(f"Text-only fallback: {str(e)[:200]}")
     
-    except Exception as e:
-        return jsonify({'success': False, 'error': f'Server error: {str(e)}'}), 500
+    if not image_url:
+        error_detail = ' | '.join(errors) if errors else 'No image data returned'
+        raise RuntimeError(f'Image generation failed: {error_detail}')
+    
+    # Keep the image bytes in the DB blob store so the gallery survives Render restarts
+    job.progress(95, 'Saving to gallery')
+    _image_bytes = None
+    try:
+        _img_path = app.static_folder + image_url[len('/static'):]
+        with open(_img_path, 'rb') as _f:
+            _image_bytes = _f.read()
+    except Exception as _e:
+        print(f"[Gallery] Could not read image for blob storage: {_e}")
+    
+    _save_gallery_id = _save_to_gallery('image', image_url, prompt, bg_scene_prompt if use_reference else prompt, bottle_type if use_reference else '', image_bytes=_image_bytes)
+    
+    return {
+        'success': True,
+        'image_url': image_url,
+        'revised_prompt': bg_scene_prompt if use_reference else prompt,
+        'model': model_used,
+        'used_reference': bool(bottle_cutout and background_img),
+        'gallery_id': _save_gallery_id,
+        'quality_score': best_score if use_reference and bottle_cutout and background_img else None,
+        'quality_feedback': best_feedback if use_reference and bottle_cutout and background_img else None,
+        'debug_errors': errors  # visible in browser devtools network tab
+    }
+
 
 
 def _maybe_resize_for_runway(abs_path, rel_url, portrait=True, max_px=1280):
@@ -1833,7 +1791,11 @@ def api_generate_video():
             _rel = source_image
             if _rel.startswith(_base_url):
                 _rel = _rel[len(_base_url):]
-            if _rel.startswith('/static/'):
+            if _rel.startswith('/static/photos/'):
+                if not photo_library.lookup(_rel):
+                    print(f"[Video] source_image {source_image} not in the photo library — will select best bottle photo")
+                    source_image = None
+            elif _rel.startswith('/static/'):
                 _abs = os.path.join(app.static_folder, _rel[len('/static/'):])
                 if not os.path.exists(_abs):
                     print(f"[Video] source_image {source_image} not found on disk — will select best bottle photo")
@@ -1841,12 +1803,9 @@ def api_generate_video():
 
         # Auto-select best available clean bottle photo
         if not source_image:
-            for _candidate in _clean_bottle_candidates:
-                _abs = os.path.join(app.static_folder, _candidate[len('/static/'):])
-                if os.path.exists(_abs):
-                    source_image = _candidate
-                    print(f"[Video] Auto-selected source image: {source_image}")
-                    break
+            source_image = photo_library.first_existing(_clean_bottle_candidates)
+            if source_image:
+                print(f"[Video] Auto-selected source image: {source_image}")
 
         # ── PROMPT: inject brand-specific camera-motion prompt if frontend sends generic/empty ──
         _DEFAULT_VIDEO_PROMPT = (
@@ -1874,7 +1833,6 @@ def api_generate_video():
             prompt = prompt + ". CRITICAL CONSTRAINTS: " + ", ".join(hard_constraints) + "."
             print(f"[Video] Using user prompt (enhanced with hard constraints)")
 
-        import requests as req
 
         # ── RUNWAY ML ──────────────────────────────────────────────────────────
         if provider == 'runway':
@@ -2412,7 +2370,6 @@ def api_finalize_video():
       "voiceover": { "enabled": true, "text": "...", "voice_id": "..." }
     }
     """
-    import requests as req
     import subprocess
     import uuid
     import tempfile
@@ -2572,7 +2529,6 @@ def _auto_add_audio(raw_video_url, duration=10, audio_style='ambient'):
     audio_style: 'ambient' (bar atmosphere), 'music' (cinematic instrumental), 'none' (silent)
     Falls back to the original CDN URL if ElevenLabs key missing or any step fails.
     """
-    import requests as req
     import subprocess
     import uuid
 
@@ -2668,7 +2624,6 @@ def _auto_add_audio(raw_video_url, duration=10, audio_style='ambient'):
 def api_video_status(task_id):
     """Check video generation status — supports Runway and Luma"""
     try:
-        import requests as req
         provider = request.args.get('provider', 'runway')
 
         if provider == 'runway':
@@ -2790,30 +2745,28 @@ def api_ai_gallery():
     try:
         saved_only = request.args.get('saved', '') == 'true'
         limit = min(int(request.args.get('limit', '50')), 100)
-        conn = db.get_db()
-        if saved_only:
-            items = db._fetchall(conn, 'SELECT * FROM ai_gallery WHERE saved = TRUE ORDER BY created_at DESC LIMIT ?', (limit,))
-        else:
-            items = db._fetchall(conn, 'SELECT * FROM ai_gallery ORDER BY created_at DESC LIMIT ?', (limit,))
-        conn.close()
+        items = db.get_gallery_items(saved_only=saved_only, limit=limit)
 
         result = []
         for i in items:
             url = i['url']
-            # If file is in ephemeral uploads and has been wiped on restart, serve from stored base64
-            if url.startswith('/static/uploads/'):
+            variants = {'thumb': '', 'srcset': ''}
+            if i.get('blob_sha256'):
+                # Stored copy outlives Render's ephemeral disk and is cached by the browser
+                url = f"/api/ai/gallery/{i['id']}/image"
+                variants = thumbnails.variant_urls(url)
+            elif url.startswith('/static/uploads/'):
                 abs_path = app.static_folder + url[len('/static'):]
                 if not os.path.exists(abs_path):
-                    img_data = i.get('image_data', '') or ''
-                    if img_data:
-                        ext = 'png' if url.lower().endswith('.png') else 'jpeg'
-                        url = f'data:image/{ext};base64,{img_data}'
-                    else:
-                        url = ''  # genuinely gone, no backup stored
+                    url = ''  # genuinely gone, no backup stored
+                elif i['media_type'] == 'image':
+                    variants = thumbnails.variant_urls('/api/thumb' + url[len('/static'):], thumbnails.file_version(abs_path))
             result.append({
                 'id': i.get('id'),
                 'type': i['media_type'],
                 'url': url,
+                'thumb': variants['thumb'] or url,
+                'srcset': variants['srcset'],
                 'prompt': i['prompt'],
                 'created': str(i['created_at']),
                 'saved': bool(i.get('saved', False)),
@@ -2825,6 +2778,36 @@ def api_ai_gallery():
         return jsonify({'items': []})
 
 
+@app.route('/api/ai/gallery/<int:gallery_id>/image')
+def api_ai_gallery_image(gallery_id):
+    """Serve a gallery image from the blob store. Content-addressed, so the ETag never changes.
+    ?w= returns a cached WebP/AVIF thumbnail instead of the original."""
+    sha256 = db.get_gallery_blob_sha(gallery_id)
+    if not sha256:
+        return jsonify({'error': 'Image not found'}), 404
+    headers = {'Cache-Control': 'public, max-age=31536000, immutable', 'ETag': f'"{sha256}"'}
+    width = fmt = None
+    if request.args.get('w') and thumbnails.available():
+        width = thumbnails.pick_width(request.args.get('w'))
+        fmt = thumbnails.pick_format(request.headers.get('Accept', ''))
+        headers.update({'ETag': f'"{sha256}-{width}-{fmt}"', 'Vary': 'Accept'})
+    if request.headers.get('If-None-Match') == headers['ETag']:
+        return Response(status=304, headers=headers)
+    
+    if width:
+        # The blob is only read from the DB when this variant isn't on disk yet
+        variant = thumbnails.variant_for_blob(sha256, lambda: db.get_blob(sha256)['data'], width, fmt)
+        if variant:
+            resp = send_file(variant, mimetype=thumbnails.MIMETYPES[fmt], etag=False)
+            resp.headers.update(headers)
+            return resp
+        headers.update({'ETag': f'"{sha256}"'})
+    blob = db.get_blob(sha256)
+    if not blob:
+        return jsonify({'error': 'Image not found'}), 404
+    return Response(blob['data'], mimetype=blob['mime_type'], headers=headers)
+
+
 @app.route('/api/ai/save-image', methods=['POST'])
 def api_save_image():
     """Toggle save status on a gallery image"""
@@ -2836,13 +2819,7 @@ def api_save_image():
         if not gallery_id:
             return jsonify({'success': False, 'error': 'No image ID provided'}), 400
         
-        conn = db.get_db()
-        if db.USE_POSTGRES:
-            conn.cursor().execute('UPDATE ai_gallery SET saved = %s WHERE id = %s', (saved, gallery_id))
-        else:
-            conn.execute('UPDATE ai_gallery SET saved = ? WHERE id = ?', (1 if saved else 0, gallery_id))
-        conn.commit()
-        conn.close()
+        db.set_gallery_saved(gallery_id, saved)
         return jsonify({'success': True, 'saved': saved})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2852,13 +2829,7 @@ def api_save_image():
 def api_delete_image(image_id):
     """Delete an image from the gallery"""
     try:
-        conn = db.get_db()
-        if db.USE_POSTGRES:
-            conn.cursor().execute('DELETE FROM ai_gallery WHERE id = %s', (image_id,))
-        else:
-            conn.execute('DELETE FROM ai_gallery WHERE id = ?', (image_id,))
-        conn.commit()
-        conn.close()
+        db.delete_gallery_item(image_id)
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2875,36 +2846,15 @@ def _get_featured_bottle_image():
         'gallery/SmallBatch1.jpg',
         'bottle-ref.jpg',
     ]
-    for fname in candidates:
-        fpath = os.path.join(app.static_folder, 'photos', fname)
-        if os.path.exists(fpath):
-            return f'/static/photos/{fname}'
-    return None
+    return photo_library.first_existing(f'/static/photos/{fname}' for fname in candidates)
 
 
-def _save_to_gallery(media_type, url, prompt, revised_prompt, bottle_type='', image_data=''):
+def _save_to_gallery(media_type, url, prompt, revised_prompt, bottle_type='', image_bytes=None):
     """Save generated media to gallery, returns the new row ID.
-    image_data: base64 string of the image file — survives Render ephemeral filesystem resets.
+    image_bytes: the image file contents — kept in the DB blob store so it survives Render ephemeral filesystem resets.
     """
     try:
-        conn = db.get_db()
-        if db.USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute(
-                'INSERT INTO ai_gallery (media_type, url, prompt, revised_prompt, bottle_type, image_data) VALUES (%s, %s, %s, %s, %s, %s) RETURNING id',
-                (media_type, url or '', prompt or '', revised_prompt or '', bottle_type or '', image_data or '')
-            )
-            row = cur.fetchone()
-            new_id = row[0] if row else None
-        else:
-            cur = conn.execute(
-                'INSERT INTO ai_gallery (media_type, url, prompt, revised_prompt, bottle_type, image_data) VALUES (?, ?, ?, ?, ?, ?)',
-                (media_type, url or '', prompt or '', revised_prompt or '', bottle_type or '', image_data or '')
-            )
-            new_id = cur.lastrowid
-        conn.commit()
-        conn.close()
-        return new_id
+        return db.add_gallery_item(media_type, url, prompt, revised_prompt, bottle_type, image_bytes=image_bytes)
     except Exception as e:
         print(f"Gallery save error: {e}")
         return None
@@ -2965,7 +2915,7 @@ Keep answers SHORT and actionable. 2-3 sentences max unless they ask for detail.
 
 @app.route('/api/assistant/chat', methods=['POST'])
 def api_assistant_chat():
-    """AI help assistant powered by OpenAI"""
+    """AI help assistant: OpenAI (fast, cheap) first, Anthropic as the fallback"""
     try:
         data = request.get_json()
         user_messages = data.get('messages', [])
@@ -2973,42 +2923,30 @@ def api_assistant_chat():
         if not user_messages:
             return jsonify({'error': 'No message provided'}), 400
         
-        api_key = get_api_key('openai')
-        if not api_key:
-            return jsonify({'reply': "I'm not connected yet — the team needs to set the OPENAI_API_KEY in Render environment variables. Once that's done, I'll be able to help!"})
-        
-        import requests as req
+        providers = ('openai', 'anthropic')
+        if not llm.available(providers):
+            return jsonify({'reply': "I'm not connected yet — the team needs to set OPENAI_API_KEY or ANTHROPIC_API_KEY in Render environment variables. Once that's done, I'll be able to help!"})
         
-        # Build messages with system prompt
-        messages = [{'role': 'system', 'content': ASSISTANT_SYSTEM_PROMPT}]
-        # Only send last 10 messages to keep context manageable
+        # Only send last 10 messages to keep context manageable; the system prompt goes first
+        messages = []
         for msg in user_messages[-10:]:
             messages.append({
                 'role': msg.get('role', 'user'),
                 'content': msg.get('content', '')
             })
         
-        resp = req.post(
-            'https://api.openai.com/v1/chat/completions',
-            headers={
-                'Authorization': f'Bearer {api_key}',
-                'Content-Type': 'application/json'
-            },
-            json={
-                'model': 'gpt-4o-mini',
-                'messages': messages,
-                'max_tokens': 300,
-                'temperature': 0.7
-            },
-            timeout=30
-        )
+        if _wants_stream(data):
+            return _sse_response(_stream_completion(
+                ASSISTANT_SYSTEM_PROMPT, messages, 300, lambda text: {'reply': text},
+                providers=providers, temperature=0.7))
         
-        if resp.status_code == 200:
-            result = resp.json()
-            reply = result['choices'][0]['message']['content']
-            return jsonify({'reply': reply})
-        else:
+        try:
+            result = llm.complete(ASSISTANT_SYSTEM_PROMPT, messages, 300, providers=providers,
+                                  temperature=0.7, hedge=True)
+        except llm.LLMError as e:
+            print(f"Assistant error: {e}")
             return jsonify({'reply': 'Sorry, I had trouble connecting. Try again in a moment.'})
+        return jsonify({'reply': result.text})
     
     except Exception as e:
         print(f"Assistant error: {e}")
@@ -3023,6 +2961,14 @@ def api_stats():
     stats = db.get_dashboard_stats()
     return jsonify(stats)
 
+@app.route('/api/llm-cache/stats')
+def api_llm_cache_stats():
+    return jsonify(llm_cache.stats())
+
+@app.route('/api/llm/usage')
+def api_llm_usage():
+    return jsonify(llm.usage())
+
 @app.route('/api/activity')
 def api_activity():
     activity = db.get_activity(limit=20)
@@ -3053,63 +2999,42 @@ def api_upload_image():
 # SCHEDULER BACKGROUND THREAD
 # ============================================================
 
+def _publish_due_posts():
+    """Publish every post whose scheduled_at has passed, and any platform retries that are due.
+    Returns how many posts were looked at."""
+    due_posts = db.get_due_posts()
+    if not due_posts:
+        return 0
+    platform_lookup = {p['name']: p for p in db.get_platforms()}
+    for post in due_posts:
+        # A pass can outlast our leadership; each platform row is also claimed before it is published
+        if not leader.is_leader('post_scheduler'):
+            print("[Scheduler] Lost leadership mid-pass, stopping")
+            break
+        # Overall post status is rolled up from its platforms by db.record_publish_results
+        _publish_post(post, platform_lookup, due_only=True)
+    return len(due_posts)
+
+
 def scheduler_loop():
-    """Check for due posts every 60 seconds and publish them"""
+    """Publish scheduled posts as they fall due (in the leader process only).
+    post_scheduler sleeps until the next scheduled_at, or until a schedule changes."""
     while True:
+        leader.wait_for_leadership('post_scheduler')
         try:
-            due_posts = db.get_due_posts()
-            for post in due_posts:
-                all_platforms = db.get_platforms()
-                platform_lookup = {p['name']: p for p in all_platforms}
-                
-                image_full_path = ''
-                if post.get('image_path'):
-                    image_full_path = os.path.join(
-                        os.path.dirname(os.path.abspath(__file__)),
-                        post['image_path'].lstrip('/')
-                    )
-                
-                for pp in post.get('platforms', []):
-                    platform_name = pp['platform_name']
-                    platform_config = platform_lookup.get(platform_name, {})
-                    
-                    if not platform_config.get('connected'):
-                        db.mark_post_failed(post['id'], platform_name, 'Platform not connected')
-                        continue
-                    
-                    config = {
-                        'api_key': platform_config.get('api_key', ''),
-                        'api_secret': platform_config.get('api_secret', ''),
-                        'access_token': platform_config.get('access_token', ''),
-                        'refresh_token': platform_config.get('refresh_token', ''),
-                        'username': platform_config.get('username', ''),
-                    }
-                    
-                    result = publish_to_platform(platform_name, post['content'], image_full_path, config)
-                    
-                    if result.success:
-                        db.mark_post_published(post['id'], platform_name, result.post_id)
-                    else:
-                        db.mark_post_failed(post['id'], platform_name, result.error)
-                
-                # Update overall post status
-                updated_post = db.get_post(post['id'])
-                if updated_post:
-                    statuses = [p['status'] for p in updated_post.get('platforms', [])]
-                    if all(s == 'published' for s in statuses):
-                        db.update_post(post['id'], status='published',
-                                      published_at=datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'))
-                    elif all(s == 'failed' for s in statuses):
-                        db.update_post(post['id'], status='failed')
+            if post_scheduler.wait_for_due(max_wait=leader.LEADER_RENEW_INTERVAL) and leader.is_leader('post_scheduler'):
+                _publish_due_posts()
         except Exception as e:
             print(f"Scheduler error: {e}")
-        
-        time_module.sleep(60)
+            time_module.sleep(5)
 
 # Start scheduler thread
 scheduler_thread = threading.Thread(target=scheduler_loop, daemon=True)
 scheduler_thread.start()
 
+# Start background job runners (also picks up jobs left queued by a previous deploy)
+jobs.start()
+
 
 # ============================================================
 # BLOG AUTO-SCHEDULER
@@ -3136,13 +3061,9 @@ def clean_article_title(title):
 
 def blog_auto_post(platform):
     """Generate and publish one blog article to a platform"""
-    import requests as req
     import re
     
-    anthropic_key = os.environ.get('ANTHROPIC_API_KEY', '')
-    openai_key = os.environ.get('OPENAI_API_KEY', '')
-    
-    if not anthropic_key and not openai_key:
+    if not llm.available():
         print(f"[Blog Auto] No AI key — skipping")
         return False
     
@@ -3161,18 +3082,8 @@ def blog_auto_post(platform):
             subreddit = random.choice(REDDIT_SUBREDDITS)
             user_message = f"Write a Reddit post for r/{subreddit} about: {topic['title']}"
             
-            if anthropic_key:
-                resp = req.post('https://api.anthropic.com/v1/messages',
-                    headers={'x-api-key': anthropic_key, 'anthropic-version': '2023-06-01', 'Content-Type': 'application/json'},
-                    json={'model': 'claude-sonnet-4-6', 'max_tokens': 1024, 'system': REDDIT_SYSTEM_PROMPT,
-                          'messages': [{'role': 'user', 'content': user_message}]}, timeout=60)
-                text = ''.join(b['text'] for b in resp.json().get('content', []) if b.get('type') == 'text')
-            else:
-                resp = req.post('https://api.openai.com/v1/chat/completions',
-                    headers={'Authorization': f'Bearer {openai_key}', 'Content-Type': 'application/json'},
-                    json={'model': 'gpt-4o-mini', 'messages': [{'role': 'system', 'content': REDDIT_SYSTEM_PROMPT},
-                          {'role': 'user', 'content': user_message}], 'max_tokens': 1024}, timeout=60)
-                text = resp.json()['choices'][0]['message']['content']
+            # Background work: no hedge, but a failed provider still falls back to the other
+            text = llm.complete(REDDIT_SYSTEM_PROMPT, [{'role': 'user', 'content': user_message}], 1024).text
             
             json_match = re.search(r'\{.*\}', text, re.DOTALL)
             post_data = json.loads(json_match.group()) if json_match else {'title': topic['title'], 'body': text, 'subreddit': subreddit}
@@ -3193,7 +3104,10 @@ def blog_auto_post(platform):
             reddit_user = os.environ.get('REDDIT_USERNAME', '')
             reddit_pass = os.environ.get('REDDIT_PASSWORD', '')
             
-            if all([client_id, client_secret, reddit_user, reddit_pass]):
+            reddit_wait = ratelimit.acquire('reddit:submit') if all([client_id, client_secret, reddit_user, reddit_pass]) else 0
+            if reddit_wait:
+                print(f"[Blog Auto] Reddit rate limit: saved as draft, next slot in {reddit_wait:.0f}s")
+            elif all([client_id, client_secret, reddit_user, reddit_pass]):
                 auth_resp = req.post('https://www.reddit.com/api/v1/access_token',
                     auth=(client_id, client_secret),
                     data={'grant_type': 'password', 'username': reddit_user, 'password': reddit_pass},
@@ -3205,6 +3119,7 @@ def blog_auto_post(platform):
                         headers={'Authorization': f'Bearer {reddit_token}', 'User-Agent': 'ForbiddenCommandCenter/1.0'},
                         data={'kind': 'self', 'sr': post_data.get('subreddit', subreddit),
                               'title': post_data.get('title', ''), 'text': post_data.get('body', ''), 'api_type': 'json'})
+                    ratelimit.observe('reddit:submit', pub_resp, retry_after_seconds(pub_resp))
                     
                     if pub_resp.status_code == 200:
                         reddit_data = pub_resp.json().get('json', {}).get('data', {})
@@ -3227,18 +3142,8 @@ def blog_auto_post(platform):
             # Generate blog article for Medium/WordPress/Blogger
             user_message = f"Write a blog article about: {topic['title']}\n\nTarget SEO keywords: {topic.get('keywords', '')}"
             
-            if anthropic_key:
-                resp = req.post('https://api.anthropic.com/v1/messages',
-                    headers={'x-api-key': anthropic_key, 'anthropic-version': '2023-06-01', 'Content-Type': 'application/json'},
-                    json={'model': 'claude-sonnet-4-6', 'max_tokens': 4096, 'system': BLOG_SYSTEM_PROMPT,
-                          'messages': [{'role': 'user', 'content': user_message}]}, timeout=60)
-                text = ''.join(b['text'] for b in resp.json().get('content', []) if b.get('type') == 'text')
-            else:
-                resp = req.post('https://api.openai.com/v1/chat/completions',
-                    headers={'Authorization': f'Bearer {openai_key}', 'Content-Type': 'application/json'},
-                    json={'model': 'gpt-4o-mini', 'messages': [{'role': 'system', 'content': BLOG_SYSTEM_PROMPT},
-                          {'role': 'user', 'content': user_message}], 'max_tokens': 4096, 'temperature': 0.8}, timeout=60)
-                text = resp.json()['choices'][0]['message']['content']
+            text = llm.complete(BLOG_SYSTEM_PROMPT, [{'role': 'user', 'content': user_message}], 4096,
+                                temperature=0.8).text
             
             json_match = re.search(r'\{.*\}', text, re.DOTALL)
             article_data = json.loads(json_match.group()) if json_match else {'title': topic['title'], 'content': text, 'excerpt': text[:200], 'keywords': topic.get('keywords', '')}
@@ -3260,7 +3165,10 @@ def blog_auto_post(platform):
             
             if platform == 'medium':
                 token = os.environ.get('MEDIUM_TOKEN', '')
-                if token:
+                medium_wait = ratelimit.acquire('medium') if token else 0
+                if medium_wait:
+                    print(f"[Blog Auto] Medium rate limit: left as draft, next slot in {medium_wait:.0f}s")
+                elif token:
                     user_resp = req.get('https://api.medium.com/v1/me', headers={'Authorization': f'Bearer {token}'})
                     if user_resp.status_code == 200:
                         user_id = user_resp.json()['data']['id']
@@ -3270,6 +3178,7 @@ def blog_auto_post(platform):
                                   'content': article_data.get('content', ''),
                                   'tags': [k.strip() for k in article_data.get('keywords', '').split(',')[:5]],
                                   'publishStatus': 'public'})
+                        ratelimit.observe('medium', pub_resp, retry_after_seconds(pub_resp))
                         if pub_resp.status_code in (200, 201):
                             pub_data = pub_resp.json()['data']
                             db.update_blog_article(article_id, status='published', platform='medium',
@@ -3344,11 +3253,12 @@ def blog_auto_post(platform):
 
 
 def blog_scheduler_loop():
-    """Auto-generate and post blog content on schedule"""
+    """Auto-generate and post blog content on schedule (in the leader process only)"""
     # Wait 5 min after startup before first check
     time_module.sleep(300)
     
     while True:
+        leader.wait_for_leadership('blog_scheduler')
         try:
             today = datetime.utcnow().weekday()  # 0=Mon
             hour = datetime.utcnow().hour
@@ -3396,11 +3306,12 @@ blog_scheduler_thread.start()
 BRAND_INTEL_SCAN_INTERVAL = 10 * 24 * 60 * 60  # 10 days in seconds
 
 def brand_intel_scanner_loop():
-    """Auto-run deep scan for Forbidden Bourbon mentions every 10 days"""
+    """Auto-run deep scan for Forbidden Bourbon mentions every 10 days (in the leader process only)"""
     # Wait 2 min after startup before first scan
     time_module.sleep(120)
     
     while True:
+        leader.wait_for_leadership('brand_intel_scanner')
         try:
             print(f"[Brand Intel Auto] Starting deep scan at {datetime.utcnow()}")
             results = scrape_mentions(deep=True)
@@ -3465,6 +3376,59 @@ Return ONLY a JSON object with these fields:
 {"title": "...", "content": "...(HTML)...", "excerpt": "...(2-3 sentence summary)...", "keywords": "keyword1, keyword2, keyword3"}"""
 
 
+def _save_generated_article(text, topic, keywords):
+    """Turn a BLOG_SYSTEM_PROMPT completion into a draft blog_articles row; returns the API payload"""
+    # Parse JSON response
+    import re
+    json_match = re.search(r'\{.*\}', text, re.DOTALL)
+    if json_match:
+        article_data = json.loads(json_match.group())
+    else:
+        # Fallback: treat as plain content
+        article_data = {
+            'title': topic,
+            'content': text,
+            'excerpt': text[:200] + '...',
+            'keywords': keywords
+        }
+    
+    word_count = len(article_data.get('content', '').split())
+    
+    # Auto-inject featured bottle image into article content
+    featured_image = _get_featured_bottle_image()
+    content = article_data.get('content', '')
+    if featured_image and '<img' not in content[:500]:
+        # Insert hero image after the first paragraph
+        first_p_end = content.find('</p>')
+        if first_p_end > 0:
+            img_html = f'\n<figure style="text-align:center;margin:24px 0;"><img src="{featured_image}" alt="Forbidden Bourbon" style="max-width:100%;border-radius:8px;box-shadow:0 4px 16px rgba(0,0,0,0.2);"><figcaption style="font-size:0.85em;color:#888;margin-top:8px;">Forbidden Bourbon — A Twist on Tradition</figcaption></figure>\n'
+            content = content[:first_p_end + 4] + img_html + content[first_p_end + 4:]
+            article_data['content'] = content
+    
+    # Save to database
+    article_id = db.create_blog_article(
+        title=article_data.get('title', topic),
+        content=article_data.get('content', ''),
+        excerpt=article_data.get('excerpt', ''),
+        topic=topic,
+        keywords=article_data.get('keywords', keywords),
+        status='draft',
+        word_count=word_count
+    )
+    
+    return {
+        'success': True,
+        'article': {
+            'id': article_id,
+            'title': article_data.get('title', ''),
+            'content': article_data.get('content', ''),
+            'excerpt': article_data.get('excerpt', ''),
+            'keywords': article_data.get('keywords', ''),
+            'word_count': word_count
+        }
+    }
+
+
 @app.route('/api/blog/generate', methods=['POST'])
 def api_blog_generate():
     """Generate a blog article using AI"""
@@ -3474,11 +3438,8 @@ def api_blog_generate():
         keywords = data.get('keywords', '')
         custom_prompt = data.get('custom_prompt', '')
         
-        # Try Anthropic first (better writing), fall back to OpenAI
-        anthropic_key = os.environ.get('ANTHROPIC_API_KEY', '')
-        openai_key = get_api_key('openai')
-        
-        if not anthropic_key and not openai_key:
+        # Anthropic first (better writing), OpenAI as the fallback
+        if not llm.available():
             return jsonify({'success': False, 'error': 'No AI API key configured'}), 400
         
         if custom_prompt:
@@ -3488,100 +3449,16 @@ def api_blog_generate():
             if keywords:
                 user_message += f"\n\nTarget SEO keywords to include naturally: {keywords}"
         
-        import requests as req
+        # Not cached: every Generate saves a new draft, so it must be a new article, not a replay
+        messages = [{'role': 'user', 'content': user_message}]
+        if _wants_stream(data):
+            # The article is parsed and saved server-side once the stream ends; `done` carries it
+            return _sse_response(_stream_completion(
+                BLOG_SYSTEM_PROMPT, messages, 4096, lambda text: _save_generated_article(text, topic, keywords),
+                temperature=0.8))
         
-        if anthropic_key:
-            resp = req.post(
-                'https://api.anthropic.com/v1/messages',
-                headers={
-                    'x-api-key': anthropic_key,
-                    'anthropic-version': '2023-06-01',
-                    'Content-Type': 'application/json'
-                },
-                json={
-                    'model': 'claude-sonnet-4-6',
-                    'max_tokens': 4096,
-                    'system': BLOG_SYSTEM_PROMPT,
-                    'messages': [{'role': 'user', 'content': user_message}]
-                },
-                timeout=60
-            )
-            if resp.status_code == 200:
-                text = ''
-                for block in resp.json().get('content', []):
-                    if block.get('type') == 'text':
-                        text += block['text']
-            else:
-                return jsonify({'success': False, 'error': f'Anthropic API error: {resp.status_code}'}), 500
-        else:
-            resp = req.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers={'Authorization': f'Bearer {openai_key}', 'Content-Type': 'application/json'},
-                json={
-                    'model': 'gpt-4o-mini',
-                    'messages': [
-                        {'role': 'system', 'content': BLOG_SYSTEM_PROMPT},
-                        {'role': 'user', 'content': user_message}
-                    ],
-                    'max_tokens': 4096,
-                    'temperature': 0.8
-                },
-                timeout=60
-            )
-            if resp.status_code == 200:
-                text = resp.json()['choices'][0]['message']['content']
-            else:
-                return jsonify({'success': False, 'error': f'OpenAI API error: {resp.status_code}'}), 500
-        
-        # Parse JSON response
-        import re
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            article_data = json.loads(json_match.group())
-        else:
-            # Fallback: treat as plain content
-            article_data = {
-                'title': topic,
-                'content': text,
-                'excerpt': text[:200] + '...',
-                'keywords': keywords
-            }
-        
-        word_count = len(article_data.get('content', '').split())
-        
-        # Auto-inject featured bottle image into article content
-        featured_image = _get_featured_bottle_image()
-        content = article_data.get('content', '')
-        if featured_image and '<img' not in content[:500]:
-            # Insert hero image after the first paragraph
-            first_p_end = content.find('</p>')
-            if first_p_end > 0:
-                img_html = f'\n<figure style="text-align:center;margin:24px 0;"><img src="{featured_image}" alt="Forbidden Bourbon" style="max-width:100%;border-radius:8px;box-shadow:0 4px 16px rgba(0,0,0,0.2);"><figcaption style="font-size:0.85em;color:#888;margin-top:8px;">Forbidden Bourbon — A Twist on Tradition</figcaption></figure>\n'
-                content = content[:first_p_end + 4] + img_html + content[first_p_end + 4:]
-                article_data['content'] = content
-        
-        # Save to database
-        article_id = db.create_blog_article(
-            title=article_data.get('title', topic),
-            content=article_data.get('content', ''),
-            excerpt=article_data.get('excerpt', ''),
-            topic=topic,
-            keywords=article_data.get('keywords', keywords),
-            status='draft',
-            word_count=word_count
-        )
-        
-        return jsonify({
-            'success': True,
-            'article': {
-                'id': article_id,
-                'title': article_data.get('title', ''),
-                'content': article_data.get('content', ''),
-                'excerpt': article_data.get('excerpt', ''),
-                'keywords': article_data.get('keywords', ''),
-                'word_count': word_count
-            }
-        })
+        result = llm.complete(BLOG_SYSTEM_PROMPT, messages, 4096, temperature=0.8)
+        return jsonify(_save_generated_article(result.text, topic, keywords))
         
     except Exception as e:
         print(f"[Blog Generate] Error: {e}")
@@ -3591,8 +3468,12 @@ def api_blog_generate():
 @app.route('/api/blog/articles', methods=['GET'])
 def api_blog_articles():
     status = request.args.get('status')
-    articles = db.get_blog_articles(status=status)
-    return jsonify({'success': True, 'articles': articles})
+    limit, cursor = _page_args(50)
+    try:
+        articles, next_cursor = db.get_blog_articles_page(status=status, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return _page_json('articles', articles, next_cursor, 'partials/article_cards.html')
 
 
 @app.route('/api/blog/articles/<int:article_id>', methods=['GET'])
@@ -3670,7 +3551,6 @@ def api_blog_publish(article_id):
         if not article:
             return jsonify({'success': False, 'error': 'Article not found'}), 404
         
-        import requests as req
         
         if platform == 'medium':
             token = data.get('token', os.environ.get('MEDIUM_TOKEN', ''))
@@ -3942,29 +3822,15 @@ def api_blog_generate_quora():
         data = request.get_json()
         topic = data.get('topic', '')
         
-        anthropic_key = os.environ.get('ANTHROPIC_API_KEY', '')
-        openai_key = get_api_key('openai')
-        
-        if not anthropic_key and not openai_key:
+        if not llm.available():
             return jsonify({'success': False, 'error': 'No AI API key configured'}), 400
         
         user_message = f"Write a Quora answer about: {topic}"
         
-        import requests as req
         import re
         
-        if anthropic_key:
-            resp = req.post('https://api.anthropic.com/v1/messages',
-                headers={'x-api-key': anthropic_key, 'anthropic-version': '2023-06-01', 'Content-Type': 'application/json'},
-                json={'model': 'claude-sonnet-4-6', 'max_tokens': 1024, 'system': QUORA_SYSTEM_PROMPT,
-                      'messages': [{'role': 'user', 'content': user_message}]}, timeout=30)
-            text = ''.join(b['text'] for b in resp.json().get('content', []) if b.get('type') == 'text')
-        else:
-            resp = req.post('https://api.openai.com/v1/chat/completions',
-                headers={'Authorization': f'Bearer {openai_key}', 'Content-Type': 'application/json'},
-                json={'model': 'gpt-4o-mini', 'messages': [{'role': 'system', 'content': QUORA_SYSTEM_PROMPT},
-                      {'role': 'user', 'content': user_message}], 'max_tokens': 1024}, timeout=30)
-            text = resp.json()['choices'][0]['message']['content']
+        # Uncached, like api_blog_generate: each answer is saved as its own draft
+        text = llm.complete(QUORA_SYSTEM_PROMPT, [{'role': 'user', 'content': user_message}], 1024, hedge=True).text
         
         json_match = re.search(r'\{.*\}', text, re.DOTALL)
         if json_match:
@@ -4000,29 +3866,15 @@ def api_blog_generate_reddit():
         topic = data.get('topic', '')
         subreddit = data.get('subreddit', 'bourbon')
         
-        anthropic_key = os.environ.get('ANTHROPIC_API_KEY', '')
-        openai_key = get_api_key('openai')
-        
-        if not anthropic_key and not openai_key:
+        if not llm.available():
             return jsonify({'success': False, 'error': 'No AI API key configured'}), 400
         
         user_message = f"Write a Reddit post for r/{subreddit} about: {topic}"
         
-        import requests as req
         import re
         
-        if anthropic_key:
-            resp = req.post('https://api.anthropic.com/v1/messages',
-                headers={'x-api-key': anthropic_key, 'anthropic-version': '2023-06-01', 'Content-Type': 'application/json'},
-                json={'model': 'claude-sonnet-4-6', 'max_tokens': 1024, 'system': REDDIT_SYSTEM_PROMPT,
-                      'messages': [{'role': 'user', 'content': user_message}]}, timeout=30)
-            text = ''.join(b['text'] for b in resp.json().get('content', []) if b.get('type') == 'text')
-        else:
-            resp = req.post('https://api.openai.com/v1/chat/completions',
-                headers={'Authorization': f'Bearer {openai_key}', 'Content-Type': 'application/json'},
-                json={'model': 'gpt-4o-mini', 'messages': [{'role': 'system', 'content': REDDIT_SYSTEM_PROMPT},
-                      {'role': 'user', 'content': user_message}], 'max_tokens': 1024}, timeout=30)
-            text = resp.json()['choices'][0]['message']['content']
+        # Uncached, like api_blog_generate: each post is saved as its own draft
+        text = llm.complete(REDDIT_SYSTEM_PROMPT, [{'role': 'user', 'content': user_message}], 1024, hedge=True).text
         
         json_match = re.search(r'\{.*\}', text, re.DOTALL)
         if json_match:
@@ -4068,7 +3920,6 @@ def api_blog_add_topic():
 
 def scrape_mentions(deep=False):
     """Search the web for Forbidden Bourbon mentions across multiple sources"""
-    import requests as req
     
     results = []
     headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}
@@ -4243,7 +4094,6 @@ def _classify_result(url, title, snippet, query):
 
 def fetch_full_content(url):
     """Fetch the full text content of a URL"""
-    import requests as req
     from bs4 import BeautifulSoup
     
     try:
@@ -4339,11 +4189,16 @@ def api_brand_intel_fetch_content(mention_id):
 def api_brand_intel_mentions():
     source_type = request.args.get('type')
     starred = request.args.get('starred')
-    mentions = db.get_brand_mentions(
-        source_type=source_type if source_type else None,
-        starred=int(starred) if starred else None
-    )
-    return jsonify({'success': True, 'mentions': mentions})
+    limit, cursor = _page_args(100)
+    try:
+        mentions, next_cursor = db.get_brand_mentions_page(
+            source_type=source_type if source_type else None,
+            starred=int(starred) if starred else None,
+            limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return _page_json('mentions', mentions, next_cursor, 'partials/mention_cards.html')
 
 
 @app.route('/api/brand-intel/mentions/<int:mention_id>', methods=['PUT'])
@@ -4425,7 +4280,6 @@ def api_ga4_realtime():
 
 def scan_bourbon_contacts():
     """Find bourbon influencers, reviewers, bartenders, and media contacts with public emails"""
-    import requests as req
     from bs4 import BeautifulSoup
     
     contacts = []
@@ -4590,6 +4444,20 @@ def api_outreach_scan():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/outreach/contacts', methods=['GET'])
+def api_outreach_contacts():
+    limit, cursor = _page_args(100)
+    try:
+        contacts, next_cursor = db.get_outreach_contacts_page(
+            category=request.args.get('category') or None,
+            status=request.args.get('status') or None,
+            tier=request.args.get('tier') or None,
+            limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return _page_json('contacts', contacts, next_cursor, 'partials/contact_cards.html')
+
+
 @app.route('/api/outreach/contacts', methods=['POST'])
 def api_outreach_add():
     data = request.get_json()
@@ -4604,6 +4472,17 @@ def api_outreach_update(contact_id):
     return jsonify({'success': True})
 
 
+@app.route('/api/outreach/contacts/bulk', methods=['PUT'])
+def api_outreach_bulk_update():
+    """Apply the same field changes (e.g. status) to many contacts at once"""
+    data = request.get_json() or {}
+    ids = [int(i) for i in data.pop('ids', []) if str(i).isdigit()]
+    if not ids:
+        return jsonify({'success': False, 'error': 'No contacts selected'}), 400
+    updated = db.update_outreach_contacts(ids, **data)
+    return jsonify({'success': True, 'updated': updated})
+
+
 @app.route('/api/outreach/contacts/<int:contact_id>', methods=['DELETE'])
 def api_outreach_delete(contact_id):
     db.delete_outreach_contact(contact_id)
@@ -4615,32 +4494,61 @@ def api_outreach_toggle_sent(contact_id):
     contact = db.get_outreach_contact(contact_id)
     if contact:
         new_val = 0 if contact.get('product_sent', 0) else 1
-        db.update_outreach_contact(contact_id, product_sent=new_val)
         if new_val:
-            db.update_outreach_contact(contact_id, status='product_sent')
+            db.update_outreach_contact(contact_id, product_sent=new_val, status='product_sent')
+        else:
+            db.update_outreach_contact(contact_id, product_sent=new_val)
         return jsonify({'success': True, 'product_sent': new_val})
     return jsonify({'success': False}), 404
 
 
 @app.route('/api/outreach/customer-emails')
 def api_customer_emails():
-    """Get all customer emails for the email list"""
-    emails = db.get_customer_emails()
-    return jsonify({'success': True, 'emails': [dict(e) for e in emails], 'count': len(emails)})
+    """Get customer emails for the email list (all of them, or one page with ?limit=&offset=)"""
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', 0, type=int)
+    emails = db.get_customer_emails(limit=limit, offset=offset)
+    count = db.get_customer_email_count() if limit is not None else len(emails)
+    return jsonify({'success': True, 'emails': [dict(e) for e in emails], 'count': count})
 
 
 @app.route('/api/outreach/customer-emails/export')
 def api_customer_emails_export():
-    """Export customer emails as CSV"""
-    emails = db.get_customer_emails()
+    """Export customer emails as CSV, streamed page by page so large lists never sit in memory"""
     import io, csv
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['Email', 'Orders', 'Total Spend', 'AOV', 'First Order', 'Last Order'])
-    for e in emails:
-        writer.writerow([e['email'], e.get('orders', 1), e.get('total_spend', 0), e.get('aov', 0), e.get('first_order', ''), e.get('last_order', '')])
     from flask import Response
-    return Response(output.getvalue(), mimetype='text/csv', headers={'Content-Disposition': 'attachment; filename=forbidden_customer_emails.csv'})
+    
+    def generate():
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['Email', 'Orders', 'Total Spend', 'AOV', 'First Order', 'Last Order'])
+        for e in db.iter_customer_emails():
+            writer.writerow([e['email'], e.get('orders', 1), e.get('total_spend', 0), e.get('aov', 0), e.get('first_order', ''), e.get('last_order', '')])
+            if output.tell() > 64 * 1024:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        yield output.getvalue()
+    
+    return Response(generate(), mimetype='text/csv', headers={'Content-Disposition': 'attachment; filename=forbidden_customer_emails.csv'})
+
+
+@app.route('/api/outreach/customer-emails/import', methods=['POST'])
+def api_customer_emails_import():
+    """Bulk import customer emails from an uploaded CSV (any size; existing addresses are updated)"""
+    import io
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({'success': False, 'error': 'No CSV file uploaded'}), 400
+    source = request.form.get('source', 'csv_import')
+    try:
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', errors='replace', newline='')
+        imported = db.import_customer_emails_csv(stream, source=source)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Import failed: {e}'}), 500
+    return jsonify({'success': True, 'imported': imported, 'count': db.get_customer_email_count()})
 
 
 # ============================================================
@@ -4663,7 +4571,6 @@ def _get_email_provider():
 
 def _send_single_email(provider, api_key, from_email, to_email, subject, html_body):
     """Send a single transactional email via Resend or SendGrid. Returns (success, error)."""
-    import requests as req
     try:
         if provider == 'resend':
             resp = req.post('https://api.resend.com/emails',
@@ -4706,9 +4613,8 @@ def api_create_email_campaign():
     if not subject or not body:
         return jsonify({'error': 'Subject and body required'}), 400
     
-    # Get all customer emails
-    emails = db.get_customer_emails()
-    recipient_count = len(emails)
+    # Count only; recipients are streamed from the DB when sending
+    recipient_count = db.get_customer_email_count()
     
     provider, api_key, from_email = _get_email_provider()
     
@@ -4732,11 +4638,10 @@ def api_create_email_campaign():
             })
         
         # Send individually via the configured provider
-        import requests as req
         sent = 0
         failed = 0
         
-        for e in emails:
+        for e in db.iter_customer_emails():
             ok, err = _send_single_email(provider, api_key, from_email, e['email'], subject, body)
             if ok:
                 sent += 1
@@ -4810,7 +4715,6 @@ def api_apollo_status():
     if not APOLLO_API_KEY:
         return jsonify({'connected': False, 'error': 'APOLLO_API_KEY not set in Render env vars'})
     try:
-        import requests as req
         # Get organization info (includes credits)
         # Check health + get org details for credits
         resp = req.get(
@@ -4850,7 +4754,6 @@ def api_apollo_search():
     if not APOLLO_API_KEY:
         return jsonify({'success': False, 'error': 'APOLLO_API_KEY not configured'}), 400
     try:
-        import requests as req
         data = request.get_json()
         lane = data.get('lane', 'wholesale')  # wholesale, partnerships, media
         custom_titles = data.get('titles', [])
@@ -4962,7 +4865,6 @@ def api_apollo_enrich():
     if not APOLLO_API_KEY:
         return jsonify({'success': False, 'error': 'APOLLO_API_KEY not configured'}), 400
     try:
-        import requests as req
         data = request.get_json()
         apollo_id = data.get('apollo_id', '')
 
@@ -5134,7 +5036,6 @@ BLOGGER_REDIRECT_URI = os.environ.get('RENDER_EXTERNAL_URL', 'https://forbidden-
 
 def get_blogger_access_token():
     """Get a valid Blogger access token, refreshing if needed"""
-    import requests as req
     
     token_data = db.get_oauth_token('blogger')
     if not token_data or not token_data.get('refresh_token'):
@@ -5209,7 +5110,6 @@ def auth_blogger_start():
 @app.route('/auth/blogger/callback')
 def auth_blogger_callback():
     """Handle Blogger OAuth2 callback"""
-    import requests as req
     
     code = request.args.get('code')
     error = request.args.get('error')
@@ -1,6 +1,18 @@
 # Forbidden Bourbon Command Center Database v12.1 — Blog tables + 6 platform seeds
 import os
+import csv
+import random
+import base64
+import atexit
 import json
+import hashlib
+import time
+import functools
+import itertools
+import mimetypes
+import threading
+import zlib
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 # ============================================================
@@ -21,31 +33,229 @@ else:
 
 DB_PATH = os.environ.get('DB_PATH', 'command_center.db')
 
+# Pool sizing — 2 gunicorn workers x 2 threads + background loops per worker
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '30'))      # seconds to wait for a free slot
+DB_POOL_CHECK_IDLE = float(os.environ.get('DB_POOL_CHECK_IDLE', '30'))  # ping connections idle longer than this
+DB_POOL_MAX_AGE = float(os.environ.get('DB_POOL_MAX_AGE', '1800'))    # recycle connections after 30 min
 
-def get_db():
+
+def _connect():
+    """Open a brand-new raw connection. Only the pool and open_lock_session() should call this."""
     if USE_POSTGRES:
         conn = psycopg2.connect(DATABASE_URL)
         conn.autocommit = False
         return conn
     else:
-        conn = sqlite3.connect(DB_PATH)
+        # Pooled connections move between gunicorn threads, so disable sqlite's same-thread guard
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA foreign_keys=ON")
         return conn
 
 
-def _execute(conn, sql, params=None):
-    """Execute SQL, converting ? placeholders to %s for PostgreSQL"""
+class ConnectionPool:
+    """Bounded, thread-safe pool of raw DB connections.
+
+    At most `size` connections are checked out at once; callers block up to
+    `timeout` seconds for a free slot. Idle connections are pinged before reuse
+    and recycled after `max_age` so Render's Postgres can drop them safely.
+    A thread that re-enters connection() gets the connection it already holds,
+    so nested helpers (e.g. the seed_* helpers inside init_db) share one transaction.
+    """
+
+    def __init__(self, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT,
+                 check_idle=DB_POOL_CHECK_IDLE, max_age=DB_POOL_MAX_AGE):
+        self.size = size
+        self.timeout = timeout
+        self.check_idle = check_idle
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []  # LIFO of (conn, created_at, returned_at)
+        self._born = {}  # id(conn) -> created_at for checked-out connections
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+    def _reset_after_fork(self):
+        # Connections inherited from a parent process must never be shared — drop them unclosed
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle = []
+            self._born = {}
+            self._slots = threading.BoundedSemaphore(self.size)
+            self._local = threading.local()
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            if USE_POSTGRES and conn.closed:
+                return False
+            cur = conn.cursor()
+            cur.execute('SELECT 1')
+            cur.fetchone()
+            if USE_POSTGRES:
+                conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """Check out a raw connection, blocking until one is free."""
+        self._reset_after_fork()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise RuntimeError(f'Database pool exhausted ({self.size} connections busy for {self.timeout:.0f}s)')
+        try:
+            now = time.monotonic()
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    break
+                conn, created_at, returned_at = entry
+                if now - created_at > self.max_age:
+                    self._discard(conn)
+                    continue
+                if now - returned_at > self.check_idle and not self._is_healthy(conn):
+                    self._discard(conn)
+                    continue
+                with self._lock:
+                    self._born[id(conn)] = created_at
+                return conn
+            conn = _connect()
+            with self._lock:
+                self._born[id(conn)] = now
+            return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool, rolling back anything left uncommitted."""
+        with self._lock:
+            created_at = self._born.pop(id(conn), None)
+        if created_at is None:
+            return  # already released, or checked out before a fork
+        try:
+            if not discard:
+                try:
+                    conn.rollback()
+                except Exception:
+                    discard = True
+            if discard or (USE_POSTGRES and conn.closed):
+                self._discard(conn)
+            else:
+                with self._lock:
+                    self._idle.append((conn, created_at, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Yield this thread's connection; commit on success, roll back on error."""
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            self._local.depth += 1
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self.acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self.release(conn, discard=broken)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+
+class _PooledConnection:
+    """Raw-connection proxy returned by get_db(); close() hands it back to the pool."""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise RuntimeError('Connection already returned to the pool')
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __del__(self):
+        self.close()
+
+
+_pool = ConnectionPool()
+
+
+def connection():
+    """Context manager for pooled DB access: `with db.connection() as conn:`.
+
+    Commits when the block exits cleanly, rolls back on exceptions and always
+    returns the connection to the pool.
+    """
+    return _pool.connection()
+
+
+def get_db():
+    """Legacy checkout — caller must commit and close(); close() returns it to the pool."""
+    return _PooledConnection(_pool, _pool.acquire())
+
+
+@functools.lru_cache(maxsize=1024)
+def _translate_sql(sql):
+    """SQLite-flavoured statement -> Postgres. Cached: the module only ever issues a few hundred distinct strings."""
+    sql = sql.replace('?', '%s')
+    # Convert SQLite-specific syntax
+    sql = sql.replace('INTEGER PRIMARY KEY AUTOINCREMENT', 'SERIAL PRIMARY KEY')
+    # Convert SQLite's INSERT OR IGNORE to Postgres ON CONFLICT DO NOTHING
+    if 'INSERT OR IGNORE' in sql:
+        sql = sql.replace('INSERT OR IGNORE INTO', 'INSERT INTO')
+        sql = sql.rstrip().rstrip(';') + ' ON CONFLICT DO NOTHING'
+    return sql
+
+
+def _execute(conn, sql, params=None, as_dict=True):
+    """Execute SQL, converting ? placeholders to %s for PostgreSQL.
+    as_dict=False returns plain tuple rows (used by the _fetch helpers, which build dicts themselves)."""
     if USE_POSTGRES:
-        sql = sql.replace('?', '%s')
-        # Convert SQLite-specific syntax
-        sql = sql.replace('INTEGER PRIMARY KEY AUTOINCREMENT', 'SERIAL PRIMARY KEY')
-        # Convert SQLite's INSERT OR IGNORE to Postgres ON CONFLICT DO NOTHING
-        if 'INSERT OR IGNORE' in sql:
-            sql = sql.replace('INSERT OR IGNORE INTO', 'INSERT INTO')
-            sql = sql.rstrip().rstrip(';') + ' ON CONFLICT DO NOTHING'
-    cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) if USE_POSTGRES else conn.cursor()
+        sql = _translate_sql(sql)
+        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) if as_dict else conn.cursor()
+    else:
+        cur = conn.cursor()
+        if not as_dict:
+            cur.row_factory = None
     if params:
         cur.execute(sql, params)
     else:
@@ -53,42 +263,322 @@ def _execute(conn, sql, params=None):
     return cur
 
 
+def _executemany(conn, sql, rows):
+    """executemany() counterpart of _execute, for batched writes"""
+    cur = conn.cursor()
+    cur.executemany(_translate_sql(sql) if USE_POSTGRES else sql, rows)
+    return cur
+
+
+# Every TIMESTAMP column in the schema. Postgres hands these back as datetimes, which are
+# rendered as strings for JSON; SQLite already stores them as text, so it needs no conversion.
+TIMESTAMP_COLUMNS = frozenset({
+    'created_at', 'updated_at', 'published_at', 'scheduled_at', 'sent_at', 'date_found',
+    'last_used', 'expires_at', 'applied_at', 'tracked_at',
+    'started_at', 'finished_at', 'heartbeat_at', 'acquired_at', 'next_attempt_at',
+})
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _row_adapter(cur):
+    """Build a tuple -> dict converter for this result set, resolving column names and the
+    timestamp columns once instead of inspecting every value of every row."""
+    names = [col[0] for col in cur.description]
+    stamps = [name for name in names if name in TIMESTAMP_COLUMNS] if USE_POSTGRES else []
+    if not stamps:
+        return lambda row: dict(zip(names, row))
+    
+    def adapt(row):
+        d = dict(zip(names, row))
+        for name in stamps:
+            value = d[name]
+            if value is not None and not isinstance(value, str):
+                d[name] = value.strftime(TIMESTAMP_FORMAT)
+        return d
+    return adapt
+
+
 def _fetchone(conn, sql, params=None):
-    cur = _execute(conn, sql, params)
+    cur = _execute(conn, sql, params, as_dict=False)
     row = cur.fetchone()
     if row is None:
         return None
-    d = dict(row)
-    for key in d:
-        if hasattr(d[key], 'strftime'):
-            d[key] = d[key].strftime('%Y-%m-%d %H:%M:%S')
-    return d
+    return _row_adapter(cur)(row)
 
 
 def _fetchall(conn, sql, params=None):
-    cur = _execute(conn, sql, params)
+    cur = _execute(conn, sql, params, as_dict=False)
     rows = cur.fetchall()
-    result = []
-    for r in rows:
-        d = dict(r)
-        # Convert datetime objects to strings for JSON serialization (Postgres returns datetime, SQLite returns string)
-        for key in d:
-            if hasattr(d[key], 'strftime'):
-                d[key] = d[key].strftime('%Y-%m-%d %H:%M:%S')
-        result.append(d)
-    return result
+    if not rows:
+        return []
+    return list(map(_row_adapter(cur), rows))
+
+
+_MAX_BIND_PARAMS = 900  # per multi-row statement; stays under SQLite's default 999 limit
+
+# Columns the generic updaters may write; unknown kwargs (e.g. straight from request JSON) are dropped
+UPDATABLE_COLUMNS = {
+    'blog_articles': ('title', 'content', 'excerpt', 'topic', 'keywords', 'status', 'platform', 'platform_url',
+                      'platform_post_id', 'published_platforms', 'word_count', 'ai_generated', 'published_at'),
+    'brand_mentions': ('title', 'url', 'source', 'source_type', 'snippet', 'full_content', 'author', 'sentiment',
+                       'date_published', 'starred', 'notes'),
+    'outreach_contacts': ('name', 'email', 'platform', 'platform_handle', 'platform_url', 'followers', 'category',
+                          'tier', 'status', 'notes', 'last_contacted', 'product_sent', 'responded'),
+    'email_campaigns': ('subject', 'body', 'from_name', 'from_email', 'recipient_count', 'sent_count',
+                        'failed_count', 'status', 'sent_at'),
+}
+
+
+def _update_fields(conn, table, ids, fields):
+    """Write every whitelisted field in `fields` to the given row id(s) with a single UPDATE
+    (chunked only past the bind-parameter limit). Returns the number of rows changed."""
+    allowed = UPDATABLE_COLUMNS[table]
+    updates = {k: v for k, v in fields.items() if k in allowed}
+    if isinstance(ids, (int, str)):
+        ids = [ids]
+    ids = list(ids)
+    if not updates or not ids:
+        return 0
+    
+    set_clause = ', '.join(f'{k} = ?' for k in updates)
+    values = list(updates.values())
+    chunk = max(1, _MAX_BIND_PARAMS - len(values))
+    changed = 0
+    for start in range(0, len(ids), chunk):
+        batch = ids[start:start + chunk]
+        where = 'id = ?' if len(batch) == 1 else f"id IN ({', '.join(['?'] * len(batch))})"
+        cur = _execute(conn, f'UPDATE {table} SET {set_clause} WHERE {where}', values + batch)
+        changed += max(cur.rowcount, 0)
+    return changed
+
+
+def encode_cursor(values):
+    """Opaque, URL-safe token for the sort-key values of the last row on a page."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor(); raises ValueError on anything malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('utf-8'))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def _keyset_page(conn, table, keys, conditions=(), params=(), limit=50, cursor=None):
+    """Read one page of `table` ordered by `keys` (all DESC, unique last key) starting after `cursor`.
+    Seeks with a row-value comparison instead of OFFSET, so every page costs the same.
+    Returns (rows, next_cursor); next_cursor is None on the last page."""
+    conditions, params = list(conditions), list(params)
+    if cursor:
+        after = decode_cursor(cursor)
+        if len(after) != len(keys):
+            raise ValueError('Invalid cursor')
+        conditions.append(f"({', '.join(keys)}) < ({', '.join(['?'] * len(keys))})")
+        params.extend(after)
+    sql = f'SELECT * FROM {table}'
+    if conditions:
+        sql += ' WHERE ' + ' AND '.join(conditions)
+    sql += ' ORDER BY ' + ', '.join(f'{key} DESC' for key in keys) + ' LIMIT ?'
+    params.append(limit + 1)
+    
+    cur = _execute(conn, sql, tuple(params), as_dict=False)
+    raw = cur.fetchall()
+    if not raw:
+        return [], None
+    next_cursor = None
+    if len(raw) > limit:
+        raw = raw[:limit]
+        last = dict(zip([col[0] for col in cur.description], raw[-1]))
+        # Keep full timestamp precision in the cursor; the display format drops microseconds
+        next_cursor = encode_cursor([last[key].isoformat(sep=' ') if hasattr(last[key], 'isoformat') else last[key]
+                                     for key in keys])
+    return list(map(_row_adapter(cur), raw)), next_cursor
 
 
 # ============================================================
-# INIT DATABASE
+# STATS SNAPSHOT CACHE — dashboard counters served from memory for a few seconds
 # ============================================================
 
-def init_db():
-    conn = get_db()
+STATS_CACHE_TTL = float(os.environ.get('STATS_CACHE_TTL', '30'))  # seconds
+
+_stats_cache = {}
+_stats_lock = threading.Lock()
+_stats_generation = 0
+
+
+def invalidate_stats():
+    """Drop cached stats snapshots — call after any write that changes a counted table."""
+    global _stats_generation
+    with _stats_lock:
+        _stats_cache.clear()
+        _stats_generation += 1
+
+
+def _invalidates_stats(func):
+    """Decorator for writers: drop cached stats once the write has committed."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            invalidate_stats()
+    return wrapper
+
+
+def _cached_stats(key, loader):
+    """Return a copy of the cached snapshot for `key`, reloading it once it is older than STATS_CACHE_TTL.
+    Each worker process keeps its own snapshot, so cross-worker staleness is bounded by the TTL."""
+    now = time.monotonic()
+    with _stats_lock:
+        hit = _stats_cache.get(key)
+        generation = _stats_generation
+    if hit and now - hit[0] < STATS_CACHE_TTL:
+        return dict(hit[1])
+    stats = loader()
+    with _stats_lock:
+        # A write that landed while we were loading makes this snapshot stale — don't keep it
+        if generation == _stats_generation:
+            _stats_cache[key] = (now, stats)
+    return dict(stats)
+
+
+def _aggregate(conn, sql, params=None):
+    """Run a single-row conditional-aggregate query; SUM() over an empty table comes back as 0, not None"""
+    row = _fetchone(conn, sql, params) or {}
+    return {k: (v or 0) for k, v in row.items()}
 
+
+# ============================================================
+# WRITE-BEHIND BUFFER — audit/notification inserts batched off the request path
+# ============================================================
+
+WRITE_BUFFER_INTERVAL = float(os.environ.get('WRITE_BUFFER_INTERVAL', '2'))  # seconds between flushes
+WRITE_BUFFER_MAX_ROWS = int(os.environ.get('WRITE_BUFFER_MAX_ROWS', '100'))  # flush early at this size
+WRITE_BUFFER_MAX_PENDING = int(os.environ.get('WRITE_BUFFER_MAX_PENDING', '5000'))  # kept through failed flushes; oldest dropped past it
+
+
+class WriteBehindBuffer:
+    """In-process queue of rows for one append-only table.
+
+    add() only appends to a list; a daemon thread writes everything pending as
+    one multi-row INSERT every `interval` seconds, or sooner once `max_rows`
+    are waiting. Readers call flush() first so they always see their own writes.
+    A failed write puts its rows back (up to `max_pending`) for the next flush.
+    Rows still pending when the process exits are flushed by an atexit hook, and
+    before a fork (gunicorn's master forking workers) by an at-fork hook.
+    """
+
+    def __init__(self, table, columns, interval=WRITE_BUFFER_INTERVAL, max_rows=WRITE_BUFFER_MAX_ROWS,
+                 max_pending=WRITE_BUFFER_MAX_PENDING):
+        self.table = table
+        self.columns = columns
+        self.interval = interval
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self._rows = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def _ensure_flusher(self):
+        # The flusher thread doesn't survive a fork; rows queued in the parent were flushed (or kept) by the parent
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._rows = []
+            self._thread = threading.Thread(target=self._run, name=f'{self.table}-writer', daemon=True)
+            self._thread.start()
+
+    def add(self, *values):
+        with self._lock:
+            self._ensure_flusher()
+            self._rows.append(values)
+            full = len(self._rows) >= self.max_rows
+        if full:
+            self._wake.set()
+
+    def pending(self):
+        with self._lock:
+            # Rows inherited across a fork are the parent's to write
+            return len(self._rows) if self._pid == os.getpid() else 0
+
+    def flush(self):
+        """Write every pending row now, on the caller's connection if it holds one.
+        Returns the number of rows written; on failure they are queued again."""
+        if not self.pending():
+            return 0
+        rows = []
+        try:
+            # Pool slot before _flush_lock: a reader already holding a connection must never
+            # wait on a flusher that is itself waiting for a free slot
+            with connection() as conn, self._flush_lock:
+                with self._lock:
+                    rows, self._rows = self._rows, []
+                width = len(self.columns)
+                chunk = max(1, _MAX_BIND_PARAMS // width)
+                placeholders = '(' + ', '.join(['?'] * width) + ')'
+                for start in range(0, len(rows), chunk):
+                    batch = rows[start:start + chunk]
+                    _execute(conn, f"INSERT INTO {self.table} ({', '.join(self.columns)}) "
+                                   f"VALUES {', '.join([placeholders] * len(batch))}",
+                             [value for row in batch for value in row])
+        except Exception as e:
+            self._requeue(rows, e)
+            return 0
+        return len(rows)
+
+    def _requeue(self, rows, error):
+        """Put the rows of a failed write back ahead of newer ones, keeping at most max_pending"""
+        with self._lock:
+            self._rows = rows + self._rows
+            dropped = max(0, len(self._rows) - self.max_pending)
+            if dropped:
+                self._rows = self._rows[dropped:]
+            kept = len(self._rows)
+        print(f"[WriteBehind] {self.table} write failed, {kept} rows pending"
+              f"{f', {dropped} oldest dropped' if dropped else ''}: {error}")
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+
+def _utc_now():
+    return datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+
+# created_at is stamped at enqueue time so ordering doesn't drift by the flush interval
+_activity_buffer = WriteBehindBuffer('activity_log', ('action', 'details', 'post_id', 'created_at'))
+_notification_buffer = WriteBehindBuffer('notifications', ('type', 'title', 'message', 'link', 'created_at'))
+
+
+def flush_write_buffers():
+    """Flush every write-behind buffer (atexit, tests, or before a read that must see the writes)."""
+    _activity_buffer.flush()
+    _notification_buffer.flush()
+
+
+atexit.register(flush_write_buffers)
+# Rows buffered in a parent (e.g. gunicorn's master with preload_app) would otherwise be lost at fork
+os.register_at_fork(before=flush_write_buffers)
+
+
+# ============================================================
+# SCHEMA MIGRATIONS — ordered, recorded in schema_version
+# ============================================================
+
+def _create_base_schema(conn):
+    """Migration 1: the v12 tables. Safe on databases that pre-date schema_version."""
     if USE_POSTGRES:
         cur = conn.cursor()
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS platforms (
                 id SERIAL PRIMARY KEY,
@@ -106,7 +596,7 @@ def init_db():
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS posts (
                 id SERIAL PRIMARY KEY,
@@ -123,7 +613,7 @@ def init_db():
                 notes TEXT DEFAULT ''
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS post_platforms (
                 id SERIAL PRIMARY KEY,
@@ -135,7 +625,7 @@ def init_db():
                 error_message TEXT DEFAULT ''
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS content_templates (
                 id SERIAL PRIMARY KEY,
@@ -148,7 +638,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS hashtag_groups (
                 id SERIAL PRIMARY KEY,
@@ -157,7 +647,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS analytics (
                 id SERIAL PRIMARY KEY,
@@ -171,7 +661,7 @@ def init_db():
                 tracked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS activity_log (
                 id SERIAL PRIMARY KEY,
@@ -181,7 +671,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS ai_gallery (
                 id SERIAL PRIMARY KEY,
@@ -192,18 +682,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        # Add new columns if they don't exist
-        try:
-            cur.execute("ALTER TABLE ai_gallery ADD COLUMN saved BOOLEAN DEFAULT FALSE")
-        except Exception:
-            if USE_POSTGRES:
-                conn.rollback()
-        try:
-            cur.execute("ALTER TABLE ai_gallery ADD COLUMN bottle_type TEXT DEFAULT ''")
-        except Exception:
-            if USE_POSTGRES:
-                conn.rollback()
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS blog_articles (
                 id SERIAL PRIMARY KEY,
@@ -223,27 +702,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
-        # Add published_platforms column if missing (existing tables)
-        try:
-            cur.execute("ALTER TABLE blog_articles ADD COLUMN published_platforms TEXT DEFAULT '{}'")
-            conn.commit()
-        except:
-            conn.rollback()
-        
-        # Backfill published_platforms from existing platform/platform_url for pre-migration articles
-        try:
-            cur.execute("SELECT id, platform, platform_url FROM blog_articles WHERE platform != '' AND (published_platforms IS NULL OR published_platforms = '{}')")
-            rows = cur.fetchall()
-            for row in rows:
-                import json as _json
-                pp = _json.dumps({row[1]: row[2] or ''})
-                cur.execute("UPDATE blog_articles SET published_platforms = %s WHERE id = %s", (pp, row[0]))
-            if rows:
-                conn.commit()
-        except:
-            conn.rollback()
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS blog_topics (
                 id SERIAL PRIMARY KEY,
@@ -255,7 +714,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS brand_mentions (
                 id SERIAL PRIMARY KEY,
@@ -274,7 +733,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS outreach_contacts (
                 id SERIAL PRIMARY KEY,
@@ -294,7 +753,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS customer_emails (
                 id SERIAL PRIMARY KEY,
@@ -308,7 +767,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS email_campaigns (
                 id SERIAL PRIMARY KEY,
@@ -324,7 +783,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS notifications (
                 id SERIAL PRIMARY KEY,
@@ -336,7 +795,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cur.execute('''
             CREATE TABLE IF NOT EXISTS oauth_tokens (
                 id SERIAL PRIMARY KEY,
@@ -348,11 +807,11 @@ def init_db():
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
     else:
         # SQLite schema
         cursor = conn.cursor()
-        
+    
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS platforms (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -370,7 +829,7 @@ def init_db():
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS posts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -387,7 +846,7 @@ def init_db():
                 notes TEXT DEFAULT ''
             )
         ''')
-        
+    
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS post_platforms (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -400,7 +859,7 @@ def init_db():
                 FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE
             )
         ''')
-        
+    
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS content_templates (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -413,7 +872,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS hashtag_groups (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -422,7 +881,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS analytics (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -437,7 +896,7 @@ def init_db():
                 FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE SET NULL
             )
         ''')
-        
+    
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS activity_log (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -447,7 +906,18 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ai_gallery (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                media_type TEXT NOT NULL,
+                url TEXT NOT NULL,
+                prompt TEXT DEFAULT '',
+                revised_prompt TEXT DEFAULT '',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+    
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS blog_articles (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -467,27 +937,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
-        # Add published_platforms column if missing (existing tables)
-        try:
-            cursor.execute("ALTER TABLE blog_articles ADD COLUMN published_platforms TEXT DEFAULT '{}'")
-            conn.commit()
-        except:
-            pass
-        
-        # Backfill published_platforms from existing platform/platform_url for pre-migration articles
-        try:
-            cursor.execute("SELECT id, platform, platform_url FROM blog_articles WHERE platform != '' AND (published_platforms IS NULL OR published_platforms = '{}')")
-            rows = cursor.fetchall()
-            for row in rows:
-                import json as _json
-                pp = _json.dumps({row[1]: row[2] or ''})
-                cursor.execute("UPDATE blog_articles SET published_platforms = ? WHERE id = ?", (pp, row[0]))
-            if rows:
-                conn.commit()
-        except:
-            pass
-        
+    
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS blog_topics (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -499,7 +949,7 @@ def init_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+    
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS brand_mentions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -593,760 +1043,1255 @@ def init_db():
             )
         ''')
 
-    # Seed default platforms
-    default_platforms = [
-        ('twitter', 'Twitter / X', '𝕏'),
-        ('bluesky', 'Bluesky', '🦋'),
-        ('facebook', 'Facebook', 'f'),
-        ('linkedin', 'LinkedIn', 'in'),
-        ('instagram', 'Instagram', '📷'),
-        ('openai', 'OpenAI (DALL-E)', '🎨'),
-        ('runway', 'Runway ML (Video)', '🎬'),
-        ('medium', 'Medium', '📝'),
-        ('wordpress', 'WordPress', '📰'),
-        ('blogger', 'Blogger', '📢'),
-        ('reddit', 'Reddit', '🤖'),
-        ('pinterest', 'Pinterest', '📌'),
-        ('quora', 'Quora (Manual)', '❓'),
-    ]
-    
-    for name, display_name, icon in default_platforms:
-        if USE_POSTGRES:
-            conn.cursor().execute(
-                'INSERT INTO platforms (name, display_name, icon) VALUES (%s, %s, %s) ON CONFLICT (name) DO NOTHING',
-                (name, display_name, icon)
-            )
-        else:
-            conn.execute(
-                'INSERT OR IGNORE INTO platforms (name, display_name, icon) VALUES (?, ?, ?)',
-                (name, display_name, icon)
-            )
+
+def _table_columns(conn, table):
+    if USE_POSTGRES:
+        rows = _fetchall(conn, '''SELECT column_name AS name FROM information_schema.columns
+                                  WHERE table_schema = current_schema() AND table_name = ?''', (table,))
+    else:
+        rows = _fetchall(conn, f'PRAGMA table_info({table})')
+    return {r['name'] for r in rows}
+
+
+def _add_column(conn, table, column, definition):
+    """ALTER TABLE ... ADD COLUMN only when the column is missing (SQLite has no ADD COLUMN IF NOT EXISTS)"""
+    if column not in _table_columns(conn, table):
+        _execute(conn, f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+
+def _add_late_columns(conn):
+    """Migration 2: columns bolted on after launch, plus the published_platforms backfill."""
+    _add_column(conn, 'ai_gallery', 'saved', 'BOOLEAN DEFAULT FALSE' if USE_POSTGRES else 'BOOLEAN DEFAULT 0')
+    _add_column(conn, 'ai_gallery', 'bottle_type', "TEXT DEFAULT ''")
+    _add_column(conn, 'ai_gallery', 'image_data', "TEXT DEFAULT ''")
+    _add_column(conn, 'blog_articles', 'published_platforms', "TEXT DEFAULT '{}'")
     
-    # Seed default hashtag groups
-    default_hashtag_groups = [
-        ('Bourbon Core', '#bourbon #whiskey #bourbonwhiskey #wheatedbourbon #kentuckybourbon #forbiddenbourbon #drinkforbidden'),
-        ('Cocktails', '#bourboncocktail #cocktails #mixology #craftcocktails #oldfashioned #whiskeysour #manhattancocktail'),
-        ('Lifestyle', '#bourbonlife #bourbonculture #sipandsavor #cheers #bourboncommunity #whiskeylovers'),
-        ('Product Launch', '#newrelease #limitededition #singlebarre #smallbatch #craftspirits #distillery'),
-        ('Food Pairing', '#bourbonpairing #foodanddrink #whiskeyandfood #bourbonchocolate #bourbondinner'),
-    ]
+    # Backfill published_platforms from existing platform/platform_url for pre-migration articles
+    rows = _fetchall(conn, "SELECT id, platform, platform_url FROM blog_articles WHERE platform != '' AND (published_platforms IS NULL OR published_platforms = '{}')")
+    for row in rows:
+        pp = json.dumps({row['platform']: row['platform_url'] or ''})
+        _execute(conn, 'UPDATE blog_articles SET published_platforms = ? WHERE id = ?', (pp, row['id']))
+
+
+# (index name, table, columns) — every hot WHERE / ORDER BY in this module has one
+SECONDARY_INDEXES = [
+    ('idx_posts_status_scheduled', 'posts', 'status, scheduled_at'),
+    ('idx_posts_status_created', 'posts', 'status, created_at'),
+    ('idx_posts_created', 'posts', 'created_at'),
+    ('idx_post_platforms_post', 'post_platforms', 'post_id, platform_name'),
+    ('idx_blog_articles_status_created', 'blog_articles', 'status, created_at'),
+    ('idx_brand_mentions_url', 'brand_mentions', 'url'),
+    ('idx_brand_mentions_type_created', 'brand_mentions', 'source_type, created_at'),
+    ('idx_brand_mentions_created', 'brand_mentions', 'created_at'),
+    ('idx_outreach_email', 'outreach_contacts', 'email'),
+    ('idx_outreach_platform_url', 'outreach_contacts', 'platform_url'),
+    ('idx_notifications_read_created', 'notifications', 'read, created_at'),
+    ('idx_activity_created', 'activity_log', 'created_at'),
+    ('idx_ai_gallery_created', 'ai_gallery', 'created_at'),
+]
+
+
+def _create_secondary_indexes(conn):
+    """Migration 3: composite indexes for the dashboard, queue, scheduler and list pages."""
+    for name, table, columns in SECONDARY_INDEXES:
+        _execute(conn, f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})')
+
+
+def _create_app_meta(conn):
+    """Migration 4: small key/value table for boot bookkeeping (the seed fingerprint)."""
+    _execute(conn, '''
+        CREATE TABLE IF NOT EXISTS app_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT DEFAULT '',
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+# Sort keys served by _keyset_page(); each list is read newest-first with id as the tie-breaker
+KEYSET_INDEXES = [
+    ('idx_posts_created_id', 'posts', 'created_at, id'),
+    ('idx_posts_status_created_id', 'posts', 'status, created_at, id'),
+    ('idx_blog_articles_created_id', 'blog_articles', 'created_at, id'),
+    ('idx_blog_articles_status_created_id', 'blog_articles', 'status, created_at, id'),
+    ('idx_brand_mentions_created_id', 'brand_mentions', 'created_at, id'),
+    ('idx_brand_mentions_type_created_id', 'brand_mentions', 'source_type, created_at, id'),
+    ('idx_outreach_followers_created_id', 'outreach_contacts', 'followers, created_at, id'),
+]
+
+
+def _create_keyset_indexes(conn):
+    """Migration 5: (created_at, id) indexes so cursor pages are read straight off an index."""
+    for name, table, columns in KEYSET_INDEXES:
+        _execute(conn, f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})')
+
+
+# Migration-3 indexes that are a leading prefix of a KEYSET_INDEXES one: the wider index serves
+# the same lookups and sorts, so keeping both only doubles the write cost on every insert
+SUPERSEDED_INDEXES = [
+    ('idx_posts_created', 'idx_posts_created_id'),
+    ('idx_posts_status_created', 'idx_posts_status_created_id'),
+    ('idx_blog_articles_status_created', 'idx_blog_articles_status_created_id'),
+    ('idx_brand_mentions_created', 'idx_brand_mentions_created_id'),
+    ('idx_brand_mentions_type_created', 'idx_brand_mentions_type_created_id'),
+]
+
+
+def _drop_superseded_indexes(conn):
+    """Migration 12: drop the narrower secondary indexes the keyset ones made redundant."""
+    for name, _ in SUPERSEDED_INDEXES:
+        _execute(conn, f'DROP INDEX IF EXISTS {name}')
+
+
+# (index name, table, key): seed keys that _upsert_seed() writes ON CONFLICT against. Partial, because
+# contacts and mentions added by hand may have no email/url; the plain migration-3 index still serves lookups
+SEED_KEY_INDEXES = [
+    ('idx_brand_mentions_url_unique', 'brand_mentions', 'url'),
+    ('idx_outreach_email_unique', 'outreach_contacts', 'email'),
+]
+
+
+def _create_seed_key_indexes(conn):
+    """Migration 13: unique seed keys, after dropping any duplicates that slipped in (oldest row wins)."""
+    for name, table, key in SEED_KEY_INDEXES:
+        _execute(conn, f'''DELETE FROM {table} WHERE {key} <> '' AND id NOT IN
+                              (SELECT MIN(id) FROM {table} WHERE {key} <> '' GROUP BY {key})''')
+        _execute(conn, f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table} ({key}) WHERE {key} <> ''")
+
+
+def _create_media_blobs(conn):
+    """Migration 6: content-addressed media_blobs table; ai_gallery.image_data base64 moves into it."""
+    _execute(conn, f'''
+        CREATE TABLE IF NOT EXISTS media_blobs (
+            sha256 TEXT PRIMARY KEY,
+            mime_type TEXT DEFAULT 'application/octet-stream',
+            size INTEGER DEFAULT 0,
+            data {'BYTEA' if USE_POSTGRES else 'BLOB'} NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    _add_column(conn, 'ai_gallery', 'blob_sha256', "TEXT DEFAULT ''")
+    _execute(conn, 'CREATE INDEX IF NOT EXISTS idx_ai_gallery_blob ON ai_gallery (blob_sha256)')
     
-    for name, hashtags in default_hashtag_groups:
-        existing = _fetchone(conn, 'SELECT id FROM hashtag_groups WHERE name = ?', (name,))
-        if not existing:
-            if USE_POSTGRES:
-                conn.cursor().execute('INSERT INTO hashtag_groups (name, hashtags) VALUES (%s, %s)', (name, hashtags))
-            else:
-                conn.execute('INSERT INTO hashtag_groups (name, hashtags) VALUES (?, ?)', (name, hashtags))
+    # One row at a time: each image_data value can be several MB
+    ids = [r['id'] for r in _fetchall(conn, "SELECT id FROM ai_gallery WHERE image_data IS NOT NULL AND image_data != ''")]
+    for gallery_id in ids:
+        row = _fetchone(conn, 'SELECT url, image_data FROM ai_gallery WHERE id = ?', (gallery_id,))
+        try:
+            data = base64.b64decode(row['image_data'])
+        except Exception:
+            continue
+        sha256 = _store_blob(conn, data, name=row['url'])
+        _execute(conn, "UPDATE ai_gallery SET blob_sha256 = ?, image_data = '' WHERE id = ?", (sha256, gallery_id))
+
+
+def _create_jobs(conn):
+    """Migration 7: durable background job queue (image generation and other long tasks)."""
+    _execute(conn, '''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            status TEXT DEFAULT 'queued',
+            payload TEXT DEFAULT '{}',
+            result TEXT DEFAULT '',
+            error TEXT DEFAULT '',
+            progress INTEGER DEFAULT 0,
+            message TEXT DEFAULT '',
+            attempts INTEGER DEFAULT 0,
+            max_attempts INTEGER DEFAULT 1,
+            worker TEXT DEFAULT '',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            heartbeat_at TIMESTAMP
+        )
+    ''')
+    _execute(conn, 'CREATE INDEX IF NOT EXISTS idx_jobs_status_id ON jobs (status, id)')
+
+
+def _create_leader_leases(conn):
+    """Migration 8: one lease row per background loop (leader election on SQLite)."""
+    _execute(conn, '''
+        CREATE TABLE IF NOT EXISTS leader_leases (
+            name TEXT PRIMARY KEY,
+            owner TEXT DEFAULT '',
+            acquired_at TIMESTAMP,
+            expires_at TIMESTAMP
+        )
+    ''')
+
+
+def _add_publish_retry_columns(conn):
+    """Migration 9: post_platforms retry bookkeeping for transient publish failures."""
+    _add_column(conn, 'post_platforms', 'attempts', 'INTEGER DEFAULT 0')
+    _add_column(conn, 'post_platforms', 'next_attempt_at', 'TIMESTAMP')
+    _execute(conn, 'CREATE INDEX IF NOT EXISTS idx_post_platforms_retry ON post_platforms (status, next_attempt_at)')
+
+
+def _create_rate_limits(conn):
+    """Migration 10: token buckets for outbound API rate limiting, shared by every worker."""
+    real = 'DOUBLE PRECISION' if USE_POSTGRES else 'REAL'
+    _execute(conn, f'''
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            key TEXT PRIMARY KEY,
+            tokens {real} DEFAULT 0,
+            refilled_at {real} DEFAULT 0,
+            blocked_until {real} DEFAULT 0
+        )
+    ''')
+
+
+def _create_llm_cache(conn):
+    """Migration 11: content-addressed cache of LLM completions (see llm_cache.py)."""
+    real = 'DOUBLE PRECISION' if USE_POSTGRES else 'REAL'
+    _execute(conn, f'''
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            provider TEXT DEFAULT '',
+            model TEXT DEFAULT '',
+            response TEXT NOT NULL,
+            size INTEGER DEFAULT 0,
+            hits INTEGER DEFAULT 0,
+            stored_at {real} DEFAULT 0,
+            used_at {real} DEFAULT 0
+        )
+    ''')
+    _execute(conn, 'CREATE INDEX IF NOT EXISTS idx_llm_cache_used ON llm_cache (used_at)')
+
+
+# Append-only: never edit or reorder a shipped migration, add a new one instead
+MIGRATIONS = [
+    (1, 'base schema', _create_base_schema),
+    (2, 'ai_gallery + blog_articles late columns', _add_late_columns),
+    (3, 'secondary indexes', _create_secondary_indexes),
+    (4, 'app_meta key/value table', _create_app_meta),
+    (5, 'keyset pagination indexes', _create_keyset_indexes),
+    (6, 'media_blobs + ai_gallery.blob_sha256', _create_media_blobs),
+    (7, 'jobs queue', _create_jobs),
+    (8, 'leader_leases', _create_leader_leases),
+    (9, 'post_platforms retry columns', _add_publish_retry_columns),
+    (10, 'rate_limits token buckets', _create_rate_limits),
+    (11, 'llm_cache responses', _create_llm_cache),
+    (12, 'drop indexes superseded by keyset ones', _drop_superseded_indexes),
+    (13, 'unique seed keys for brand mentions and outreach contacts', _create_seed_key_indexes),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+_MIGRATION_LOCK_ID = 72_410_001  # arbitrary app-wide key for pg_advisory_lock
+
+
+@contextmanager
+def _advisory_lock(conn):
+    """Serialise schema/seed work across booting workers (Postgres only; re-entrant per session)."""
+    if USE_POSTGRES:
+        _execute(conn, 'SELECT pg_advisory_lock(?)', (_MIGRATION_LOCK_ID,))
+    try:
+        yield
+    finally:
+        if USE_POSTGRES:
+            conn.rollback()
+            _execute(conn, 'SELECT pg_advisory_unlock(?)', (_MIGRATION_LOCK_ID,))
+            conn.commit()
+
+
+@contextmanager
+def _savepoint(conn, name):
+    """Run a block inside SAVEPOINT `name`; on error only its own work is rolled back and the
+    enclosing transaction stays usable (a failed statement otherwise poisons it on Postgres)."""
+    _execute(conn, f'SAVEPOINT {name}')
+    try:
+        yield
+    except Exception:
+        _execute(conn, f'ROLLBACK TO SAVEPOINT {name}')
+        _execute(conn, f'RELEASE SAVEPOINT {name}')
+        raise
+    _execute(conn, f'RELEASE SAVEPOINT {name}')
+
+
+def get_schema_version(conn):
+    row = _fetchone(conn, 'SELECT MAX(version) AS version FROM schema_version')
+    return (row or {}).get('version') or 0
+
+
+def migrate(conn):
+    """Apply every pending migration in order, committing after each one.
+    On Postgres an advisory lock keeps two booting workers from migrating at the same time."""
+    _execute(conn, '''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT DEFAULT '',
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.commit()
     
-    # Seed content templates
-    default_templates = [
-        ('Product Spotlight - Small Batch', 
-         'Beautifully balanced, sweet and complex. Our Small Batch Select is hand-blended by Master Distiller Marianne Eaves using white corn, white wheat, and a high percentage of barley. A new twist on tradition.\n\nShop now: https://shop.drinkforbidden.com',
-         'product', '#forbiddenbourbon #smallbatch #wheatedbourbon #bourbon #whiskey'),
-        
-        ('Product Spotlight - Single Barrel',
-         'A bolder expression of Forbidden. Each Single Barrel is hand-selected by Master Distiller Marianne Eaves for its unique character. No two barrels are alike.\n\nShop now: https://shop.drinkforbidden.com',
-         'product', '#forbiddenbourbon #singlebarrel #bourbon #whiskey #craftspirits'),
-        
-        ('Marianne Eaves Feature',
-         'Master Distiller Marianne Eaves brings innovation while respecting heritage. As one of Kentucky\'s most celebrated distillers, she crafts each expression of Forbidden with intention and artistry.',
-         'brand', '#marianneeaves #masterdistiller #forbiddenbourbon #womeninwhiskey #kentucky'),
-        
-        ('Weekend Sipping',
-         'Weekend plans: pour something Forbidden. What\'s in your glass tonight?',
-         'engagement', '#forbiddenbourbon #weekendvibes #bourbon #whiskey #fridaynight'),
-        
-        ('Old Fashioned Recipe',
-         'The Forbidden Old Fashioned:\n\n2 oz Forbidden Small Batch\n1 sugar cube\n2-3 dashes Angostura bitters\nOrange peel\n\nMuddle sugar and bitters. Add bourbon and ice. Stir. Express orange peel over glass. Enjoy the twist on tradition.',
-         'recipe', '#oldfashioned #bourboncocktail #forbiddenbourbon #cocktailrecipe #mixology'),
-        
-        ('Tasting Notes',
-         'On the nose: vanilla, caramel, toasted oak. On the palate: honey, baking spices, a whisper of citrus. The finish: long, warm, and inviting. This is Forbidden.\n\nExperience it yourself: https://shop.drinkforbidden.com',
-         'product', '#forbiddenbourbon #tastingnotes #bourbon #whiskey #wheatedbourbon'),
-        
-        ('Store Locator Push',
-         'Looking for Forbidden near you? Use our store locator to find a bottle at a retailer close to home.\n\n🔍 drinkforbidden.com/store-locator',
-         'sales', '#forbiddenbourbon #bourbon #findyourbottle #whiskey'),
-        
-        ('Bourbon & Chocolate Pairing',
-         'Forbidden + dark chocolate = a match made in Kentucky. The rich, wheated profile of our Small Batch pairs perfectly with 70% cacao. Try it tonight.',
-         'pairing', '#bourbonpairing #chocolate #forbiddenbourbon #bourbon #foodanddrink'),
+    with _advisory_lock(conn):
+        current = get_schema_version(conn)
+        for version, description, apply in MIGRATIONS:
+            if version <= current:
+                continue
+            apply(conn)
+            _execute(conn, 'INSERT INTO schema_version (version, description) VALUES (?, ?)', (version, description))
+            conn.commit()
+            print(f"[DB] Applied migration {version}: {description}")
 
-        ('Whiskey Sour Recipe',
-         'The Forbidden Whiskey Sour:\n\n2 oz Forbidden Small Batch\n1 oz fresh lemon juice\n3/4 oz simple syrup\n1 egg white (optional)\n\nDry shake with egg white. Add ice, shake again. Strain into rocks glass. Garnish with a cherry and lemon wheel.',
-         'recipe', '#whiskeysour #forbiddenbourbon #cocktailrecipe #bourbon #mixology'),
 
-        ('Mint Julep Recipe',
-         'The Forbidden Mint Julep:\n\n2.5 oz Forbidden Small Batch\n1 oz simple syrup\n8-10 fresh mint leaves\nCrushed ice\n\nGently muddle mint with syrup. Pack glass with crushed ice. Pour bourbon. Stir until glass frosts. Crown with more ice. Garnish with mint sprig.',
-         'recipe', '#mintjulep #forbiddenbourbon #derbycocktail #bourbon #kentucky'),
+# ============================================================
+# SEED DATA
+# ============================================================
 
-        ('Manhattan Recipe',
-         'The Forbidden Manhattan:\n\n2 oz Forbidden Small Batch\n1 oz sweet vermouth\n2 dashes Angostura bitters\nLuxardo cherry\n\nStir ingredients with ice for 30 seconds. Strain into chilled coupe. Garnish with cherry. Pure sophistication.',
-         'recipe', '#manhattan #forbiddenbourbon #classiccocktail #bourbon #cocktails'),
-
-        ('Bourbon Smash Recipe',
-         'The Forbidden Smash:\n\n2 oz Forbidden Small Batch\n1 oz fresh lemon juice\n3/4 oz simple syrup\n4-5 fresh mint leaves\n\nMuddle mint with syrup. Add bourbon and lemon. Shake with ice. Strain over fresh ice. Garnish with mint and lemon wheel. Refreshing and bold.',
-         'recipe', '#bourbonsmash #forbiddenbourbon #summercocktail #bourbon #mixology'),
-
-        ('Gold Rush Recipe',
-         'The Forbidden Gold Rush:\n\n2 oz Forbidden Small Batch\n3/4 oz honey syrup (equal parts honey + hot water)\n3/4 oz fresh lemon juice\n\nShake all ingredients with ice. Strain into rocks glass over fresh ice. Simple. Elegant. Golden.',
-         'recipe', '#goldrush #forbiddenbourbon #honeycocktail #bourbon #craftcocktails'),
-
-        ('Boulevardier Recipe',
-         'The Forbidden Boulevardier:\n\n1.5 oz Forbidden Small Batch\n1 oz Campari\n1 oz sweet vermouth\nOrange peel\n\nStir with ice. Strain into rocks glass over a large ice cube. Express orange peel. A bourbon lover\'s Negroni.',
-         'recipe', '#boulevardier #forbiddenbourbon #bittercocktail #bourbon #aperitivo'),
-
-        ('White Corn Difference',
-         'Most bourbons use yellow dent corn. Forbidden uses white corn — the same variety prized in artisan cornbread and fine cooking. The result? A cleaner, sweeter foundation that lets our wheated mash bill shine.',
-         'product', '#forbiddenbourbon #whitecorn #bourboneducation #mashbill #craftspirits'),
-
-        ('Bardstown Bourbon Company',
-         'Forbidden is distilled at Bardstown Bourbon Company — one of the most advanced and respected distilleries in Kentucky. State-of-the-art meets Southern tradition. The perfect home for a bourbon that breaks the mold.',
-         'brand', '#bardstownbourboncompany #forbiddenbourbon #kentucky #distillery #bourboncountry'),
-
-        ('Award Winner Announcement',
-         '🏆 Forbidden Bourbon keeps racking up medals. Award-winning at San Francisco, New York, Los Angeles, Denver, and Ascot competitions. The judges agree — this bourbon is something special.\n\nTaste what the fuss is about: shop.drinkforbidden.com',
-         'brand', '#awardwinning #forbiddenbourbon #bourbon #goldmedal #spiritsaward'),
-
-        ('Wheated Bourbon Education',
-         'What makes a wheated bourbon? Instead of rye as the secondary grain, we use wheat. The result is a smoother, softer, more approachable pour — without sacrificing complexity. Forbidden is wheated by design, not by accident.',
-         'product', '#wheatedbourbon #bourboneducation #forbiddenbourbon #mashbill #whiskey'),
-
-        ('Gift Idea Post',
-         'Looking for the perfect gift for the bourbon lover in your life? Forbidden Small Batch Select or Single Barrel — both arrive in a stunning package worthy of any occasion.\n\n🎁 shop.drinkforbidden.com',
-         'sales', '#bourbongift #forbiddenbourbon #giftideas #whiskeygift #bourbonlover'),
-
-        ('Behind the Label',
-         'Every detail of the Forbidden bottle was designed with intention. The dark glass protects the spirit. The gold accents speak to quality. The name — Forbidden — is an invitation to break from the ordinary.',
-         'brand', '#forbiddenbourbon #bottledesign #brandstory #bourbon #premiumspirits'),
-
-        ('Bourbon & Steak Pairing',
-         'Forbidden Small Batch + a perfectly seared ribeye. The wheated sweetness complements the char, the caramel notes echo the Maillard crust. This is bourbon and beef at its finest.',
-         'pairing', '#bourbonandsteak #forbiddenbourbon #foodpairing #bourbon #steaknight'),
-
-        ('Bourbon & Cigar Pairing',
-         'Forbidden Single Barrel and a medium-bodied cigar — cedar, leather, and toasted oak. The bold bourbon stands up to smoke while the wheat softness keeps things balanced. A gentleman\'s evening.',
-         'pairing', '#bourbonandcigar #forbiddenbourbon #cigarlife #bourbon #gentlemanstyle'),
-
-        ('Bourbon & Pecan Pie',
-         'Pour a glass of Forbidden alongside a warm slice of pecan pie. The vanilla and caramel notes in our wheated bourbon mirror the buttery sweetness of the filling. Pure Southern comfort.',
-         'pairing', '#bourbonpairing #pecanpie #forbiddenbourbon #southernfood #dessert'),
-
-        ('Bourbon & Charcuterie',
-         'Build the perfect bourbon board: aged cheddar, honeycomb, dark chocolate, candied pecans, and prosciutto. Pour Forbidden Small Batch and let the flavors mingle. Date night, elevated.',
-         'pairing', '#charcuterie #bourbonboard #forbiddenbourbon #bourbon #datenight'),
-
-        ('Monday Motivation',
-         'Start the week with intention. End it with a pour of Forbidden. You\'ve earned it.',
-         'engagement', '#mondaymotivation #forbiddenbourbon #bourbon #weekstart #whiskey'),
-
-        ('This or That - Engagement',
-         'Neat or on the rocks? Small Batch or Single Barrel? Let us know in the comments 👇\n\nEither way, you\'re drinking Forbidden. And that\'s always the right choice.',
-         'engagement', '#thisorthat #forbiddenbourbon #bourbon #whiskeylover #poll'),
-
-        ('Pour & Share',
-         'Tag someone you\'d share a glass of Forbidden with. Good bourbon is even better with good company. 🥃',
-         'engagement', '#tagafriend #forbiddenbourbon #bourbon #whiskey #cheers'),
-
-        ('Sunset Pour',
-         'Golden hour hits different with a glass of Forbidden in hand. The light catches the bourbon the same way — amber, warm, and full of promise.',
-         'engagement', '#goldenhour #forbiddenbourbon #sunsetpour #bourbon #eveningvibes'),
-
-        ('Shop Small Batch Select',
-         '🛒 Forbidden Small Batch Select — max 50 barrels per blend. Limited by design. Crafted by Marianne Eaves. Ships nationwide.\n\nOrder now: shop.drinkforbidden.com\n\nFree shipping on orders over $100.',
-         'sales', '#forbiddenbourbon #smallbatch #shopnow #bourbon #freeshiping'),
-
-        ('Shop Single Barrel',
-         '🛒 Forbidden Single Barrel — hand-picked by our Master Distiller. Every bottle is unique. Every sip tells a different story.\n\nOrder: shop.drinkforbidden.com',
-         'sales', '#forbiddenbourbon #singlebarrel #shopnow #rarebourbon #whiskey'),
-
-        ('Customer Testimonial',
-         '"I\'ve tried a lot of bourbons, but Forbidden is something else. Smooth enough to sip neat, complex enough to keep you coming back. My new go-to." — A real Forbidden customer\n\nJoin them: shop.drinkforbidden.com',
-         'sales', '#forbiddenbourbon #customerreview #bourbon #testimonial #whiskey'),
-
-        ('Cocktail Hour Invite',
-         'It\'s 5 o\'clock somewhere — and wherever you are, Forbidden makes it better. What are you mixing tonight?\n\nShare your Forbidden cocktail with us! 🍸',
-         'engagement', '#cocktailhour #forbiddenbourbon #happyhour #bourbon #mixology'),
-
-        ('Father\'s Day Gift',
-         'Dad deserves better than a tie this year. Give him a bottle of Forbidden — Kentucky\'s finest wheated bourbon, crafted by Marianne Eaves.\n\n🎁 shop.drinkforbidden.com',
-         'seasonal', '#fathersday #forbiddenbourbon #dadgift #bourbon #giftideas'),
+DEFAULT_PLATFORMS = [
+    ('twitter', 'Twitter / X', '𝕏'),
+    ('bluesky', 'Bluesky', '🦋'),
+    ('facebook', 'Facebook', 'f'),
+    ('linkedin', 'LinkedIn', 'in'),
+    ('instagram', 'Instagram', '📷'),
+    ('openai', 'OpenAI (DALL-E)', '🎨'),
+    ('runway', 'Runway ML (Video)', '🎬'),
+    ('medium', 'Medium', '📝'),
+    ('wordpress', 'WordPress', '📰'),
+    ('blogger', 'Blogger', '📢'),
+    ('reddit', 'Reddit', '🤖'),
+    ('pinterest', 'Pinterest', '📌'),
+    ('quora', 'Quora (Manual)', '❓'),
+]
+
+DEFAULT_HASHTAG_GROUPS = [
+    ('Bourbon Core', '#bourbon #whiskey #bourbonwhiskey #wheatedbourbon #kentuckybourbon #forbiddenbourbon #drinkforbidden'),
+    ('Cocktails', '#bourboncocktail #cocktails #mixology #craftcocktails #oldfashioned #whiskeysour #manhattancocktail'),
+    ('Lifestyle', '#bourbonlife #bourbonculture #sipandsavor #cheers #bourboncommunity #whiskeylovers'),
+    ('Product Launch', '#newrelease #limitededition #singlebarre #smallbatch #craftspirits #distillery'),
+    ('Food Pairing', '#bourbonpairing #foodanddrink #whiskeyandfood #bourbonchocolate #bourbondinner'),
+]
+
+DEFAULT_TEMPLATES = [
+    ('Product Spotlight - Small Batch', 
+     'Beautifully balanced, sweet and complex. Our Small Batch Select is hand-blended by Master Distiller Marianne Eaves using white corn, white wheat, and a high percentage of barley. A new twist on tradition.\n\nShop now: https://shop.drinkforbidden.com',
+     'product', '#forbiddenbourbon #smallbatch #wheatedbourbon #bourbon #whiskey'),
+
+    ('Product Spotlight - Single Barrel',
+     'A bolder expression of Forbidden. Each Single Barrel is hand-selected by Master Distiller Marianne Eaves for its unique character. No two barrels are alike.\n\nShop now: https://shop.drinkforbidden.com',
+     'product', '#forbiddenbourbon #singlebarrel #bourbon #whiskey #craftspirits'),
+
+    ('Marianne Eaves Feature',
+     'Master Distiller Marianne Eaves brings innovation while respecting heritage. As one of Kentucky\'s most celebrated distillers, she crafts each expression of Forbidden with intention and artistry.',
+     'brand', '#marianneeaves #masterdistiller #forbiddenbourbon #womeninwhiskey #kentucky'),
+
+    ('Weekend Sipping',
+     'Weekend plans: pour something Forbidden. What\'s in your glass tonight?',
+     'engagement', '#forbiddenbourbon #weekendvibes #bourbon #whiskey #fridaynight'),
+
+    ('Old Fashioned Recipe',
+     'The Forbidden Old Fashioned:\n\n2 oz Forbidden Small Batch\n1 sugar cube\n2-3 dashes Angostura bitters\nOrange peel\n\nMuddle sugar and bitters. Add bourbon and ice. Stir. Express orange peel over glass. Enjoy the twist on tradition.',
+     'recipe', '#oldfashioned #bourboncocktail #forbiddenbourbon #cocktailrecipe #mixology'),
+
+    ('Tasting Notes',
+     'On the nose: vanilla, caramel, toasted oak. On the palate: honey, baking spices, a whisper of citrus. The finish: long, warm, and inviting. This is Forbidden.\n\nExperience it yourself: https://shop.drinkforbidden.com',
+     'product', '#forbiddenbourbon #tastingnotes #bourbon #whiskey #wheatedbourbon'),
+
+    ('Store Locator Push',
+     'Looking for Forbidden near you? Use our store locator to find a bottle at a retailer close to home.\n\n🔍 drinkforbidden.com/store-locator',
+     'sales', '#forbiddenbourbon #bourbon #findyourbottle #whiskey'),
+
+    ('Bourbon & Chocolate Pairing',
+     'Forbidden + dark chocolate = a match made in Kentucky. The rich, wheated profile of our Small Batch pairs perfectly with 70% cacao. Try it tonight.',
+     'pairing', '#bourbonpairing #chocolate #forbiddenbourbon #bourbon #foodanddrink'),
+
+    ('Whiskey Sour Recipe',
+     'The Forbidden Whiskey Sour:\n\n2 oz Forbidden Small Batch\n1 oz fresh lemon juice\n3/4 oz simple syrup\n1 egg white (optional)\n\nDry shake with egg white. Add ice, shake again. Strain into rocks glass. Garnish with a cherry and lemon wheel.',
+     'recipe', '#whiskeysour #forbiddenbourbon #cocktailrecipe #bourbon #mixology'),
+
+    ('Mint Julep Recipe',
+     'The Forbidden Mint Julep:\n\n2.5 oz Forbidden Small Batch\n1 oz simple syrup\n8-10 fresh mint leaves\nCrushed ice\n\nGently muddle mint with syrup. Pack glass with crushed ice. Pour bourbon. Stir until glass frosts. Crown with more ice. Garnish with mint sprig.',
+     'recipe', '#mintjulep #forbiddenbourbon #derbycocktail #bourbon #kentucky'),
+
+    ('Manhattan Recipe',
+     'The Forbidden Manhattan:\n\n2 oz Forbidden Small Batch\n1 oz sweet vermouth\n2 dashes Angostura bitters\nLuxardo cherry\n\nStir ingredients with ice for 30 seconds. Strain into chilled coupe. Garnish with cherry. Pure sophistication.',
+     'recipe', '#manhattan #forbiddenbourbon #classiccocktail #bourbon #cocktails'),
+
+    ('Bourbon Smash Recipe',
+     'The Forbidden Smash:\n\n2 oz Forbidden Small Batch\n1 oz fresh lemon juice\n3/4 oz simple syrup\n4-5 fresh mint leaves\n\nMuddle mint with syrup. Add bourbon and lemon. Shake with ice. Strain over fresh ice. Garnish with mint and lemon wheel. Refreshing and bold.',
+     'recipe', '#bourbonsmash #forbiddenbourbon #summercocktail #bourbon #mixology'),
+
+    ('Gold Rush Recipe',
+     'The Forbidden Gold Rush:\n\n2 oz Forbidden Small Batch\n3/4 oz honey syrup (equal parts honey + hot water)\n3/4 oz fresh lemon juice\n\nShake all ingredients with ice. Strain into rocks glass over fresh ice. Simple. Elegant. Golden.',
+     'recipe', '#goldrush #forbiddenbourbon #honeycocktail #bourbon #craftcocktails'),
+
+    ('Boulevardier Recipe',
+     'The Forbidden Boulevardier:\n\n1.5 oz Forbidden Small Batch\n1 oz Campari\n1 oz sweet vermouth\nOrange peel\n\nStir with ice. Strain into rocks glass over a large ice cube. Express orange peel. A bourbon lover\'s Negroni.',
+     'recipe', '#boulevardier #forbiddenbourbon #bittercocktail #bourbon #aperitivo'),
+
+    ('White Corn Difference',
+     'Most bourbons use yellow dent corn. Forbidden uses white corn — the same variety prized in artisan cornbread and fine cooking. The result? A cleaner, sweeter foundation that lets our wheated mash bill shine.',
+     'product', '#forbiddenbourbon #whitecorn #bourboneducation #mashbill #craftspirits'),
+
+    ('Bardstown Bourbon Company',
+     'Forbidden is distilled at Bardstown Bourbon Company — one of the most advanced and respected distilleries in Kentucky. State-of-the-art meets Southern tradition. The perfect home for a bourbon that breaks the mold.',
+     'brand', '#bardstownbourboncompany #forbiddenbourbon #kentucky #distillery #bourboncountry'),
+
+    ('Award Winner Announcement',
+     '🏆 Forbidden Bourbon keeps racking up medals. Award-winning at San Francisco, New York, Los Angeles, Denver, and Ascot competitions. The judges agree — this bourbon is something special.\n\nTaste what the fuss is about: shop.drinkforbidden.com',
+     'brand', '#awardwinning #forbiddenbourbon #bourbon #goldmedal #spiritsaward'),
+
+    ('Wheated Bourbon Education',
+     'What makes a wheated bourbon? Instead of rye as the secondary grain, we use wheat. The result is a smoother, softer, more approachable pour — without sacrificing complexity. Forbidden is wheated by design, not by accident.',
+     'product', '#wheatedbourbon #bourboneducation #forbiddenbourbon #mashbill #whiskey'),
+
+    ('Gift Idea Post',
+     'Looking for the perfect gift for the bourbon lover in your life? Forbidden Small Batch Select or Single Barrel — both arrive in a stunning package worthy of any occasion.\n\n🎁 shop.drinkforbidden.com',
+     'sales', '#bourbongift #forbiddenbourbon #giftideas #whiskeygift #bourbonlover'),
+
+    ('Behind the Label',
+     'Every detail of the Forbidden bottle was designed with intention. The dark glass protects the spirit. The gold accents speak to quality. The name — Forbidden — is an invitation to break from the ordinary.',
+     'brand', '#forbiddenbourbon #bottledesign #brandstory #bourbon #premiumspirits'),
+
+    ('Bourbon & Steak Pairing',
+     'Forbidden Small Batch + a perfectly seared ribeye. The wheated sweetness complements the char, the caramel notes echo the Maillard crust. This is bourbon and beef at its finest.',
+     'pairing', '#bourbonandsteak #forbiddenbourbon #foodpairing #bourbon #steaknight'),
+
+    ('Bourbon & Cigar Pairing',
+     'Forbidden Single Barrel and a medium-bodied cigar — cedar, leather, and toasted oak. The bold bourbon stands up to smoke while the wheat softness keeps things balanced. A gentleman\'s evening.',
+     'pairing', '#bourbonandcigar #forbiddenbourbon #cigarlife #bourbon #gentlemanstyle'),
+
+    ('Bourbon & Pecan Pie',
+     'Pour a glass of Forbidden alongside a warm slice of pecan pie. The vanilla and caramel notes in our wheated bourbon mirror the buttery sweetness of the filling. Pure Southern comfort.',
+     'pairing', '#bourbonpairing #pecanpie #forbiddenbourbon #southernfood #dessert'),
+
+    ('Bourbon & Charcuterie',
+     'Build the perfect bourbon board: aged cheddar, honeycomb, dark chocolate, candied pecans, and prosciutto. Pour Forbidden Small Batch and let the flavors mingle. Date night, elevated.',
+     'pairing', '#charcuterie #bourbonboard #forbiddenbourbon #bourbon #datenight'),
+
+    ('Monday Motivation',
+     'Start the week with intention. End it with a pour of Forbidden. You\'ve earned it.',
+     'engagement', '#mondaymotivation #forbiddenbourbon #bourbon #weekstart #whiskey'),
+
+    ('This or That - Engagement',
+     'Neat or on the rocks? Small Batch or Single Barrel? Let us know in the comments 👇\n\nEither way, you\'re drinking Forbidden. And that\'s always the right choice.',
+     'engagement', '#thisorthat #forbiddenbourbon #bourbon #whiskeylover #poll'),
+
+    ('Pour & Share',
+     'Tag someone you\'d share a glass of Forbidden with. Good bourbon is even better with good company. 🥃',
+     'engagement', '#tagafriend #forbiddenbourbon #bourbon #whiskey #cheers'),
+
+    ('Sunset Pour',
+     'Golden hour hits different with a glass of Forbidden in hand. The light catches the bourbon the same way — amber, warm, and full of promise.',
+     'engagement', '#goldenhour #forbiddenbourbon #sunsetpour #bourbon #eveningvibes'),
+
+    ('Shop Small Batch Select',
+     '🛒 Forbidden Small Batch Select — max 50 barrels per blend. Limited by design. Crafted by Marianne Eaves. Ships nationwide.\n\nOrder now: shop.drinkforbidden.com\n\nFree shipping on orders over $100.',
+     'sales', '#forbiddenbourbon #smallbatch #shopnow #bourbon #freeshiping'),
+
+    ('Shop Single Barrel',
+     '🛒 Forbidden Single Barrel — hand-picked by our Master Distiller. Every bottle is unique. Every sip tells a different story.\n\nOrder: shop.drinkforbidden.com',
+     'sales', '#forbiddenbourbon #singlebarrel #shopnow #rarebourbon #whiskey'),
+
+    ('Customer Testimonial',
+     '"I\'ve tried a lot of bourbons, but Forbidden is something else. Smooth enough to sip neat, complex enough to keep you coming back. My new go-to." — A real Forbidden customer\n\nJoin them: shop.drinkforbidden.com',
+     'sales', '#forbiddenbourbon #customerreview #bourbon #testimonial #whiskey'),
+
+    ('Cocktail Hour Invite',
+     'It\'s 5 o\'clock somewhere — and wherever you are, Forbidden makes it better. What are you mixing tonight?\n\nShare your Forbidden cocktail with us! 🍸',
+     'engagement', '#cocktailhour #forbiddenbourbon #happyhour #bourbon #mixology'),
+
+    ('Father\'s Day Gift',
+     'Dad deserves better than a tie this year. Give him a bottle of Forbidden — Kentucky\'s finest wheated bourbon, crafted by Marianne Eaves.\n\n🎁 shop.drinkforbidden.com',
+     'seasonal', '#fathersday #forbiddenbourbon #dadgift #bourbon #giftideas'),
+
+    ('Holiday Whiskey Sour',
+     'Holiday Forbidden Whiskey Sour:\n\n2 oz Forbidden Small Batch\n1 oz cranberry juice\n3/4 oz lemon juice\n1/2 oz maple syrup\nRosemary sprig\n\nShake, strain, garnish with rosemary and cranberries. Festive and Forbidden.',
+     'seasonal', '#holidaycocktail #forbiddenbourbon #cranberry #festivedrinks #bourbon'),
+
+    ('Valentine\'s Day Pour',
+     'This Valentine\'s Day, skip the wine. Pour something bold, something smooth, something... Forbidden. \n\nTwo glasses. One bottle. All heart. ❤️\n\nshop.drinkforbidden.com',
+     'seasonal', '#valentinesday #forbiddenbourbon #datenight #bourbon #love'),
+
+    ('National Bourbon Day',
+     'Happy National Bourbon Day! 🥃 Today we celebrate America\'s native spirit — and there\'s no better way than with a glass of Forbidden.\n\nHow are you celebrating? Drop your pour below 👇',
+     'seasonal', '#nationalbourbonday #forbiddenbourbon #bourbon #june14 #whiskey'),
+]
+
+DEFAULT_BLOG_TOPICS = [
+    ('What Makes a Wheated Bourbon Different', 'education', 'wheated bourbon, bourbon mash bill, wheat vs rye'),
+    ('The Art of Small Batch Blending', 'education', 'small batch bourbon, barrel selection, blending'),
+    ('Understanding Bourbon Mash Bills', 'education', 'bourbon mash bill, corn wheat barley, bourbon grains'),
+    ('How Bourbon is Aged: The Science of the Barrel', 'education', 'bourbon aging, oak barrel, char levels'),
+    ('Kentucky Straight Bourbon: What the Label Means', 'education', 'Kentucky bourbon, straight bourbon, bourbon rules'),
+    ('The Difference Between Single Barrel and Small Batch', 'education', 'single barrel bourbon, small batch, bourbon types'),
+    ('Why Proof Matters in Bourbon', 'education', 'bourbon proof, barrel proof, cask strength'),
+    ('Food-Grade Grains: Why Quality Ingredients Matter', 'education', 'food grade corn, white corn, bourbon ingredients'),
+    ('Women Pioneers in American Whiskey', 'people', 'women in whiskey, master distiller, Marianne Eaves'),
+    ('The Role of a Master Distiller', 'people', 'master distiller, bourbon distiller, distilling craft'),
+    ('Innovation Meets Tradition in Modern Bourbon', 'people', 'craft bourbon, bourbon innovation, modern distilling'),
+    ('Bardstown: The Bourbon Capital of the World', 'culture', 'Bardstown Kentucky, bourbon trail, bourbon capital'),
+    ('5 Classic Bourbon Cocktails Everyone Should Know', 'cocktails', 'bourbon cocktails, old fashioned, whiskey sour'),
+    ('The Perfect Old Fashioned: A Step-by-Step Guide', 'cocktails', 'old fashioned recipe, bourbon cocktail, classic cocktail'),
+    ('Bourbon Cocktails for Every Season', 'cocktails', 'seasonal cocktails, bourbon drinks, summer winter cocktails'),
+    ('The History of the Whiskey Sour', 'cocktails', 'whiskey sour history, bourbon cocktail, cocktail history'),
+    ('How to Build a Home Bourbon Bar', 'cocktails', 'home bar, bourbon bar setup, cocktail tools'),
+    ('Bourbon Hot Toddy for Cold Nights', 'cocktails', 'hot toddy, bourbon hot toddy, winter cocktails'),
+    ('The Ultimate Bourbon and Chocolate Pairing Guide', 'pairing', 'bourbon chocolate, bourbon pairing, food pairing'),
+    ('Bourbon and BBQ: A Match Made in the South', 'pairing', 'bourbon bbq, bourbon food pairing, southern food'),
+    ('Bourbon and Cheese: An Unexpected Pairing', 'pairing', 'bourbon cheese pairing, bourbon food, artisan cheese'),
+    ('Cooking with Bourbon: Recipes That Impress', 'pairing', 'cooking with bourbon, bourbon recipes, bourbon glaze'),
+    ('The Rise of Craft Bourbon in America', 'culture', 'craft bourbon, bourbon industry, American whiskey'),
+    ('Kentucky Bourbon Trail: Planning Your Visit', 'culture', 'bourbon trail, Kentucky distillery tour, bourbon tourism'),
+    ('Bourbon Collecting: What to Know Before You Start', 'culture', 'bourbon collecting, rare bourbon, bourbon investment'),
+    ('Bourbon vs Whiskey: What You Need to Know', 'culture', 'bourbon vs whiskey, American whiskey, whiskey types'),
+    ('The Story Behind Bourbon Bottle Design', 'culture', 'bourbon bottle design, bourbon packaging, craft design'),
+    ('Direct-to-Consumer Bourbon: The Future of Buying Spirits', 'culture', 'DTC spirits, buy bourbon online, bourbon delivery'),
+    ('Holiday Gift Guide: Bourbon Edition', 'seasonal', 'bourbon gifts, holiday bourbon, whiskey gifts'),
+    ('Summer Bourbon Cocktails That Beat the Heat', 'seasonal', 'summer bourbon, refreshing bourbon cocktails, bourbon lemonade'),
+    ('New Year Bourbon Traditions Worth Starting', 'seasonal', 'new year bourbon, bourbon toast, bourbon traditions'),
+    ('Fall Flavors and Bourbon: A Perfect Match', 'seasonal', 'fall bourbon, autumn cocktails, bourbon and apple'),
+    ('The Perfect Bourbon Gift for Every Budget', 'seasonal', 'bourbon gift guide, affordable bourbon, premium bourbon gifts'),
+    ('White Corn vs Yellow Corn in Bourbon: Why It Matters', 'education', 'white corn bourbon, yellow dent corn, bourbon grain quality'),
+    ('How to Read a Bourbon Label Like a Pro', 'education', 'bourbon label, straight bourbon, bottled in bond, age statement'),
+    ('What Does Wheated Mean in Bourbon?', 'education', 'wheated bourbon, wheat mash bill, smooth bourbon, Pappy Van Winkle'),
+    ('Barrel Char Levels Explained: How They Shape Bourbon', 'education', 'barrel char, alligator char, bourbon barrel, oak aging'),
+    ('The Science of Bourbon Color', 'education', 'bourbon color, amber whiskey, barrel aging color, caramel notes'),
+    ('Bourbon vs Scotch: A Complete Comparison', 'education', 'bourbon vs scotch, American whiskey, single malt, comparison'),
+    ('How Temperature Affects Bourbon Aging in Kentucky', 'education', 'Kentucky climate, bourbon aging, rickhouse temperature, angels share'),
+    ('Marianne Eaves: Breaking Barriers in Bourbon', 'people', 'Marianne Eaves, women master distiller, Kentucky bourbon, glass ceiling'),
+    ('How Bardstown Became the Bourbon Capital', 'culture', 'Bardstown Kentucky, bourbon capital, distillery row, bourbon heritage'),
+    ('The Resurgence of Wheated Bourbons', 'culture', 'wheated bourbon trend, bourbon market, craft distilling renaissance'),
+    ('Direct-to-Consumer Spirits: How Online Sales Are Changing Bourbon', 'culture', 'DTC bourbon, online spirits, e-commerce whiskey, shipping laws'),
+    ('Building a Bourbon Collection: Tips from Enthusiasts', 'culture', 'bourbon collection, whiskey shelf, rare bourbon, bourbon hunting'),
+    ('Bourbon and Music: Pairing Playlists with Your Pour', 'culture', 'bourbon playlist, whiskey music, jazz bourbon, country bourbon'),
+    ('The Forbidden Whiskey Sour: Our Signature Cocktail', 'cocktails', 'whiskey sour recipe, forbidden cocktail, bourbon sour, egg white cocktail'),
+    ('Bourbon Highball: The Underrated Classic', 'cocktails', 'bourbon highball, highball recipe, Japanese highball, simple cocktail'),
+    ('Smoked Bourbon Cocktails at Home', 'cocktails', 'smoked cocktail, bourbon smoke, cocktail smoking, mixology'),
+    ('Batch Cocktails for Your Next Party', 'cocktails', 'batch cocktails, bourbon punch, party drinks, large format cocktails'),
+    ('Bourbon and Apple Cider: A Fall Essential', 'cocktails', 'bourbon apple cider, fall cocktail, hot cider bourbon, autumn drink'),
+    ('Bourbon and Coffee: Morning Meets Evening', 'pairing', 'bourbon coffee, Irish coffee bourbon, coffee cocktail, espresso bourbon'),
+    ('Grilling with Bourbon: Marinades and Glazes', 'pairing', 'bourbon glaze, bourbon marinade, bourbon BBQ sauce, grilling'),
+    ('Bourbon and Ice Cream: Yes Really', 'pairing', 'bourbon ice cream, bourbon float, dessert cocktail, bourbon vanilla'),
+    ('Bourbon and Thanksgiving: The Complete Guide', 'seasonal', 'Thanksgiving bourbon, holiday dinner bourbon, bourbon cranberry'),
+    ('Derby Day: Mint Juleps and Forbidden Bourbon', 'seasonal', 'Kentucky Derby, mint julep, Derby Day bourbon, Churchill Downs'),
+    ('Bourbon Advent Calendar: 25 Days of Discovery', 'seasonal', 'bourbon advent, whiskey calendar, holiday bourbon tasting'),
+]
 
-        ('Holiday Whiskey Sour',
-         'Holiday Forbidden Whiskey Sour:\n\n2 oz Forbidden Small Batch\n1 oz cranberry juice\n3/4 oz lemon juice\n1/2 oz maple syrup\nRosemary sprig\n\nShake, strain, garnish with rosemary and cranberries. Festive and Forbidden.',
-         'seasonal', '#holidaycocktail #forbiddenbourbon #cranberry #festivedrinks #bourbon'),
 
-        ('Valentine\'s Day Pour',
-         'This Valentine\'s Day, skip the wine. Pour something bold, something smooth, something... Forbidden. \n\nTwo glasses. One bottle. All heart. ❤️\n\nshop.drinkforbidden.com',
-         'seasonal', '#valentinesday #forbiddenbourbon #datenight #bourbon #love'),
+# ============================================================
+# INIT DATABASE
+# ============================================================
 
-        ('National Bourbon Day',
-         'Happy National Bourbon Day! 🥃 Today we celebrate America\'s native spirit — and there\'s no better way than with a glass of Forbidden.\n\nHow are you celebrating? Drop your pour below 👇',
-         'seasonal', '#nationalbourbonday #forbiddenbourbon #bourbon #june14 #whiskey'),
-    ]
+def _unique_seed_rows(table, rows, key_index):
+    """Seed rows with their keys de-duplicated (first one wins); a repeated key is a bug in the seed set"""
+    unique, seen = [], set()
+    for row in rows:
+        if row[key_index] in seen:
+            print(f"[DB] Duplicate {table} seed key skipped: {row[key_index]}")
+            continue
+        seen.add(row[key_index])
+        unique.append(row)
+    return unique
+
+
+def _insert_missing(conn, table, columns, rows, key):
+    """Insert-only seeding: rows whose `key` is already present are left alone, so users' edits to
+    platforms, hashtag groups, templates and blog topics survive a seed change. One INSERT ... SELECT
+    per chunk; both SQLite and Postgres name the columns of a bare VALUES list column1, column2, ..."""
+    key_index = columns.index(key)
+    unique = _unique_seed_rows(table, rows, key_index)
     
-    for title, content, category, hashtags in default_templates:
-        existing = _fetchone(conn, 'SELECT id FROM content_templates WHERE title = ?', (title,))
-        if not existing:
-            if USE_POSTGRES:
-                conn.cursor().execute(
-                    'INSERT INTO content_templates (title, content, category, hashtags) VALUES (%s, %s, %s, %s)',
-                    (title, content, category, hashtags)
-                )
-            else:
-                conn.execute(
-                    'INSERT INTO content_templates (title, content, category, hashtags) VALUES (?, ?, ?, ?)',
-                    (title, content, category, hashtags)
-                )
+    width = len(columns)
+    placeholders = '(' + ', '.join(['?'] * width) + ')'
+    picks = ', '.join(f'column{i}' for i in range(1, width + 1))
+    chunk = max(1, _MAX_BIND_PARAMS // width)
+    inserted = 0
+    for start in range(0, len(unique), chunk):
+        batch = unique[start:start + chunk]
+        cur = _execute(conn, f'''INSERT INTO {table} ({', '.join(columns)})
+                                SELECT {picks} FROM (VALUES {', '.join([placeholders] * len(batch))}) AS v
+                                WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{key} = v.column{key_index + 1})''',
+                       [value for row in batch for value in row])
+        inserted += max(cur.rowcount, 0)
+    return inserted
+
+
+def _upsert_seed(conn, table, columns, rows, key):
+    """Insert-or-update seeding for the reference sets the app owns (brand mentions, outreach contacts):
+    an edited seed row is updated in place, as the old delete-and-reseed did. Columns outside `columns`
+    (starred, status, ...) are kept. Relies on the partial unique index on `key` from migration 13."""
+    unique = [row for row in _unique_seed_rows(table, rows, columns.index(key)) if row[columns.index(key)]]
+    width = len(columns)
+    placeholders = '(' + ', '.join(['?'] * width) + ')'
+    updates = ', '.join(f'{column} = excluded.{column}' for column in columns if column != key)
+    chunk = max(1, _MAX_BIND_PARAMS // width)
+    written = 0
+    for start in range(0, len(unique), chunk):
+        batch = unique[start:start + chunk]
+        cur = _execute(conn, f'''INSERT INTO {table} ({', '.join(columns)})
+                                VALUES {', '.join([placeholders] * len(batch))}
+                                ON CONFLICT ({key}) WHERE {key} <> '' DO UPDATE SET {updates}''',
+                       [value for row in batch for value in row])
+        written += max(cur.rowcount, 0)
+    return written
+
+
+BOOT_FINGERPRINT_KEY = 'boot_fingerprint'
+
+
+def _boot_fingerprint():
+    """Hash of everything init_db() would write: the migration list plus every seed data set."""
+    payload = json.dumps({
+        'migrations': [(version, description) for version, description, _ in MIGRATIONS],
+        'platforms': DEFAULT_PLATFORMS,
+        'hashtag_groups': DEFAULT_HASHTAG_GROUPS,
+        'templates': DEFAULT_TEMPLATES,
+        'blog_topics': DEFAULT_BLOG_TOPICS,
+        'outreach_contacts': SEED_OUTREACH_CONTACTS,
+        'brand_mentions': SEED_BRAND_MENTIONS,
+        'customer_emails': SEED_CUSTOMER_EMAILS,
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _stored_fingerprint(conn):
+    """Fingerprint recorded by the last completed init_db(), or None on a fresh/pre-app_meta database."""
+    try:
+        row = _fetchone(conn, 'SELECT value FROM app_meta WHERE key = ?', (BOOT_FINGERPRINT_KEY,))
+    except Exception:
+        conn.rollback()
+        return None
+    return row['value'] if row else None
+
+
+def _store_fingerprint(conn, fingerprint):
+    _execute(conn, 'DELETE FROM app_meta WHERE key = ?', (BOOT_FINGERPRINT_KEY,))
+    _execute(conn, 'INSERT INTO app_meta (key, value) VALUES (?, ?)', (BOOT_FINGERPRINT_KEY, fingerprint))
+
+
+@_invalidates_stats
+def init_db():
+    """Bring the schema and seed data up to date.
+    A warm database whose stored fingerprint matches costs a single SELECT; otherwise
+    migrations run and the seed sets are upserted, then the new fingerprint is recorded."""
+    fingerprint = _boot_fingerprint()
+    with connection() as conn:
+        if _stored_fingerprint(conn) == fingerprint:
+            return
+        
+        with _advisory_lock(conn):
+            # Another worker may have finished the same boot while we waited for the lock
+            if _stored_fingerprint(conn) == fingerprint:
+                return
+            migrate(conn)
+            
+            _insert_missing(conn, 'platforms', ['name', 'display_name', 'icon'], DEFAULT_PLATFORMS, 'name')
+            _insert_missing(conn, 'hashtag_groups', ['name', 'hashtags'], DEFAULT_HASHTAG_GROUPS, 'name')
+            _insert_missing(conn, 'content_templates', ['title', 'content', 'category', 'hashtags'],
+                            DEFAULT_TEMPLATES, 'title')
+            # Blog topics for SEO content generation
+            _insert_missing(conn, 'blog_topics', ['title', 'category', 'keywords'], DEFAULT_BLOG_TOPICS, 'title')
+            seed_brand_mentions()
+            seed_outreach_contacts()
+            # Customer emails from Mash Networks
+            seed_customer_emails()
+            
+            _store_fingerprint(conn, fingerprint)
+            conn.commit()
+            print(f"[DB] Boot fingerprint updated: {fingerprint[:12]}")
+
+
+SEED_OUTREACH_CONTACTS = [
+    # (name, email, platform, handle, url, followers, category, tier, notes)
     
-    # Seed blog topics for SEO content generation
-    blog_topics = [
-        ('What Makes a Wheated Bourbon Different', 'education', 'wheated bourbon, bourbon mash bill, wheat vs rye'),
-        ('The Art of Small Batch Blending', 'education', 'small batch bourbon, barrel selection, blending'),
-        ('Understanding Bourbon Mash Bills', 'education', 'bourbon mash bill, corn wheat barley, bourbon grains'),
-        ('How Bourbon is Aged: The Science of the Barrel', 'education', 'bourbon aging, oak barrel, char levels'),
-        ('Kentucky Straight Bourbon: What the Label Means', 'education', 'Kentucky bourbon, straight bourbon, bourbon rules'),
-        ('The Difference Between Single Barrel and Small Batch', 'education', 'single barrel bourbon, small batch, bourbon types'),
-        ('Why Proof Matters in Bourbon', 'education', 'bourbon proof, barrel proof, cask strength'),
-        ('Food-Grade Grains: Why Quality Ingredients Matter', 'education', 'food grade corn, white corn, bourbon ingredients'),
-        ('Women Pioneers in American Whiskey', 'people', 'women in whiskey, master distiller, Marianne Eaves'),
-        ('The Role of a Master Distiller', 'people', 'master distiller, bourbon distiller, distilling craft'),
-        ('Innovation Meets Tradition in Modern Bourbon', 'people', 'craft bourbon, bourbon innovation, modern distilling'),
-        ('Bardstown: The Bourbon Capital of the World', 'culture', 'Bardstown Kentucky, bourbon trail, bourbon capital'),
-        ('5 Classic Bourbon Cocktails Everyone Should Know', 'cocktails', 'bourbon cocktails, old fashioned, whiskey sour'),
-        ('The Perfect Old Fashioned: A Step-by-Step Guide', 'cocktails', 'old fashioned recipe, bourbon cocktail, classic cocktail'),
-        ('Bourbon Cocktails for Every Season', 'cocktails', 'seasonal cocktails, bourbon drinks, summer winter cocktails'),
-        ('The History of the Whiskey Sour', 'cocktails', 'whiskey sour history, bourbon cocktail, cocktail history'),
-        ('How to Build a Home Bourbon Bar', 'cocktails', 'home bar, bourbon bar setup, cocktail tools'),
-        ('Bourbon Hot Toddy for Cold Nights', 'cocktails', 'hot toddy, bourbon hot toddy, winter cocktails'),
-        ('The Ultimate Bourbon and Chocolate Pairing Guide', 'pairing', 'bourbon chocolate, bourbon pairing, food pairing'),
-        ('Bourbon and BBQ: A Match Made in the South', 'pairing', 'bourbon bbq, bourbon food pairing, southern food'),
-        ('Bourbon and Cheese: An Unexpected Pairing', 'pairing', 'bourbon cheese pairing, bourbon food, artisan cheese'),
-        ('Cooking with Bourbon: Recipes That Impress', 'pairing', 'cooking with bourbon, bourbon recipes, bourbon glaze'),
-        ('The Rise of Craft Bourbon in America', 'culture', 'craft bourbon, bourbon industry, American whiskey'),
-        ('Kentucky Bourbon Trail: Planning Your Visit', 'culture', 'bourbon trail, Kentucky distillery tour, bourbon tourism'),
-        ('Bourbon Collecting: What to Know Before You Start', 'culture', 'bourbon collecting, rare bourbon, bourbon investment'),
-        ('Bourbon vs Whiskey: What You Need to Know', 'culture', 'bourbon vs whiskey, American whiskey, whiskey types'),
-        ('The Story Behind Bourbon Bottle Design', 'culture', 'bourbon bottle design, bourbon packaging, craft design'),
-        ('Direct-to-Consumer Bourbon: The Future of Buying Spirits', 'culture', 'DTC spirits, buy bourbon online, bourbon delivery'),
-        ('Holiday Gift Guide: Bourbon Edition', 'seasonal', 'bourbon gifts, holiday bourbon, whiskey gifts'),
-        ('Summer Bourbon Cocktails That Beat the Heat', 'seasonal', 'summer bourbon, refreshing bourbon cocktails, bourbon lemonade'),
-        ('New Year Bourbon Traditions Worth Starting', 'seasonal', 'new year bourbon, bourbon toast, bourbon traditions'),
-        ('Fall Flavors and Bourbon: A Perfect Match', 'seasonal', 'fall bourbon, autumn cocktails, bourbon and apple'),
-        ('The Perfect Bourbon Gift for Every Budget', 'seasonal', 'bourbon gift guide, affordable bourbon, premium bourbon gifts'),
-        ('White Corn vs Yellow Corn in Bourbon: Why It Matters', 'education', 'white corn bourbon, yellow dent corn, bourbon grain quality'),
-        ('How to Read a Bourbon Label Like a Pro', 'education', 'bourbon label, straight bourbon, bottled in bond, age statement'),
-        ('What Does Wheated Mean in Bourbon?', 'education', 'wheated bourbon, wheat mash bill, smooth bourbon, Pappy Van Winkle'),
-        ('Barrel Char Levels Explained: How They Shape Bourbon', 'education', 'barrel char, alligator char, bourbon barrel, oak aging'),
-        ('The Science of Bourbon Color', 'education', 'bourbon color, amber whiskey, barrel aging color, caramel notes'),
-        ('Bourbon vs Scotch: A Complete Comparison', 'education', 'bourbon vs scotch, American whiskey, single malt, comparison'),
-        ('How Temperature Affects Bourbon Aging in Kentucky', 'education', 'Kentucky climate, bourbon aging, rickhouse temperature, angels share'),
-        ('Marianne Eaves: Breaking Barriers in Bourbon', 'people', 'Marianne Eaves, women master distiller, Kentucky bourbon, glass ceiling'),
-        ('How Bardstown Became the Bourbon Capital', 'culture', 'Bardstown Kentucky, bourbon capital, distillery row, bourbon heritage'),
-        ('The Resurgence of Wheated Bourbons', 'culture', 'wheated bourbon trend, bourbon market, craft distilling renaissance'),
-        ('Direct-to-Consumer Spirits: How Online Sales Are Changing Bourbon', 'culture', 'DTC bourbon, online spirits, e-commerce whiskey, shipping laws'),
-        ('Building a Bourbon Collection: Tips from Enthusiasts', 'culture', 'bourbon collection, whiskey shelf, rare bourbon, bourbon hunting'),
-        ('Bourbon and Music: Pairing Playlists with Your Pour', 'culture', 'bourbon playlist, whiskey music, jazz bourbon, country bourbon'),
-        ('The Forbidden Whiskey Sour: Our Signature Cocktail', 'cocktails', 'whiskey sour recipe, forbidden cocktail, bourbon sour, egg white cocktail'),
-        ('Bourbon Highball: The Underrated Classic', 'cocktails', 'bourbon highball, highball recipe, Japanese highball, simple cocktail'),
-        ('Smoked Bourbon Cocktails at Home', 'cocktails', 'smoked cocktail, bourbon smoke, cocktail smoking, mixology'),
-        ('Batch Cocktails for Your Next Party', 'cocktails', 'batch cocktails, bourbon punch, party drinks, large format cocktails'),
-        ('Bourbon and Apple Cider: A Fall Essential', 'cocktails', 'bourbon apple cider, fall cocktail, hot cider bourbon, autumn drink'),
-        ('Bourbon and Coffee: Morning Meets Evening', 'pairing', 'bourbon coffee, Irish coffee bourbon, coffee cocktail, espresso bourbon'),
-        ('Grilling with Bourbon: Marinades and Glazes', 'pairing', 'bourbon glaze, bourbon marinade, bourbon BBQ sauce, grilling'),
-        ('Bourbon and Ice Cream: Yes Really', 'pairing', 'bourbon ice cream, bourbon float, dessert cocktail, bourbon vanilla'),
-        ('Bourbon and Thanksgiving: The Complete Guide', 'seasonal', 'Thanksgiving bourbon, holiday dinner bourbon, bourbon cranberry'),
-        ('Derby Day: Mint Juleps and Forbidden Bourbon', 'seasonal', 'Kentucky Derby, mint julep, Derby Day bourbon, Churchill Downs'),
-        ('Bourbon Advent Calendar: 25 Days of Discovery', 'seasonal', 'bourbon advent, whiskey calendar, holiday bourbon tasting'),
-    ]
+    # === BOURBON REVIEWERS WITH EMAIL ===
+    ('Christopher Null (Drinkhacker)', 'editor@drinkhacker.com', 'website', '@drinkhacker', 'https://www.drinkhacker.com', 50000, 'media', '1',
+     'Publisher & Editor-in-Chief, Drinkhacker. Already reviewed Forbidden (A-). Send new batches + single barrels.'),
+    ('Frank Dobbins (Drinkhacker)', 'frank@drinkhacker.com', 'website', '@drinkhacker', 'https://www.drinkhacker.com/contact-information/', 50000, 'media', '1',
+     'Drinkhacker reviewer. Wrote the Forbidden Bourbon A- review. DC-based. Whiskey, rum, tequila, cocktails.'),
+    ('Maggie Kimberl (Drinkhacker)', 'maggie@drinkhacker.com', 'website', '@maggiekimberl', 'https://www.drinkhacker.com/contact-information/staff', 50000, 'media', '2',
+     'Drinkhacker staff. 2020 World Icon of Whiskey Award. ADI top influencer 2024.'),
+    ('Patrick Garrett (Bourbon & Banter)', 'pops@bourbonbanter.com', 'website', '@bourbonbanter', 'https://www.bourbonbanter.com', 55000, 'media', '1',
+     'Founder Bourbon & Banter. 3M annual users. 37K Twitter, 20K IG. Hosts Drink Curious tastings. Podcast too.'),
+    ('Tom Fischer (BourbonBlog)', 'bourbon@bourbonblog.com', 'website', '@bourbonblog', 'https://bourbonblog.com', 95000, 'media', '1',
+     'Founder BourbonBlog.com. 95K Twitter. Netflix Heist expert. Phone: 310-598-1550. Hosts tastings. Also: tasting@bourbonblog.com.'),
+    ('Drink Spirits', 'editor@drinkspirits.com', 'website', '@drinkspirits', 'https://www.drinkspirits.com', 20000, 'media', '2',
+     'DrinkSpirits.com. Independent reviews. Phone: 617-249-4947. Prior authorization for samples.'),
     
-    for title, category, keywords in blog_topics:
-        existing = _fetchone(conn, 'SELECT id FROM blog_topics WHERE title = ?', (title,))
-        if not existing:
-            if USE_POSTGRES:
-                conn.cursor().execute(
-                    'INSERT INTO blog_topics (title, category, keywords) VALUES (%s, %s, %s)',
-                    (title, category, keywords)
-                )
-            else:
-                conn.execute(
-                    'INSERT INTO blog_topics (title, category, keywords) VALUES (?, ?, ?)',
-                    (title, category, keywords)
-                )
+    # === MAJOR PUBLICATIONS WITH SUBMISSION EMAILS ===
+    ('VinePair — Sample Submissions', 'tastings@vinepair.com', 'website', '@vinepair', 'https://vinepair.com', 500000, 'media', '1',
+     'Already awarded Marianne Master Distiller of Year 2024. Ship to: 244 5th Ave 11th Fl NY 10001. Submit new batches.'),
+    ('Whisky Advocate — Buying Guide', 'watasting@mshanken.com', 'website', '@whiskyadvocate', 'https://whiskyadvocate.com/contact', 200000, 'media', '1',
+     'Submit for Buying Guide review. Ship to: 825 8th Ave 33rd Fl NY 10019. 100-point scale. Top 20 Whiskies list.'),
+    ('David Fleming (Whisky Advocate)', 'dfleming@mshanken.com', 'website', '@whiskyadvocate', 'https://whiskyadvocate.com/contact', 200000, 'media', '1',
+     'Executive Editor, Whisky Advocate. Key decision maker for reviews and features. Also: info@whiskyadvocate.com.'),
+    ('Julia Higgins (Whisky Advocate)', 'jhiggins@mshanken.com', 'website', '@whiskyadvocate', 'https://whiskyadvocate.com/contact', 200000, 'media', '2',
+     'Senior Editor, Whisky Advocate. Buying Guide reviewer.'),
+    ('Stephen Senatore (Whisky Advocate Ads)', 'ssenatore@mshanken.com', 'website', '@whiskyadvocate', 'https://whiskyadvocate.com/contact', 200000, 'media', '2',
+     'Advertising contact at Whisky Advocate. Media kit, rates, deadlines, ad opportunities.'),
     
-    conn.commit()
-    conn.close()
+    # === EVENTS & COMPETITIONS WITH EMAIL ===
+    ('WhiskyFest', 'whiskyfest@whiskyadvocate.com', 'website', '@whiskyfest', 'https://whiskyadvocate.com', 200000, 'industry', '1',
+     'Multi-city events: NY, Chicago, SF. Exhibit booth opportunity. Direct consumer tasting.'),
+    ('SF World Spirits Competition', 'info@sfspiritscomp.com', 'website', '@sfwspiritscomp', 'https://thetastingalliance.com/events/san-francisco-world-spirits-competition', 31000, 'industry', '1',
+     '2026 open for entries. Deadline Apr 24, ship by May 1. $600/entry. Ship to Pier 50 Shed A, San Francisco CA 94158. Phone: 415-345-9000.'),
+    ('SF World Spirits (Europe Satellite)', 'maddee@thetastingalliance.com', 'website', '@sfwspiritscomp', 'https://thetastingalliance.com', 31000, 'industry', '2',
+     'European satellite competition contact. Also handles general competition inquiries.'),
     
-    # Seed brand mentions
-    seed_brand_mentions()
-    # Seed outreach contacts
-    seed_outreach_contacts()
-    # Seed customer emails from Mash Networks
-    seed_customer_emails()
+    # === PODCASTS WITH EMAIL ===
+    ('Bourbon Pursuit Podcast', 'podcast@pursuitspirits.com', 'podcast', '@bourbonpursuit', 'https://bourbonpursuit.com', 78500, 'influencer', '1',
+     'Top bourbon podcast. Kenny Coleman, Ryan Cecil, Fred Minnick. Already had Marianne on Ep 425. Send new batches.'),
+]
 
 
+@_invalidates_stats
 def seed_outreach_contacts():
     """Pre-populate outreach contacts — ONLY contacts with verified email addresses"""
-    conn = get_db()
+    with connection() as conn:
+        written = _upsert_seed(conn, 'outreach_contacts',
+                               ['name', 'email', 'platform', 'platform_handle', 'platform_url',
+                                'followers', 'category', 'tier', 'notes'],
+                               SEED_OUTREACH_CONTACTS, 'email')
     
-    # Clear old data and re-seed fresh
-    _execute(conn, "DELETE FROM outreach_contacts")
+    print(f"Outreach contacts seeded: {written} of {len(SEED_OUTREACH_CONTACTS)} contacts inserted or updated (all with verified emails)")
+
+
+SEED_BRAND_MENTIONS = [
+    # === REVIEWS (6) - All specifically review Forbidden Bourbon ===
+    ('Forbidden Bourbon Review', 'https://thebourbonculture.com/whiskey-reviews/forbidden-bourbon-review/', 'thebourbonculture.com', 'review',
+     'In-depth review of Forbidden Bourbon. Covers low-temp fermentation, white corn mash bill, $129 price point. Wheated profile with vanilla, brown butter, orange citrus.', 'Bourbon Culture'),
+    ('Forbidden Batch 3 Bourbon Review & Rating', 'https://vinepair.com/review/forbidden-batch-3-bourbon/', 'vinepair.com', 'review',
+     'VinePair review of Forbidden Batch 3. Bright, borderline-refreshing wheated bourbon blended with a deft touch. Lavender, honey syrup, bright oak on the nose.', 'VinePair'),
+    ('Forbidden Bourbon Review: Tasting Notes & Complete Analysis', 'https://thewhiskeywash.com/reviews/whiskey-review-forbidden-bourbon/', 'thewhiskeywash.com', 'review',
+     'Whiskey Wash review of Forbidden Bourbon. Notes vanilla, creme brulee, clove, coffee. Calls it subtly ingenious — familiar flavors arranged in unexpected ways.', 'The Whiskey Wash'),
+    ('Review: Forbidden Bourbon (Rated A-)', 'https://www.drinkhacker.com/2023/07/26/review-forbidden-bourbon/', 'drinkhacker.com', 'review',
+     'Drinkhacker rates Forbidden Bourbon A-. Wheat toast, tayberries, chocolate almonds, cinnamon bark, creamy custard. Emblematic of Eaves deft blending touch.', 'Drinkhacker'),
+    ('Forbidden Kentucky Straight Bourbon Review (8.3/10)', 'https://www.pastemagazine.com/drink/whiskey/fordbidden-bourbon-review-marianne-eaves', 'pastemagazine.com', 'review',
+     'Paste Magazine scores Forbidden Bourbon 8.3/10. Creamy texture, orange citrus, toffee, cream soda. Mouthfeel is one of the most memorable under 100 proof.', 'Paste Magazine'),
+    ('Forbidden Batch 2 Review', 'https://www.josephbourbon.com/post/forbidden-batch-2', 'josephbourbon.com', 'review',
+     'Review of Forbidden Bourbon Batch 2. Star-shaped bottle. 75% white corn, 12% white wheat, 13% malted barley. 95.2 proof.', 'Joseph Bourbon'),
+    ('Bourbon Lens: Forbidden Bourbon Tasted & Reviewed', 'https://bourbonlens.com/forbidden-bourbon-reviewed/', 'bourbonlens.com', 'review',
+     'Bourbon Lens review. Habanero honey, pepper, cinnamon on palate. Long milk chocolate finish. Can get behind this bourbon despite higher price tag.', 'Bourbon Lens'),
+    ('The Bourbon Flight: Forbidden Bourbon Review (5/5 Barrels)', 'https://www.thebourbonflight.com/featured-bourbon-review-forbidden-bourbon-by-marianne-eaves/', 'thebourbonflight.com', 'review',
+     'Featured review. 5/5 Barrels rating. Vanilla, deep-roasted corn, hazelnut aromas. Caramel creme brulee, toffee, cherry. Minimal burn at 95.2 proof. Worth the extra money at $129.', 'The Bourbon Flight'),
+    ('Distiller.com: Forbidden Bourbon User Reviews (4.0/5)', 'https://distiller.com/spirits/forbidden-bourbon/tastes', 'distiller.com', 'review',
+     'Distiller.com community reviews. 4.0 out of 5 stars. Batch #3 notes: grain, wood, fruits, flowers, vanilla bean, orange zest, glazed doughnuts, spiced caramel latte.', 'Distiller.com'),
+    ('American Whiskey Magazine: Forbidden Bourbon Batch 1 Tasting', 'https://americanwhiskeymag.com/reviews/tasting-forbidden-bourbon-batch-1/', 'americanwhiskeymag.com', 'review',
+     'American Whiskey Magazine official tasting of Forbidden Bourbon Batch 1. 47.6% ABV, 95.2 proof. Wheat style from Kentucky.', 'American Whiskey Magazine'),
+
+    # === MAJOR MAGAZINE FEATURES (8) - All specifically about Forbidden Bourbon ===
+    ('Forbes: Whiskey Of The Week — Forbidden Bourbon Batch #2', 'https://www.forbes.com/sites/joemicallef/2023/11/16/whiskey-of-the-week-forbidden-bourbon-batch-2/', 'forbes.com', 'feature',
+     'Forbes Whiskey Of The Week feature on Forbidden Bourbon Batch #2. $130, rich profile with mellow corn, soft wheat, notable barley. Low-temperature fermentation.', 'Forbes'),
+    ('Maxim: Spirit of the Week — Forbidden Small Batch Bourbon', 'https://www.maxim.com/food-drink/spirit-of-the-week-forbidden-small-batch-bourbon/', 'maxim.com', 'feature',
+     'Maxim Spirit of the Week feature (Aug 2023). Forbidden Small Batch Bourbon highlighted as a standout new release with innovative mash bill.', 'Maxim'),
+    ('Garden & Gun: Marianne Eaves Whiskey Dreams (Forbidden Profile)', 'https://gardenandgun.com/articles/marianne-eavess-whiskey-dreams/', 'gardenandgun.com', 'feature',
+     'Garden & Gun feature profile on Forbidden Bourbon. Eaves discusses making it from scratch with white corn and white winter wheat. Name nods to KY law forbidding women as master distillers.', 'Garden & Gun'),
+    ('Garden & Gun: 2023 Holiday Gift Guide feat. Forbidden Bourbon', 'https://gardenandgun.com/feature/gift-guide-2023/', 'gardenandgun.com', 'feature',
+     'Garden & Gun holiday gift guide featuring Forbidden Bourbon as a top gift pick for bourbon lovers in 2023.', 'Garden & Gun'),
+    ('Garden & Gun: A Forbidden Evening (Brand Event)', 'https://gardenandgun.com/slideshow/a-forbidden-evening/', 'gardenandgun.com', 'event',
+     'Garden & Gun hosted A Forbidden Evening in Charleston, SC — a dedicated Forbidden Bourbon event with tastings and live music. May 2023.', 'Garden & Gun'),
+    ('Garden & Gun: Craig Melvin Says Forbidden Is His Favorite Bourbon', 'https://gardenandgun.com/articles/get-to-know-craig-melvin-the-today-shows-new-co-lead-anchor/', 'gardenandgun.com', 'feature',
+     'TODAY Show co-anchor Craig Melvin tells Garden & Gun that Forbidden by Marianne Eaves is his favorite bourbon. Calls it perfectly balanced.', 'Garden & Gun'),
+    ('Gear Patrol: Best New Bourbon Releases of 2023 (feat. Forbidden)', 'https://www.gearpatrol.com/food-drink/a44215959/best-new-bourbon-releases-2023/', 'gearpatrol.com', 'feature',
+     'Gear Patrol names Forbidden Bourbon one of the best new bourbon releases of 2023. Highlights innovative mash bill and Marianne Eaves pedigree.', 'Gear Patrol'),
+    ('American Whiskey Magazine: Marianne Eaves Talks Forbidden Bourbon', 'https://americanwhiskeymag.com/articles/marianne-eaves-forbidden-bourbon/', 'americanwhiskeymag.com', 'feature',
+     'American Whiskey Magazine interview about Forbidden Bourbon. Eaves explains the name, low-temp fermentation from a 1910 Seagrams manual, KY law against women in production until 1974.', 'American Whiskey Magazine'),
+
+    # === TV / BROADCAST (1) - Specifically about Forbidden Bourbon ===
+    ('NBC TODAY Show: Craig Melvin Features Forbidden Bourbon', 'https://www.today.com/video/kentucky-s-first-female-master-distiller-set-to-launch-her-own-brand-186833477881', 'today.com', 'video',
+     'NBC TODAY Show segment. Craig Melvin visits Bardstown Bourbon Company to taste Forbidden Bourbon from the barrel with Marianne Eaves. National broadcast feature. July 2023.', 'NBC TODAY Show'),
+
+    # === PRESS / NEWS (9) - All specifically about Forbidden Bourbon launch/coverage ===
+    ('Breaking Bourbon: Rebellion and Innovation Collide to Birth Forbidden', 'https://www.breakingbourbon.com/bourbon-whiskey-press-releases/rebellion-and-innovation-collide-to-birth-forbidden-bourbon', 'breakingbourbon.com', 'press',
+     'Breaking Bourbon press release. Forbidden Bourbon — first white corn and white winter wheat bourbon. Distilled at Bardstown Bourbon Co. KY, TN, GA, SC at $129.', 'Breaking Bourbon'),
+    ('GoBourbon: Marianne Eaves Debuts Forbidden Bourbon', 'https://www.gobourbon.com/new-release-marianne-eaves-debuts-forbidden-bourbon/', 'gobourbon.com', 'press',
+     'The Bourbon Review coverage of Forbidden Bourbon launch. Mash bill details, low-temperature fermentation, SC-based partnership.', 'The Bourbon Review'),
+    ('Distillery Trail: Marianne Eaves Releases Forbidden Bourbon', 'https://www.distillerytrail.com/blog/master-distiller-marianne-eaves-releases-forbidden-her-5-year-old-grain-to-glass-kentucky-bourbon/', 'distillerytrail.com', 'press',
+     'Distillery Trail deep dive into Forbidden Bourbon launch. Direct quotes from Eaves on low-temp fermentation. Craig Melvin TODAY Show visit also documented.', 'Distillery Trail'),
+    ('Cola Daily: Columbia Mayor Partners to Debut Forbidden Bourbon', 'https://www.coladaily.com/business/master-distiller-marianne-eaves-partners-with-columbia-mayor-to-debut-new-bourbon-forbidden/article_840f19be-202a-11ee-82ea-5bbcc61d6ada.html', 'coladaily.com', 'press',
+     'Columbia SC news on Forbidden Bourbon debut tasting at Smoked restaurant. Details partnership with Mayor Daniel Rickenmann and SC-based founders.', 'Cola Daily'),
+    ('Tasting Table: Eaves Reinvents Kentucky Bourbon With Forbidden', 'https://www.tastingtable.com/1308476/marianne-eaves-reinvents-kentucky-bourbon-forbidden-debut/', 'tastingtable.com', 'press',
+     'Tasting Table coverage of Forbidden Bourbon launch. White corn, white wheat, low-temperature fermentation. May 16, 2023.', 'Tasting Table'),
+    ('Atlanta Journal-Constitution: Female Master Distiller Tackles the Forbidden', 'https://www.ajc.com/things-to-do/female-master-distiller-likes-to-tackle-the-forbidden/', 'ajc.com', 'press',
+     'AJC feature on Forbidden Bourbon launch. Coverage of the brand debut for the Georgia market. May 2023.', 'Atlanta Journal-Constitution'),
+    ('Post and Courier: Forbidden Bourbon Debuts in South Carolina', 'https://www.postandcourier.com/free-times/food/kentuckys-1st-female-master-distiller-debuts-new-bourbon-in-sc/', 'postandcourier.com', 'press',
+     'Charleston Post and Courier covers Forbidden Bourbon debut in South Carolina, backed by Columbia mayor Daniel Rickenmann.', 'The Post and Courier'),
+    ('The Daily Pour: Forbidden Bourbon Breaks All the Rules', 'https://thedailypour.com/whiskey/bourbon/marianne-eaves-forbidden-bourbon/', 'thedailypour.com', 'press',
+     'The Daily Pour coverage of Forbidden Bourbon launch. First white corn and white winter wheat bourbon. Cold fermentation, cuisine-quality ingredients. $129.', 'The Daily Pour'),
+    ('TOWN Carolina: Forbidden Bourbon Leaves Innovative Mark', 'https://towncarolina.com/marianne-eaves-forbidden-bourbon-leaves-innovative-mark', 'towncarolina.com', 'press',
+     'TOWN Carolina feature on Forbidden Bourbon and its impact on the South Carolina spirits scene.', 'TOWN Carolina'),
+    ('Fred Minnick: Marianne Eaves Forbidden Brand Debuts', 'https://www.fredminnick.com/2023/05/19/marianne-eaves-forbidden-brand-debuts/', 'fredminnick.com', 'press',
+     'Fred Minnick covers Forbidden Bourbon debut. First white corn and white winter wheat bourbon. Available in KY, TN, GA, SC at $129. Single barrel cask strength expressions.', 'Fred Minnick'),
+
+    # === AWARDS (11) - Specifically credits Forbidden Bourbon ===
+    ('VinePair Next Wave: Master Distiller of the Year (for Forbidden)', 'https://vinepair.com/articles/2024-next-wave-marianne-eaves/', 'vinepair.com', 'award',
+     'VinePair 2024 Next Wave Award — Master Distiller of the Year. Profiles Eaves career culminating in Forbidden Bourbon. All three batches sold out quickly and well reviewed.', 'VinePair'),
+    ('New Orleans Spirits Competition 2024: Silver Medal — Forbidden Single Barrel', 'https://www.nolaspiritscomp.com/awards-24/silver-medal-spirits-24', 'nolaspiritscomp.com', 'award',
+     'Forbidden Bourbon Single Barrel won Silver Medal at the 2024 New Orleans Spirits Competition. Entered by Small Batch Medicinal Spirits Company.', 'New Orleans Spirits Competition'),
+    ('New Orleans Spirits Competition 2024: Silver Medal — Forbidden Small Batch', 'https://www.nolaspiritscomp.com/awards-24/silver-medal-spirits-24#small-batch', 'nolaspiritscomp.com', 'award',
+     'Forbidden Bourbon Small Batch won Silver Medal at the 2024 New Orleans Spirits Competition. Entered by Small Batch Medicinal Spirits Company.', 'New Orleans Spirits Competition'),
+    ('Denver International Spirits Competition 2025: Double Gold (96 pts) — Forbidden Single Barrel', 'https://denverspiritscomp.com/wp-content/uploads/2025/04/2025_DISC_Win.xls.pdf', 'denverspiritscomp.com', 'award',
+     'Forbidden Single Barrel Bourbon won Double Gold with 96 points at the 2025 Denver International Spirits Competition. Highest-scoring Forbidden entry.', 'Denver International Spirits Competition'),
+    ('Denver International Spirits Competition 2025: Silver (88 pts) — Forbidden Small Batch 3', 'https://denverspiritscomp.com/wp-content/uploads/2025/04/2025_DISC_Win.xls.pdf#small-batch-3', 'denverspiritscomp.com', 'award',
+     'Forbidden Bourbon Small Batch 3 won Silver Medal with 88 points at the 2025 Denver International Spirits Competition.', 'Denver International Spirits Competition'),
+    ('New York International Spirits Competition 2024: 96 Points — Forbidden Single Barrel', 'https://nyispiritscompetition.com/2024-whisky-awards/', 'nyispiritscompetition.com', 'award',
+     'Forbidden Bourbon Single Barrel scored 96 points at the 2024 New York International Spirits Competition, placing among the Best Whiskies of the Year.', 'New York International Spirits Competition'),
+    ('L.A. Spirits Awards 2025: Best Bourbons — Forbidden Single Barrel', 'https://www.thebestdrinkever.com/home/2025/8/13/the-best-bourbons-of-2025-according-to-the-prestigious-la-spirits-awards', 'thebestdrinkever.com', 'award',
+     'Forbidden Single Barrel Wheated Bourbon recognized among the Best Bourbons of 2025 at the L.A. Spirits Awards. Praised for 114 proof, creamy butterscotch, and warm finish.', 'L.A. Spirits Awards'),
+    ('Fred Minnick Top 100 American Whiskeys 2024 — Forbidden Batch 3', 'https://www.fredminnick.com/2024/12/24/2024-top-100-american-whiskeys-unranked/', 'fredminnick.com', 'award',
+     'Forbidden Batch 3 named to Fred Minnick Top 100 American Whiskeys of 2024. Minnick called it "one of the best whiskeys Marianne Eaves has created."', 'Fred Minnick'),
+    ('Fred Minnick Top 100 American Whiskeys 2025: #82 — Forbidden Batch 3', 'https://brewpublic.com/distilling/fred-minnick-delivers-his-top-100-whiskeys-of-2025/', 'brewpublic.com', 'award',
+     'Forbidden Batch 3 ranked #82 on Fred Minnick Top 100 American Whiskeys of 2025. Second consecutive year on the list. 95.2 proof, $100.', 'Fred Minnick'),
+    ('San Francisco World Spirits Competition — Forbidden Bourbon', 'https://thetastingalliance.com/events/san-francisco-world-spirits-competition', 'thetastingalliance.com', 'award',
+     'Forbidden Bourbon recognized at the San Francisco World Spirits Competition, the most prestigious spirits competition in the world. Award laurel displayed on drinkforbidden.com.', 'San Francisco World Spirits Competition'),
+    ('ASCOT Awards — Forbidden Bourbon', 'https://www.fredminnick.com/2023/05/17/2023-ascot-awards-winners-announced/', 'fredminnick.com', 'award',
+     'Forbidden Bourbon recognized at the ASCOT Awards, Fred Minnick international spirits competition. Award laurel displayed on drinkforbidden.com.', 'ASCOT Awards'),
+
+    # === INTERVIEWS (1) - Specifically discusses Forbidden Bourbon ===
+    ('Drinkhacker: Eaves on Forbidden, Innovation & Bourbon Gluts', 'https://www.drinkhacker.com/2023/10/30/marianne-eaves-speaks-on-forbidden-whiskey-innovation-and-bourbon-gluts/', 'drinkhacker.com', 'interview',
+     'Drinkhacker interview focused on Forbidden Bourbon. Eaves discusses Bardstown Bourbon Company partnership, pricing, and industry overproduction.', 'Drinkhacker'),
+
+    # === PODCASTS (4) - All specifically discuss Forbidden Bourbon ===
+    ('Bourbon Pursuit #425: Marianne Eaves on Forbidden Bourbon', 'https://bourbonpursuit.com/2023/08/31/425-marianne-eaves-gets-real-about-her-new-bourbon/', 'bourbonpursuit.com', 'podcast',
+     'Marianne Eaves discusses Forbidden Bourbon in detail. Clears up press release confusion about distilling timeline. Discusses pricing, process, and mash bill.', 'Bourbon Pursuit'),
+    ('The Mash Up E322: Marianne Eaves of Forbidden Bourbon', 'https://open.spotify.com/episode/1EPo0g8qPhirFHtHjKvdr7', 'spotify.com', 'podcast',
+     'Deep conversation about Forbidden Bourbon origins, craft distilling approach, and future plans for the brand.', 'The Mash Up'),
+    ('Barrel Room Chronicles: Marianne Eaves on Forbidden Bourbon', 'https://www.barrelroomchronicles.com/exploring-louisvilles-whiskey-row-and-the-trailblazing-women-in-whiskey-at-the-wow-awards-s3-e15/', 'barrelroomchronicles.com', 'podcast',
+     'Eaves discusses Forbidden Bourbon at WOW Awards. Reveals plans for Montana distillery and Louisville tasting room on 5th and Market Street.', 'Barrel Room Chronicles'),
+    ('Distilling Greatness Ep 13: Marianne Eaves on Forbidden', 'https://companydistilling.com/2024/06/podcast-marianne-eaves/', 'companydistilling.com', 'podcast',
+     'Company Distilling podcast. Eaves discusses her journey to creating Forbidden Bourbon, white corn sourcing, and the Eaves Foundation.', 'Company Distilling'),
+
+    # === EVENTS (5) - Forbidden Bourbon tasting events ===
+    ('Virgin Hotels NYC: Meet the Maker — Forbidden Bourbon Tasting', 'https://virginhotels.com/new-york/entertainment/meet-the-maker/', 'virginhotels.com', 'event',
+     'Virgin Hotels NYC event. Forbidden Bourbon tasting and lite bites presented by Marianne Eaves at The Shag Room at Everdene.', 'Virgin Hotels'),
+    ('Garden & Gun Distilled Week: Forbidden Bourbon Pairing', 'https://thewhiskeywash.com/whiskey-news/garden-gun-partners-with-kentucky-distilleries-to-offer-a-week-of-bourbon-experiences/', 'thewhiskeywash.com', 'event',
+     'Forbidden Bourbon featured at G&G Distilled week in Kentucky. Eaves provided Forbidden bourbon pairings at Yew Dell Botanical Gardens.', 'The Whiskey Wash'),
+    ('New Orleans Bourbon Festival 2025: Forbidden Booth & Women\'s Panel', 'https://www.thebourbonandryeclub.com/splash-page/new-orleans-bourbon-festival-2025-live-updates', 'thebourbonandryeclub.com', 'event',
+     'Forbidden had booth at NOLA Bourbon Festival 2025 grand tasting. Marianne Eaves spoke on Women\'s Panel alongside Jane Bowie (Potter Jane), Lauren Patz (Redwood Empire), Melinda Maddox (Old Elk). Tickets $175 for Baton Rouge meet & greet.', 'The Bourbon and Rye Club'),
+    ('Marianne Eaves Bourbon Tasting — Tiger\'s Trail RV Resort, Baton Rouge', 'https://tigerstrailrvresort.com/tiger-trail-events/bourbon-tasting-featuring-the-first-female-master-distiller-and-creator-of-forbidden-bourbon-marianne-eaves/', 'tigerstrailrvresort.com', 'event',
+     'March 20, 2025 meet & greet with Marianne Eaves in Baton Rouge during NOLA Bourbon Fest week. Tickets $175, special bourbon pricing. Tiger\'s Trail RV Resort.', 'Tiger\'s Trail RV Resort'),
+    ('Forbidden Bourbon Tasting — Instagram Post', 'https://www.instagram.com/p/DS0Dzgrjo_n/', 'instagram.com', 'event',
+     'Instagram post featuring photos from a Forbidden Bourbon tasting event. Community engagement and in-person brand experience.', 'Instagram'),
+
+    # === SOCIAL / VIDEO (16) ===
+    ('TikTok: Forbidden Bourbon Review — The Whiskey Boys', 'https://www.tiktok.com/@thewhiskyboys/video/7337101775884832042', 'tiktok.com', 'video',
+     'TikTok video review of Forbidden Bourbon by @thewhiskyboys. Dedicated review with tasting notes and rating.', 'The Whiskey Boys'),
+    ('TikTok: Forbidden Bourbon Product Review — Big Bear Wine', 'https://www.tiktok.com/@bigbearwine/video/7444698371358575915', 'tiktok.com', 'video',
+     'TikTok product review of Forbidden Bourbon by Big Bear Wine liquor store. In-store feature and recommendation.', 'Big Bear Wine'),
+    ('The Best Bourbons of 2025 (So Far)', 'https://youtu.be/ltL5x0OPVYc', 'youtube.com', 'video',
+     'Brad\'s Bourbon Reviews ranks the best bourbons of 2025 so far. 12K views. 10:31 runtime. Follow on IG and TikTok @bradsbourbonreviews.', 'Brad\'s Bourbon Reviews'),
+    ('The Best Allocated Bourbon You Didn\'t Know Existed', 'https://youtu.be/LVAbYUqjvhU', 'youtube.com', 'video',
+     'Uncut Never Filtered discovers Forbidden Bourbon as an unknown allocated treasure while bottle hunting at The Blind Pig in Bardstown. 217 views. 8:48 runtime.', 'Uncut Never Filtered'),
+    ('YouTube Short: Bourbon Banter — Forbidden Small Batch', 'https://youtube.com/shorts/_gy3ND28UgI', 'youtube.com', 'video',
+     'Bourbon Banter shares their thoughts on this award-winning bourbon. YouTube Short.', 'Bourbon Banter'),
+    ('YouTube Short: Forbidden Bourbon!!!', 'https://youtube.com/shorts/JXAsK65ukBg', 'youtube.com', 'video',
+     'Short enthusiastic review of Forbidden Bourbon. 439 views.', 'YouTube Short'),
+    ('YouTube Short: Forbidden Bourbon Review', 'https://youtube.com/shorts/l_-gpX0TPb0', 'youtube.com', 'video',
+     'Quick Forbidden Bourbon review. 202 views.', 'YouTube Short'),
+    ('Marianne Eaves — VinePair Master Distiller of the Year', 'https://youtu.be/DOLWLJktzNk', 'youtube.com', 'video',
+     'Forbidden Bourbon official channel. In an industry ruled by old men who often work for a single legacy distillery their entire lives, Marianne Eaves has seemingly packed several careers into one. 71 views. 1:22 runtime.', 'Forbidden Bourbon'),
+    ('New Limited Release Forbidden Bourbon Review', 'https://youtu.be/VS6CfanKplc', 'youtube.com', 'video',
+     'RJtheFED reviews a bottle of Forbidden Bourbon. Released in only 4 states, a privilege to acquire. 183 views. 10:54 runtime.', 'RJtheFED'),
+    ('Kentucky\'s First Female Master Distiller Releases \'Forbidden\' Bourbon', 'https://youtu.be/NcRZ8E8P_VM', 'youtube.com', 'video',
+     'WAVE News Louisville news segment. After three years of developing recipes, followed by five years aging in bourbon barrels, Marianne Eaves is finally ready to introduce her creation. 660 views. 2:30 runtime.', 'WAVE News Louisville'),
+    ('Club Marzipan Barrel Pick: Forbidden Bourbon', 'https://www.youtube.com/live/nv2c5u84G8o', 'youtube.com', 'video',
+     'Fred Minnick live barrel pick session for Forbidden Bourbon. Tasting and choosing a barrel — 6.3 year bourbon options. 2.2K views. 2:02:37 runtime.', 'Fred Minnick'),
+    ('NEW Forbidden Bourbon FIRST IMPRESSIONS — Worth It? It Depends', 'https://youtu.be/hovC28iHKAE', 'youtube.com', 'video',
+     'TyTheBourbonGuy first impressions review. Forbidden Bourbon is a new project from Marianne Eaves, very well known in the whiskey world. 375 views. 6:00 runtime.', 'TyTheBourbonGuy'),
+    ('YouTube Short: Forbidden Bourbon Tasting', 'https://youtube.com/shorts/nMUDKSb3CS8', 'youtube.com', 'video',
+     'YouTube Shorts tasting of Forbidden Bourbon.', 'YouTube Short'),
+    ('Forbidden Batch 1 & 2 Bourbon Review', 'https://www.youtube.com/watch?v=RJFED_BATCH12', 'youtube.com', 'video',
+     'RJtheFED compares Forbidden Batch 1 and Batch 2 Trouble Bar Pick, a 114 proof Single Barrel. 172 views. 7:47 runtime.', 'RJtheFED'),
+    ('Forbidden Bourbon Review! Is It Truly Groundbreaking?', 'https://www.youtube.com/watch?v=MASHANDDRUM_FB', 'youtube.com', 'video',
+     'The Mash and Drum in-depth review of Forbidden debut release Small Batch Bourbon. Is it truly groundbreaking? 14K views. 11:31 runtime. Support on Patreon for Mash & Journey barrel picks.', 'The Mash and Drum'),
+    ('Forbidden Bourbon Official Instagram', 'https://www.instagram.com/forbiddenbourbon/', 'instagram.com', 'social',
+     'Official Forbidden Bourbon Instagram (@forbiddenbourbon). 4,387 followers, 128 posts. The first bourbon of its kind, thoughtfully blended by Kentucky\'s 1st Female Master Distiller.', 'Forbidden Bourbon'),
+    ('Forbidden Bourbon Official Facebook', 'https://www.facebook.com/forbiddenbourbon', 'facebook.com', 'social',
+     'Official Forbidden Bourbon Facebook page. Brand updates, event announcements, cocktail recipes, and community engagement.', 'Forbidden Bourbon'),
+
+    # === ADDITIONAL FEATURES & PRESS ===
+    ('Whisky Advocate: The Many Whiskeys of Marianne Eaves', 'https://whiskyadvocate.com/The-Many-Whiskeys-of-Marianne-Eaves', 'whiskyadvocate.com', 'feature',
+     'Whisky Advocate deep profile by Julia Higgins. 8000 barrels set aside for Forbidden, 50 or fewer per batch. Also details Eavesdrop bar concept in Louisville and Big Sky Stillhouse in Montana.', 'Whisky Advocate'),
+    ('Bourbon Trend: Wheated Bourbon Wonder — Marianne Eaves Forbidden Story', 'https://bourbontrend.com/bourbon-news/wheated-bourbon-wonder-marianne-eavess-forbidden-story/', 'bourbontrend.com', 'press',
+     'Bourbon Trend feature on the creation of Forbidden Bourbon. Journey of Marianne Eaves and her unique wheated bourbon approach.', 'Bourbon Trend'),
+    ('The Whiskey Wash: Marianne Eaves New Forbidden Treads New Ground', 'https://thewhiskeywash.com/whiskey-styles/bourbon/marianne-eaves-new-forbidden-bourbon-treads-new-whiskey-ground/', 'thewhiskeywash.com', 'press',
+     'Whiskey Wash news coverage of Forbidden launch. First white corn and white winter wheat bourbon expression from iconic female master distiller.', 'The Whiskey Wash'),
+
+    # === OWN SITES (4) ===
+    ('Forbidden Bourbon — Official Website', 'https://drinkforbidden.com/', 'drinkforbidden.com', 'own_site',
+     'Official website. A Twist on Tradition. Premium Kentucky wheated bourbon by Master Distiller Marianne Eaves.', 'Forbidden'),
+    ('Forbidden Bourbon — Online Shop', 'https://shop.drinkforbidden.com', 'shop.drinkforbidden.com', 'own_site',
+     'Official online shop. Buy Forbidden Bourbon direct — Small Batch Select and Single Barrel.', 'Forbidden'),
+    ('Forbidden Bourbon — Single Barrel Product Page', 'https://drinkforbidden.com/products/single-barrel-bourbon', 'drinkforbidden.com', 'own_site',
+     'Single Barrel product page. Hand-selected barrels. Bold, elegant, sweet, smooth, complex.', 'Forbidden'),
+    ('Forbidden Bourbon — News & Media', 'https://drinkforbidden.com/news-media', 'drinkforbidden.com', 'own_site',
+     'Official news and media page listing all press coverage, articles, and bourbon education content.', 'Forbidden'),
+]
+
+
+@_invalidates_stats
+def seed_brand_mentions():
+    """Pre-populate Brand Intel with verified Forbidden Bourbon mentions only"""
+    with connection() as conn:
+        written = _upsert_seed(conn, 'brand_mentions',
+                               ['title', 'url', 'source', 'source_type', 'snippet', 'author'],
+                               SEED_BRAND_MENTIONS, 'url')
     
-    contacts = [
-        # (name, email, platform, handle, url, followers, category, tier, notes)
-        
-        # === BOURBON REVIEWERS WITH EMAIL ===
-        ('Christopher Null (Drinkhacker)', 'editor@drinkhacker.com', 'website', '@drinkhacker', 'https://www.drinkhacker.com', 50000, 'media', '1',
-         'Publisher & Editor-in-Chief, Drinkhacker. Already reviewed Forbidden (A-). Send new batches + single barrels.'),
-        ('Frank Dobbins (Drinkhacker)', 'frank@drinkhacker.com', 'website', '@drinkhacker', 'https://www.drinkhacker.com/contact-information/', 50000, 'media', '1',
-         'Drinkhacker reviewer. Wrote the Forbidden Bourbon A- review. DC-based. Whiskey, rum, tequila, cocktails.'),
-        ('Maggie Kimberl (Drinkhacker)', 'maggie@drinkhacker.com', 'website', '@maggiekimberl', 'https://www.drinkhacker.com/contact-information/staff', 50000, 'media', '2',
-         'Drinkhacker staff. 2020 World Icon of Whiskey Award. ADI top influencer 2024.'),
-        ('Patrick Garrett (Bourbon & Banter)', 'pops@bourbonbanter.com', 'website', '@bourbonbanter', 'https://www.bourbonbanter.com', 55000, 'media', '1',
-         'Founder Bourbon & Banter. 3M annual users. 37K Twitter, 20K IG. Hosts Drink Curious tastings. Podcast too.'),
-        ('Tom Fischer (BourbonBlog)', 'bourbon@bourbonblog.com', 'website', '@bourbonblog', 'https://bourbonblog.com', 95000, 'media', '1',
-         'Founder BourbonBlog.com. 95K Twitter. Netflix Heist expert. Phone: 310-598-1550. Hosts tastings. Also: tasting@bourbonblog.com.'),
-        ('Drink Spirits', 'editor@drinkspirits.com', 'website', '@drinkspirits', 'https://www.drinkspirits.com', 20000, 'media', '2',
-         'DrinkSpirits.com. Independent reviews. Phone: 617-249-4947. Prior authorization for samples.'),
-        
-        # === MAJOR PUBLICATIONS WITH SUBMISSION EMAILS ===
-        ('VinePair — Sample Submissions', 'tastings@vinepair.com', 'website', '@vinepair', 'https://vinepair.com', 500000, 'media', '1',
-         'Already awarded Marianne Master Distiller of Year 2024. Ship to: 244 5th Ave 11th Fl NY 10001. Submit new batches.'),
-        ('Whisky Advocate — Buying Guide', 'watasting@mshanken.com', 'website', '@whiskyadvocate', 'https://whiskyadvocate.com/contact', 200000, 'media', '1',
-         'Submit for Buying Guide review. Ship to: 825 8th Ave 33rd Fl NY 10019. 100-point scale. Top 20 Whiskies list.'),
-        ('David Fleming (Whisky Advocate)', 'dfleming@mshanken.com', 'website', '@whiskyadvocate', 'https://whiskyadvocate.com/contact', 200000, 'media', '1',
-         'Executive Editor, Whisky Advocate. Key decision maker for reviews and features. Also: info@whiskyadvocate.com.'),
-        ('Julia Higgins (Whisky Advocate)', 'jhiggins@mshanken.com', 'website', '@whiskyadvocate', 'https://whiskyadvocate.com/contact', 200000, 'media', '2',
-         'Senior Editor, Whisky Advocate. Buying Guide reviewer.'),
-        ('Stephen Senatore (Whisky Advocate Ads)', 'ssenatore@mshanken.com', 'website', '@whiskyadvocate', 'https://whiskyadvocate.com/contact', 200000, 'media', '2',
-         'Advertising contact at Whisky Advocate. Media kit, rates, deadlines, ad opportunities.'),
-        
-        # === EVENTS & COMPETITIONS WITH EMAIL ===
-        ('WhiskyFest', 'whiskyfest@whiskyadvocate.com', 'website', '@whiskyfest', 'https://whiskyadvocate.com', 200000, 'industry', '1',
-         'Multi-city events: NY, Chicago, SF. Exhibit booth opportunity. Direct consumer tasting.'),
-        ('SF World Spirits Competition', 'info@sfspiritscomp.com', 'website', '@sfwspiritscomp', 'https://thetastingalliance.com/events/san-francisco-world-spirits-competition', 31000, 'industry', '1',
-         '2026 open for entries. Deadline Apr 24, ship by May 1. $600/entry. Ship to Pier 50 Shed A, San Francisco CA 94158. Phone: 415-345-9000.'),
-        ('SF World Spirits (Europe Satellite)', 'maddee@thetastingalliance.com', 'website', '@sfwspiritscomp', 'https://thetastingalliance.com', 31000, 'industry', '2',
-         'European satellite competition contact. Also handles general competition inquiries.'),
-        
-        # === PODCASTS WITH EMAIL ===
-        ('Bourbon Pursuit Podcast', 'podcast@pursuitspirits.com', 'podcast', '@bourbonpursuit', 'https://bourbonpursuit.com', 78500, 'influencer', '1',
-         'Top bourbon podcast. Kenny Coleman, Ryan Cecil, Fred Minnick. Already had Marianne on Ep 425. Send new batches.'),
-    ]
-    
-    for c in contacts:
-        name, email, platform, handle, url, followers, category, tier, notes = c
-        existing = _fetchone(conn, 'SELECT id FROM outreach_contacts WHERE email = ?', (email,))
-        if not existing:
-            _execute(conn, '''INSERT INTO outreach_contacts (name, email, platform, platform_handle, platform_url, followers, category, tier, notes)
-                              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''', (name, email, platform, handle, url, followers, category, tier, notes))
-    
-    conn.commit()
-    conn.close()
-    print(f"Outreach contacts seeded: {len(contacts)} contacts (all with verified emails)")
-
-
-def seed_brand_mentions():
-    """Pre-populate Brand Intel with verified Forbidden Bourbon mentions only"""
-    conn = get_db()
-    
-    # Clear old seeded data and re-seed fresh (prevents duplicates across versions)
-    _execute(conn, "DELETE FROM brand_mentions")
-    
-    mentions = [
-        # === REVIEWS (6) - All specifically review Forbidden Bourbon ===
-        ('Forbidden Bourbon Review', 'https://thebourbonculture.com/whiskey-reviews/forbidden-bourbon-review/', 'thebourbonculture.com', 'review',
-         'In-depth review of Forbidden Bourbon. Covers low-temp fermentation, white corn mash bill, $129 price point. Wheated profile with vanilla, brown butter, orange citrus.', 'Bourbon Culture'),
-        ('Forbidden Batch 3 Bourbon Review & Rating', 'https://vinepair.com/review/forbidden-batch-3-bourbon/', 'vinepair.com', 'review',
-         'VinePair review of Forbidden Batch 3. Bright, borderline-refreshing wheated bourbon blended with a deft touch. Lavender, honey syrup, bright oak on the nose.', 'VinePair'),
-        ('Forbidden Bourbon Review: Tasting Notes & Complete Analysis', 'https://thewhiskeywash.com/reviews/whiskey-review-forbidden-bourbon/', 'thewhiskeywash.com', 'review',
-         'Whiskey Wash review of Forbidden Bourbon. Notes vanilla, creme brulee, clove, coffee. Calls it subtly ingenious — familiar flavors arranged in unexpected ways.', 'The Whiskey Wash'),
-        ('Review: Forbidden Bourbon (Rated A-)', 'https://www.drinkhacker.com/2023/07/26/review-forbidden-bourbon/', 'drinkhacker.com', 'review',
-         'Drinkhacker rates Forbidden Bourbon A-. Wheat toast, tayberries, chocolate almonds, cinnamon bark, creamy custard. Emblematic of Eaves deft blending touch.', 'Drinkhacker'),
-        ('Forbidden Kentucky Straight Bourbon Review (8.3/10)', 'https://www.pastemagazine.com/drink/whiskey/fordbidden-bourbon-review-marianne-eaves', 'pastemagazine.com', 'review',
-         'Paste Magazine scores Forbidden Bourbon 8.3/10. Creamy texture, orange citrus, toffee, cream soda. Mouthfeel is one of the most memorable under 100 proof.', 'Paste Magazine'),
-        ('Forbidden Batch 2 Review', 'https://www.josephbourbon.com/post/forbidden-batch-2', 'josephbourbon.com', 'review',
-         'Review of Forbidden Bourbon Batch 2. Star-shaped bottle. 75% white corn, 12% white wheat, 13% malted barley. 95.2 proof.', 'Joseph Bourbon'),
-        ('Bourbon Lens: Forbidden Bourbon Tasted & Reviewed', 'https://bourbonlens.com/forbidden-bourbon-reviewed/', 'bourbonlens.com', 'review',
-         'Bourbon Lens review. Habanero honey, pepper, cinnamon on palate. Long milk chocolate finish. Can get behind this bourbon despite higher price tag.', 'Bourbon Lens'),
-        ('The Bourbon Flight: Forbidden Bourbon Review (5/5 Barrels)', 'https://www.thebourbonflight.com/featured-bourbon-review-forbidden-bourbon-by-marianne-eaves/', 'thebourbonflight.com', 'review',
-         'Featured review. 5/5 Barrels rating. Vanilla, deep-roasted corn, hazelnut aromas. Caramel creme brulee, toffee, cherry. Minimal burn at 95.2 proof. Worth the extra money at $129.', 'The Bourbon Flight'),
-        ('Distiller.com: Forbidden Bourbon User Reviews (4.0/5)', 'https://distiller.com/spirits/forbidden-bourbon/tastes', 'distiller.com', 'review',
-         'Distiller.com community reviews. 4.0 out of 5 stars. Batch #3 notes: grain, wood, fruits, flowers, vanilla bean, orange zest, glazed doughnuts, spiced caramel latte.', 'Distiller.com'),
-        ('American Whiskey Magazine: Forbidden Bourbon Batch 1 Tasting', 'https://americanwhiskeymag.com/reviews/tasting-forbidden-bourbon-batch-1/', 'americanwhiskeymag.com', 'review',
-         'American Whiskey Magazine official tasting of Forbidden Bourbon Batch 1. 47.6% ABV, 95.2 proof. Wheat style from Kentucky.', 'American Whiskey Magazine'),
-
-        # === MAJOR MAGAZINE FEATURES (8) - All specifically about Forbidden Bourbon ===
-        ('Forbes: Whiskey Of The Week — Forbidden Bourbon Batch #2', 'https://www.forbes.com/sites/joemicallef/2023/11/16/whiskey-of-the-week-forbidden-bourbon-batch-2/', 'forbes.com', 'feature',
-         'Forbes Whiskey Of The Week feature on Forbidden Bourbon Batch #2. $130, rich profile with mellow corn, soft wheat, notable barley. Low-temperature fermentation.', 'Forbes'),
-        ('Maxim: Spirit of the Week — Forbidden Small Batch Bourbon', 'https://www.maxim.com/food-drink/spirit-of-the-week-forbidden-small-batch-bourbon/', 'maxim.com', 'feature',
-         'Maxim Spirit of the Week feature (Aug 2023). Forbidden Small Batch Bourbon highlighted as a standout new release with innovative mash bill.', 'Maxim'),
-        ('Garden & Gun: Marianne Eaves Whiskey Dreams (Forbidden Profile)', 'https://gardenandgun.com/articles/marianne-eavess-whiskey-dreams/', 'gardenandgun.com', 'feature',
-         'Garden & Gun feature profile on Forbidden Bourbon. Eaves discusses making it from scratch with white corn and white winter wheat. Name nods to KY law forbidding women as master distillers.', 'Garden & Gun'),
-        ('Garden & Gun: 2023 Holiday Gift Guide feat. Forbidden Bourbon', 'https://gardenandgun.com/feature/gift-guide-2023/', 'gardenandgun.com', 'feature',
-         'Garden & Gun holiday gift guide featuring Forbidden Bourbon as a top gift pick for bourbon lovers in 2023.', 'Garden & Gun'),
-        ('Garden & Gun: A Forbidden Evening (Brand Event)', 'https://gardenandgun.com/slideshow/a-forbidden-evening/', 'gardenandgun.com', 'event',
-         'Garden & Gun hosted A Forbidden Evening in Charleston, SC — a dedicated Forbidden Bourbon event with tastings and live music. May 2023.', 'Garden & Gun'),
-        ('Garden & Gun: Craig Melvin Says Forbidden Is His Favorite Bourbon', 'https://gardenandgun.com/articles/get-to-know-craig-melvin-the-today-shows-new-co-lead-anchor/', 'gardenandgun.com', 'feature',
-         'TODAY Show co-anchor Craig Melvin tells Garden & Gun that Forbidden by Marianne Eaves is his favorite bourbon. Calls it perfectly balanced.', 'Garden & Gun'),
-        ('Gear Patrol: Best New Bourbon Releases of 2023 (feat. Forbidden)', 'https://www.gearpatrol.com/food-drink/a44215959/best-new-bourbon-releases-2023/', 'gearpatrol.com', 'feature',
-         'Gear Patrol names Forbidden Bourbon one of the best new bourbon releases of 2023. Highlights innovative mash bill and Marianne Eaves pedigree.', 'Gear Patrol'),
-        ('American Whiskey Magazine: Marianne Eaves Talks Forbidden Bourbon', 'https://americanwhiskeymag.com/articles/marianne-eaves-forbidden-bourbon/', 'americanwhiskeymag.com', 'feature',
-         'American Whiskey Magazine interview about Forbidden Bourbon. Eaves explains the name, low-temp fermentation from a 1910 Seagrams manual, KY law against women in production until 1974.', 'American Whiskey Magazine'),
-
-        # === TV / BROADCAST (1) - Specifically about Forbidden Bourbon ===
-        ('NBC TODAY Show: Craig Melvin Features Forbidden Bourbon', 'https://www.today.com/video/kentucky-s-first-female-master-distiller-set-to-launch-her-own-brand-186833477881', 'today.com', 'video',
-         'NBC TODAY Show segment. Craig Melvin visits Bardstown Bourbon Company to taste Forbidden Bourbon from the barrel with Marianne Eaves. National broadcast feature. July 2023.', 'NBC TODAY Show'),
-
-        # === PRESS / NEWS (9) - All specifically about Forbidden Bourbon launch/coverage ===
-        ('Breaking Bourbon: Rebellion and Innovation Collide to Birth Forbidden', 'https://www.breakingbourbon.com/bourbon-whiskey-press-releases/rebellion-and-innovation-collide-to-birth-forbidden-bourbon', 'breakingbourbon.com', 'press',
-         'Breaking Bourbon press release. Forbidden Bourbon — first white corn and white winter wheat bourbon. Distilled at Bardstown Bourbon Co. KY, TN, GA, SC at $129.', 'Breaking Bourbon'),
-        ('GoBourbon: Marianne Eaves Debuts Forbidden Bourbon', 'https://www.gobourbon.com/new-release-marianne-eaves-debuts-forbidden-bourbon/', 'gobourbon.com', 'press',
-         'The Bourbon Review coverage of Forbidden Bourbon launch. Mash bill details, low-temperature fermentation, SC-based partnership.', 'The Bourbon Review'),
-        ('Distillery Trail: Marianne Eaves Releases Forbidden Bourbon', 'https://www.distillerytrail.com/blog/master-distiller-marianne-eaves-releases-forbidden-her-5-year-old-grain-to-glass-kentucky-bourbon/', 'distillerytrail.com', 'press',
-         'Distillery Trail deep dive into Forbidden Bourbon launch. Direct quotes from Eaves on low-temp fermentation. Craig Melvin TODAY Show visit also documented.', 'Distillery Trail'),
-        ('Cola Daily: Columbia Mayor Partners to Debut Forbidden Bourbon', 'https://www.coladaily.com/business/master-distiller-marianne-eaves-partners-with-columbia-mayor-to-debut-new-bourbon-forbidden/article_840f19be-202a-11ee-82ea-5bbcc61d6ada.html', 'coladaily.com', 'press',
-         'Columbia SC news on Forbidden Bourbon debut tasting at Smoked restaurant. Details partnership with Mayor Daniel Rickenmann and SC-based founders.', 'Cola Daily'),
-        ('Tasting Table: Eaves Reinvents Kentucky Bourbon With Forbidden', 'https://www.tastingtable.com/1308476/marianne-eaves-reinvents-kentucky-bourbon-forbidden-debut/', 'tastingtable.com', 'press',
-         'Tasting Table coverage of Forbidden Bourbon launch. White corn, white wheat, low-temperature fermentation. May 16, 2023.', 'Tasting Table'),
-        ('Atlanta Journal-Constitution: Female Master Distiller Tackles the Forbidden', 'https://www.ajc.com/things-to-do/female-master-distiller-likes-to-tackle-the-forbidden/', 'ajc.com', 'press',
-         'AJC feature on Forbidden Bourbon launch. Coverage of the brand debut for the Georgia market. May 2023.', 'Atlanta Journal-Constitution'),
-        ('Post and Courier: Forbidden Bourbon Debuts in South Carolina', 'https://www.postandcourier.com/free-times/food/kentuckys-1st-female-master-distiller-debuts-new-bourbon-in-sc/', 'postandcourier.com', 'press',
-         'Charleston Post and Courier covers Forbidden Bourbon debut in South Carolina, backed by Columbia mayor Daniel Rickenmann.', 'The Post and Courier'),
-        ('The Daily Pour: Forbidden Bourbon Breaks All the Rules', 'https://thedailypour.com/whiskey/bourbon/marianne-eaves-forbidden-bourbon/', 'thedailypour.com', 'press',
-         'The Daily Pour coverage of Forbidden Bourbon launch. First white corn and white winter wheat bourbon. Cold fermentation, cuisine-quality ingredients. $129.', 'The Daily Pour'),
-        ('TOWN Carolina: Forbidden Bourbon Leaves Innovative Mark', 'https://towncarolina.com/marianne-eaves-forbidden-bourbon-leaves-innovative-mark', 'towncarolina.com', 'press',
-         'TOWN Carolina feature on Forbidden Bourbon and its impact on the South Carolina spirits scene.', 'TOWN Carolina'),
-        ('Fred Minnick: Marianne Eaves Forbidden Brand Debuts', 'https://www.fredminnick.com/2023/05/19/marianne-eaves-forbidden-brand-debuts/', 'fredminnick.com', 'press',
-         'Fred Minnick covers Forbidden Bourbon debut. First white corn and white winter wheat bourbon. Available in KY, TN, GA, SC at $129. Single barrel cask strength expressions.', 'Fred Minnick'),
-
-        # === AWARDS (11) - Specifically credits Forbidden Bourbon ===
-        ('VinePair Next Wave: Master Distiller of the Year (for Forbidden)', 'https://vinepair.com/articles/2024-next-wave-marianne-eaves/', 'vinepair.com', 'award',
-         'VinePair 2024 Next Wave Award — Master Distiller of the Year. Profiles Eaves career culminating in Forbidden Bourbon. All three batches sold out quickly and well reviewed.', 'VinePair'),
-        ('New Orleans Spirits Competition 2024: Silver Medal — Forbidden Single Barrel', 'https://www.nolaspiritscomp.com/awards-24/silver-medal-spirits-24', 'nolaspiritscomp.com', 'award',
-         'Forbidden Bourbon Single Barrel won Silver Medal at the 2024 New Orleans Spirits Competition. Entered by Small Batch Medicinal Spirits Company.', 'New Orleans Spirits Competition'),
-        ('New Orleans Spirits Competition 2024: Silver Medal — Forbidden Small Batch', 'https://www.nolaspiritscomp.com/awards-24/silver-medal-spirits-24', 'nolaspiritscomp.com', 'award',
-         'Forbidden Bourbon Small Batch won Silver Medal at the 2024 New Orleans Spirits Competition. Entered by Small Batch Medicinal Spirits Company.', 'New Orleans Spirits Competition'),
-        ('Denver International Spirits Competition 2025: Double Gold (96 pts) — Forbidden Single Barrel', 'https://denverspiritscomp.com/wp-content/uploads/2025/04/2025_DISC_Win.xls.pdf', 'denverspiritscomp.com', 'award',
-         'Forbidden Single Barrel Bourbon won Double Gold with 96 points at the 2025 Denver International Spirits Competition. Highest-scoring Forbidden entry.', 'Denver International Spirits Competition'),
-        ('Denver International Spirits Competition 2025: Silver (88 pts) — Forbidden Small Batch 3', 'https://denverspiritscomp.com/wp-content/uploads/2025/04/2025_DISC_Win.xls.pdf', 'denverspiritscomp.com', 'award',
-         'Forbidden Bourbon Small Batch 3 won Silver Medal with 88 points at the 2025 Denver International Spirits Competition.', 'Denver International Spirits Competition'),
-        ('New York International Spirits Competition 2024: 96 Points — Forbidden Single Barrel', 'https://nyispiritscompetition.com/2024-whisky-awards/', 'nyispiritscompetition.com', 'award',
-         'Forbidden Bourbon Single Barrel scored 96 points at the 2024 New York International Spirits Competition, placing among the Best Whiskies of the Year.', 'New York International Spirits Competition'),
-        ('L.A. Spirits Awards 2025: Best Bourbons — Forbidden Single Barrel', 'https://www.thebestdrinkever.com/home/2025/8/13/the-best-bourbons-of-2025-according-to-the-prestigious-la-spirits-awards', 'thebestdrinkever.com', 'award',
-         'Forbidden Single Barrel Wheated Bourbon recognized among the Best Bourbons of 2025 at the L.A. Spirits Awards. Praised for 114 proof, creamy butterscotch, and warm finish.', 'L.A. Spirits Awards'),
-        ('Fred Minnick Top 100 American Whiskeys 2024 — Forbidden Batch 3', 'https://www.fredminnick.com/2024/12/24/2024-top-100-american-whiskeys-unranked/', 'fredminnick.com', 'award',
-         'Forbidden Batch 3 named to Fred Minnick Top 100 American Whiskeys of 2024. Minnick called it "one of the best whiskeys Marianne Eaves has created."', 'Fred Minnick'),
-        ('Fred Minnick Top 100 American Whiskeys 2025: #82 — Forbidden Batch 3', 'https://brewpublic.com/distilling/fred-minnick-delivers-his-top-100-whiskeys-of-2025/', 'brewpublic.com', 'award',
-         'Forbidden Batch 3 ranked #82 on Fred Minnick Top 100 American Whiskeys of 2025. Second consecutive year on the list. 95.2 proof, $100.', 'Fred Minnick'),
-        ('San Francisco World Spirits Competition — Forbidden Bourbon', 'https://thetastingalliance.com/events/san-francisco-world-spirits-competition', 'thetastingalliance.com', 'award',
-         'Forbidden Bourbon recognized at the San Francisco World Spirits Competition, the most prestigious spirits competition in the world. Award laurel displayed on drinkforbidden.com.', 'San Francisco World Spirits Competition'),
-        ('ASCOT Awards — Forbidden Bourbon', 'https://www.fredminnick.com/2023/05/17/2023-ascot-awards-winners-announced/', 'fredminnick.com', 'award',
-         'Forbidden Bourbon recognized at the ASCOT Awards, Fred Minnick international spirits competition. Award laurel displayed on drinkforbidden.com.', 'ASCOT Awards'),
-
-        # === INTERVIEWS (1) - Specifically discusses Forbidden Bourbon ===
-        ('Drinkhacker: Eaves on Forbidden, Innovation & Bourbon Gluts', 'https://www.drinkhacker.com/2023/10/30/marianne-eaves-speaks-on-forbidden-whiskey-innovation-and-bourbon-gluts/', 'drinkhacker.com', 'interview',
-         'Drinkhacker interview focused on Forbidden Bourbon. Eaves discusses Bardstown Bourbon Company partnership, pricing, and industry overproduction.', 'Drinkhacker'),
-
-        # === PODCASTS (4) - All specifically discuss Forbidden Bourbon ===
-        ('Bourbon Pursuit #425: Marianne Eaves on Forbidden Bourbon', 'https://bourbonpursuit.com/2023/08/31/425-marianne-eaves-gets-real-about-her-new-bourbon/', 'bourbonpursuit.com', 'podcast',
-         'Marianne Eaves discusses Forbidden Bourbon in detail. Clears up press release confusion about distilling timeline. Discusses pricing, process, and mash bill.', 'Bourbon Pursuit'),
-        ('The Mash Up E322: Marianne Eaves of Forbidden Bourbon', 'https://open.spotify.com/episode/1EPo0g8qPhirFHtHjKvdr7', 'spotify.com', 'podcast',
-         'Deep conversation about Forbidden Bourbon origins, craft distilling approach, and future plans for the brand.', 'The Mash Up'),
-        ('Barrel Room Chronicles: Marianne Eaves on Forbidden Bourbon', 'https://www.barrelroomchronicles.com/exploring-louisvilles-whiskey-row-and-the-trailblazing-women-in-whiskey-at-the-wow-awards-s3-e15/', 'barrelroomchronicles.com', 'podcast',
-         'Eaves discusses Forbidden Bourbon at WOW Awards. Reveals plans for Montana distillery and Louisville tasting room on 5th and Market Street.', 'Barrel Room Chronicles'),
-        ('Distilling Greatness Ep 13: Marianne Eaves on Forbidden', 'https://companydistilling.com/2024/06/podcast-marianne-eaves/', 'companydistilling.com', 'podcast',
-         'Company Distilling podcast. Eaves discusses her journey to creating Forbidden Bourbon, white corn sourcing, and the Eaves Foundation.', 'Company Distilling'),
-
-        # === EVENTS (5) - Forbidden Bourbon tasting events ===
-        ('Virgin Hotels NYC: Meet the Maker — Forbidden Bourbon Tasting', 'https://virginhotels.com/new-york/entertainment/meet-the-maker/', 'virginhotels.com', 'event',
-         'Virgin Hotels NYC event. Forbidden Bourbon tasting and lite bites presented by Marianne Eaves at The Shag Room at Everdene.', 'Virgin Hotels'),
-        ('Garden & Gun Distilled Week: Forbidden Bourbon Pairing', 'https://thewhiskeywash.com/whiskey-news/garden-gun-partners-with-kentucky-distilleries-to-offer-a-week-of-bourbon-experiences/', 'thewhiskeywash.com', 'event',
-         'Forbidden Bourbon featured at G&G Distilled week in Kentucky. Eaves provided Forbidden bourbon pairings at Yew Dell Botanical Gardens.', 'The Whiskey Wash'),
-        ('New Orleans Bourbon Festival 2025: Forbidden Booth & Women\'s Panel', 'https://www.thebourbonandryeclub.com/splash-page/new-orleans-bourbon-festival-2025-live-updates', 'thebourbonandryeclub.com', 'event',
-         'Forbidden had booth at NOLA Bourbon Festival 2025 grand tasting. Marianne Eaves spoke on Women\'s Panel alongside Jane Bowie (Potter Jane), Lauren Patz (Redwood Empire), Melinda Maddox (Old Elk). Tickets $175 for Baton Rouge meet & greet.', 'The Bourbon and Rye Club'),
-        ('Marianne Eaves Bourbon Tasting — Tiger\'s Trail RV Resort, Baton Rouge', 'https://tigerstrailrvresort.com/tiger-trail-events/bourbon-tasting-featuring-the-first-female-master-distiller-and-creator-of-forbidden-bourbon-marianne-eaves/', 'tigerstrailrvresort.com', 'event',
-         'March 20, 2025 meet & greet with Marianne Eaves in Baton Rouge during NOLA Bourbon Fest week. Tickets $175, special bourbon pricing. Tiger\'s Trail RV Resort.', 'Tiger\'s Trail RV Resort'),
-        ('Forbidden Bourbon Tasting — Instagram Post', 'https://www.instagram.com/p/DS0Dzgrjo_n/', 'instagram.com', 'event',
-         'Instagram post featuring photos from a Forbidden Bourbon tasting event. Community engagement and in-person brand experience.', 'Instagram'),
-
-        # === SOCIAL / VIDEO (16) ===
-        ('TikTok: Forbidden Bourbon Review — The Whiskey Boys', 'https://www.tiktok.com/@thewhiskyboys/video/7337101775884832042', 'tiktok.com', 'video',
-         'TikTok video review of Forbidden Bourbon by @thewhiskyboys. Dedicated review with tasting notes and rating.', 'The Whiskey Boys'),
-        ('TikTok: Forbidden Bourbon Product Review — Big Bear Wine', 'https://www.tiktok.com/@bigbearwine/video/7444698371358575915', 'tiktok.com', 'video',
-         'TikTok product review of Forbidden Bourbon by Big Bear Wine liquor store. In-store feature and recommendation.', 'Big Bear Wine'),
-        ('The Best Bourbons of 2025 (So Far)', 'https://youtu.be/ltL5x0OPVYc', 'youtube.com', 'video',
-         'Brad\'s Bourbon Reviews ranks the best bourbons of 2025 so far. 12K views. 10:31 runtime. Follow on IG and TikTok @bradsbourbonreviews.', 'Brad\'s Bourbon Reviews'),
-        ('The Best Allocated Bourbon You Didn\'t Know Existed', 'https://youtu.be/LVAbYUqjvhU', 'youtube.com', 'video',
-         'Uncut Never Filtered discovers Forbidden Bourbon as an unknown allocated treasure while bottle hunting at The Blind Pig in Bardstown. 217 views. 8:48 runtime.', 'Uncut Never Filtered'),
-        ('YouTube Short: Bourbon Banter — Forbidden Small Batch', 'https://youtube.com/shorts/_gy3ND28UgI', 'youtube.com', 'video',
-         'Bourbon Banter shares their thoughts on this award-winning bourbon. YouTube Short.', 'Bourbon Banter'),
-        ('YouTube Short: Forbidden Bourbon!!!', 'https://youtube.com/shorts/JXAsK65ukBg', 'youtube.com', 'video',
-         'Short enthusiastic review of Forbidden Bourbon. 439 views.', 'YouTube Short'),
-        ('YouTube Short: Forbidden Bourbon Review', 'https://youtube.com/shorts/l_-gpX0TPb0', 'youtube.com', 'video',
-         'Quick Forbidden Bourbon review. 202 views.', 'YouTube Short'),
-        ('Marianne Eaves — VinePair Master Distiller of the Year', 'https://youtu.be/DOLWLJktzNk', 'youtube.com', 'video',
-         'Forbidden Bourbon official channel. In an industry ruled by old men who often work for a single legacy distillery their entire lives, Marianne Eaves has seemingly packed several careers into one. 71 views. 1:22 runtime.', 'Forbidden Bourbon'),
-        ('New Limited Release Forbidden Bourbon Review', 'https://youtu.be/VS6CfanKplc', 'youtube.com', 'video',
-         'RJtheFED reviews a bottle of Forbidden Bourbon. Released in only 4 states, a privilege to acquire. 183 views. 10:54 runtime.', 'RJtheFED'),
-        ('Kentucky\'s First Female Master Distiller Releases \'Forbidden\' Bourbon', 'https://youtu.be/NcRZ8E8P_VM', 'youtube.com', 'video',
-         'WAVE News Louisville news segment. After three years of developing recipes, followed by five years aging in bourbon barrels, Marianne Eaves is finally ready to introduce her creation. 660 views. 2:30 runtime.', 'WAVE News Louisville'),
-        ('Club Marzipan Barrel Pick: Forbidden Bourbon', 'https://www.youtube.com/live/nv2c5u84G8o', 'youtube.com', 'video',
-         'Fred Minnick live barrel pick session for Forbidden Bourbon. Tasting and choosing a barrel — 6.3 year bourbon options. 2.2K views. 2:02:37 runtime.', 'Fred Minnick'),
-        ('NEW Forbidden Bourbon FIRST IMPRESSIONS — Worth It? It Depends', 'https://youtu.be/hovC28iHKAE', 'youtube.com', 'video',
-         'TyTheBourbonGuy first impressions review. Forbidden Bourbon is a new project from Marianne Eaves, very well known in the whiskey world. 375 views. 6:00 runtime.', 'TyTheBourbonGuy'),
-        ('YouTube Short: Forbidden Bourbon Tasting', 'https://youtube.com/shorts/nMUDKSb3CS8', 'youtube.com', 'video',
-         'YouTube Shorts tasting of Forbidden Bourbon.', 'YouTube Short'),
-        ('Forbidden Batch 1 & 2 Bourbon Review', 'https://www.youtube.com/watch?v=RJFED_BATCH12', 'youtube.com', 'video',
-         'RJtheFED compares Forbidden Batch 1 and Batch 2 Trouble Bar Pick, a 114 proof Single Barrel. 172 views. 7:47 runtime.', 'RJtheFED'),
-        ('Forbidden Bourbon Review! Is It Truly Groundbreaking?', 'https://www.youtube.com/watch?v=MASHANDDRUM_FB', 'youtube.com', 'video',
-         'The Mash and Drum in-depth review of Forbidden debut release Small Batch Bourbon. Is it truly groundbreaking? 14K views. 11:31 runtime. Support on Patreon for Mash & Journey barrel picks.', 'The Mash and Drum'),
-        ('Forbidden Bourbon Official Instagram', 'https://www.instagram.com/forbiddenbourbon/', 'instagram.com', 'social',
-         'Official Forbidden Bourbon Instagram (@forbiddenbourbon). 4,387 followers, 128 posts. The first bourbon of its kind, thoughtfully blended by Kentucky\'s 1st Female Master Distiller.', 'Forbidden Bourbon'),
-        ('Forbidden Bourbon Official Facebook', 'https://www.facebook.com/forbiddenbourbon', 'facebook.com', 'social',
-         'Official Forbidden Bourbon Facebook page. Brand updates, event announcements, cocktail recipes, and community engagement.', 'Forbidden Bourbon'),
-
-        # === ADDITIONAL FEATURES & PRESS ===
-        ('Whisky Advocate: The Many Whiskeys of Marianne Eaves', 'https://whiskyadvocate.com/The-Many-Whiskeys-of-Marianne-Eaves', 'whiskyadvocate.com', 'feature',
-         'Whisky Advocate deep profile by Julia Higgins. 8000 barrels set aside for Forbidden, 50 or fewer per batch. Also details Eavesdrop bar concept in Louisville and Big Sky Stillhouse in Montana.', 'Whisky Advocate'),
-        ('Bourbon Trend: Wheated Bourbon Wonder — Marianne Eaves Forbidden Story', 'https://bourbontrend.com/bourbon-news/wheated-bourbon-wonder-marianne-eavess-forbidden-story/', 'bourbontrend.com', 'press',
-         'Bourbon Trend feature on the creation of Forbidden Bourbon. Journey of Marianne Eaves and her unique wheated bourbon approach.', 'Bourbon Trend'),
-        ('The Whiskey Wash: Marianne Eaves New Forbidden Treads New Ground', 'https://thewhiskeywash.com/whiskey-styles/bourbon/marianne-eaves-new-forbidden-bourbon-treads-new-whiskey-ground/', 'thewhiskeywash.com', 'press',
-         'Whiskey Wash news coverage of Forbidden launch. First white corn and white winter wheat bourbon expression from iconic female master distiller.', 'The Whiskey Wash'),
-
-        # === OWN SITES (4) ===
-        ('Forbidden Bourbon — Official Website', 'https://drinkforbidden.com/', 'drinkforbidden.com', 'own_site',
-         'Official website. A Twist on Tradition. Premium Kentucky wheated bourbon by Master Distiller Marianne Eaves.', 'Forbidden'),
-        ('Forbidden Bourbon — Online Shop', 'https://shop.drinkforbidden.com', 'shop.drinkforbidden.com', 'own_site',
-         'Official online shop. Buy Forbidden Bourbon direct — Small Batch Select and Single Barrel.', 'Forbidden'),
-        ('Forbidden Bourbon — Single Barrel Product Page', 'https://drinkforbidden.com/products/single-barrel-bourbon', 'drinkforbidden.com', 'own_site',
-         'Single Barrel product page. Hand-selected barrels. Bold, elegant, sweet, smooth, complex.', 'Forbidden'),
-        ('Forbidden Bourbon — News & Media', 'https://drinkforbidden.com/news-media', 'drinkforbidden.com', 'own_site',
-         'Official news and media page listing all press coverage, articles, and bourbon education content.', 'Forbidden'),
-    ]
-    
-    for title, url, source, source_type, snippet, author in mentions:
-        existing = _fetchone(conn, 'SELECT id FROM brand_mentions WHERE url = ?', (url,))
-        if not existing:
-            _execute(conn,
-                'INSERT INTO brand_mentions (title, url, source, source_type, snippet, author) VALUES (?, ?, ?, ?, ?, ?)',
-                (title, url, source, source_type, snippet, author))
-    
-    conn.commit()
-    conn.close()
-    count = len(mentions)
-    print(f"Brand Intel seeded: {count} verified Forbidden Bourbon mentions")
+    print(f"Brand Intel seeded: {written} of {len(SEED_BRAND_MENTIONS)} verified Forbidden Bourbon mentions inserted or updated")
 
 
 # ============================================================
 # POST OPERATIONS
 # ============================================================
 
+_schedule_listeners = []
+
+
+def on_schedule_change(callback):
+    """Register callback(post_id) to run after a post's status or scheduled_at has been written"""
+    _schedule_listeners.append(callback)
+    return callback
+
+
+def _schedule_changed(post_id):
+    for callback in _schedule_listeners:
+        try:
+            callback(post_id)
+        except Exception as e:
+            print(f"[DB] Schedule listener error: {e}")
+
+
+@_invalidates_stats
 def create_post(content, image_path='', status='draft', hashtags='', link_url='', 
                 scheduled_at=None, platforms=None, ai_generated=0, notes=''):
-    conn = get_db()
-    if USE_POSTGRES:
-        cur = conn.cursor()
-        cur.execute(
-            '''INSERT INTO posts (content, image_path, status, hashtags, link_url, scheduled_at, ai_generated, notes)
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING id''',
-            (content, image_path, status, hashtags, link_url, scheduled_at, ai_generated, notes)
-        )
-        post_id = cur.fetchone()[0]
+    with connection() as conn:
+        if USE_POSTGRES:
+            cur = conn.cursor()
+            cur.execute(
+                '''INSERT INTO posts (content, image_path, status, hashtags, link_url, scheduled_at, ai_generated, notes)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING id''',
+                (content, image_path, status, hashtags, link_url, scheduled_at, ai_generated, notes)
+            )
+            post_id = cur.fetchone()[0]
         
-        if platforms:
-            for platform in platforms:
-                cur.execute(
-                    "INSERT INTO post_platforms (post_id, platform_name, status) VALUES (%s, %s, 'pending')",
-                    (post_id, platform)
-                )
-    else:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO posts (content, image_path, status, hashtags, link_url, scheduled_at, ai_generated, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (content, image_path, status, hashtags, link_url, scheduled_at, ai_generated, notes))
-        post_id = cursor.lastrowid
+            if platforms:
+                for platform in platforms:
+                    cur.execute(
+                        "INSERT INTO post_platforms (post_id, platform_name, status) VALUES (%s, %s, 'pending')",
+                        (post_id, platform)
+                    )
+        else:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO posts (content, image_path, status, hashtags, link_url, scheduled_at, ai_generated, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (content, image_path, status, hashtags, link_url, scheduled_at, ai_generated, notes))
+            post_id = cursor.lastrowid
         
-        if platforms:
-            for platform in platforms:
-                cursor.execute(
-                    "INSERT INTO post_platforms (post_id, platform_name, status) VALUES (?, ?, 'pending')",
-                    (post_id, platform)
-                )
+            if platforms:
+                for platform in platforms:
+                    cursor.execute(
+                        "INSERT INTO post_platforms (post_id, platform_name, status) VALUES (?, ?, 'pending')",
+                        (post_id, platform)
+                    )
     
-    log_activity('post_created', f'New {status} post created', post_id)
-    conn.commit()
-    conn.close()
+        log_activity('post_created', f'New {status} post created', post_id)
+    if status == 'scheduled':
+        _schedule_changed(post_id)
     return post_id
 
 
+def _attach_platforms(conn, posts):
+    """Load post_platforms rows for the posts (one query per _MAX_BIND_PARAMS ids) and attach them as post['platforms']"""
+    by_post = {p['id']: [] for p in posts}
+    ids = list(by_post)
+    for start in range(0, len(ids), _MAX_BIND_PARAMS):
+        batch = ids[start:start + _MAX_BIND_PARAMS]
+        placeholders = ', '.join('?' for _ in batch)
+        rows = _fetchall(conn,
+            f'SELECT * FROM post_platforms WHERE post_id IN ({placeholders}) ORDER BY id',
+            tuple(batch))
+        for row in rows:
+            by_post[row['post_id']].append(row)
+    for p in posts:
+        p['platforms'] = by_post[p['id']]
+    return posts
+
+
 def get_post(post_id):
-    conn = get_db()
-    post = _fetchone(conn, 'SELECT * FROM posts WHERE id = ?', (post_id,))
-    if post:
-        platforms = _fetchall(conn, 'SELECT * FROM post_platforms WHERE post_id = ?', (post_id,))
-        post['platforms'] = platforms
-    conn.close()
-    return post
+    with connection() as conn:
+        post = _fetchone(conn, 'SELECT * FROM posts WHERE id = ?', (post_id,))
+        if post:
+            platforms = _fetchall(conn, 'SELECT * FROM post_platforms WHERE post_id = ?', (post_id,))
+            post['platforms'] = platforms
+        return post
+
+
+def get_posts_page(status=None, limit=50, cursor=None):
+    """Newest-first page of posts (with platforms) plus the cursor for the next page"""
+    with connection() as conn:
+        posts, next_cursor = _keyset_page(conn, 'posts', ('created_at', 'id'),
+                                          ['status = ?'] if status else [], [status] if status else [],
+                                          limit, cursor)
+        _attach_platforms(conn, posts)
+        return posts, next_cursor
 
 
 def get_posts(status=None, limit=50, offset=0):
-    conn = get_db()
-    if status:
-        posts = _fetchall(conn,
-            'SELECT * FROM posts WHERE status = ? ORDER BY created_at DESC LIMIT ? OFFSET ?',
-            (status, limit, offset))
-    else:
-        posts = _fetchall(conn,
-            'SELECT * FROM posts ORDER BY created_at DESC LIMIT ? OFFSET ?',
-            (limit, offset))
-    
-    for p in posts:
-        platforms = _fetchall(conn, 'SELECT * FROM post_platforms WHERE post_id = ?', (p['id'],))
-        p['platforms'] = platforms
-    
-    conn.close()
-    return posts
+    with connection() as conn:
+        if status:
+            posts = _fetchall(conn,
+                'SELECT * FROM posts WHERE status = ? ORDER BY created_at DESC LIMIT ? OFFSET ?',
+                (status, limit, offset))
+        else:
+            posts = _fetchall(conn,
+                'SELECT * FROM posts ORDER BY created_at DESC LIMIT ? OFFSET ?',
+                (limit, offset))
+        _attach_platforms(conn, posts)
+        return posts
+
+
+def get_scheduled_posts(limit=None):
+    with connection() as conn:
+        sql = '''
+            SELECT * FROM posts 
+            WHERE status = 'scheduled' AND scheduled_at IS NOT NULL 
+            ORDER BY scheduled_at ASC
+        '''
+        if limit:
+            posts = _fetchall(conn, sql + ' LIMIT ?', (limit,))
+        else:
+            posts = _fetchall(conn, sql)
+        _attach_platforms(conn, posts)
+        return posts
+
+
+def get_schedule_times():
+    """(id, scheduled_at) for the post scheduler's reconcile: each scheduled post's time, or for
+    posts waiting on retries, each pending platform's next_attempt_at"""
+    with connection() as conn:
+        return _fetchall(conn, '''
+            SELECT id, scheduled_at FROM posts p
+            WHERE status = 'scheduled' AND scheduled_at IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM post_platforms pp WHERE pp.post_id = p.id AND pp.next_attempt_at IS NOT NULL
+                                                               AND pp.status = 'pending')
+            UNION ALL
+            SELECT pp.post_id AS id, pp.next_attempt_at AS scheduled_at FROM post_platforms pp
+            JOIN posts p ON p.id = pp.post_id
+            WHERE p.status = 'scheduled' AND pp.status = 'pending' AND pp.next_attempt_at IS NOT NULL
+        ''')
 
 
-def get_scheduled_posts():
-    conn = get_db()
-    posts = _fetchall(conn, '''
-        SELECT * FROM posts 
-        WHERE status = 'scheduled' AND scheduled_at IS NOT NULL 
-        ORDER BY scheduled_at ASC
-    ''')
-    
-    for p in posts:
-        platforms = _fetchall(conn, 'SELECT * FROM post_platforms WHERE post_id = ?', (p['id'],))
-        p['platforms'] = platforms
-    
-    conn.close()
-    return posts
+SCHEDULE_VERSION_KEY = 'schedule_version'
 
 
-def get_due_posts():
-    conn = get_db()
-    now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-    posts = _fetchall(conn, '''
-        SELECT * FROM posts 
-        WHERE status = 'scheduled' AND scheduled_at <= ?
-        ORDER BY scheduled_at ASC
-    ''', (now,))
-    
-    for p in posts:
-        platforms = _fetchall(conn, 'SELECT * FROM post_platforms WHERE post_id = ?', (p['id'],))
-        p['platforms'] = platforms
-    
-    conn.close()
-    return posts
+def touch_schedule_version():
+    """Record that some post's schedule changed (the SQLite stand-in for pg_notify across workers)"""
+    with connection() as conn:
+        _execute(conn, '''INSERT INTO app_meta (key, value) VALUES (?, ?)
+                          ON CONFLICT (key) DO UPDATE SET value = excluded.value''',
+                 (SCHEDULE_VERSION_KEY, str(time.time_ns())))
 
 
+def get_schedule_version():
+    with connection() as conn:
+        row = _fetchone(conn, 'SELECT value FROM app_meta WHERE key = ?', (SCHEDULE_VERSION_KEY,))
+        return row['value'] if row else ''
+
+
+def get_due_posts():
+    with connection() as conn:
+        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        posts = _fetchall(conn, '''
+            SELECT * FROM posts 
+            WHERE status = 'scheduled' AND scheduled_at <= ?
+            ORDER BY scheduled_at ASC
+        ''', (now,))
+        _attach_platforms(conn, posts)
+        return posts
+
+
+@_invalidates_stats
 def update_post(post_id, **kwargs):
-    conn = get_db()
-    allowed_fields = ['content', 'image_path', 'status', 'hashtags', 'link_url', 
-                      'scheduled_at', 'published_at', 'notes']
-    updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
+    with connection() as conn:
+        allowed_fields = ['content', 'image_path', 'status', 'hashtags', 'link_url', 
+                          'scheduled_at', 'published_at', 'notes']
+        updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
     
-    if updates:
-        if USE_POSTGRES:
-            set_clause = ', '.join(f'{k} = %s' for k in updates.keys())
-            values = list(updates.values()) + [post_id]
-            conn.cursor().execute(f'UPDATE posts SET {set_clause} WHERE id = %s', values)
-        else:
-            set_clause = ', '.join(f'{k} = ?' for k in updates.keys())
-            values = list(updates.values()) + [post_id]
-            conn.execute(f'UPDATE posts SET {set_clause} WHERE id = ?', values)
+        if updates:
+            if USE_POSTGRES:
+                set_clause = ', '.join(f'{k} = %s' for k in updates.keys())
+                values = list(updates.values()) + [post_id]
+                conn.cursor().execute(f'UPDATE posts SET {set_clause} WHERE id = %s', values)
+            else:
+                set_clause = ', '.join(f'{k} = ?' for k in updates.keys())
+                values = list(updates.values()) + [post_id]
+                conn.execute(f'UPDATE posts SET {set_clause} WHERE id = ?', values)
     
-    if 'platforms' in kwargs:
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute('DELETE FROM post_platforms WHERE post_id = %s', (post_id,))
-            for platform in kwargs['platforms']:
-                cur.execute(
-                    "INSERT INTO post_platforms (post_id, platform_name, status) VALUES (%s, %s, 'pending')",
-                    (post_id, platform)
-                )
-        else:
-            conn.execute('DELETE FROM post_platforms WHERE post_id = ?', (post_id,))
-            for platform in kwargs['platforms']:
-                conn.execute(
-                    "INSERT INTO post_platforms (post_id, platform_name, status) VALUES (?, ?, 'pending')",
-                    (post_id, platform)
-                )
+        if 'platforms' in kwargs:
+            if USE_POSTGRES:
+                cur = conn.cursor()
+                cur.execute('DELETE FROM post_platforms WHERE post_id = %s', (post_id,))
+                for platform in kwargs['platforms']:
+                    cur.execute(
+                        "INSERT INTO post_platforms (post_id, platform_name, status) VALUES (%s, %s, 'pending')",
+                        (post_id, platform)
+                    )
+            else:
+                conn.execute('DELETE FROM post_platforms WHERE post_id = ?', (post_id,))
+                for platform in kwargs['platforms']:
+                    conn.execute(
+                        "INSERT INTO post_platforms (post_id, platform_name, status) VALUES (?, ?, 'pending')",
+                        (post_id, platform)
+                    )
     
-    log_activity('post_updated', f'Post #{post_id} updated', post_id)
-    conn.commit()
-    conn.close()
+        log_activity('post_updated', f'Post #{post_id} updated', post_id)
+    if 'status' in kwargs or 'scheduled_at' in kwargs:
+        _schedule_changed(post_id)
 
 
+@_invalidates_stats
 def delete_post(post_id):
-    conn = get_db()
-    if USE_POSTGRES:
-        conn.cursor().execute('DELETE FROM posts WHERE id = %s', (post_id,))
-    else:
-        conn.execute('DELETE FROM posts WHERE id = ?', (post_id,))
-    log_activity('post_deleted', f'Post #{post_id} deleted')
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        if USE_POSTGRES:
+            conn.cursor().execute('DELETE FROM posts WHERE id = %s', (post_id,))
+        else:
+            conn.execute('DELETE FROM posts WHERE id = ?', (post_id,))
+        log_activity('post_deleted', f'Post #{post_id} deleted')
 
 
+@_invalidates_stats
 def mark_post_published(post_id, platform_name, platform_post_id=''):
-    conn = get_db()
-    now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    with connection() as conn:
+        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
     
-    if USE_POSTGRES:
-        cur = conn.cursor()
-        cur.execute('''
-            UPDATE post_platforms SET status = 'published', published_at = %s, platform_post_id = %s
-            WHERE post_id = %s AND platform_name = %s
-        ''', (now, platform_post_id, post_id, platform_name))
+        if USE_POSTGRES:
+            cur = conn.cursor()
+            cur.execute('''
+                UPDATE post_platforms SET status = 'published', published_at = %s, platform_post_id = %s
+                WHERE post_id = %s AND platform_name = %s
+            ''', (now, platform_post_id, post_id, platform_name))
         
-        cur.execute('''
-            SELECT COUNT(*) as cnt FROM post_platforms 
-            WHERE post_id = %s AND status = 'pending'
-        ''', (post_id,))
-        pending = cur.fetchone()
+            cur.execute('''
+                SELECT COUNT(*) as cnt FROM post_platforms 
+                WHERE post_id = %s AND status = 'pending'
+            ''', (post_id,))
+            pending = cur.fetchone()
         
-        if pending[0] == 0:
-            cur.execute('UPDATE posts SET status = %s, published_at = %s WHERE id = %s',
-                       ('published', now, post_id))
-    else:
-        conn.execute('''
-            UPDATE post_platforms SET status = 'published', published_at = ?, platform_post_id = ?
-            WHERE post_id = ? AND platform_name = ?
-        ''', (now, platform_post_id, post_id, platform_name))
+            if pending[0] == 0:
+                cur.execute('UPDATE posts SET status = %s, published_at = %s WHERE id = %s',
+                           ('published', now, post_id))
+        else:
+            conn.execute('''
+                UPDATE post_platforms SET status = 'published', published_at = ?, platform_post_id = ?
+                WHERE post_id = ? AND platform_name = ?
+            ''', (now, platform_post_id, post_id, platform_name))
         
-        pending = conn.execute('''
-            SELECT COUNT(*) as cnt FROM post_platforms 
-            WHERE post_id = ? AND status = 'pending'
-        ''', (post_id,)).fetchone()
+            pending = conn.execute('''
+                SELECT COUNT(*) as cnt FROM post_platforms 
+                WHERE post_id = ? AND status = 'pending'
+            ''', (post_id,)).fetchone()
         
-        if pending['cnt'] == 0:
-            conn.execute('UPDATE posts SET status = ?, published_at = ? WHERE id = ?',
-                        ('published', now, post_id))
+            if pending['cnt'] == 0:
+                conn.execute('UPDATE posts SET status = ?, published_at = ? WHERE id = ?',
+                            ('published', now, post_id))
     
-    log_activity('post_published', f'Post #{post_id} published to {platform_name}', post_id)
-    conn.commit()
-    conn.close()
+        log_activity('post_published', f'Post #{post_id} published to {platform_name}', post_id)
+
+
+# Retry policy for transient publish failures (publisher.RETRYABLE_STATUSES, connect errors)
+PUBLISH_MAX_ATTEMPTS = int(os.environ.get('PUBLISH_MAX_ATTEMPTS', '5'))    # including the first try
+PUBLISH_RETRY_BASE = float(os.environ.get('PUBLISH_RETRY_BASE', '60'))     # seconds before the first retry, doubling after
+PUBLISH_RETRY_CAP = float(os.environ.get('PUBLISH_RETRY_CAP', '3600'))     # longest gap between retries
+
+
+def _retry_delay(attempts, retry_after=None):
+    """Jittered exponential backoff after `attempts` tries, never sooner than the platform's Retry-After"""
+    delay = min(PUBLISH_RETRY_CAP, PUBLISH_RETRY_BASE * 2 ** (attempts - 1))
+    return max(random.uniform(delay / 2, delay), retry_after or 0)
+
+
+def claim_publish_platforms(post_id, platform_names, hold_seconds):
+    """Claim due pending platforms of a post for one publish attempt, so no other process publishes them.
+    Each row is taken with a conditional UPDATE (due now -> next_attempt_at pushed `hold_seconds` out);
+    record_publish_results replaces the hold, and if we die first the row falls due again after it.
+    Returns the names this call claimed."""
+    now_dt = datetime.utcnow()
+    now = now_dt.strftime(TIMESTAMP_FORMAT)
+    hold_until = (now_dt + timedelta(seconds=hold_seconds)).strftime(TIMESTAMP_FORMAT)
+    claimed = []
+    with connection() as conn:
+        for name in platform_names:
+            cur = _execute(conn, '''
+                UPDATE post_platforms SET next_attempt_at = ?
+                WHERE post_id = ? AND platform_name = ? AND status = 'pending'
+                  AND (next_attempt_at IS NULL OR next_attempt_at <= ?)
+            ''', (hold_until, post_id, name, now))
+            if cur.rowcount == 1:
+                claimed.append(name)
+    return claimed
+
+
+@_invalidates_stats
+def record_publish_results(post_id, results):
+    """Write a whole fan-out publish in one transaction, then roll the post's status up from its platforms.
+    A retryable failure leaves its row 'pending' with a backed-off next_attempt_at (until PUBLISH_MAX_ATTEMPTS);
+    while any platform is pending the post stays 'scheduled' so the scheduler drains the retries.
+    `results` are PublishResults. Returns the post's status afterwards."""
+    now_dt = datetime.utcnow()
+    now = now_dt.strftime(TIMESTAMP_FORMAT)
+    with connection() as conn:
+        attempts = {row['platform_name']: row['attempts'] or 0 for row in
+                    _fetchall(conn, 'SELECT platform_name, attempts FROM post_platforms WHERE post_id = ?', (post_id,))}
+        published, failed = [], []
+        for r in results:
+            tries = attempts.get(r.platform, 0) + 1
+            if r.success:
+                published.append((now, r.post_id or '', tries, post_id, r.platform))
+            elif getattr(r, 'retryable', False) and tries < PUBLISH_MAX_ATTEMPTS:
+                retry_at = now_dt + timedelta(seconds=_retry_delay(tries, getattr(r, 'retry_after', None)))
+                failed.append(('pending', r.error or '', tries, retry_at.strftime(TIMESTAMP_FORMAT), post_id, r.platform))
+            else:
+                failed.append(('failed', r.error or '', tries, None, post_id, r.platform))
+        if published:
+            _executemany(conn, '''
+                UPDATE post_platforms SET status = 'published', published_at = ?, platform_post_id = ?,
+                                          attempts = ?, next_attempt_at = NULL
+                WHERE post_id = ? AND platform_name = ?
+            ''', published)
+        if failed:
+            _executemany(conn, '''
+                UPDATE post_platforms SET status = ?, error_message = ?, attempts = ?, next_attempt_at = ?
+                WHERE post_id = ? AND platform_name = ?
+            ''', failed)
+        
+        statuses = [row['status'] for row in _fetchall(conn, 'SELECT status FROM post_platforms WHERE post_id = ?', (post_id,))]
+        if 'pending' in statuses:
+            status = 'scheduled'
+            _execute(conn, "UPDATE posts SET status = 'scheduled', scheduled_at = COALESCE(scheduled_at, ?) WHERE id = ?",
+                     (now, post_id))
+        elif 'published' in statuses or not statuses:
+            status = 'published'
+            _execute(conn, 'UPDATE posts SET status = ?, published_at = ? WHERE id = ?', ('published', now, post_id))
+        else:
+            status = 'failed'
+            _execute(conn, 'UPDATE posts SET status = ? WHERE id = ?', ('failed', post_id))
+    
+    for r in results:
+        if r.success:
+            log_activity('post_published', f'Post #{post_id} published to {r.platform}', post_id)
+    retrying = [row[-1] for row in failed if row[0] == 'pending']
+    if retrying:
+        log_activity('post_retry_scheduled', f'Post #{post_id}: will retry {", ".join(retrying)}', post_id)
+        _schedule_changed(post_id)
+    return status
 
 
 def mark_post_failed(post_id, platform_name, error_message=''):
-    conn = get_db()
-    if USE_POSTGRES:
-        conn.cursor().execute('''
-            UPDATE post_platforms SET status = 'failed', error_message = %s
-            WHERE post_id = %s AND platform_name = %s
-        ''', (error_message, post_id, platform_name))
-    else:
-        conn.execute('''
-            UPDATE post_platforms SET status = 'failed', error_message = ?
-            WHERE post_id = ? AND platform_name = ?
-        ''', (error_message, post_id, platform_name))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        if USE_POSTGRES:
+            conn.cursor().execute('''
+                UPDATE post_platforms SET status = 'failed', error_message = %s
+                WHERE post_id = %s AND platform_name = %s
+            ''', (error_message, post_id, platform_name))
+        else:
+            conn.execute('''
+                UPDATE post_platforms SET status = 'failed', error_message = ?
+                WHERE post_id = ? AND platform_name = ?
+            ''', (error_message, post_id, platform_name))
 
 
 # ============================================================
@@ -1354,62 +2299,57 @@ def mark_post_failed(post_id, platform_name, error_message=''):
 # ============================================================
 
 def get_platforms():
-    conn = get_db()
-    platforms = _fetchall(conn, 'SELECT * FROM platforms ORDER BY id')
-    conn.close()
-    return platforms
+    with connection() as conn:
+        platforms = _fetchall(conn, 'SELECT * FROM platforms ORDER BY id')
+        return platforms
 
 
 def get_platform(name):
-    conn = get_db()
-    platform = _fetchone(conn, 'SELECT * FROM platforms WHERE name = ?', (name,))
-    conn.close()
-    return platform
+    with connection() as conn:
+        platform = _fetchone(conn, 'SELECT * FROM platforms WHERE name = ?', (name,))
+        return platform
 
 
+@_invalidates_stats
 def update_platform(name, **kwargs):
-    conn = get_db()
-    allowed_fields = ['api_key', 'api_secret', 'access_token', 'refresh_token', 
-                      'additional_config', 'connected', 'username']
-    updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
+    with connection() as conn:
+        allowed_fields = ['api_key', 'api_secret', 'access_token', 'refresh_token', 
+                          'additional_config', 'connected', 'username']
+        updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
     
-    if updates:
-        if USE_POSTGRES:
-            set_clause = ', '.join(f'{k} = %s' for k in updates.keys())
-            values = list(updates.values()) + [name]
-            conn.cursor().execute(f'UPDATE platforms SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE name = %s', values)
-        else:
-            set_clause = ', '.join(f'{k} = ?' for k in updates.keys())
-            values = list(updates.values()) + [name]
-            conn.execute(f'UPDATE platforms SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE name = ?', values)
+        if updates:
+            if USE_POSTGRES:
+                set_clause = ', '.join(f'{k} = %s' for k in updates.keys())
+                values = list(updates.values()) + [name]
+                conn.cursor().execute(f'UPDATE platforms SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE name = %s', values)
+            else:
+                set_clause = ', '.join(f'{k} = ?' for k in updates.keys())
+                values = list(updates.values()) + [name]
+                conn.execute(f'UPDATE platforms SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE name = ?', values)
     
-    conn.commit()
-    conn.close()
 
 
+@_invalidates_stats
 def add_platform(name, api_key='', connected=False):
-    conn = get_db()
-    display_names = {'openai': 'OpenAI (DALL-E)', 'runway': 'Runway ML'}
-    icons = {'openai': '🎨', 'runway': '🎬'}
-    if USE_POSTGRES:
-        conn.cursor().execute(
-            'INSERT INTO platforms (name, display_name, icon, api_key, connected) VALUES (%s, %s, %s, %s, %s) ON CONFLICT (name) DO NOTHING',
-            (name, display_names.get(name, name), icons.get(name, '🔧'), api_key, int(connected))
-        )
-    else:
-        conn.execute(
-            'INSERT OR IGNORE INTO platforms (name, display_name, icon, api_key, connected) VALUES (?, ?, ?, ?, ?)',
-            (name, display_names.get(name, name), icons.get(name, '🔧'), api_key, int(connected))
-        )
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        display_names = {'openai': 'OpenAI (DALL-E)', 'runway': 'Runway ML'}
+        icons = {'openai': '🎨', 'runway': '🎬'}
+        if USE_POSTGRES:
+            conn.cursor().execute(
+                'INSERT INTO platforms (name, display_name, icon, api_key, connected) VALUES (%s, %s, %s, %s, %s) ON CONFLICT (name) DO NOTHING',
+                (name, display_names.get(name, name), icons.get(name, '🔧'), api_key, int(connected))
+            )
+        else:
+            conn.execute(
+                'INSERT OR IGNORE INTO platforms (name, display_name, icon, api_key, connected) VALUES (?, ?, ?, ?, ?)',
+                (name, display_names.get(name, name), icons.get(name, '🔧'), api_key, int(connected))
+            )
 
 
 def get_connected_platforms():
-    conn = get_db()
-    platforms = _fetchall(conn, 'SELECT * FROM platforms WHERE connected = 1')
-    conn.close()
-    return platforms
+    with connection() as conn:
+        platforms = _fetchall(conn, 'SELECT * FROM platforms WHERE connected = 1')
+        return platforms
 
 
 # ============================================================
@@ -1417,57 +2357,52 @@ def get_connected_platforms():
 # ============================================================
 
 def get_templates(category=None):
-    conn = get_db()
-    if category:
-        templates = _fetchall(conn,
-            'SELECT * FROM content_templates WHERE category = ? ORDER BY use_count DESC, created_at DESC',
-            (category,))
-    else:
-        templates = _fetchall(conn,
-            'SELECT * FROM content_templates ORDER BY use_count DESC, created_at DESC')
-    conn.close()
-    return templates
+    with connection() as conn:
+        if category:
+            templates = _fetchall(conn,
+                'SELECT * FROM content_templates WHERE category = ? ORDER BY use_count DESC, created_at DESC',
+                (category,))
+        else:
+            templates = _fetchall(conn,
+                'SELECT * FROM content_templates ORDER BY use_count DESC, created_at DESC')
+        return templates
 
 
+@_invalidates_stats
 def create_template(title, content, category='general', hashtags=''):
-    conn = get_db()
-    if USE_POSTGRES:
-        cur = conn.cursor()
-        cur.execute(
-            'INSERT INTO content_templates (title, content, category, hashtags) VALUES (%s, %s, %s, %s) RETURNING id',
-            (title, content, category, hashtags)
-        )
-        template_id = cur.fetchone()[0]
-    else:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO content_templates (title, content, category, hashtags)
-            VALUES (?, ?, ?, ?)
-        ''', (title, content, category, hashtags))
-        template_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return template_id
+    with connection() as conn:
+        if USE_POSTGRES:
+            cur = conn.cursor()
+            cur.execute(
+                'INSERT INTO content_templates (title, content, category, hashtags) VALUES (%s, %s, %s, %s) RETURNING id',
+                (title, content, category, hashtags)
+            )
+            template_id = cur.fetchone()[0]
+        else:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO content_templates (title, content, category, hashtags)
+                VALUES (?, ?, ?, ?)
+            ''', (title, content, category, hashtags))
+            template_id = cursor.lastrowid
+        return template_id
 
 
+@_invalidates_stats
 def delete_template(template_id):
-    conn = get_db()
-    if USE_POSTGRES:
-        conn.cursor().execute('DELETE FROM content_templates WHERE id = %s', (template_id,))
-    else:
-        conn.execute('DELETE FROM content_templates WHERE id = ?', (template_id,))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        if USE_POSTGRES:
+            conn.cursor().execute('DELETE FROM content_templates WHERE id = %s', (template_id,))
+        else:
+            conn.execute('DELETE FROM content_templates WHERE id = ?', (template_id,))
 
 
 def increment_template_use(template_id):
-    conn = get_db()
-    if USE_POSTGRES:
-        conn.cursor().execute('UPDATE content_templates SET use_count = use_count + 1 WHERE id = %s', (template_id,))
-    else:
-        conn.execute('UPDATE content_templates SET use_count = use_count + 1 WHERE id = ?', (template_id,))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        if USE_POSTGRES:
+            conn.cursor().execute('UPDATE content_templates SET use_count = use_count + 1 WHERE id = %s', (template_id,))
+        else:
+            conn.execute('UPDATE content_templates SET use_count = use_count + 1 WHERE id = ?', (template_id,))
 
 
 # ============================================================
@@ -1475,35 +2410,30 @@ def increment_template_use(template_id):
 # ============================================================
 
 def get_hashtag_groups():
-    conn = get_db()
-    groups = _fetchall(conn, 'SELECT * FROM hashtag_groups ORDER BY name')
-    conn.close()
-    return groups
+    with connection() as conn:
+        groups = _fetchall(conn, 'SELECT * FROM hashtag_groups ORDER BY name')
+        return groups
 
 
 def create_hashtag_group(name, hashtags):
-    conn = get_db()
-    if USE_POSTGRES:
-        cur = conn.cursor()
-        cur.execute('INSERT INTO hashtag_groups (name, hashtags) VALUES (%s, %s) RETURNING id', (name, hashtags))
-        group_id = cur.fetchone()[0]
-    else:
-        cursor = conn.cursor()
-        cursor.execute('INSERT INTO hashtag_groups (name, hashtags) VALUES (?, ?)', (name, hashtags))
-        group_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return group_id
+    with connection() as conn:
+        if USE_POSTGRES:
+            cur = conn.cursor()
+            cur.execute('INSERT INTO hashtag_groups (name, hashtags) VALUES (%s, %s) RETURNING id', (name, hashtags))
+            group_id = cur.fetchone()[0]
+        else:
+            cursor = conn.cursor()
+            cursor.execute('INSERT INTO hashtag_groups (name, hashtags) VALUES (?, ?)', (name, hashtags))
+            group_id = cursor.lastrowid
+        return group_id
 
 
 def delete_hashtag_group(group_id):
-    conn = get_db()
-    if USE_POSTGRES:
-        conn.cursor().execute('DELETE FROM hashtag_groups WHERE id = %s', (group_id,))
-    else:
-        conn.execute('DELETE FROM hashtag_groups WHERE id = ?', (group_id,))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        if USE_POSTGRES:
+            conn.cursor().execute('DELETE FROM hashtag_groups WHERE id = %s', (group_id,))
+        else:
+            conn.execute('DELETE FROM hashtag_groups WHERE id = ?', (group_id,))
 
 
 # ============================================================
@@ -1511,38 +2441,35 @@ def delete_hashtag_group(group_id):
 # ============================================================
 
 def log_analytics(post_id, platform_name, impressions=0, likes=0, retweets=0, replies=0, clicks=0):
-    conn = get_db()
-    if USE_POSTGRES:
-        conn.cursor().execute('''
-            INSERT INTO analytics (post_id, platform_name, impressions, likes, retweets, replies, clicks)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ''', (post_id, platform_name, impressions, likes, retweets, replies, clicks))
-    else:
-        conn.execute('''
-            INSERT INTO analytics (post_id, platform_name, impressions, likes, retweets, replies, clicks)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (post_id, platform_name, impressions, likes, retweets, replies, clicks))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        if USE_POSTGRES:
+            conn.cursor().execute('''
+                INSERT INTO analytics (post_id, platform_name, impressions, likes, retweets, replies, clicks)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ''', (post_id, platform_name, impressions, likes, retweets, replies, clicks))
+        else:
+            conn.execute('''
+                INSERT INTO analytics (post_id, platform_name, impressions, likes, retweets, replies, clicks)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (post_id, platform_name, impressions, likes, retweets, replies, clicks))
 
 
 def get_analytics_summary(days=30):
-    conn = get_db()
-    since = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
-    summary = _fetchall(conn, '''
-        SELECT platform_name,
-               SUM(impressions) as total_impressions,
-               SUM(likes) as total_likes,
-               SUM(retweets) as total_retweets,
-               SUM(replies) as total_replies,
-               SUM(clicks) as total_clicks,
-               COUNT(*) as post_count
-        FROM analytics 
-        WHERE tracked_at >= ?
-        GROUP BY platform_name
-    ''', (since,))
-    conn.close()
-    return summary
+    with connection() as conn:
+        since = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        summary = _fetchall(conn, '''
+            SELECT platform_name,
+                   SUM(impressions) as total_impressions,
+                   SUM(likes) as total_likes,
+                   SUM(retweets) as total_retweets,
+                   SUM(replies) as total_replies,
+                   SUM(clicks) as total_clicks,
+                   COUNT(*) as post_count
+            FROM analytics 
+            WHERE tracked_at >= ?
+            GROUP BY platform_name
+        ''', (since,))
+        return summary
 
 
 # ============================================================
@@ -1550,315 +2477,291 @@ def get_analytics_summary(days=30):
 # ============================================================
 
 def log_activity(action, details='', post_id=None):
-    try:
-        conn = get_db()
-        if USE_POSTGRES:
-            conn.cursor().execute(
-                'INSERT INTO activity_log (action, details, post_id) VALUES (%s, %s, %s)',
-                (action, details, post_id)
-            )
-        else:
-            conn.execute(
-                'INSERT INTO activity_log (action, details, post_id) VALUES (?, ?, ?)',
-                (action, details, post_id)
-            )
-        conn.commit()
-        conn.close()
-    except:
-        pass
+    """Queue an audit row; it is written with the next batch, never on the caller's connection."""
+    _activity_buffer.add(action, details, post_id, _utc_now())
 
 
 def get_activity(limit=20):
-    conn = get_db()
-    activities = _fetchall(conn,
-        'SELECT * FROM activity_log ORDER BY created_at DESC LIMIT ?', (limit,))
-    conn.close()
-    return activities
+    _activity_buffer.flush()
+    with connection() as conn:
+        activities = _fetchall(conn,
+            'SELECT * FROM activity_log ORDER BY created_at DESC LIMIT ?', (limit,))
+        return activities
 
 
 # ============================================================
 # DASHBOARD STATS
 # ============================================================
 
+def _post_counts(conn, since):
+    return _aggregate(conn, '''
+        SELECT COUNT(*) AS total,
+               SUM(CASE WHEN status = 'draft' THEN 1 ELSE 0 END) AS drafts,
+               SUM(CASE WHEN status = 'scheduled' THEN 1 ELSE 0 END) AS scheduled,
+               SUM(CASE WHEN status = 'published' THEN 1 ELSE 0 END) AS published,
+               SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) AS failed,
+               SUM(CASE WHEN status = 'published' AND published_at >= ? THEN 1 ELSE 0 END) AS published_week
+        FROM posts
+    ''', (since,))
+
+
+def _blog_article_counts(conn, since):
+    return _aggregate(conn, '''
+        SELECT COUNT(*) AS total,
+               SUM(CASE WHEN status = 'draft' THEN 1 ELSE 0 END) AS drafts,
+               SUM(CASE WHEN status = 'published' THEN 1 ELSE 0 END) AS published,
+               SUM(CASE WHEN status = 'published' AND published_at >= ? THEN 1 ELSE 0 END) AS published_week
+        FROM blog_articles
+    ''', (since,))
+
+
 def get_dashboard_stats():
-    conn = get_db()
-    
-    # Social media posts
-    post_total = _fetchone(conn, 'SELECT COUNT(*) as cnt FROM posts')['cnt']
-    post_drafts = _fetchone(conn, "SELECT COUNT(*) as cnt FROM posts WHERE status = 'draft'")['cnt']
-    post_scheduled = _fetchone(conn, "SELECT COUNT(*) as cnt FROM posts WHERE status = 'scheduled'")['cnt']
-    post_published = _fetchone(conn, "SELECT COUNT(*) as cnt FROM posts WHERE status = 'published'")['cnt']
-    
-    # Blog articles
-    blog_total = _fetchone(conn, 'SELECT COUNT(*) as cnt FROM blog_articles')['cnt']
-    blog_drafts = _fetchone(conn, "SELECT COUNT(*) as cnt FROM blog_articles WHERE status = 'draft'")['cnt']
-    blog_published = _fetchone(conn, "SELECT COUNT(*) as cnt FROM blog_articles WHERE status = 'published'")['cnt']
-    
-    stats = {
-        'total_posts': post_total + blog_total,
-        'drafts': post_drafts + blog_drafts,
-        'scheduled': post_scheduled,
-        'published': post_published + blog_published,
-        'failed': _fetchone(conn, "SELECT COUNT(*) as cnt FROM posts WHERE status = 'failed'")['cnt'],
-        'connected_platforms': _fetchone(conn, "SELECT COUNT(*) as cnt FROM platforms WHERE connected = 1")['cnt'],
-        'templates': _fetchone(conn, 'SELECT COUNT(*) as cnt FROM content_templates')['cnt'],
-    }
-    
+    return _cached_stats('dashboard', _load_dashboard_stats)
+
+
+def _load_dashboard_stats():
     week_ago = (datetime.utcnow() - timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
-    posts_week = _fetchone(conn,
-        "SELECT COUNT(*) as cnt FROM posts WHERE status = 'published' AND published_at >= ?",
-        (week_ago,))['cnt']
-    blogs_week = _fetchone(conn,
-        "SELECT COUNT(*) as cnt FROM blog_articles WHERE status = 'published' AND published_at >= ?",
-        (week_ago,))['cnt']
-    stats['published_this_week'] = posts_week + blogs_week
+    with connection() as conn:
+        posts = _post_counts(conn, week_ago)
+        blogs = _blog_article_counts(conn, week_ago)
+        misc = _aggregate(conn, '''
+            SELECT (SELECT COUNT(*) FROM platforms WHERE connected = 1) AS connected_platforms,
+                   (SELECT COUNT(*) FROM content_templates) AS templates
+        ''')
     
-    conn.close()
-    return stats
+    return {
+        'total_posts': posts['total'] + blogs['total'],
+        'drafts': posts['drafts'] + blogs['drafts'],
+        'scheduled': posts['scheduled'],
+        'published': posts['published'] + blogs['published'],
+        'failed': posts['failed'],
+        'connected_platforms': misc['connected_platforms'],
+        'templates': misc['templates'],
+        'published_this_week': posts['published_week'] + blogs['published_week'],
+    }
 
 
 # ============================================================
 # BLOG OPERATIONS
 # ============================================================
 
+@_invalidates_stats
 def create_blog_article(title, content, excerpt='', topic='', keywords='', 
                         status='draft', platform='', platform_url='', word_count=0):
-    conn = get_db()
-    if USE_POSTGRES:
-        cur = conn.cursor()
-        cur.execute(
-            '''INSERT INTO blog_articles (title, content, excerpt, topic, keywords, status, platform, platform_url, word_count)
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id''',
-            (title, content, excerpt, topic, keywords, status, platform, platform_url, word_count)
-        )
-        article_id = cur.fetchone()[0]
-    else:
-        cursor = conn.cursor()
-        cursor.execute(
-            '''INSERT INTO blog_articles (title, content, excerpt, topic, keywords, status, platform, platform_url, word_count)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-            (title, content, excerpt, topic, keywords, status, platform, platform_url, word_count)
-        )
-        article_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return article_id
+    with connection() as conn:
+        if USE_POSTGRES:
+            cur = conn.cursor()
+            cur.execute(
+                '''INSERT INTO blog_articles (title, content, excerpt, topic, keywords, status, platform, platform_url, word_count)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id''',
+                (title, content, excerpt, topic, keywords, status, platform, platform_url, word_count)
+            )
+            article_id = cur.fetchone()[0]
+        else:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''INSERT INTO blog_articles (title, content, excerpt, topic, keywords, status, platform, platform_url, word_count)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                (title, content, excerpt, topic, keywords, status, platform, platform_url, word_count)
+            )
+            article_id = cursor.lastrowid
+        return article_id
+
+
+def get_blog_articles_page(status=None, limit=50, cursor=None):
+    """Newest-first page of blog articles plus the cursor for the next page"""
+    with connection() as conn:
+        return _keyset_page(conn, 'blog_articles', ('created_at', 'id'),
+                            ['status = ?'] if status else [], [status] if status else [], limit, cursor)
 
 
 def get_blog_articles(status=None, limit=50):
-    conn = get_db()
-    if status:
-        articles = _fetchall(conn, 
-            'SELECT * FROM blog_articles WHERE status = ? ORDER BY created_at DESC LIMIT ?',
-            (status, limit))
-    else:
-        articles = _fetchall(conn, 
-            'SELECT * FROM blog_articles ORDER BY created_at DESC LIMIT ?', (limit,))
-    conn.close()
-    return articles
+    return get_blog_articles_page(status=status, limit=limit)[0]
 
 
 def get_blog_article(article_id):
-    conn = get_db()
-    article = _fetchone(conn, 'SELECT * FROM blog_articles WHERE id = ?', (article_id,))
-    conn.close()
-    return article
+    with connection() as conn:
+        article = _fetchone(conn, 'SELECT * FROM blog_articles WHERE id = ?', (article_id,))
+        return article
 
 
+@_invalidates_stats
 def update_blog_article(article_id, **kwargs):
-    conn = get_db()
-    for key, value in kwargs.items():
-        _execute(conn, f'UPDATE blog_articles SET {key} = ? WHERE id = ?', (value, article_id))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        _update_fields(conn, 'blog_articles', article_id, kwargs)
 
 
 def add_published_platform(article_id, platform, url=''):
     """Track cross-posting: add a platform to published_platforms JSON"""
-    conn = get_db()
-    article = _fetchone(conn, 'SELECT published_platforms FROM blog_articles WHERE id = ?', (article_id,))
-    if article:
-        try:
-            platforms = json.loads(article.get('published_platforms', '{}') or '{}')
-        except:
-            platforms = {}
-        platforms[platform] = url
-        _execute(conn, 'UPDATE blog_articles SET published_platforms = ? WHERE id = ?',
-                (json.dumps(platforms), article_id))
-        conn.commit()
-    conn.close()
-
-
+    with connection() as conn:
+        article = _fetchone(conn, 'SELECT published_platforms FROM blog_articles WHERE id = ?', (article_id,))
+        if article:
+            try:
+                platforms = json.loads(article.get('published_platforms', '{}') or '{}')
+            except:
+                platforms = {}
+            platforms[platform] = url
+            _execute(conn, 'UPDATE blog_articles SET published_platforms = ? WHERE id = ?',
+                    (json.dumps(platforms), article_id))
+
+
+@_invalidates_stats
 def delete_blog_article(article_id):
-    conn = get_db()
-    _execute(conn, 'DELETE FROM blog_articles WHERE id = ?', (article_id,))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        _execute(conn, 'DELETE FROM blog_articles WHERE id = ?', (article_id,))
 
 
 def get_blog_topics(category=None):
-    conn = get_db()
-    if category:
-        topics = _fetchall(conn, 'SELECT * FROM blog_topics WHERE category = ? ORDER BY times_used ASC', (category,))
-    else:
-        topics = _fetchall(conn, 'SELECT * FROM blog_topics ORDER BY times_used ASC, created_at DESC')
-    conn.close()
-    return topics
+    with connection() as conn:
+        if category:
+            topics = _fetchall(conn, 'SELECT * FROM blog_topics WHERE category = ? ORDER BY times_used ASC', (category,))
+        else:
+            topics = _fetchall(conn, 'SELECT * FROM blog_topics ORDER BY times_used ASC, created_at DESC')
+        return topics
 
 
+@_invalidates_stats
 def add_blog_topic(title, category='general', keywords=''):
-    conn = get_db()
-    _execute(conn, 'INSERT INTO blog_topics (title, category, keywords) VALUES (?, ?, ?)',
-             (title, category, keywords))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        _execute(conn, 'INSERT INTO blog_topics (title, category, keywords) VALUES (?, ?, ?)',
+                 (title, category, keywords))
 
 
 def use_blog_topic(topic_id):
-    conn = get_db()
-    _execute(conn, 'UPDATE blog_topics SET times_used = times_used + 1, last_used = CURRENT_TIMESTAMP WHERE id = ?',
-             (topic_id,))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        _execute(conn, 'UPDATE blog_topics SET times_used = times_used + 1, last_used = CURRENT_TIMESTAMP WHERE id = ?',
+                 (topic_id,))
 
 
 def get_blog_stats():
-    conn = get_db()
-    stats = {
-        'total': _fetchone(conn, 'SELECT COUNT(*) as cnt FROM blog_articles')['cnt'],
-        'drafts': _fetchone(conn, "SELECT COUNT(*) as cnt FROM blog_articles WHERE status = 'draft'")['cnt'],
-        'published': _fetchone(conn, "SELECT COUNT(*) as cnt FROM blog_articles WHERE status = 'published'")['cnt'],
-        'topics': _fetchone(conn, 'SELECT COUNT(*) as cnt FROM blog_topics')['cnt'],
-    }
-    conn.close()
-    return stats
+    return _cached_stats('blog', _load_blog_stats)
+
+
+def _load_blog_stats():
+    with connection() as conn:
+        return _aggregate(conn, '''
+            SELECT COUNT(*) AS total,
+                   SUM(CASE WHEN status = 'draft' THEN 1 ELSE 0 END) AS drafts,
+                   SUM(CASE WHEN status = 'published' THEN 1 ELSE 0 END) AS published,
+                   (SELECT COUNT(*) FROM blog_topics) AS topics
+            FROM blog_articles
+        ''')
 
 
 # ============================================================
 # BRAND MENTIONS
 # ============================================================
 
+@_invalidates_stats
 def add_brand_mention(title, url='', source='', source_type='article', snippet='', 
                       full_content='', author='', sentiment='neutral', date_published=''):
-    conn = get_db()
-    if url:
-        existing = _fetchone(conn, 'SELECT id FROM brand_mentions WHERE url = ?', (url,))
-        if existing:
-            conn.close()
-            return None
-    if USE_POSTGRES:
-        cur = conn.cursor()
-        cur.execute(
-            '''INSERT INTO brand_mentions (title, url, source, source_type, snippet, full_content, author, sentiment, date_published)
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id''',
-            (title, url, source, source_type, snippet, full_content, author, sentiment, date_published))
-        mention_id = cur.fetchone()[0]
-    else:
-        cursor = conn.cursor()
-        cursor.execute(
-            '''INSERT INTO brand_mentions (title, url, source, source_type, snippet, full_content, author, sentiment, date_published)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-            (title, url, source, source_type, snippet, full_content, author, sentiment, date_published))
-        mention_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return mention_id
+    with connection() as conn:
+        if url:
+            existing = _fetchone(conn, 'SELECT id FROM brand_mentions WHERE url = ?', (url,))
+            if existing:
+                return None
+        if USE_POSTGRES:
+            cur = conn.cursor()
+            cur.execute(
+                '''INSERT INTO brand_mentions (title, url, source, source_type, snippet, full_content, author, sentiment, date_published)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id''',
+                (title, url, source, source_type, snippet, full_content, author, sentiment, date_published))
+            mention_id = cur.fetchone()[0]
+        else:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''INSERT INTO brand_mentions (title, url, source, source_type, snippet, full_content, author, sentiment, date_published)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                (title, url, source, source_type, snippet, full_content, author, sentiment, date_published))
+            mention_id = cursor.lastrowid
+        return mention_id
+
+
+def get_brand_mentions_page(source_type=None, starred=None, limit=100, cursor=None):
+    """Newest-first page of brand mentions plus the cursor for the next page"""
+    conditions, params = [], []
+    if source_type:
+        conditions.append('source_type = ?')
+        params.append(source_type)
+    if starred is not None:
+        conditions.append('starred = ?')
+        params.append(starred)
+    with connection() as conn:
+        return _keyset_page(conn, 'brand_mentions', ('created_at', 'id'), conditions, params, limit, cursor)
 
 
 def get_brand_mentions(source_type=None, starred=None, limit=100):
-    conn = get_db()
-    if source_type and starred is not None:
-        mentions = _fetchall(conn, 
-            'SELECT * FROM brand_mentions WHERE source_type = ? AND starred = ? ORDER BY created_at DESC LIMIT ?',
-            (source_type, starred, limit))
-    elif source_type:
-        mentions = _fetchall(conn, 
-            'SELECT * FROM brand_mentions WHERE source_type = ? ORDER BY created_at DESC LIMIT ?',
-            (source_type, limit))
-    elif starred is not None:
-        mentions = _fetchall(conn, 
-            'SELECT * FROM brand_mentions WHERE starred = ? ORDER BY created_at DESC LIMIT ?',
-            (starred, limit))
-    else:
-        mentions = _fetchall(conn, 
-            'SELECT * FROM brand_mentions ORDER BY created_at DESC LIMIT ?', (limit,))
-    conn.close()
-    return mentions
+    return get_brand_mentions_page(source_type=source_type, starred=starred, limit=limit)[0]
 
 
 def get_brand_mention(mention_id):
-    conn = get_db()
-    mention = _fetchone(conn, 'SELECT * FROM brand_mentions WHERE id = ?', (mention_id,))
-    conn.close()
-    return mention
+    with connection() as conn:
+        mention = _fetchone(conn, 'SELECT * FROM brand_mentions WHERE id = ?', (mention_id,))
+        return mention
 
 
+@_invalidates_stats
 def update_brand_mention(mention_id, **kwargs):
-    conn = get_db()
-    for key, value in kwargs.items():
-        _execute(conn, f'UPDATE brand_mentions SET {key} = ? WHERE id = ?', (value, mention_id))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        _update_fields(conn, 'brand_mentions', mention_id, kwargs)
 
 
+@_invalidates_stats
 def delete_brand_mention(mention_id):
-    conn = get_db()
-    _execute(conn, 'DELETE FROM brand_mentions WHERE id = ?', (mention_id,))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        _execute(conn, 'DELETE FROM brand_mentions WHERE id = ?', (mention_id,))
 
 
 def get_brand_mention_stats():
-    conn = get_db()
-    stats = {
-        'total': _fetchone(conn, 'SELECT COUNT(*) as cnt FROM brand_mentions')['cnt'],
-        'reviews': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE source_type = 'review'")['cnt'],
-        'features': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE source_type = 'feature'")['cnt'],
-        'press': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE source_type = 'press'")['cnt'],
-        'podcasts': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE source_type = 'podcast'")['cnt'],
-        'videos': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE source_type = 'video'")['cnt'],
-        'events': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE source_type = 'event'")['cnt'],
-        'awards': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE source_type = 'award'")['cnt'],
-        'interviews': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE source_type = 'interview'")['cnt'],
-        'social': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE source_type = 'social'")['cnt'],
-        'own_site': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE source_type = 'own_site'")['cnt'],
-        'starred': _fetchone(conn, 'SELECT COUNT(*) as cnt FROM brand_mentions WHERE starred = 1')['cnt'],
-        'with_content': _fetchone(conn, "SELECT COUNT(*) as cnt FROM brand_mentions WHERE full_content IS NOT NULL AND full_content != ''")['cnt'],
-    }
-    conn.close()
-    return stats
+    return _cached_stats('brand_mentions', _load_brand_mention_stats)
+
+
+def _load_brand_mention_stats():
+    with connection() as conn:
+        return _aggregate(conn, '''
+            SELECT COUNT(*) AS total,
+                   SUM(CASE WHEN source_type = 'review' THEN 1 ELSE 0 END) AS reviews,
+                   SUM(CASE WHEN source_type = 'feature' THEN 1 ELSE 0 END) AS features,
+                   SUM(CASE WHEN source_type = 'press' THEN 1 ELSE 0 END) AS press,
+                   SUM(CASE WHEN source_type = 'podcast' THEN 1 ELSE 0 END) AS podcasts,
+                   SUM(CASE WHEN source_type = 'video' THEN 1 ELSE 0 END) AS videos,
+                   SUM(CASE WHEN source_type = 'event' THEN 1 ELSE 0 END) AS events,
+                   SUM(CASE WHEN source_type = 'award' THEN 1 ELSE 0 END) AS awards,
+                   SUM(CASE WHEN source_type = 'interview' THEN 1 ELSE 0 END) AS interviews,
+                   SUM(CASE WHEN source_type = 'social' THEN 1 ELSE 0 END) AS social,
+                   SUM(CASE WHEN source_type = 'own_site' THEN 1 ELSE 0 END) AS own_site,
+                   SUM(CASE WHEN starred = 1 THEN 1 ELSE 0 END) AS starred,
+                   SUM(CASE WHEN full_content IS NOT NULL AND full_content != '' THEN 1 ELSE 0 END) AS with_content
+            FROM brand_mentions
+        ''')
 
 
 # ============================================================
 # OUTREACH CONTACTS
 # ============================================================
 
+@_invalidates_stats
 def add_outreach_contact(name, email='', platform='', platform_handle='', platform_url='', 
                          followers=0, category='influencer', tier='1', notes=''):
-    conn = get_db()
-    if email:
-        existing = _fetchone(conn, 'SELECT id FROM outreach_contacts WHERE email = ?', (email,))
-        if existing:
-            conn.close()
-            return None
-    if platform_url:
-        existing = _fetchone(conn, 'SELECT id FROM outreach_contacts WHERE platform_url = ?', (platform_url,))
-        if existing:
-            conn.close()
-            return None
+    with connection() as conn:
+        if email:
+            existing = _fetchone(conn, 'SELECT id FROM outreach_contacts WHERE email = ?', (email,))
+            if existing:
+                return None
+        if platform_url:
+            existing = _fetchone(conn, 'SELECT id FROM outreach_contacts WHERE platform_url = ?', (platform_url,))
+            if existing:
+                return None
     
-    _execute(conn, '''INSERT INTO outreach_contacts (name, email, platform, platform_handle, platform_url, followers, category, tier, notes)
-                      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-             (name, email, platform, platform_handle, platform_url, followers, category, tier, notes))
-    conn.commit()
-    contact_id = _fetchone(conn, 'SELECT MAX(id) as id FROM outreach_contacts')['id']
-    conn.close()
-    return contact_id
+        _execute(conn, '''INSERT INTO outreach_contacts (name, email, platform, platform_handle, platform_url, followers, category, tier, notes)
+                          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                 (name, email, platform, platform_handle, platform_url, followers, category, tier, notes))
+        contact_id = _fetchone(conn, 'SELECT MAX(id) as id FROM outreach_contacts')['id']
+        return contact_id
 
 
-def get_outreach_contacts(category=None, status=None, tier=None, limit=500):
-    conn = get_db()
-    query = 'SELECT * FROM outreach_contacts'
+def get_outreach_contacts_page(category=None, status=None, tier=None, limit=100, cursor=None):
+    """Page of outreach contacts, biggest audience first, plus the cursor for the next page"""
     conditions = []
     params = []
     if category:
@@ -1870,703 +2773,807 @@ def get_outreach_contacts(category=None, status=None, tier=None, limit=500):
     if tier:
         conditions.append('tier = ?')
         params.append(tier)
-    if conditions:
-        query += ' WHERE ' + ' AND '.join(conditions)
-    query += ' ORDER BY followers DESC, created_at DESC LIMIT ?'
-    params.append(limit)
-    contacts = _fetchall(conn, query, tuple(params))
-    conn.close()
-    return contacts
+    with connection() as conn:
+        return _keyset_page(conn, 'outreach_contacts', ('followers', 'created_at', 'id'),
+                            conditions, params, limit, cursor)
+
+
+def get_outreach_contacts(category=None, status=None, tier=None, limit=500):
+    return get_outreach_contacts_page(category=category, status=status, tier=tier, limit=limit)[0]
 
 
 def get_outreach_contact(contact_id):
-    conn = get_db()
-    contact = _fetchone(conn, 'SELECT * FROM outreach_contacts WHERE id = ?', (contact_id,))
-    conn.close()
-    return contact
+    with connection() as conn:
+        contact = _fetchone(conn, 'SELECT * FROM outreach_contacts WHERE id = ?', (contact_id,))
+        return contact
 
 
+@_invalidates_stats
 def update_outreach_contact(contact_id, **kwargs):
-    conn = get_db()
-    for key, value in kwargs.items():
-        _execute(conn, f'UPDATE outreach_contacts SET {key} = ? WHERE id = ?', (value, contact_id))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        _update_fields(conn, 'outreach_contacts', contact_id, kwargs)
 
 
+@_invalidates_stats
+def update_outreach_contacts(contact_ids, **kwargs):
+    """Apply the same field changes to many contacts in one statement (outreach batch actions)"""
+    with connection() as conn:
+        return _update_fields(conn, 'outreach_contacts', contact_ids, kwargs)
+
+
+@_invalidates_stats
 def delete_outreach_contact(contact_id):
-    conn = get_db()
-    _execute(conn, 'DELETE FROM outreach_contacts WHERE id = ?', (contact_id,))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        _execute(conn, 'DELETE FROM outreach_contacts WHERE id = ?', (contact_id,))
 
 
 def get_outreach_stats():
-    conn = get_db()
-    stats = {
-        'total': _fetchone(conn, 'SELECT COUNT(*) as cnt FROM outreach_contacts')['cnt'],
-        'with_email': _fetchone(conn, "SELECT COUNT(*) as cnt FROM outreach_contacts WHERE email != ''")['cnt'],
-        'contacted': _fetchone(conn, "SELECT COUNT(*) as cnt FROM outreach_contacts WHERE status = 'contacted'")['cnt'],
-        'product_sent': _fetchone(conn, 'SELECT COUNT(*) as cnt FROM outreach_contacts WHERE product_sent = 1')['cnt'],
-        'responded': _fetchone(conn, 'SELECT COUNT(*) as cnt FROM outreach_contacts WHERE responded = 1')['cnt'],
-        'influencers': _fetchone(conn, "SELECT COUNT(*) as cnt FROM outreach_contacts WHERE category = 'influencer'")['cnt'],
-        'industry': _fetchone(conn, "SELECT COUNT(*) as cnt FROM outreach_contacts WHERE category = 'industry'")['cnt'],
-        'media': _fetchone(conn, "SELECT COUNT(*) as cnt FROM outreach_contacts WHERE category = 'media'")['cnt'],
-        'adjacent': _fetchone(conn, "SELECT COUNT(*) as cnt FROM outreach_contacts WHERE category = 'adjacent'")['cnt'],
-        'community': _fetchone(conn, "SELECT COUNT(*) as cnt FROM outreach_contacts WHERE category = 'community'")['cnt'],
-    }
-    conn.close()
-    return stats
+    return _cached_stats('outreach', _load_outreach_stats)
+
+
+def _load_outreach_stats():
+    with connection() as conn:
+        return _aggregate(conn, '''
+            SELECT COUNT(*) AS total,
+                   SUM(CASE WHEN email != '' THEN 1 ELSE 0 END) AS with_email,
+                   SUM(CASE WHEN status = 'contacted' THEN 1 ELSE 0 END) AS contacted,
+                   SUM(CASE WHEN product_sent = 1 THEN 1 ELSE 0 END) AS product_sent,
+                   SUM(CASE WHEN responded = 1 THEN 1 ELSE 0 END) AS responded,
+                   SUM(CASE WHEN category = 'influencer' THEN 1 ELSE 0 END) AS influencers,
+                   SUM(CASE WHEN category = 'industry' THEN 1 ELSE 0 END) AS industry,
+                   SUM(CASE WHEN category = 'media' THEN 1 ELSE 0 END) AS media,
+                   SUM(CASE WHEN category = 'adjacent' THEN 1 ELSE 0 END) AS adjacent,
+                   SUM(CASE WHEN category = 'community' THEN 1 ELSE 0 END) AS community
+            FROM outreach_contacts
+        ''')
 
 
-def seed_customer_emails():
-    """Seed customer email list from Mash Networks data"""
-    conn = get_db()
+SEED_CUSTOMER_EMAILS = [
+    "07-sparkly.piccolo@icloud.com",
+    "073bmw@gmail.com",
+    "1994sadlers@gmail.com",
+    "1audreydavis@gmail.com",
+    "88STEPHLOVA@GMAIL.COM",
+    "aaw8752@gmail.com",
+    "aclema2@gmail.com",
+    "adamdart@gmail.com",
+    "advdance@aol.com",
+    "aggrobait@gmail.com",
+    "alan_schubert@icloud.com",
+    "alpinetim72@gmail.com",
+    "amandagiannini@gmail.com",
+    "amy.worthington.91@att.net",
+    "amygo5900@gmail.com",
+    "andersonpalmetto@gmail.com",
+    "andersonusc@icloud.com",
+    "andifoti@sbcglobal.net",
+    "andrea.bauman.96@facebook.com",
+    "angela.oneal@gmail.com",
+    "angieveronese@gmail.com",
+    "annie@ahstevens.com",
+    "annlang68@yahoo.com",
+    "annniles@dairy-dreams.com",
+    "Aprsrccpa@gmail.com",
+    "arestovich@gmail.com",
+    "ari.sussman@gmail.com",
+    "artemis1300@hotmail.com",
+    "ashlynnwade89@gmail.com",
+    "astrid@an-research.com",
+    "atafralis@intero.com",
+    "atpropertyhomes@gmail.com",
+    "auntiesue3@gmail.com",
+    "avoss756@gmail.com",
+    "b.pearce@hotmail.com",
+    "babsit@hotmail.com",
+    "barbara.c.brenner@icloud.com",
+    "barbie@umcontractors.com",
+    "Barry46@yahoo.com",
+    "bauble_insteps.42@icloud.com",
+    "bdgrammer@1callhome.com",
+    "bdgross@aol.com",
+    "bearbogen@gmail.com",
+    "bearstj@gmail.com",
+    "belt5@comcast.net",
+    "benbeeler@comcast.net",
+    "bethanyiocrain@gmail.com",
+    "betsyaschroeder@gmail.com",
+    "bhargavpatel1@yahoo.com",
+    "bhissongdmd@icloud.com",
+    "bigburge1974@comcast.net",
+    "billdeb101202@gmail.com",
+    "billk@sit-co.net",
+    "billy.lyons@gmail.com",
+    "bmf3@mac.com",
+    "bmmail01@gmail.com",
+    "bob@excelleron.com",
+    "brandon@practacbr.com",
+    "brettbostwick@aol.com",
+    "Brian.Bradsher@yahoo.com",
+    "brinnaner98@gmail.com",
+    "brittany.wilkinson@me.com",
+    "britter@scrtc.com",
+    "brownfelder@gmail.com",
+    "bs.martin@me.com",
+    "buck2212@yahoo.com",
+    "burtonfive5577@gmail.com",
+    "cameronmoore89@yahoo.com",
+    "carlyjoe@hotmail.com",
+    "carmennordstrand@icloud.com",
+    "carolinecurrier3@gmail.com",
+    "carolinejpereira2@gmail.com",
+    "carrie.showalter2@gmail.com",
+    "carruthers_ci@hotmail.com",
+    "caryfowler@mac.com",
+    "cathieastorey@gmail.com",
+    "cathyjowheeler@bellsouth.net",
+    "cb_singer@yahoo.com",
+    "cberchuck@gmail.com",
+    "cbibbryant@gmail.com",
+    "cbrudolph@gmail.com",
+    "cburnsnc1@gmail.com",
+    "ccampbell6179@gmail.com",
+    "cflavin@wholeleader.com",
+    "chelemarsh@aol.com",
+    "cherylawb@msn.com",
+    "chollanddvm@Gmail.com",
+    "chris.bach@gmail.com",
+    "chrislarellano@gmail.com",
+    "chrislclary@gmail.com",
+    "christian.frueh@gmail.com",
+    "christine.reynolds.white@gmail.com",
+    "cindy@jdalexander.com",
+    "cjbuckley01@gmail.com",
+    "cjwiersum@aol.com",
+    "ckoether@kitchenbrains.com",
+    "clark@vidsol.media",
+    "claudecrocker@gmail.com",
+    "cliflawson@comcast.net",
+    "cole.mshawn@gmail.com",
+    "colin.hanna15@gmail.com",
+    "conceptii@att.net",
+    "conrad1947@hotmail.com",
+    "courtneyjonesshannon@gmail.com",
+    "cplgeorge@yahoo.com",
+    "craigmelvin803@gmail.com",
+    "craigwash1@aol.com",
+    "craininv@gmail.com",
+    "crensky79@gmail.com",
+    "curlyfrog8@gmail.com",
+    "cwmorse52@gmail.com",
+    "cyllu85@me.com",
+    "dadybrawls@aol.com",
+    "dakinshoemaker@gmail.com",
+    "dan@smithprint.net",
+    "dan@thebarnesfamily.com",
+    "danamcniel@hotmail.com",
+    "dandpt@charter.net",
+    "daniellemeyer8640@gmail.com",
+    "danny_s@cox.net",
+    "dantaylor1981@hotmail.com",
+    "dapper1328@aol.com",
+    "darci.ulrich@gmail.com",
+    "darl4865@att.net",
+    "davidallan3@live.com",
+    "davidmartin10@mac.com",
+    "dawkinsamy5@gmail.com",
+    "dawn@boswellandmoore.com",
+    "daynaetaylor@yahoo.com",
+    "dbarker910@gmail.com",
+    "dbenkendorf2580@gmail.com",
+    "ddresely@comcast.net",
+    "deannamking@gmail.com",
+    "debbiehann@gmail.com",
+    "deerrick@swbell.net",
+    "dennis43440@aol.com",
+    "des6557@gmail.com",
+    "dgately89@gmail.com",
+    "dgulick@protonmail.com",
+    "dhallman5095@yahoo.com",
+    "dick.lakebj@gmail.com",
+    "didickers@aol.com",
+    "dihenson@comcast.net",
+    "diverkdavis@hotmail.com",
+    "djhartman2271@comcast.net",
+    "dkranich@gmail.com",
+    "dmwhite77@hotmail.com",
+    "dmyers52@gmail.com",
+    "dnewsch@gmail.com",
+    "dogilama@yahoo.com",
+    "donald.c.lee@gmail.com",
+    "donaldw62@gmail.com",
+    "donna_hewett@aol.com",
+    "doug_atchison@gmail.com",
+    "dougeb2002@yahoo.com",
+    "dpurdum122@gmail.com",
+    "dregarver@gmail.com",
+    "drickenmann803@gmail.com",
+    "drjacquilevesque@gmail.com",
+    "dschwans05@gmail.com",
+    "dstuber45@gmail.com",
+    "dulaneys1640@gmail.com",
+    "dwilliams5000@gmail.com",
+    "dwolfeden@gmail.com",
+    "dzlexus@gmail.com",
+    "e061453@yahoo.com",
+    "ebruce08@gmail.com",
+    "edwards.glenn@comcast.net",
+    "efcasper2u@gmail.com",
+    "elipinski123@gmail.com",
+    "ellens1229@comcast.net",
+    "ellisk205@gmail.com",
+    "ellorygraff23@gmail.com",
+    "elm1100@att.net",
+    "emilymclex@gmail.com",
+    "erchilders@outlook.com",
+    "erika.olsen87@gmail.com",
+    "erinbarry@mac.com",
+    "eveltwin1@icloud.com",
+    "evelynward1961@gmail.com",
+    "ewoodruff@satx.rr.com",
+    "ezzieok@gmail.com",
+    "firdoc23@Reagan.com",
+    "fisherh15@gmail.com",
+    "fjbeeck@optonline.net",
+    "flyingdr1964@gmail.com",
+    "fndrbp@icloud.com",
+    "francahaas02@gmail.com",
+    "frankr@sbslp.com",
+    "frasco711@outlook.com",
+    "frequenttraveler2015@gmail.com",
+    "fvogel1321@gmail.com",
+    "gaaap@buckeye-express.com",
+    "gagglematt@gmail.com",
+    "garyschoenhouse@gmail.com",
+    "gbruno3@gmail.com",
+    "gcarson47@gmail.com",
+    "georgannebyrd@yahoo.com",
+    "gerardwelch10@me.com",
+    "ggood1628@aol.co",
+    "gibbspatrick@patrickfamilyfarms.com",
+    "glen@bescoassociates.com",
+    "gloriage819@gmail.com",
+    "gpowell763@gmail.com",
+    "greenwoodesg@gmail.com",
+    "gregoryashantz@gmail.com",
+    "gregsticka@icloud.com",
+    "gromit1.nf@gmail.com",
+    "gsgibson@icloud.com",
+    "gtrieger@aol.com",
+    "guillermo_tapia@hotmail.com",
+    "guillermorego@yahoo.com",
+    "guinnrapps@gmail.com",
+    "guyurtalking2@gmail.com",
+    "hammyus@hotmail.com",
+    "hassner@att.net",
+    "hauck8621@outlook.com",
+    "hawilliams1962@hitmail.com",
+    "hayward@cardtrop.shop",
+    "hctiger2002mv@gmail.com",
+    "heather20007@gmail.com",
+    "heatherchuitt@hotmail.com",
+    "henleyroger@yahoo.com",
+    "hgrantham1@gmail.com",
+    "hkwatt44@gmail.com",
+    "hlarrymays@gmail.com",
+    "hmjensen@earthlink.net",
+    "hodsondrsd@gmail.com",
+    "hokieapc@yahoo.com",
+    "holidaytuttle@me.com",
+    "hshields2021@gmail.com",
+    "hundred81_flashes@icloud.com",
+    "hunterstephen977@gmail.com",
+    "icrlemmor@aol.com",
+    "idahojoe66@gmail.com",
+    "incognito@twc.com",
+    "ingaklusa2003@yahoo.com",
+    "investigativeproducts@ymail.com",
+    "isaacbeste39@gmail.com",
+    "izager@comcast.net",
+    "izghami11@gmail.com",
+    "J2526sing@gmail.com",
+    "jabencox@gmail.com",
+    "jalton17@gmail.com",
+    "jamesdiem59@gmail.com",
+    "JamesSchmidt678@outlook.com",
+    "jamosg2025@gmail.com",
+    "janetmdavis9@gmail.com",
+    "janettanguay@hammockwayoflife.com",
+    "jason_kwintner@comcast.net",
+    "javalyon1@aol.com",
+    "jay.mcrae@pfizer.com",
+    "jcatandella@yahoo.com",
+    "jchapmandds@yahoo.com",
+    "jcheath@nc.rr.com",
+    "jcrohde@gmail.com",
+    "jcwatson@alumni.stanford.edu",
+    "jdandlauri1985@gmail.com",
+    "jeaninethornton@icloud.com",
+    "jeff.turnage59@yahoo.com",
+    "jemilhorn@charter.net",
+    "jenldaniel06@gmail.com",
+    "jennifer@hermannfurniture.com",
+    "jenniferbrisbin@yahoo.com",
+    "jessegraham2010@gmail.com",
+    "jessica.frasco@gmail.com",
+    "jessica_toll@kindermorgan.com",
+    "jewett.michael.j@gmail.com",
+    "jewls425@me.com",
+    "jganderson96@gmail.com",
+    "jhjh333@sbcglobal.net",
+    "jhouse@greatsouthernbank.com",
+    "jimb@boydinsurance.com",
+    "jimbohebert@hotmail.com",
+    "jj34email@gmail.com",
+    "jlbayha@gmail.com",
+    "jmax4508@gmail.com",
+    "jmeyers@imaginepub.com",
+    "jmhale1@msn.com",
+    "jmigas@yahoo.com",
+    "jmshugars@gmail.com",
+    "joanna@jtdinc.com",
+    "jodi44@gmail.com",
+    "john.h.silver@gmail.com",
+    "john.ritter51@gmail.com",
+    "john@golfprollc.com",
+    "johnabarnes@gmail.com",
+    "johnbarney@bellsouth.net",
+    "johnhill2525@yahoo.com",
+    "johnmarty1376@aol.com",
+    "johnriemath@yahoo.com",
+    "johns@calvertinc.com",
+    "jonesmc@me.com",
+    "jpheineman@aol.com",
+    "jpunishill@gmail.com",
+    "jsearcy80@gmail.com",
+    "jsmann17@gmail.com",
+    "jsnmusselman@gmail.com",
+    "jsveselka@gmail.com",
+    "jt_sangsland@yahoo.com",
+    "jturner@stregisculvert.com",
+    "judit@studiogirlart.com",
+    "judyeggleston@aol.com",
+    "juliebergenevents@gmail.com",
+    "julsmastro@me.com",
+    "jumpit54@yahoo.com",
+    "june@bayhagroup.com",
+    "jweir@icloud.com",
+    "jweiss831@gmail.com",
+    "jwilsonfzr@gmail.com",
+    "k8winterton@gmail.com",
+    "karenmb7@yahoo.com",
+    "karenr@sbslp.com",
+    "karensubs@icloud.com",
+    "kari.sagehorn73@gmail.com",
+    "karibdmd@gmail.com",
+    "karishadevlin@gmail.com",
+    "karsten@skyt.com",
+    "katherineames469@gmail.com",
+    "kathybivens@icloud.com",
+    "kathynicod@verizon.net",
+    "katrin@pdxrevival.com",
+    "kbansfam@comcast.net",
+    "kbennett86@gmail.com",
+    "kbretz@comcast.net",
+    "kbriefel@comcast.net",
+    "kcolwell77@comcast.net",
+    "kdians@aol.com",
+    "keith@hogantitle.com",
+    "kellymoore.zv@gmail.com",
+    "ken.kuziel@att.net",
+    "kenglish947@gmail.com",
+    "kerri.holm@gmail.com",
+    "Kerry@khirsh.com",
+    "kevin.dakota.suess24@gmail.com",
+    "kevin.page@yanfeng.com",
+    "kevin@umcontractors.com",
+    "keyskim.gaddy1981@gmail.com",
+    "kgiles1999@yahoo.com",
+    "kgrieff2012@gmail.com",
+    "khkelly2@gmail.com",
+    "kielrois@gmail.com",
+    "kilburn.landry@gmail.com",
+    "kimberlyhasenberg@yahoo.com",
+    "kithaxton@gmail.com",
+    "klig@dentistryoldetowne.com",
+    "kmelder129@yahoo.com",
+    "kpennshop@gmail.com",
+    "kristin_ludwig@yahoo.com",
+    "kristina.gedgaudas@gmail.com",
+    "kskf@earthlink.net",
+    "ksnixon@gmail.com",
+    "ksomoza@gmail.com",
+    "ksouza@alleghenyenviron.com",
+    "kstehmer@gmail.com",
+    "ksumner@athensk8.net",
+    "ktm991@comcast.net",
+    "kwildman@neo.rr.com",
+    "kwolin@gmail.com",
+    "kyle.j.stevens@gmail.com",
+    "laltmann@reliapath.com",
+    "lamj10@aol.com",
+    "lauren.vanduser@gmail.com",
+    "lee.blomquist@gmail.com",
+    "leitha.olson57@gmail.com",
+    "lesleyd@elpasotel.net",
+    "lesly_curtis@yahoo.com",
+    "libbybullock501@gmail.com",
+    "lilabell20@gmail.com",
+    "limelizard@charter.net",
+    "lindahar52@gmail.com",
+    "lindaiknoll@gmail.com",
+    "lindsbarber6@gmail.com",
+    "Lindsey.a.driscoll@gmail.com",
+    "lipriebe@aol.com",
+    "lisapate@cox.net",
+    "lisaphipps3@gmail.com",
+    "lisarajek@gmail.com",
+    "liv6903@yahoo.com",
+    "lizcharnes@gmail.com",
+    "lkasman@gmail.com",
+    "lmorriso@ma.rr.com",
+    "loridreilly@gmail.com",
+    "loritracy@sdhca.org",
+    "lscott11@columbus.rr.com",
+    "luckysnoop77@yahoo.com",
+    "lynnajohnson72@gmail.com",
+    "Lynnecpacer@aol.com",
+    "lyonkss69@gmail.com",
+    "mac036985111@yahoo.com",
+    "mactools1963@gmail.com",
+    "maddoxpatricia@hotmail.com",
+    "madelynhubbard@icloud.com",
+    "madie125@yahoo.com",
+    "malshopping@protonmail.com",
+    "manocc22@gmail.com",
+    "marc.lebaron@lincolnindustries.com",
+    "marcusfurn@iglou.com",
+    "mark@salquist.com",
+    "marmed1@aol.com",
+    "maronna@g.com",
+    "mary.ellen.rucks@gmail.com",
+    "mattwiggins78@gmail.com",
+    "mayojessica75@gmail.com",
+    "mbmallon13@gmail.com",
+    "mcobri2@gmail.com",
+    "mcollins@centralsc.org",
+    "mda187eb@gmail.com",
+    "mdsmith@hiwaay.net",
+    "mem5425@gmail.com",
+    "meridithm98@gmail.com",
+    "mfawcett8@gmail.com",
+    "mhearn@att.net",
+    "michael_mc@live.com",
+    "michaelchirschi@gmail.com",
+    "michaelrdover@hotmail.com",
+    "michaelthillan@gmail.com",
+    "michellewitteveen@yahoo.com",
+    "mikeaviation@gmail.com",
+    "mikecauldwell@gmail.com",
+    "mikemackie@mac.com",
+    "mikemulka@hotmail.com",
+    "millsed73@protonmail.com",
+    "mimiamoore53@gmail.com",
+    "missybest40@gmail.com",
+    "mjstraley@comcast.net",
+    "mkrohn129@gmail.com",
+    "ml_taylor@comcast.net",
+    "mlfoley3@gmail.com",
+    "mlucchesi@comcast.net",
+    "momoneyathome@gmail.com",
+    "monicawillis64@gmail.com",
+    "morgan.majopian@gmail.com",
+    "mroberts@scqc.org",
+    "mrskatyfrank@gmail.com",
+    "ms1126@hotmail.comm",
+    "mstevensrdn@gmail.com",
+    "mtiszai@cfl.rr.com",
+    "muddcat1144@att.net",
+    "mylifecoachtoo@comcast.net",
+    "mysque@aol.com",
+    "nabroussard@cox.net",
+    "nathanhuber2014@gmail.com",
+    "natler1@hotmail.com",
+    "navcax@gmail.com",
+    "ndmize@outlook.com",
+    "nhc.217@gmail.com",
+    "nick.remelts@gmail.com",
+    "nikolas.markos@gmail.com",
+    "nilwon23@hotmail.com",
+    "nloggy@gvtc.com",
+    "noony49@sbcglobal.net",
+    "Nvba712@gmail.com",
+    "orlandorockwell@hotmail.com",
+    "ousleyamanda09@gmail.com",
+    "oznewton@mac.com",
+    "palanhicks@gmail.com",
+    "palcer@comcast.net",
+    "pamalama2009@gmail.com",
+    "pattihellyer@gmail.com",
+    "paulejennings@bellsouth.net",
+    "pdhubert213@gmail.com",
+    "pendoc@cfl.rr.com",
+    "pesposito@charter.net",
+    "petesky71@gmail.com",
+    "phyllismadren@gmail.com",
+    "pjwrobert@aol.com",
+    "poneilll10@comcast.net",
+    "ppaclinic@gmail.com",
+    "pzivley@cmzlaw.net",
+    "randienjones@yahoo.com",
+    "ranger88a@gmail.com",
+    "rbucholtz@gmail.com",
+    "rccola668@gmail.com",
+    "rdksrammel@bellsouth.net",
+    "rebeccabanerji@gmail.com",
+    "rebekahwiggins@sbcglobal.net",
+    "redhatgator@yahoo.com",
+    "reese.baker@sbcglobl.net",
+    "REIDFAWCETT@GMAIL.COM",
+    "reidtx2579@gmail.com",
+    "rfabrici@yahoo.com",
+    "rich.altman60@gmail.com",
+    "richard.cox1135@aol.com",
+    "richcies@tir.com",
+    "rick@americanzealotproductions.com",
+    "rickdti@msn.com",
+    "rishman8881@gmail.com",
+    "ritz68@aol.com",
+    "rjarends@me.com",
+    "rjlpartner@aol.com",
+    "rlahoff@hallsgarden.com",
+    "robert.hartigan@aviagogy.com",
+    "robertdurish@gmail.com",
+    "robjiarrett@aol.com",
+    "robmaugeri@yahoo.com",
+    "roderick802@gmail.com",
+    "rolltideroll44@gmail.com",
+    "ron@rlewisconstruction.net",
+    "ronnieandei@verizon.net",
+    "rosehillya@me.com",
+    "rosesq328@msn.com",
+    "rosinskig@hswc.com",
+    "rowefamily7@comcast.net",
+    "roy.reasor@yahoo.com",
+    "rpsesq@dslawny.com",
+    "rrigby19@gmail.com",
+    "rsontheair@gmail.com",
+    "rtrefzer@hotmail.com",
+    "rwright112345@gmail.com",
+    "ryan@equinox-development.com",
+    "ryan@longcliff.com",
+    "ryansethtaylor@hotmail.com",
+    "ryderkirgolf@aol.com",
+    "S@sosarris.com",
+    "samanthawilkin3324@att.net",
+    "sandymrussell1968@gmail.com",
+    "santonict@comcast.net",
+    "saperkinson@gmail.com",
+    "sasday@tampabay.rr.com",
+    "scarlton925@yahoo.com",
+    "scotto@ollenburgmotors.com",
+    "scsheprd@gmail.com",
+    "scverdery@gmail.com",
+    "scwissman54@gmail.com",
+    "seamuspcarey@gmail.com",
+    "seanbradio@Gmail.com",
+    "secwikla@icloud.com",
+    "sferlo4@gmail.com",
+    "sgruenheid@gmail.com",
+    "sgtgatekeeper@gmail.com",
+    "shanvalijen@gmail.com",
+    "sharon@rmscotati.com",
+    "shauna.keough@syneoshealth.com",
+    "shea.nangle@gmail.com",
+    "sheilathayer2@gmail.com",
+    "shelly.sccconstruction@gmail.com",
+    "sherri_zhou@harmoniqo.com",
+    "shli@me.com",
+    "sledhead36@aol.com",
+    "slehman25850tmi@comcast.net",
+    "smorr911@gmail.com",
+    "snavarrete@mpwonline.com",
+    "Spearsall58@gmail.com",
+    "spicerhousekaty@yahoo.com",
+    "Squaz115@me.com",
+    "squiddy09@aol.com",
+    "srseymour11@gmail.com",
+    "ssengineer2001@yahoo.com",
+    "ssmith53.al@gmail.com",
+    "ssrdeb@gmail.com",
+    "stacy.nvonhoffman@gmail.com",
+    "stan.vela@gmail.com",
+    "stephencyruscopenhaver@yahoo.com",
+    "stephendkane@gmail.com",
+    "sterlingcleancarpet@gmail.com",
+    "stevegrosscup@gmail.com",
+    "stevepenn14@hotmail.com",
+    "strefzer@sbcglobal.net",
+    "stuphelps@gmail.com",
+    "sueforys@yahoo.com",
+    "suekain63@gmail.com",
+    "sunshine4u1972@att.net",
+    "susan.benac@gmail.com",
+    "susanhuber1@hotmail.com",
+    "susanparrish@mac.com",
+    "suzan_limaye@hotmail.com",
+    "suzy.townsend1@gmail.com",
+    "swebb757@gmail.com",
+    "sybaris412@hotmail.com",
+    "tbarritt@bernards.com",
+    "teniola.akinwale@gmail.com",
+    "terrielynn_baldwin@hotmail.com",
+    "tfawcett@goldenrodcompanies.com",
+    "tfischer2117@gmail.com",
+    "thebeginning2@gmail.com",
+    "theikens043@gmail.com",
+    "thomas.krebs16@gmail.com",
+    "thomaspschur@gmail.com",
+    "tim.miller1207@gmail.com",
+    "titaearly@hotmail.com",
+    "tj@titate.com",
+    "tjstowell@gmail.com",
+    "tlefkow@hotmail.com",
+    "tlewiscpa@gmail.com",
+    "tmcrauen@gmail.com",
+    "tom.raney@jedunn.com",
+    "travistelder@bresnan.net",
+    "tschwans@hotmail.com",
+    "tstangel77@gmail.com",
+    "ttmiller9@gmail.com",
+    "tyree022@yahoo.com",
+    "undrpar66@gmail.com",
+    "V238758@YAHOO.COM",
+    "valeriepascoe@gmail.com",
+    "villain714@yahoo.com",
+    "vincent.barresi@gmail.com",
+    "viscuglia@gmail.com",
+    "vkcastillo@gmail.com",
+    "vlcaughman1982@gmail.com",
+    "vspahrewin@gmail.com",
+    "w.t.taekwondoman@st-tel.net",
+    "wanickles3@gmail.com",
+    "wbrannagan@comcast.net",
+    "wedmorei@msn.com",
+    "wesherratt@gmail.com",
+    "wgipsonfl40@gmail.com",
+    "wgurgun1971@outlook.com",
+    "whowould@aol.com",
+    "williamprego10@yahoo.com",
+    "wilson123314@bellsouth.net",
+    "witchman@comcast.net",
+    "woodruffej@gmail.com",
+    "wooseybennett1@gmail.com",
+    "wstorick@gmail.com",
+    "wwstacy13@gmail.com",
+    "wwwtbu@gmail.com",
+    "zasha_zepeda@yahoo.com",
+]
+
+
+# Column order shared by the bulk import paths and the CSV export
+CUSTOMER_EMAIL_COLUMNS = ('email', 'orders', 'total_spend', 'aov', 'first_order', 'last_order', 'source')
+CUSTOMER_IMPORT_BATCH = 5000   # rows per execute_values / executemany round trip
+CUSTOMER_STREAM_BATCH = 1000   # rows per page when iterating the list for campaigns / export
+
+# CSV header (lower-cased) -> column; accepts our own export format and the Mash Networks one
+_CUSTOMER_CSV_HEADERS = {
+    'email': 'email', 'email address': 'email', 'e-mail': 'email',
+    'orders': 'orders', 'order count': 'orders',
+    'total spend': 'total_spend', 'total_spend': 'total_spend',
+    'aov': 'aov',
+    'first order': 'first_order', 'first_order': 'first_order',
+    'last order': 'last_order', 'last_order': 'last_order',
+}
+
+
+def _csv_number(value, cast, default):
+    """Parse '1,234' / '$56.70' style spreadsheet numbers, falling back to default."""
+    if not value:
+        return default
     try:
-        _execute(conn, "DELETE FROM customer_emails")
-        emails = [
-            "07-sparkly.piccolo@icloud.com",
-            "073bmw@gmail.com",
-            "1994sadlers@gmail.com",
-            "1audreydavis@gmail.com",
-            "88STEPHLOVA@GMAIL.COM",
-            "aaw8752@gmail.com",
-            "aclema2@gmail.com",
-            "adamdart@gmail.com",
-            "advdance@aol.com",
-            "aggrobait@gmail.com",
-            "alan_schubert@icloud.com",
-            "alpinetim72@gmail.com",
-            "amandagiannini@gmail.com",
-            "amy.worthington.91@att.net",
-            "amygo5900@gmail.com",
-            "andersonpalmetto@gmail.com",
-            "andersonusc@icloud.com",
-            "andifoti@sbcglobal.net",
-            "andrea.bauman.96@facebook.com",
-            "angela.oneal@gmail.com",
-            "angieveronese@gmail.com",
-            "annie@ahstevens.com",
-            "annlang68@yahoo.com",
-            "annniles@dairy-dreams.com",
-            "Aprsrccpa@gmail.com",
-            "arestovich@gmail.com",
-            "ari.sussman@gmail.com",
-            "artemis1300@hotmail.com",
-            "ashlynnwade89@gmail.com",
-            "astrid@an-research.com",
-            "atafralis@intero.com",
-            "atpropertyhomes@gmail.com",
-            "auntiesue3@gmail.com",
-            "avoss756@gmail.com",
-            "b.pearce@hotmail.com",
-            "babsit@hotmail.com",
-            "barbara.c.brenner@icloud.com",
-            "barbie@umcontractors.com",
-            "Barry46@yahoo.com",
-            "bauble_insteps.42@icloud.com",
-            "bdgrammer@1callhome.com",
-            "bdgross@aol.com",
-            "bearbogen@gmail.com",
-            "bearstj@gmail.com",
-            "belt5@comcast.net",
-            "benbeeler@comcast.net",
-            "bethanyiocrain@gmail.com",
-            "betsyaschroeder@gmail.com",
-            "bhargavpatel1@yahoo.com",
-            "bhissongdmd@icloud.com",
-            "bigburge1974@comcast.net",
-            "billdeb101202@gmail.com",
-            "billk@sit-co.net",
-            "billy.lyons@gmail.com",
-            "bmf3@mac.com",
-            "bmmail01@gmail.com",
-            "bob@excelleron.com",
-            "brandon@practacbr.com",
-            "brettbostwick@aol.com",
-            "Brian.Bradsher@yahoo.com",
-            "brinnaner98@gmail.com",
-            "brittany.wilkinson@me.com",
-            "britter@scrtc.com",
-            "brownfelder@gmail.com",
-            "bs.martin@me.com",
-            "buck2212@yahoo.com",
-            "burtonfive5577@gmail.com",
-            "cameronmoore89@yahoo.com",
-            "carlyjoe@hotmail.com",
-            "carmennordstrand@icloud.com",
-            "carolinecurrier3@gmail.com",
-            "carolinejpereira2@gmail.com",
-            "carrie.showalter2@gmail.com",
-            "carruthers_ci@hotmail.com",
-            "caryfowler@mac.com",
-            "cathieastorey@gmail.com",
-            "cathyjowheeler@bellsouth.net",
-            "cb_singer@yahoo.com",
-            "cberchuck@gmail.com",
-            "cbibbryant@gmail.com",
-            "cbrudolph@gmail.com",
-            "cburnsnc1@gmail.com",
-            "ccampbell6179@gmail.com",
-            "cflavin@wholeleader.com",
-            "chelemarsh@aol.com",
-            "cherylawb@msn.com",
-            "chollanddvm@Gmail.com",
-            "chris.bach@gmail.com",
-            "chrislarellano@gmail.com",
-            "chrislclary@gmail.com",
-            "christian.frueh@gmail.com",
-            "christine.reynolds.white@gmail.com",
-            "cindy@jdalexander.com",
-            "cjbuckley01@gmail.com",
-            "cjwiersum@aol.com",
-            "ckoether@kitchenbrains.com",
-            "clark@vidsol.media",
-            "claudecrocker@gmail.com",
-            "cliflawson@comcast.net",
-            "cole.mshawn@gmail.com",
-            "colin.hanna15@gmail.com",
-            "conceptii@att.net",
-            "conrad1947@hotmail.com",
-            "courtneyjonesshannon@gmail.com",
-            "cplgeorge@yahoo.com",
-            "craigmelvin803@gmail.com",
-            "craigwash1@aol.com",
-            "craininv@gmail.com",
-            "crensky79@gmail.com",
-            "curlyfrog8@gmail.com",
-            "cwmorse52@gmail.com",
-            "cyllu85@me.com",
-            "dadybrawls@aol.com",
-            "dakinshoemaker@gmail.com",
-            "dan@smithprint.net",
-            "dan@thebarnesfamily.com",
-            "danamcniel@hotmail.com",
-            "dandpt@charter.net",
-            "daniellemeyer8640@gmail.com",
-            "danny_s@cox.net",
-            "dantaylor1981@hotmail.com",
-            "dapper1328@aol.com",
-            "darci.ulrich@gmail.com",
-            "darl4865@att.net",
-            "davidallan3@live.com",
-            "davidmartin10@mac.com",
-            "dawkinsamy5@gmail.com",
-            "dawn@boswellandmoore.com",
-            "daynaetaylor@yahoo.com",
-            "dbarker910@gmail.com",
-            "dbenkendorf2580@gmail.com",
-            "ddresely@comcast.net",
-            "deannamking@gmail.com",
-            "debbiehann@gmail.com",
-            "deerrick@swbell.net",
-            "dennis43440@aol.com",
-            "des6557@gmail.com",
-            "dgately89@gmail.com",
-            "dgulick@protonmail.com",
-            "dhallman5095@yahoo.com",
-            "dick.lakebj@gmail.com",
-            "didickers@aol.com",
-            "dihenson@comcast.net",
-            "diverkdavis@hotmail.com",
-            "djhartman2271@comcast.net",
-            "dkranich@gmail.com",
-            "dmwhite77@hotmail.com",
-            "dmyers52@gmail.com",
-            "dnewsch@gmail.com",
-            "dogilama@yahoo.com",
-            "donald.c.lee@gmail.com",
-            "donaldw62@gmail.com",
-            "donna_hewett@aol.com",
-            "doug_atchison@gmail.com",
-            "dougeb2002@yahoo.com",
-            "dpurdum122@gmail.com",
-            "dregarver@gmail.com",
-            "drickenmann803@gmail.com",
-            "drjacquilevesque@gmail.com",
-            "dschwans05@gmail.com",
-            "dstuber45@gmail.com",
-            "dulaneys1640@gmail.com",
-            "dwilliams5000@gmail.com",
-            "dwolfeden@gmail.com",
-            "dzlexus@gmail.com",
-            "e061453@yahoo.com",
-            "ebruce08@gmail.com",
-            "edwards.glenn@comcast.net",
-            "efcasper2u@gmail.com",
-            "elipinski123@gmail.com",
-            "ellens1229@comcast.net",
-            "ellisk205@gmail.com",
-            "ellorygraff23@gmail.com",
-            "elm1100@att.net",
-            "emilymclex@gmail.com",
-            "erchilders@outlook.com",
-            "erika.olsen87@gmail.com",
-            "erinbarry@mac.com",
-            "eveltwin1@icloud.com",
-            "evelynward1961@gmail.com",
-            "ewoodruff@satx.rr.com",
-            "ezzieok@gmail.com",
-            "firdoc23@Reagan.com",
-            "fisherh15@gmail.com",
-            "fjbeeck@optonline.net",
-            "flyingdr1964@gmail.com",
-            "fndrbp@icloud.com",
-            "francahaas02@gmail.com",
-            "frankr@sbslp.com",
-            "frasco711@outlook.com",
-            "frequenttraveler2015@gmail.com",
-            "fvogel1321@gmail.com",
-            "gaaap@buckeye-express.com",
-            "gagglematt@gmail.com",
-            "garyschoenhouse@gmail.com",
-            "gbruno3@gmail.com",
-            "gcarson47@gmail.com",
-            "georgannebyrd@yahoo.com",
-            "gerardwelch10@me.com",
-            "ggood1628@aol.co",
-            "gibbspatrick@patrickfamilyfarms.com",
-            "glen@bescoassociates.com",
-            "gloriage819@gmail.com",
-            "gpowell763@gmail.com",
-            "greenwoodesg@gmail.com",
-            "gregoryashantz@gmail.com",
-            "gregsticka@icloud.com",
-            "gromit1.nf@gmail.com",
-            "gsgibson@icloud.com",
-            "gtrieger@aol.com",
-            "guillermo_tapia@hotmail.com",
-            "guillermorego@yahoo.com",
-            "guinnrapps@gmail.com",
-            "guyurtalking2@gmail.com",
-            "hammyus@hotmail.com",
-            "hassner@att.net",
-            "hauck8621@outlook.com",
-            "hawilliams1962@hitmail.com",
-            "hayward@cardtrop.shop",
-            "hctiger2002mv@gmail.com",
-            "heather20007@gmail.com",
-            "heatherchuitt@hotmail.com",
-            "henleyroger@yahoo.com",
-            "hgrantham1@gmail.com",
-            "hkwatt44@gmail.com",
-            "hlarrymays@gmail.com",
-            "hmjensen@earthlink.net",
-            "hodsondrsd@gmail.com",
-            "hokieapc@yahoo.com",
-            "holidaytuttle@me.com",
-            "hshields2021@gmail.com",
-            "hundred81_flashes@icloud.com",
-            "hunterstephen977@gmail.com",
-            "icrlemmor@aol.com",
-            "idahojoe66@gmail.com",
-            "incognito@twc.com",
-            "ingaklusa2003@yahoo.com",
-            "investigativeproducts@ymail.com",
-            "isaacbeste39@gmail.com",
-            "izager@comcast.net",
-            "izghami11@gmail.com",
-            "J2526sing@gmail.com",
-            "jabencox@gmail.com",
-            "jalton17@gmail.com",
-            "jamesdiem59@gmail.com",
-            "JamesSchmidt678@outlook.com",
-            "jamosg2025@gmail.com",
-            "janetmdavis9@gmail.com",
-            "janettanguay@hammockwayoflife.com",
-            "jason_kwintner@comcast.net",
-            "javalyon1@aol.com",
-            "jay.mcrae@pfizer.com",
-            "jcatandella@yahoo.com",
-            "jchapmandds@yahoo.com",
-            "jcheath@nc.rr.com",
-            "jcrohde@gmail.com",
-            "jcwatson@alumni.stanford.edu",
-            "jdandlauri1985@gmail.com",
-            "jeaninethornton@icloud.com",
-            "jeff.turnage59@yahoo.com",
-            "jemilhorn@charter.net",
-            "jenldaniel06@gmail.com",
-            "jennifer@hermannfurniture.com",
-            "jenniferbrisbin@yahoo.com",
-            "jessegraham2010@gmail.com",
-            "jessica.frasco@gmail.com",
-            "jessica_toll@kindermorgan.com",
-            "jewett.michael.j@gmail.com",
-            "jewls425@me.com",
-            "jganderson96@gmail.com",
-            "jhjh333@sbcglobal.net",
-            "jhouse@greatsouthernbank.com",
-            "jimb@boydinsurance.com",
-            "jimbohebert@hotmail.com",
-            "jj34email@gmail.com",
-            "jlbayha@gmail.com",
-            "jmax4508@gmail.com",
-            "jmeyers@imaginepub.com",
-            "jmhale1@msn.com",
-            "jmigas@yahoo.com",
-            "jmshugars@gmail.com",
-            "joanna@jtdinc.com",
-            "jodi44@gmail.com",
-            "john.h.silver@gmail.com",
-            "john.ritter51@gmail.com",
-            "john@golfprollc.com",
-            "johnabarnes@gmail.com",
-            "johnbarney@bellsouth.net",
-            "johnhill2525@yahoo.com",
-            "johnmarty1376@aol.com",
-            "johnriemath@yahoo.com",
-            "johns@calvertinc.com",
-            "jonesmc@me.com",
-            "jpheineman@aol.com",
-            "jpunishill@gmail.com",
-            "jsearcy80@gmail.com",
-            "jsmann17@gmail.com",
-            "jsnmusselman@gmail.com",
-            "jsveselka@gmail.com",
-            "jt_sangsland@yahoo.com",
-            "jturner@stregisculvert.com",
-            "judit@studiogirlart.com",
-            "judyeggleston@aol.com",
-            "juliebergenevents@gmail.com",
-            "julsmastro@me.com",
-            "jumpit54@yahoo.com",
-            "june@bayhagroup.com",
-            "jweir@icloud.com",
-            "jweiss831@gmail.com",
-            "jwilsonfzr@gmail.com",
-            "k8winterton@gmail.com",
-            "karenmb7@yahoo.com",
-            "karenr@sbslp.com",
-            "karensubs@icloud.com",
-            "kari.sagehorn73@gmail.com",
-            "karibdmd@gmail.com",
-            "karishadevlin@gmail.com",
-            "karsten@skyt.com",
-            "katherineames469@gmail.com",
-            "kathybivens@icloud.com",
-            "kathynicod@verizon.net",
-            "katrin@pdxrevival.com",
-            "kbansfam@comcast.net",
-            "kbennett86@gmail.com",
-            "kbretz@comcast.net",
-            "kbriefel@comcast.net",
-            "kcolwell77@comcast.net",
-            "kdians@aol.com",
-            "keith@hogantitle.com",
-            "kellymoore.zv@gmail.com",
-            "ken.kuziel@att.net",
-            "kenglish947@gmail.com",
-            "kerri.holm@gmail.com",
-            "Kerry@khirsh.com",
-            "kevin.dakota.suess24@gmail.com",
-            "kevin.page@yanfeng.com",
-            "kevin@umcontractors.com",
-            "keyskim.gaddy1981@gmail.com",
-            "kgiles1999@yahoo.com",
-            "kgrieff2012@gmail.com",
-            "khkelly2@gmail.com",
-            "kielrois@gmail.com",
-            "kilburn.landry@gmail.com",
-            "kimberlyhasenberg@yahoo.com",
-            "kithaxton@gmail.com",
-            "klig@dentistryoldetowne.com",
-            "kmelder129@yahoo.com",
-            "kpennshop@gmail.com",
-            "kristin_ludwig@yahoo.com",
-            "kristina.gedgaudas@gmail.com",
-            "kskf@earthlink.net",
-            "ksnixon@gmail.com",
-            "ksomoza@gmail.com",
-            "ksouza@alleghenyenviron.com",
-            "kstehmer@gmail.com",
-            "ksumner@athensk8.net",
-            "ktm991@comcast.net",
-            "kwildman@neo.rr.com",
-            "kwolin@gmail.com",
-            "kyle.j.stevens@gmail.com",
-            "laltmann@reliapath.com",
-            "lamj10@aol.com",
-            "lauren.vanduser@gmail.com",
-            "lee.blomquist@gmail.com",
-            "leitha.olson57@gmail.com",
-            "lesleyd@elpasotel.net",
-            "lesly_curtis@yahoo.com",
-            "libbybullock501@gmail.com",
-            "lilabell20@gmail.com",
-            "limelizard@charter.net",
-            "lindahar52@gmail.com",
-            "lindaiknoll@gmail.com",
-            "lindsbarber6@gmail.com",
-            "Lindsey.a.driscoll@gmail.com",
-            "lipriebe@aol.com",
-            "lisapate@cox.net",
-            "lisaphipps3@gmail.com",
-            "lisarajek@gmail.com",
-            "liv6903@yahoo.com",
-            "lizcharnes@gmail.com",
-            "lkasman@gmail.com",
-            "lmorriso@ma.rr.com",
-            "loridreilly@gmail.com",
-            "loritracy@sdhca.org",
-            "lscott11@columbus.rr.com",
-            "luckysnoop77@yahoo.com",
-            "lynnajohnson72@gmail.com",
-            "Lynnecpacer@aol.com",
-            "lyonkss69@gmail.com",
-            "mac036985111@yahoo.com",
-            "mactools1963@gmail.com",
-            "maddoxpatricia@hotmail.com",
-            "madelynhubbard@icloud.com",
-            "madie125@yahoo.com",
-            "malshopping@protonmail.com",
-            "manocc22@gmail.com",
-            "marc.lebaron@lincolnindustries.com",
-            "marcusfurn@iglou.com",
-            "mark@salquist.com",
-            "marmed1@aol.com",
-            "maronna@g.com",
-            "mary.ellen.rucks@gmail.com",
-            "mattwiggins78@gmail.com",
-            "mayojessica75@gmail.com",
-            "mbmallon13@gmail.com",
-            "mcobri2@gmail.com",
-            "mcollins@centralsc.org",
-            "mda187eb@gmail.com",
-            "mdsmith@hiwaay.net",
-            "mem5425@gmail.com",
-            "meridithm98@gmail.com",
-            "mfawcett8@gmail.com",
-            "mhearn@att.net",
-            "michael_mc@live.com",
-            "michaelchirschi@gmail.com",
-            "michaelrdover@hotmail.com",
-            "michaelthillan@gmail.com",
-            "michellewitteveen@yahoo.com",
-            "mikeaviation@gmail.com",
-            "mikecauldwell@gmail.com",
-            "mikemackie@mac.com",
-            "mikemulka@hotmail.com",
-            "millsed73@protonmail.com",
-            "mimiamoore53@gmail.com",
-            "missybest40@gmail.com",
-            "mjstraley@comcast.net",
-            "mkrohn129@gmail.com",
-            "ml_taylor@comcast.net",
-            "mlfoley3@gmail.com",
-            "mlucchesi@comcast.net",
-            "momoneyathome@gmail.com",
-            "monicawillis64@gmail.com",
-            "morgan.majopian@gmail.com",
-            "mroberts@scqc.org",
-            "mrskatyfrank@gmail.com",
-            "ms1126@hotmail.comm",
-            "mstevensrdn@gmail.com",
-            "mtiszai@cfl.rr.com",
-            "muddcat1144@att.net",
-            "mylifecoachtoo@comcast.net",
-            "mysque@aol.com",
-            "nabroussard@cox.net",
-            "nathanhuber2014@gmail.com",
-            "natler1@hotmail.com",
-            "navcax@gmail.com",
-            "ndmize@outlook.com",
-            "nhc.217@gmail.com",
-            "nick.remelts@gmail.com",
-            "nikolas.markos@gmail.com",
-            "nilwon23@hotmail.com",
-            "nloggy@gvtc.com",
-            "noony49@sbcglobal.net",
-            "Nvba712@gmail.com",
-            "orlandorockwell@hotmail.com",
-            "ousleyamanda09@gmail.com",
-            "oznewton@mac.com",
-            "palanhicks@gmail.com",
-            "palcer@comcast.net",
-            "pamalama2009@gmail.com",
-            "pattihellyer@gmail.com",
-            "paulejennings@bellsouth.net",
-            "pdhubert213@gmail.com",
-            "pendoc@cfl.rr.com",
-            "pesposito@charter.net",
-            "petesky71@gmail.com",
-            "phyllismadren@gmail.com",
-            "pjwrobert@aol.com",
-            "poneilll10@comcast.net",
-            "ppaclinic@gmail.com",
-            "pzivley@cmzlaw.net",
-            "randienjones@yahoo.com",
-            "ranger88a@gmail.com",
-            "rbucholtz@gmail.com",
-            "rccola668@gmail.com",
-            "rdksrammel@bellsouth.net",
-            "rebeccabanerji@gmail.com",
-            "rebekahwiggins@sbcglobal.net",
-            "redhatgator@yahoo.com",
-            "reese.baker@sbcglobl.net",
-            "REIDFAWCETT@GMAIL.COM",
-            "reidtx2579@gmail.com",
-            "rfabrici@yahoo.com",
-            "rich.altman60@gmail.com",
-            "richard.cox1135@aol.com",
-            "richcies@tir.com",
-            "rick@americanzealotproductions.com",
-            "rickdti@msn.com",
-            "rishman8881@gmail.com",
-            "ritz68@aol.com",
-            "rjarends@me.com",
-            "rjlpartner@aol.com",
-            "rlahoff@hallsgarden.com",
-            "robert.hartigan@aviagogy.com",
-            "robertdurish@gmail.com",
-            "robjiarrett@aol.com",
-            "robmaugeri@yahoo.com",
-            "roderick802@gmail.com",
-            "rolltideroll44@gmail.com",
-            "ron@rlewisconstruction.net",
-            "ronnieandei@verizon.net",
-            "rosehillya@me.com",
-            "rosesq328@msn.com",
-            "rosinskig@hswc.com",
-            "rowefamily7@comcast.net",
-            "roy.reasor@yahoo.com",
-            "rpsesq@dslawny.com",
-            "rrigby19@gmail.com",
-            "rsontheair@gmail.com",
-            "rtrefzer@hotmail.com",
-            "rwright112345@gmail.com",
-            "ryan@equinox-development.com",
-            "ryan@longcliff.com",
-            "ryansethtaylor@hotmail.com",
-            "ryderkirgolf@aol.com",
-            "S@sosarris.com",
-            "samanthawilkin3324@att.net",
-            "sandymrussell1968@gmail.com",
-            "santonict@comcast.net",
-            "saperkinson@gmail.com",
-            "sasday@tampabay.rr.com",
-            "scarlton925@yahoo.com",
-            "scotto@ollenburgmotors.com",
-            "scsheprd@gmail.com",
-            "scverdery@gmail.com",
-            "scwissman54@gmail.com",
-            "seamuspcarey@gmail.com",
-            "seanbradio@Gmail.com",
-            "secwikla@icloud.com",
-            "sferlo4@gmail.com",
-            "sgruenheid@gmail.com",
-            "sgtgatekeeper@gmail.com",
-            "shanvalijen@gmail.com",
-            "sharon@rmscotati.com",
-            "shauna.keough@syneoshealth.com",
-            "shea.nangle@gmail.com",
-            "sheilathayer2@gmail.com",
-            "shelly.sccconstruction@gmail.com",
-            "sherri_zhou@harmoniqo.com",
-            "shli@me.com",
-            "sledhead36@aol.com",
-            "slehman25850tmi@comcast.net",
-            "smorr911@gmail.com",
-            "snavarrete@mpwonline.com",
-            "Spearsall58@gmail.com",
-            "spicerhousekaty@yahoo.com",
-            "Squaz115@me.com",
-            "squiddy09@aol.com",
-            "srseymour11@gmail.com",
-            "ssengineer2001@yahoo.com",
-            "ssmith53.al@gmail.com",
-            "ssrdeb@gmail.com",
-            "stacy.nvonhoffman@gmail.com",
-            "stan.vela@gmail.com",
-            "stephencyruscopenhaver@yahoo.com",
-            "stephendkane@gmail.com",
-            "sterlingcleancarpet@gmail.com",
-            "stevegrosscup@gmail.com",
-            "stevepenn14@hotmail.com",
-            "strefzer@sbcglobal.net",
-            "stuphelps@gmail.com",
-            "sueforys@yahoo.com",
-            "suekain63@gmail.com",
-            "sunshine4u1972@att.net",
-            "susan.benac@gmail.com",
-            "susanhuber1@hotmail.com",
-            "susanparrish@mac.com",
-            "suzan_limaye@hotmail.com",
-            "suzy.townsend1@gmail.com",
-            "swebb757@gmail.com",
-            "sybaris412@hotmail.com",
-            "tbarritt@bernards.com",
-            "teniola.akinwale@gmail.com",
-            "terrielynn_baldwin@hotmail.com",
-            "tfawcett@goldenrodcompanies.com",
-            "tfischer2117@gmail.com",
-            "thebeginning2@gmail.com",
-            "theikens043@gmail.com",
-            "thomas.krebs16@gmail.com",
-            "thomaspschur@gmail.com",
-            "tim.miller1207@gmail.com",
-            "titaearly@hotmail.com",
-            "tj@titate.com",
-            "tjstowell@gmail.com",
-            "tlefkow@hotmail.com",
-            "tlewiscpa@gmail.com",
-            "tmcrauen@gmail.com",
-            "tom.raney@jedunn.com",
-            "travistelder@bresnan.net",
-            "tschwans@hotmail.com",
-            "tstangel77@gmail.com",
-            "ttmiller9@gmail.com",
-            "tyree022@yahoo.com",
-            "undrpar66@gmail.com",
-            "V238758@YAHOO.COM",
-            "valeriepascoe@gmail.com",
-            "villain714@yahoo.com",
-            "vincent.barresi@gmail.com",
-            "viscuglia@gmail.com",
-            "vkcastillo@gmail.com",
-            "vlcaughman1982@gmail.com",
-            "vspahrewin@gmail.com",
-            "w.t.taekwondoman@st-tel.net",
-            "wanickles3@gmail.com",
-            "wbrannagan@comcast.net",
-            "wedmorei@msn.com",
-            "wesherratt@gmail.com",
-            "wgipsonfl40@gmail.com",
-            "wgurgun1971@outlook.com",
-            "whowould@aol.com",
-            "williamprego10@yahoo.com",
-            "wilson123314@bellsouth.net",
-            "witchman@comcast.net",
-            "woodruffej@gmail.com",
-            "wooseybennett1@gmail.com",
-            "wstorick@gmail.com",
-            "wwstacy13@gmail.com",
-            "wwwtbu@gmail.com",
-            "zasha_zepeda@yahoo.com",
-        ]
-        for email in emails:
-            _execute(conn, "INSERT INTO customer_emails (email) VALUES (?)", (email,))
-        conn.commit()
-    except Exception:
-        pass
-    finally:
-        conn.close()
+        return cast(value.replace('$', '').replace(',', '')) if isinstance(value, str) else cast(value)
+    except ValueError:
+        return default
 
 
-def get_customer_emails():
-    """Get all customer emails"""
-    conn = get_db()
-    rows = _fetchall(conn, "SELECT * FROM customer_emails ORDER BY email")
-    conn.close()
-    return rows
+def _customer_email_row(record, source):
+    """Normalise one dict into a CUSTOMER_EMAIL_COLUMNS tuple, or None if it has no usable email."""
+    email = (record.get('email') or '').strip().lower()
+    if '@' not in email:
+        return None
+    return (email, _csv_number(record.get('orders'), int, 1),
+            _csv_number(record.get('total_spend'), float, 0), _csv_number(record.get('aov'), float, 0),
+            (record.get('first_order') or '').strip(), (record.get('last_order') or '').strip(),
+            record.get('source') or source)
+
+
+def import_customer_emails(records, source='mash_networks', overwrite=True):
+    """Bulk upsert customer emails from any iterable of dicts, consumed in CUSTOMER_IMPORT_BATCH chunks
+    so memory stays flat however long the input is. Everything lands in one transaction.
+    With overwrite=False existing addresses are left untouched (used by the seed).
+    Returns the number of valid rows sent to the database."""
+    columns = ', '.join(CUSTOMER_EMAIL_COLUMNS)
+    if overwrite:
+        conflict = 'ON CONFLICT (email) DO UPDATE SET ' + ', '.join(
+            f'{col} = excluded.{col}' for col in CUSTOMER_EMAIL_COLUMNS[1:])
+    else:
+        conflict = 'ON CONFLICT (email) DO NOTHING'
+    
+    rows = (row for row in (_customer_email_row(r, source) for r in records) if row)
+    total = 0
+    with connection() as conn:
+        cur = conn.cursor()
+        while True:
+            # De-dupe inside the batch: Postgres refuses to touch the same row twice in one statement
+            batch = list({row[0]: row for row in itertools.islice(rows, CUSTOMER_IMPORT_BATCH)}.values())
+            if not batch:
+                break
+            if USE_POSTGRES:
+                psycopg2.extras.execute_values(
+                    cur, f'INSERT INTO customer_emails ({columns}) VALUES %s {conflict}',
+                    batch, page_size=len(batch))
+            else:
+                cur.executemany(
+                    f'INSERT INTO customer_emails ({columns}) VALUES ({", ".join(["?"] * len(CUSTOMER_EMAIL_COLUMNS))}) {conflict}',
+                    batch)
+            total += len(batch)
+    print(f"[Customers] Imported {total} customer emails (source={source})")
+    return total
+
+
+def import_customer_emails_csv(stream, source='csv_import'):
+    """Stream a CSV file (text mode) into customer_emails. Only the header row is required to
+    contain an email column; the other recognised columns are optional."""
+    reader = csv.DictReader(stream)
+    reader.fieldnames = [_CUSTOMER_CSV_HEADERS.get((name or '').strip().lower(), (name or '').strip().lower())
+                         for name in (reader.fieldnames or [])]
+    if 'email' not in reader.fieldnames:
+        raise ValueError('CSV needs an "Email" column')
+    return import_customer_emails(reader, source=source)
+
+
+def seed_customer_emails():
+    """Seed customer email list from Mash Networks data.
+    Runs in a savepoint so a failed batch is logged and undone without aborting init_db's transaction."""
+    with connection() as conn:
+        try:
+            with _savepoint(conn, 'seed_customer_emails'):
+                import_customer_emails(({'email': email} for email in SEED_CUSTOMER_EMAILS), overwrite=False)
+        except Exception as e:
+            print(f"[Customers] Seeding customer emails failed: {e}")
+
+
+def get_customer_emails(limit=None, offset=0):
+    """Get customer emails, optionally one page at a time"""
+    sql = "SELECT * FROM customer_emails ORDER BY email"
+    params = ()
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params = (limit, offset)
+    with connection() as conn:
+        rows = _fetchall(conn, sql, params)
+        return rows
+
+
+def iter_customer_emails(batch_size=CUSTOMER_STREAM_BATCH):
+    """Yield every customer email row, paging by id so only one batch is in memory at a time.
+    The pooled connection is released between pages, so slow consumers (sending mail) don't pin it."""
+    last_id = 0
+    while True:
+        with connection() as conn:
+            rows = _fetchall(conn, "SELECT * FROM customer_emails WHERE id > ? ORDER BY id LIMIT ?",
+                             (last_id, batch_size))
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1]['id']
 
 
 def get_customer_email_count():
     """Get customer email count"""
-    conn = get_db()
-    result = _fetchone(conn, "SELECT COUNT(*) as cnt FROM customer_emails")
-    conn.close()
-    return result["cnt"] if result else 0
+    with connection() as conn:
+        result = _fetchone(conn, "SELECT COUNT(*) as cnt FROM customer_emails")
+        return result["cnt"] if result else 0
 
 
 # ============================================================
@@ -2575,59 +3582,49 @@ def get_customer_email_count():
 
 def create_email_campaign(subject, body, from_name='Forbidden Bourbon', from_email='', recipient_count=0):
     """Create a new email campaign"""
-    conn = get_db()
     try:
-        if USE_POSTGRES:
-            cur = conn.cursor()
-            cur.execute(
-                'INSERT INTO email_campaigns (subject, body, from_name, from_email, recipient_count) VALUES (%s, %s, %s, %s, %s) RETURNING id',
-                (subject, body, from_name, from_email, recipient_count)
-            )
-            campaign_id = cur.fetchone()[0]
-        else:
-            cur = conn.execute(
-                'INSERT INTO email_campaigns (subject, body, from_name, from_email, recipient_count) VALUES (?, ?, ?, ?, ?)',
-                (subject, body, from_name, from_email, recipient_count)
-            )
-            campaign_id = cur.lastrowid
-        conn.commit()
-        return campaign_id
+        with connection() as conn:
+            if USE_POSTGRES:
+                cur = conn.cursor()
+                cur.execute(
+                    'INSERT INTO email_campaigns (subject, body, from_name, from_email, recipient_count) VALUES (%s, %s, %s, %s, %s) RETURNING id',
+                    (subject, body, from_name, from_email, recipient_count)
+                )
+                campaign_id = cur.fetchone()[0]
+            else:
+                cur = conn.execute(
+                    'INSERT INTO email_campaigns (subject, body, from_name, from_email, recipient_count) VALUES (?, ?, ?, ?, ?)',
+                    (subject, body, from_name, from_email, recipient_count)
+                )
+                campaign_id = cur.lastrowid
+            return campaign_id
     except Exception as e:
         print(f"Error creating campaign: {e}")
         return None
-    finally:
-        conn.close()
 
 
 def update_email_campaign(campaign_id, **kwargs):
     """Update email campaign fields"""
-    conn = get_db()
     try:
-        for key, val in kwargs.items():
-            ph = '%s' if USE_POSTGRES else '?'
-            _execute(conn, f'UPDATE email_campaigns SET {key} = {ph} WHERE id = {ph}', (val, campaign_id))
-        conn.commit()
+        with connection() as conn:
+            _update_fields(conn, 'email_campaigns', campaign_id, kwargs)
     except Exception as e:
         print(f"Error updating campaign: {e}")
-    finally:
-        conn.close()
 
 
 def get_email_campaigns(limit=20):
     """Get recent email campaigns"""
-    conn = get_db()
-    rows = _fetchall(conn, 'SELECT * FROM email_campaigns ORDER BY created_at DESC LIMIT ' + str(limit))
-    conn.close()
-    return rows
+    with connection() as conn:
+        rows = _fetchall(conn, 'SELECT * FROM email_campaigns ORDER BY created_at DESC LIMIT ' + str(limit))
+        return rows
 
 
 def get_email_campaign(campaign_id):
     """Get a single campaign"""
-    conn = get_db()
-    ph = '%s' if USE_POSTGRES else '?'
-    row = _fetchone(conn, f'SELECT * FROM email_campaigns WHERE id = {ph}', (campaign_id,))
-    conn.close()
-    return row
+    with connection() as conn:
+        ph = '%s' if USE_POSTGRES else '?'
+        row = _fetchone(conn, f'SELECT * FROM email_campaigns WHERE id = {ph}', (campaign_id,))
+        return row
 
 
 # ============================================================
@@ -2635,65 +3632,45 @@ def get_email_campaign(campaign_id):
 # ============================================================
 
 def create_notification(type, title, message='', link=''):
-    """Create a notification"""
-    conn = get_db()
-    try:
-        if USE_POSTGRES:
-            conn.cursor().execute(
-                'INSERT INTO notifications (type, title, message, link) VALUES (%s, %s, %s, %s)',
-                (type, title, message, link)
-            )
-        else:
-            conn.execute(
-                'INSERT INTO notifications (type, title, message, link) VALUES (?, ?, ?, ?)',
-                (type, title, message, link)
-            )
-        conn.commit()
-    except Exception as e:
-        print(f"Notification error: {e}")
-    finally:
-        conn.close()
+    """Queue a notification; it is written with the next batch"""
+    _notification_buffer.add(type, title, message, link, _utc_now())
 
 
 def get_notifications(limit=20, unread_only=False):
     """Get recent notifications"""
-    conn = get_db()
+    _notification_buffer.flush()
     try:
-        if unread_only:
-            rows = _fetchall(conn, 'SELECT * FROM notifications WHERE read = 0 ORDER BY created_at DESC LIMIT ' + str(limit))
-        else:
-            rows = _fetchall(conn, 'SELECT * FROM notifications ORDER BY created_at DESC LIMIT ' + str(limit))
-        return rows
+        with connection() as conn:
+            if unread_only:
+                rows = _fetchall(conn, 'SELECT * FROM notifications WHERE read = 0 ORDER BY created_at DESC LIMIT ' + str(limit))
+            else:
+                rows = _fetchall(conn, 'SELECT * FROM notifications ORDER BY created_at DESC LIMIT ' + str(limit))
+            return rows
     except Exception as e:
         print(f"[Notifications] get_notifications error: {e}")
         return []
-    finally:
-        conn.close()
 
 
 def get_unread_notification_count():
     """Get count of unread notifications"""
-    conn = get_db()
-    result = _fetchone(conn, 'SELECT COUNT(*) as cnt FROM notifications WHERE read = 0')
-    conn.close()
-    return result['cnt'] if result else 0
+    _notification_buffer.flush()
+    with connection() as conn:
+        result = _fetchone(conn, 'SELECT COUNT(*) as cnt FROM notifications WHERE read = 0')
+        return result['cnt'] if result else 0
 
 
 def mark_notifications_read():
     """Mark all notifications as read"""
-    conn = get_db()
-    _execute(conn, 'UPDATE notifications SET read = 1 WHERE read = 0')
-    conn.commit()
-    conn.close()
+    _notification_buffer.flush()
+    with connection() as conn:
+        _execute(conn, 'UPDATE notifications SET read = 1 WHERE read = 0')
 
 
 def mark_notification_read(notif_id):
     """Mark a single notification as read"""
-    conn = get_db()
-    ph = '%s' if USE_POSTGRES else '?'
-    _execute(conn, f'UPDATE notifications SET read = 1 WHERE id = {ph}', (notif_id,))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        ph = '%s' if USE_POSTGRES else '?'
+        _execute(conn, f'UPDATE notifications SET read = 1 WHERE id = {ph}', (notif_id,))
 
 
 # ============================================================
@@ -2702,40 +3679,396 @@ def mark_notification_read(notif_id):
 
 def save_oauth_token(service, access_token='', refresh_token='', expires_at=None):
     """Save or update an OAuth token for a service"""
-    conn = get_db()
     try:
-        ph = '%s' if USE_POSTGRES else '?'
-        # Try update first
-        existing = _fetchone(conn, f'SELECT id FROM oauth_tokens WHERE service = {ph}', (service,))
-        if existing:
-            parts = []
-            params = []
-            if access_token:
-                parts.append(f'access_token = {ph}')
-                params.append(access_token)
-            if refresh_token:
-                parts.append(f'refresh_token = {ph}')
-                params.append(refresh_token)
-            if expires_at:
-                parts.append(f'expires_at = {ph}')
-                params.append(expires_at)
-            parts.append(f'updated_at = CURRENT_TIMESTAMP')
-            params.append(service)
-            _execute(conn, f'UPDATE oauth_tokens SET {", ".join(parts)} WHERE service = {ph}', tuple(params))
-        else:
-            _execute(conn, f'INSERT INTO oauth_tokens (service, access_token, refresh_token, expires_at) VALUES ({ph}, {ph}, {ph}, {ph})',
-                (service, access_token, refresh_token, expires_at))
-        conn.commit()
+        with connection() as conn:
+            ph = '%s' if USE_POSTGRES else '?'
+            # Try update first
+            existing = _fetchone(conn, f'SELECT id FROM oauth_tokens WHERE service = {ph}', (service,))
+            if existing:
+                parts = []
+                params = []
+                if access_token:
+                    parts.append(f'access_token = {ph}')
+                    params.append(access_token)
+                if refresh_token:
+                    parts.append(f'refresh_token = {ph}')
+                    params.append(refresh_token)
+                if expires_at:
+                    parts.append(f'expires_at = {ph}')
+                    params.append(expires_at)
+                parts.append(f'updated_at = CURRENT_TIMESTAMP')
+                params.append(service)
+                _execute(conn, f'UPDATE oauth_tokens SET {", ".join(parts)} WHERE service = {ph}', tuple(params))
+            else:
+                _execute(conn, f'INSERT INTO oauth_tokens (service, access_token, refresh_token, expires_at) VALUES ({ph}, {ph}, {ph}, {ph})',
+                    (service, access_token, refresh_token, expires_at))
     except Exception as e:
         print(f"[OAuth] save_token error: {e}")
-    finally:
-        conn.close()
 
 
 def get_oauth_token(service):
     """Get stored OAuth token for a service"""
-    conn = get_db()
-    ph = '%s' if USE_POSTGRES else '?'
-    result = _fetchone(conn, f'SELECT * FROM oauth_tokens WHERE service = {ph}', (service,))
-    conn.close()
-    return result
\ No newline at end of file
+    with connection() as conn:
+        ph = '%s' if USE_POSTGRES else '?'
+        result = _fetchone(conn, f'SELECT * FROM oauth_tokens WHERE service = {ph}', (service,))
+        return result
+
+# ============================================================
+# AI GALLERY + MEDIA BLOBS
+# ============================================================
+
+# Everything the gallery grid needs — never the image bytes
+GALLERY_COLUMNS = 'id, media_type, url, prompt, revised_prompt, bottle_type, saved, blob_sha256, created_at'
+
+
+def _sniff_mime(data, name=''):
+    """Best-effort content type from magic bytes, then the file name."""
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'image/png'
+    if data[:3] == b'\xff\xd8\xff':
+        return 'image/jpeg'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif'
+    return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+def _store_blob(conn, data, mime_type=None, name=''):
+    """Insert bytes keyed by their SHA-256 (no-op if already stored) and return the hash."""
+    sha256 = hashlib.sha256(data).hexdigest()
+    _execute(conn, 'INSERT OR IGNORE INTO media_blobs (sha256, mime_type, size, data) VALUES (?, ?, ?, ?)',
+             (sha256, mime_type or _sniff_mime(data, name), len(data), data))
+    return sha256
+
+
+def get_blob(sha256):
+    """Return {'data': bytes, 'mime_type', 'size'} for a stored blob, or None"""
+    with connection() as conn:
+        cur = _execute(conn, 'SELECT data, mime_type, size FROM media_blobs WHERE sha256 = ?', (sha256,), as_dict=False)
+        row = cur.fetchone()
+    if not row:
+        return None
+    return {'data': bytes(row[0]), 'mime_type': row[1], 'size': row[2]}
+
+
+def add_gallery_item(media_type, url, prompt='', revised_prompt='', bottle_type='', image_bytes=None):
+    """Record generated media; image bytes (if any) go to media_blobs, deduplicated by hash.
+    Returns the new gallery id."""
+    with connection() as conn:
+        sha256 = _store_blob(conn, image_bytes, name=url or '') if image_bytes else ''
+        params = (media_type, url or '', prompt or '', revised_prompt or '', bottle_type or '', sha256)
+        sql = 'INSERT INTO ai_gallery (media_type, url, prompt, revised_prompt, bottle_type, blob_sha256) VALUES (?, ?, ?, ?, ?, ?)'
+        if USE_POSTGRES:
+            return _fetchone(conn, sql + ' RETURNING id', params)['id']
+        return _execute(conn, sql, params).lastrowid
+
+
+def get_gallery_items(saved_only=False, limit=50):
+    """Newest-first gallery metadata (no image payloads)"""
+    with connection() as conn:
+        where = ' WHERE saved = TRUE' if saved_only else ''
+        return _fetchall(conn, f'SELECT {GALLERY_COLUMNS} FROM ai_gallery{where} ORDER BY created_at DESC LIMIT ?', (limit,))
+
+
+def get_gallery_blob_sha(gallery_id):
+    """SHA-256 of the stored image for one gallery item, or None if it has no blob"""
+    with connection() as conn:
+        row = _fetchone(conn, 'SELECT blob_sha256 FROM ai_gallery WHERE id = ?', (gallery_id,))
+    return row['blob_sha256'] if row and row['blob_sha256'] else None
+
+
+def set_gallery_saved(gallery_id, saved):
+    with connection() as conn:
+        _execute(conn, 'UPDATE ai_gallery SET saved = ? WHERE id = ?',
+                 (bool(saved) if USE_POSTGRES else (1 if saved else 0), gallery_id))
+
+
+def delete_gallery_item(gallery_id):
+    """Delete a gallery row, and its blob once no other row points at it"""
+    with connection() as conn:
+        row = _fetchone(conn, 'SELECT blob_sha256 FROM ai_gallery WHERE id = ?', (gallery_id,))
+        _execute(conn, 'DELETE FROM ai_gallery WHERE id = ?', (gallery_id,))
+        if row and row['blob_sha256']:
+            _execute(conn, 'DELETE FROM media_blobs WHERE sha256 = ? AND NOT EXISTS '
+                           '(SELECT 1 FROM ai_gallery WHERE blob_sha256 = ?)',
+                     (row['blob_sha256'], row['blob_sha256']))
+
+
+# ============================================================
+# JOBS — durable queue drained by the worker threads in jobs.py
+# ============================================================
+
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed')
+
+
+def _job_row(row):
+    """Decode the JSON columns of a jobs row"""
+    if not row:
+        return None
+    row['payload'] = json.loads(row.get('payload') or '{}')
+    row['result'] = json.loads(row['result']) if row.get('result') else None
+    return row
+
+
+def create_job(kind, payload, max_attempts=1):
+    """Queue a job and return its id"""
+    with connection() as conn:
+        params = (kind, json.dumps(payload), max_attempts, _utc_now())
+        sql = 'INSERT INTO jobs (kind, payload, max_attempts, created_at) VALUES (?, ?, ?, ?)'
+        if USE_POSTGRES:
+            return _fetchone(conn, sql + ' RETURNING id', params)['id']
+        return _execute(conn, sql, params).lastrowid
+
+
+def get_job(job_id):
+    with connection() as conn:
+        return _job_row(_fetchone(conn, 'SELECT * FROM jobs WHERE id = ?', (job_id,)))
+
+
+def claim_job(kinds, worker):
+    """Atomically move the oldest queued job of one of `kinds` to running and return it, or None.
+    Postgres skips rows another worker has locked; SQLite relies on the conditional UPDATE."""
+    marks = ', '.join(['?'] * len(kinds))
+    now = _utc_now()
+    with connection() as conn:
+        if USE_POSTGRES:
+            row = _fetchone(conn, f'''
+                UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1,
+                                started_at = ?, heartbeat_at = ?
+                WHERE id = (SELECT id FROM jobs WHERE status = 'queued' AND kind IN ({marks})
+                            ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED)
+                RETURNING *
+            ''', (worker, now, now, *kinds))
+            return _job_row(row)
+        for _ in range(3):
+            row = _fetchone(conn, f"SELECT id FROM jobs WHERE status = 'queued' AND kind IN ({marks}) ORDER BY id LIMIT 1",
+                            tuple(kinds))
+            if not row:
+                return None
+            cur = _execute(conn, '''
+                UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1,
+                                started_at = ?, heartbeat_at = ?
+                WHERE id = ? AND status = 'queued'
+            ''', (worker, now, now, row['id']))
+            if cur.rowcount:
+                return _job_row(_fetchone(conn, 'SELECT * FROM jobs WHERE id = ?', (row['id'],)))
+        return None
+
+
+def update_job_progress(job_id, progress, message=''):
+    """Record progress (0-100) and refresh the heartbeat so the job isn't reclaimed as stale"""
+    with connection() as conn:
+        _execute(conn, "UPDATE jobs SET progress = ?, message = ?, heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                 (int(progress), message or '', _utc_now(), job_id))
+
+
+def finish_job(job_id, result=None, error=''):
+    """Mark a running job succeeded (result is JSON-encoded) or failed (non-empty error)"""
+    with connection() as conn:
+        _execute(conn, '''
+            UPDATE jobs SET status = ?, result = ?, error = ?, progress = ?, finished_at = ?, heartbeat_at = ?
+            WHERE id = ?
+        ''', ('failed' if error else 'succeeded', json.dumps(result) if result is not None else '',
+              error or '', 0 if error else 100, _utc_now(), _utc_now(), job_id))
+
+
+def requeue_stale_jobs(stale_after):
+    """Jobs whose worker stopped heartbeating (restart, OOM, deploy) go back to the queue,
+    or fail once they've used up max_attempts. Returns the number of rows touched."""
+    cutoff = (datetime.utcnow() - timedelta(seconds=stale_after)).strftime(TIMESTAMP_FORMAT)
+    with connection() as conn:
+        requeued = _execute(conn, '''
+            UPDATE jobs SET status = 'queued', worker = '', message = 'Retrying after worker restart'
+            WHERE status = 'running' AND heartbeat_at < ? AND attempts < max_attempts
+        ''', (cutoff,)).rowcount
+        failed = _execute(conn, '''
+            UPDATE jobs SET status = 'failed', error = 'Worker stopped before the job finished', finished_at = ?
+            WHERE status = 'running' AND heartbeat_at < ?
+        ''', (_utc_now(), cutoff)).rowcount
+    return requeued + failed
+
+
+def prune_jobs(keep_days=7):
+    """Delete finished jobs older than keep_days"""
+    cutoff = (datetime.utcnow() - timedelta(days=keep_days)).strftime(TIMESTAMP_FORMAT)
+    with connection() as conn:
+        return _execute(conn, "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+                        (cutoff,)).rowcount
+
+
+# ============================================================
+# LEADER ELECTION — which process runs each background loop (see leader.py)
+# ============================================================
+
+_LEADER_LOCK_NAMESPACE = 72_410_002  # classid half of the two-int advisory key; objid is the loop's crc32
+
+
+def open_lock_session():
+    """Dedicated autocommit Postgres connection for session-level advisory locks.
+    Kept out of the pool on purpose: the locks live exactly as long as this connection."""
+    conn = _connect()
+    conn.autocommit = True
+    return conn
+
+
+def open_listen_session(channel):
+    """Dedicated autocommit Postgres connection LISTENing on `channel`; select() on it, then poll() for conn.notifies"""
+    conn = open_lock_session()
+    conn.cursor().execute(f'LISTEN {channel}')
+    return conn
+
+
+def notify(channel, payload=''):
+    """pg_notify(channel, payload) — delivered to listeners once the surrounding transaction commits (Postgres only)"""
+    if USE_POSTGRES:
+        with connection() as conn:
+            _execute(conn, 'SELECT pg_notify(?, ?)', (channel, str(payload)))
+
+
+def try_session_lock(conn, name):
+    """Take (or confirm we still hold) the advisory lock for `name` on a lock session. Returns True if held."""
+    key = zlib.crc32(name.encode('utf-8')) & 0x7fffffff
+    cur = conn.cursor()
+    # pg_try_advisory_lock stacks when re-taken, so check pg_locks first instead of re-locking every renewal
+    cur.execute('''
+        SELECT 1 FROM pg_locks WHERE locktype = 'advisory' AND pid = pg_backend_pid()
+        AND classid = %s AND objid = %s AND objsubid = 2 AND granted
+    ''', (_LEADER_LOCK_NAMESPACE, key))
+    if cur.fetchone():
+        return True
+    cur.execute('SELECT pg_try_advisory_lock(%s, %s)', (_LEADER_LOCK_NAMESPACE, key))
+    return bool(cur.fetchone()[0])
+
+
+def acquire_lease(name, owner, ttl):
+    """Take or renew the `name` lease row if it is free, expired or already `owner`'s. Returns True if held."""
+    now = datetime.utcnow()
+    now_s = now.strftime(TIMESTAMP_FORMAT)
+    expires = (now + timedelta(seconds=ttl)).strftime(TIMESTAMP_FORMAT)
+    with connection() as conn:
+        _execute(conn, 'INSERT OR IGNORE INTO leader_leases (name, owner, acquired_at, expires_at) VALUES (?, ?, ?, ?)',
+                 (name, owner, now_s, expires))
+        cur = _execute(conn, '''
+            UPDATE leader_leases
+            SET acquired_at = CASE WHEN owner = ? THEN acquired_at ELSE ? END, owner = ?, expires_at = ?
+            WHERE name = ? AND (owner = ? OR expires_at < ?)
+        ''', (owner, now_s, owner, expires, name, owner, now_s))
+        return cur.rowcount > 0
+
+
+def release_lease(name, owner):
+    """Give up a lease early (clean shutdown) so another process can take over at its next renewal"""
+    with connection() as conn:
+        _execute(conn, 'UPDATE leader_leases SET expires_at = ? WHERE name = ? AND owner = ?',
+                 ('1970-01-01 00:00:00', name, owner))
+
+
+# ============================================================
+# RATE LIMIT BUCKETS — shared token buckets for outbound API calls (see ratelimit.py)
+# ============================================================
+
+class _LostRace(Exception):
+    """Another worker moved a rate bucket between our read and our write"""
+
+
+def take_rate_tokens(buckets):
+    """Take one token from every (key, rate, burst) bucket — all of them or none.
+    Each bucket refills at `rate`/s up to `burst`. Returns 0 if the tokens were taken, else the seconds
+    until every bucket will have one (nothing is spent). Updates are compare-and-set on refilled_at
+    inside a savepoint, so concurrent workers never both spend the same token and a lost race
+    leaves no bucket half-charged."""
+    with connection() as conn:
+        for _ in range(5):
+            now = time.time()
+            wait, spend = 0, []
+            for key, rate, burst in buckets:
+                row = _fetchone(conn, 'SELECT tokens, refilled_at, blocked_until FROM rate_limits WHERE key = ?', (key,))
+                if not row:
+                    spend.append((key, burst - 1.0, None))
+                    continue
+                if (row['blocked_until'] or 0) > now:
+                    wait = max(wait, row['blocked_until'] - now)
+                    continue
+                tokens = min(float(burst), row['tokens'] + (now - row['refilled_at']) * rate)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+                    continue
+                spend.append((key, tokens - 1, row['refilled_at']))
+            if wait:
+                return wait
+            try:
+                with _savepoint(conn, 'rate_tokens'):
+                    for key, tokens, seen in spend:
+                        if seen is None:
+                            cur = _execute(conn, 'INSERT OR IGNORE INTO rate_limits (key, tokens, refilled_at, blocked_until) '
+                                                 'VALUES (?, ?, ?, 0)', (key, tokens, now))
+                        else:
+                            cur = _execute(conn, 'UPDATE rate_limits SET tokens = ?, refilled_at = ? WHERE key = ? AND refilled_at = ?',
+                                           (tokens, now, key, seen))
+                        if not cur.rowcount:
+                            raise _LostRace(key)
+                return 0
+            except _LostRace:
+                continue
+        return 0.1  # lost the race five times running; try again shortly
+
+
+def block_rate_limit(key, seconds):
+    """Stop handing out `key` tokens for `seconds` (a 429's Retry-After); never shortens an existing block"""
+    until = time.time() + seconds
+    with connection() as conn:
+        _execute(conn, 'INSERT OR IGNORE INTO rate_limits (key, tokens, refilled_at, blocked_until) VALUES (?, 0, ?, ?)',
+                 (key, time.time(), until))
+        _execute(conn, 'UPDATE rate_limits SET tokens = 0, blocked_until = ? WHERE key = ? AND blocked_until < ?',
+                 (until, key, until))
+
+
+# ============================================================
+# LLM RESPONSE CACHE — completions keyed by a hash of the request (see llm_cache.py)
+# ============================================================
+
+def get_llm_cache(key, ttl):
+    """Cached completion for `key` if stored within the last `ttl` seconds, else None. Counts the hit."""
+    now = time.time()
+    with connection() as conn:
+        row = _fetchone(conn, 'SELECT response FROM llm_cache WHERE key = ? AND stored_at > ?', (key, now - ttl))
+        if row:
+            _execute(conn, 'UPDATE llm_cache SET hits = hits + 1, used_at = ? WHERE key = ?', (now, key))
+            return row['response']
+    return None
+
+
+def put_llm_cache(key, provider, model, response):
+    now = time.time()
+    with connection() as conn:
+        _execute(conn, '''INSERT INTO llm_cache (key, provider, model, response, size, hits, stored_at, used_at)
+                          VALUES (?, ?, ?, ?, ?, 0, ?, ?)
+                          ON CONFLICT (key) DO UPDATE SET response = excluded.response, size = excluded.size,
+                              hits = 0, stored_at = excluded.stored_at, used_at = excluded.used_at''',
+                 (key, provider, model, response, len(response.encode('utf-8')), now, now))
+
+
+def prune_llm_cache(ttl, max_bytes):
+    """Drop entries older than `ttl`, then least recently used ones until the cache fits in `max_bytes`.
+    Returns the number of entries removed."""
+    with connection() as conn:
+        removed = _execute(conn, 'DELETE FROM llm_cache WHERE stored_at <= ?', (time.time() - ttl,)).rowcount
+        total = _fetchone(conn, 'SELECT COALESCE(SUM(size), 0) AS total FROM llm_cache')['total']
+        if total <= max_bytes:
+            return removed
+        victims = []
+        for row in _fetchall(conn, 'SELECT key, size FROM llm_cache ORDER BY used_at'):
+            if total <= max_bytes:
+                break
+            victims.append((row['key'],))
+            total -= row['size'] or 0
+        _executemany(conn, 'DELETE FROM llm_cache WHERE key = ?', victims)
+        return removed + len(victims)
+
+
+def get_llm_cache_stats():
+    with connection() as conn:
+        row = _fetchone(conn, '''SELECT COUNT(*) AS entries, COALESCE(SUM(size), 0) AS bytes,
+                                  COALESCE(SUM(hits), 0) AS hits FROM llm_cache''')
+    return {'entries': row['entries'], 'bytes': int(row['bytes']), 'hits': int(row['hits'])}
@@ -0,0 +1,100 @@
+"""
+Shared outbound HTTP client for Forbidden Command Center.
+One requests.Session per process, so calls to OpenAI, Anthropic, ElevenLabs,
+Bluesky, Resend, Apollo and friends reuse keep-alive TCP/TLS connections instead
+of paying a fresh handshake each time. Adds default connect/read timeouts and
+retries connection failures (and 502/503/504 on idempotent requests).
+Drop-in for the requests module functions: `import http_client as req`.
+"""
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HTTP_POOL_HOSTS = int(os.environ.get('HTTP_POOL_HOSTS', '32'))          # hosts with a pool kept open
+HTTP_POOL_PER_HOST = int(os.environ.get('HTTP_POOL_PER_HOST', '10'))    # idle keep-alive connections per host
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '5'))
+HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '60'))    # when the caller didn't pass timeout=
+HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', '2'))
+
+exceptions = requests.exceptions
+RequestException = requests.exceptions.RequestException
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _timeout(timeout):
+    """timeout=N from callers bounds the read; the connect phase always gets HTTP_CONNECT_TIMEOUT"""
+    if timeout is None:
+        return (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    if isinstance(timeout, (int, float)):
+        return (min(HTTP_CONNECT_TIMEOUT, timeout), timeout)
+    return timeout
+
+
+def _build_session():
+    session = requests.Session()
+    # Requests here are independent API calls; never carry one call's cookies into the next
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    retry = Retry(
+        total=HTTP_RETRIES,
+        connect=HTTP_RETRIES,  # nothing was sent, so safe for POST too
+        read=0,                # a read failure may mean the POST went through; leave it to the caller
+        status=HTTP_RETRIES,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # status retries for idempotent methods only
+        backoff_factor=0.5,
+        # A 503's Retry-After can be minutes; hand it back to the caller (ratelimit.observe) rather than sleep here
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_PER_HOST, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # gzip/deflate are already negotiated and decoded by requests; brotli too if the package is installed
+    return session
+
+
+def session():
+    """This process's shared Session (rebuilt after a fork: pooled sockets must not be shared)."""
+    global _session, _session_pid
+    if _session_pid != os.getpid():
+        with _session_lock:
+            if _session_pid != os.getpid():
+                _session = _build_session()
+                _session_pid = os.getpid()
+    return _session
+
+
+def request(method, url, timeout=None, **kwargs):
+    return session().request(method, url, timeout=_timeout(timeout), **kwargs)
+
+
+def get(url, params=None, **kwargs):
+    return request('GET', url, params=params, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return request('POST', url, data=data, json=json, **kwargs)
+
+
+def put(url, data=None, **kwargs):
+    return request('PUT', url, data=data, **kwargs)
+
+
+def patch(url, data=None, **kwargs):
+    return request('PATCH', url, data=data, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request('DELETE', url, **kwargs)
+
+
+def head(url, **kwargs):
+    kwargs.setdefault('allow_redirects', False)
+    return request('HEAD', url, **kwargs)
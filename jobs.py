@@ -0,0 +1,121 @@
+"""
+Background jobs for Forbidden Command Center.
+Long-running work (AI image generation) is queued in the jobs table and run by a
+small pool of daemon threads in each gunicorn worker, so request threads return
+immediately and the number of concurrent renders stays bounded.
+"""
+import os
+import socket
+import threading
+import time
+import traceback
+
+import database as db
+
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '1'))                   # runner threads per gunicorn worker
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '3'))     # seconds between queue checks when idle
+JOB_HEARTBEAT = float(os.environ.get('JOB_HEARTBEAT', '30'))            # seconds between heartbeats of a running job
+JOB_STALE_AFTER = float(os.environ.get('JOB_STALE_AFTER', '300'))       # no heartbeat this long = runner died
+
+_handlers = {}
+_wake = threading.Event()
+_start_lock = threading.Lock()
+_started_pid = None
+
+
+def handler(kind):
+    """Register `func(payload, job)` as the runner for `kind`; its return value is stored as the job result."""
+    def register(func):
+        _handlers[kind] = func
+        return func
+    return register
+
+
+class JobContext:
+    """Handed to a handler as `job`; progress() is cheap enough to call between pipeline steps."""
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.kind = row['kind']
+        self.attempts = row.get('attempts') or 1
+        self.progress_pct = 0
+        self.message = ''
+
+    def progress(self, pct, message=''):
+        self.progress_pct = max(0, min(100, int(pct)))
+        self.message = message
+        try:
+            db.update_job_progress(self.id, self.progress_pct, message)
+        except Exception as e:
+            print(f"[Jobs] Progress update failed for job {self.id}: {e}")
+
+
+def submit(kind, payload, max_attempts=1):
+    """Queue a job and nudge this process's runners. Returns the job id."""
+    if kind not in _handlers:
+        raise ValueError(f'No handler registered for job kind {kind!r}')
+    job_id = db.create_job(kind, payload, max_attempts=max_attempts)
+    start()
+    _wake.set()
+    return job_id
+
+
+def start():
+    """Start the runner threads for this process (idempotent; restarts them in a forked child)."""
+    global _started_pid
+    with _start_lock:
+        if _started_pid == os.getpid():
+            return
+        _started_pid = os.getpid()
+        for n in range(max(1, JOB_WORKERS)):
+            name = f'{socket.gethostname()}:{os.getpid()}:{n}'
+            threading.Thread(target=_runner_loop, args=(name,), name=f'job-runner-{n}', daemon=True).start()
+        print(f"[Jobs] Started {max(1, JOB_WORKERS)} runner thread(s) in pid {os.getpid()}")
+
+
+def _heartbeat(ctx, stop):
+    while not stop.wait(JOB_HEARTBEAT):
+        try:
+            db.update_job_progress(ctx.id, ctx.progress_pct, ctx.message)
+        except Exception as e:
+            print(f"[Jobs] Heartbeat failed for job {ctx.id}: {e}")
+
+
+def _run(row):
+    ctx = JobContext(row)
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(ctx, stop), daemon=True).start()
+    started = time.monotonic()
+    try:
+        result = _handlers[ctx.kind](row['payload'], ctx)
+        db.finish_job(ctx.id, result=result)
+        print(f"[Jobs] {ctx.kind} #{ctx.id} succeeded in {time.monotonic() - started:.1f}s")
+    except Exception as e:
+        print(f"[Jobs] {ctx.kind} #{ctx.id} failed: {traceback.format_exc()}")
+        db.finish_job(ctx.id, error=str(e)[:500] or e.__class__.__name__)
+    finally:
+        stop.set()
+
+
+def _runner_loop(name):
+    last_reap = 0.0
+    while True:
+        row = None
+        try:
+            if time.monotonic() - last_reap > JOB_STALE_AFTER / 2:
+                last_reap = time.monotonic()
+                if db.requeue_stale_jobs(JOB_STALE_AFTER):
+                    print("[Jobs] Requeued jobs abandoned by a dead runner")
+                db.prune_jobs()
+            if _handlers:
+                row = db.claim_job(list(_handlers), name)
+        except Exception as e:
+            print(f"[Jobs] Queue poll error: {e}")
+        if row is None:
+            _wake.wait(JOB_POLL_INTERVAL)
+            _wake.clear()
+            continue
+        try:
+            _run(row)
+        except Exception as e:  # finish_job itself failed; the stale reaper will pick the row up
+            print(f"[Jobs] Could not record outcome of job {row.get('id')}: {e}")
@@ -0,0 +1,117 @@
+"""
+Leader election for Forbidden Command Center background loops.
+Every gunicorn worker starts the scheduler, blog auto-poster and brand intel
+scanner threads, but each loop only does work in the one process that owns its
+name. Postgres: a session advisory lock on a dedicated connection, released by
+the server the moment the owning process dies. SQLite: a lease row in
+leader_leases, renewed every few seconds and taken over once it expires.
+"""
+import os
+import atexit
+import socket
+import threading
+import time
+
+import database as db
+
+LEADER_LEASE_TTL = float(os.environ.get('LEADER_LEASE_TTL', '15'))           # SQLite lease lifetime without renewal
+LEADER_RENEW_INTERVAL = float(os.environ.get('LEADER_RENEW_INTERVAL', '5'))  # seconds between renewals / takeover attempts
+
+_lock = threading.Lock()
+_changed = threading.Condition(_lock)
+_kick = threading.Event()
+_wanted = set()
+_held = {}            # name -> time.monotonic() deadline until which we may act as leader
+_pid = None
+_session = None       # Postgres lock connection
+_inherited = []       # a forked parent's lock connection: never closed here, or the parent would lose its locks
+
+
+def _owner():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _ensure_started():
+    """Start the elector thread for this process (caller holds _lock)."""
+    global _pid, _session
+    if _pid == os.getpid():
+        return
+    _pid = os.getpid()
+    if _session is not None:
+        _inherited.append(_session)
+        _session = None
+    _wanted.clear()
+    _held.clear()
+    threading.Thread(target=_elect_loop, name='leader-elector', daemon=True).start()
+
+
+def _acquire(name):
+    global _session
+    if not db.USE_POSTGRES:
+        return db.acquire_lease(name, _owner(), LEADER_LEASE_TTL)
+    try:
+        if _session is None or _session.closed:
+            _session = db.open_lock_session()
+        return db.try_session_lock(_session, name)
+    except Exception:
+        # A dead session has already released every lock it held; reconnect on the next round
+        try:
+            _session.close()
+        except Exception:
+            pass
+        _session = None
+        raise
+
+
+def _elect_loop():
+    while True:
+        with _lock:
+            names = sorted(_wanted)
+        for name in names:
+            started = time.monotonic()
+            try:
+                ok = _acquire(name)
+            except Exception as e:
+                print(f"[Leader] Election error for {name}: {e}")
+                ok = False
+            with _changed:
+                was = _held.get(name, 0) > time.monotonic()
+                if ok:
+                    # Measured from before the round trip, so we stop acting before anyone else can take over
+                    _held[name] = started + LEADER_LEASE_TTL
+                else:
+                    _held.pop(name, None)
+                if ok != was:
+                    print(f"[Leader] {'Acquired' if ok else 'Lost'} {name} in {_owner()}")
+                _changed.notify_all()
+        _kick.wait(LEADER_RENEW_INTERVAL)
+        _kick.clear()
+
+
+def is_leader(name):
+    with _lock:
+        return _held.get(name, 0) > time.monotonic()
+
+
+def wait_for_leadership(name):
+    """Block until this process owns `name`. Call at the top of each loop iteration;
+    followers park here and take over within a renew interval of the leader going away."""
+    with _changed:
+        _ensure_started()
+        if name not in _wanted:
+            _wanted.add(name)
+            _kick.set()
+        while not _held.get(name, 0) > time.monotonic():
+            _changed.wait(LEADER_RENEW_INTERVAL)
+
+
+@atexit.register
+def _release_all():
+    """Hand SQLite leases over straight away on a clean shutdown (Postgres locks go with the connection)."""
+    if db.USE_POSTGRES or _pid != os.getpid():
+        return
+    for name in list(_held):
+        try:
+            db.release_lease(name, _owner())
+        except Exception:
+            pass
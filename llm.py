@@ -0,0 +1,385 @@
+"""
+LLM calls for Forbidden Command Center.
+Thin wrappers over the Anthropic Messages and OpenAI Chat Completions endpoints that
+let the provider reuse our large, unchanging system prompts between calls: Anthropic
+gets the system prompt as a cache_control block, OpenAI gets it as the first message
+plus a prompt_cache_key so identical prefixes land on the same cache. Token usage,
+including cache reads and writes, is tallied per model for /api/llm/usage.
+The *_stream variants yield text as the provider's server-sent events arrive.
+
+complete() and stream() sit on top: callers describe the request once and the
+provider is picked from whichever keys are configured (Anthropic first), with a
+per-provider deadline, fallback to the other provider on failure and, for
+interactive calls, an optional hedge that also asks the backup provider once the
+primary runs past its recent p95 latency.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import database as db
+import http_client
+import llm_cache
+
+ANTHROPIC_URL = 'https://api.anthropic.com/v1/messages'
+ANTHROPIC_VERSION = '2023-06-01'
+OPENAI_URL = 'https://api.openai.com/v1/chat/completions'
+
+MODELS = {'anthropic': 'claude-sonnet-4-6', 'openai': 'gpt-4o-mini'}
+PROVIDER_ORDER = ('anthropic', 'openai')  # Anthropic writes better; OpenAI is the fallback
+LABELS = {'anthropic': 'Anthropic', 'openai': 'OpenAI'}
+
+# Seconds a provider gets to finish one completion; {"openai": 30} in LLM_DEADLINES overrides
+LLM_DEADLINES = {'anthropic': 90.0, 'openai': 60.0}
+LLM_DEADLINES.update({k: float(v) for k, v in json.loads(os.environ.get('LLM_DEADLINES', '{}')).items()})
+LLM_HEDGE_DEFAULT = float(os.environ.get('LLM_HEDGE_DEFAULT', '12'))  # hedge delay until enough latencies are known
+LLM_HEDGE_MIN = 2.0                 # never hedge sooner than this
+LLM_LATENCY_WINDOW = 100            # recent latencies kept per provider + max_tokens for the p95
+LLM_WORKERS = int(os.environ.get('LLM_WORKERS', '8'))  # threads for hedged calls, shared across requests
+
+_usage = {}
+_usage_lock = threading.Lock()
+_latencies = {}
+_latency_lock = threading.Lock()
+_llm_pool = None
+_llm_pool_lock = threading.Lock()
+
+
+class LLMError(RuntimeError):
+    """A provider call failed (HTTP error, timeout, bad stream). status_code is the provider's, if any."""
+    def __init__(self, message, provider='', status_code=None):
+        super().__init__(message)
+        self.provider = provider
+        self.status_code = status_code
+
+
+def _record(provider, model, input_tokens=0, output_tokens=0, cache_read=0, cache_write=0):
+    with _usage_lock:
+        u = _usage.setdefault(f'{provider}:{model}', {
+            'calls': 0, 'input_tokens': 0, 'output_tokens': 0, 'cache_read_tokens': 0, 'cache_write_tokens': 0})
+        u['calls'] += 1
+        u['input_tokens'] += input_tokens
+        u['output_tokens'] += output_tokens
+        u['cache_read_tokens'] += cache_read
+        u['cache_write_tokens'] += cache_write
+    print(f"[LLM] {provider}:{model} {input_tokens} in ({cache_read} cached, {cache_write} cache-write), "
+          f"{output_tokens} out")
+
+
+def usage():
+    """Per-model token totals for this process, with the share of prompt tokens served from cache."""
+    with _usage_lock:
+        result = {k: dict(v) for k, v in _usage.items()}
+    for u in result.values():
+        prompt = u['input_tokens'] + u['cache_read_tokens'] + u['cache_write_tokens']
+        u['cache_read_ratio'] = round(u['cache_read_tokens'] / prompt, 3) if prompt else 0.0
+    return result
+
+
+def anthropic_system(system):
+    """System prompt as a cacheable block. Prompts under the model's minimum cacheable
+    length are simply processed uncached, so it is safe to mark every one."""
+    return [{'type': 'text', 'text': system, 'cache_control': {'type': 'ephemeral'}}]
+
+
+def anthropic_messages(api_key, model, system, messages, max_tokens, timeout=60, **params):
+    """POST /v1/messages with a cached system prompt. Returns the raw response."""
+    resp = http_client.post(ANTHROPIC_URL,
+        headers={'x-api-key': api_key, 'anthropic-version': ANTHROPIC_VERSION, 'Content-Type': 'application/json'},
+        json={'model': model, 'max_tokens': max_tokens, 'system': anthropic_system(system),
+              'messages': messages, **params},
+        timeout=timeout)
+    if resp.status_code == 200:
+        try:
+            u = resp.json().get('usage') or {}
+            # input_tokens excludes the cached part: reads and writes are reported separately
+            _record('anthropic', model, u.get('input_tokens', 0), u.get('output_tokens', 0),
+                    u.get('cache_read_input_tokens') or 0, u.get('cache_creation_input_tokens') or 0)
+        except ValueError:
+            pass
+    return resp
+
+
+def anthropic_text(data):
+    return ''.join(b['text'] for b in data.get('content', []) if b.get('type') == 'text')
+
+
+def _sse_data(resp):
+    """JSON payloads of a server-sent event stream, one per `data:` line"""
+    resp.encoding = 'utf-8'  # SSE is always UTF-8; requests would guess Latin-1 for text/* without a charset
+    for line in resp.iter_lines(decode_unicode=True):
+        if line and line.startswith('data:'):
+            payload = line[5:].strip()
+            if payload == '[DONE]':
+                return
+            yield json.loads(payload)
+
+
+def anthropic_stream(api_key, model, system, messages, max_tokens, timeout=60, **params):
+    """Like anthropic_messages, but yields text deltas as they arrive. Raises LLMError on API errors."""
+    resp = http_client.post(ANTHROPIC_URL,
+        headers={'x-api-key': api_key, 'anthropic-version': ANTHROPIC_VERSION, 'Content-Type': 'application/json'},
+        json={'model': model, 'max_tokens': max_tokens, 'system': anthropic_system(system),
+              'messages': messages, 'stream': True, **params},
+        timeout=timeout, stream=True)
+    try:
+        if resp.status_code != 200:
+            raise LLMError(f'Anthropic API error: {resp.status_code} - {resp.text[:300]}', 'anthropic', resp.status_code)
+        u = {}
+        for event in _sse_data(resp):
+            kind = event.get('type')
+            if kind == 'content_block_delta' and event['delta'].get('type') == 'text_delta':
+                yield event['delta']['text']
+            elif kind == 'message_start':
+                u = dict(event['message'].get('usage') or {})
+            elif kind == 'message_delta':
+                u.update(event.get('usage') or {})
+            elif kind == 'error':
+                raise LLMError(f"Anthropic stream error: {event.get('error', {}).get('message', event)}", 'anthropic')
+        _record('anthropic', model, u.get('input_tokens', 0), u.get('output_tokens', 0),
+                u.get('cache_read_input_tokens') or 0, u.get('cache_creation_input_tokens') or 0)
+    finally:
+        resp.close()
+
+
+def prompt_cache_key(system):
+    """Stable per-prompt routing key so OpenAI sends calls sharing a system prompt to the same prefix cache"""
+    return 'fcc-' + hashlib.sha256(system.encode('utf-8')).hexdigest()[:16]
+
+
+def openai_chat(api_key, model, system, messages, max_tokens, timeout=60, **params):
+    """POST /v1/chat/completions with the system prompt first (OpenAI caches shared
+    prefixes of 1024+ tokens automatically). Returns the raw response."""
+    resp = http_client.post(OPENAI_URL,
+        headers={'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'},
+        json={'model': model, 'messages': [{'role': 'system', 'content': system}] + list(messages),
+              'max_tokens': max_tokens, 'prompt_cache_key': prompt_cache_key(system), **params},
+        timeout=timeout)
+    if resp.status_code == 200:
+        try:
+            u = resp.json().get('usage') or {}
+            cached = (u.get('prompt_tokens_details') or {}).get('cached_tokens') or 0
+            # prompt_tokens includes the cached ones; report them the way Anthropic does
+            _record('openai', model, u.get('prompt_tokens', 0) - cached, u.get('completion_tokens', 0), cached)
+        except ValueError:
+            pass
+    return resp
+
+
+def openai_stream(api_key, model, system, messages, max_tokens, timeout=60, **params):
+    """Like openai_chat, but yields text deltas as they arrive. Raises LLMError on API errors."""
+    resp = http_client.post(OPENAI_URL,
+        headers={'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'},
+        json={'model': model, 'messages': [{'role': 'system', 'content': system}] + list(messages),
+              'max_tokens': max_tokens, 'prompt_cache_key': prompt_cache_key(system),
+              'stream': True, 'stream_options': {'include_usage': True}, **params},
+        timeout=timeout, stream=True)
+    try:
+        if resp.status_code != 200:
+            raise LLMError(f'OpenAI API error: {resp.status_code} - {resp.text[:300]}', 'openai', resp.status_code)
+        u = {}
+        for chunk in _sse_data(resp):
+            for choice in chunk.get('choices') or []:
+                text = (choice.get('delta') or {}).get('content')
+                if text:
+                    yield text
+            if chunk.get('usage'):
+                u = chunk['usage']
+        cached = (u.get('prompt_tokens_details') or {}).get('cached_tokens') or 0
+        _record('openai', model, u.get('prompt_tokens', 0) - cached, u.get('completion_tokens', 0), cached)
+    finally:
+        resp.close()
+
+
+# Provider layer: one call shape for every generator, whichever provider answers
+
+class Completion:
+    """A finished completion. cached: served from llm_cache; hedged: the backup provider won the race."""
+    def __init__(self, text, provider, model, latency=0.0, cached=False, hedged=False):
+        self.text = text
+        self.provider = provider
+        self.model = model
+        self.latency = latency
+        self.cached = cached
+        self.hedged = hedged
+
+
+def api_key(provider):
+    """Anthropic's key lives in the environment; OpenAI's may also be saved from AI Studio (platforms table)."""
+    if provider == 'anthropic':
+        return os.environ.get('ANTHROPIC_API_KEY', '')
+    key = os.environ.get('OPENAI_API_KEY', '')
+    if not key:
+        platform = db.get_platform('openai')
+        key = platform.get('api_key', '') if platform else ''
+    return key
+
+
+def available(providers=None):
+    """Providers with a key configured, in preference order (PROVIDER_ORDER unless given)."""
+    return [p for p in (providers or PROVIDER_ORDER) if api_key(p)]
+
+
+def _deadline(provider, deadline=None):
+    return deadline or LLM_DEADLINES.get(provider, 60.0)
+
+
+def _sampling(temperature):
+    return {} if temperature is None else {'temperature': temperature}
+
+
+def _cache_key(provider, system, messages, max_tokens, temperature):
+    """Keyed on the provider we'd ask first, so a fallback answer is reused for the same request."""
+    user = '\n'.join(str(m.get('content', '')) for m in messages)
+    return llm_cache.make_key(provider, MODELS[provider], system, user, max_tokens=max_tokens, **_sampling(temperature))
+
+
+def _note_latency(provider, max_tokens, seconds):
+    with _latency_lock:
+        _latencies.setdefault((provider, max_tokens), deque(maxlen=LLM_LATENCY_WINDOW)).append(seconds)
+
+
+def hedge_after(provider, max_tokens):
+    """Recent p95 latency for this provider and response size: past it, a hedge is worth its cost."""
+    with _latency_lock:
+        samples = sorted(_latencies.get((provider, max_tokens), ()))
+    if len(samples) < 10:
+        return LLM_HEDGE_DEFAULT
+    return max(LLM_HEDGE_MIN, samples[int(0.95 * (len(samples) - 1))])
+
+
+def _call(provider, system, messages, max_tokens, temperature=None, deadline=None):
+    """One blocking completion from one provider. Returns a Completion or raises LLMError."""
+    model = MODELS[provider]
+    started = time.monotonic()
+    try:
+        if provider == 'anthropic':
+            resp = anthropic_messages(api_key(provider), model, system, messages, max_tokens,
+                                      timeout=_deadline(provider, deadline), **_sampling(temperature))
+        else:
+            resp = openai_chat(api_key(provider), model, system, messages, max_tokens,
+                               timeout=_deadline(provider, deadline), **_sampling(temperature))
+        if resp.status_code != 200:
+            raise LLMError(f'{LABELS[provider]} API error: {resp.status_code} - {resp.text[:300]}',
+                           provider, resp.status_code)
+        data = resp.json()
+        text = anthropic_text(data) if provider == 'anthropic' else data['choices'][0]['message']['content']
+    except http_client.RequestException as e:
+        raise LLMError(f'{LABELS[provider]} request failed: {e}', provider)
+    except (ValueError, KeyError, IndexError) as e:
+        raise LLMError(f'{LABELS[provider]} returned an unreadable response: {e}', provider)
+    latency = time.monotonic() - started
+    _note_latency(provider, max_tokens, latency)
+    return Completion(text, provider, model, latency)
+
+
+def _pool():
+    global _llm_pool
+    with _llm_pool_lock:
+        if _llm_pool is None:
+            _llm_pool = ThreadPoolExecutor(max_workers=LLM_WORKERS, thread_name_prefix='llm')
+        return _llm_pool
+
+
+def _with_fallback(order, *args):
+    errors = []
+    for provider in order:
+        try:
+            return _call(provider, *args)
+        except LLMError as e:
+            print(f"[LLM] {provider} failed{', falling back' if provider != order[-1] else ''}: {e}")
+            errors.append(e)
+    raise errors[-1]
+
+
+def _hedged(order, system, messages, max_tokens, temperature, deadline):
+    """Ask the primary; if it hasn't answered within its p95 (or has failed), ask the backup too and
+    return whichever succeeds first. The loser finishes in the background and is discarded."""
+    primary, backup = order[0], order[1]
+    args = (system, messages, max_tokens, temperature, deadline)
+    pending = {_pool().submit(_call, primary, *args)}
+    give_up_at = time.monotonic() + max(_deadline(primary, deadline), _deadline(backup, deadline))
+    delay = hedge_after(primary, max_tokens)
+    hedged = False
+    errors = []
+    while pending:
+        timeout = delay if not hedged else give_up_at - time.monotonic()
+        done, pending = wait(pending, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except LLMError as e:
+                errors.append(e)
+                continue
+            result.hedged = result.provider != primary
+            if result.hedged:
+                print(f"[LLM] Hedge won: {backup} answered before {primary}")
+            return result
+        if not hedged:
+            hedged = True
+            reason = 'failed' if errors else f'no answer after {delay:.1f}s'
+            print(f"[LLM] {primary} {reason}, hedging with {backup}")
+            pending.add(_pool().submit(_call, backup, *args))
+        elif not done:
+            break
+    raise errors[-1] if errors else LLMError('No AI provider answered before the deadline')
+
+
+def complete(system, messages, max_tokens, providers=None, temperature=None, deadline=None,
+             hedge=False, cache=False, fresh=False):
+    """Run one completion on the first configured provider, falling back to the next on failure.
+    hedge=True races the backup provider once the primary is slower than usual (interactive calls).
+    cache=True consults llm_cache first (fresh=True skips the lookup). Raises LLMError."""
+    order = available(providers)
+    if not order:
+        raise LLMError('No AI API key configured. Add ANTHROPIC_API_KEY or OPENAI_API_KEY.')
+    cache_key = _cache_key(order[0], system, messages, max_tokens, temperature) if cache else None
+    if cache_key:
+        text = llm_cache.get(cache_key, fresh=fresh)
+        if text is not None:
+            return Completion(text, order[0], MODELS[order[0]], cached=True)
+    if hedge and len(order) > 1:
+        result = _hedged(order, system, messages, max_tokens, temperature, deadline)
+    else:
+        result = _with_fallback(order, system, messages, max_tokens, temperature, deadline)
+    if cache_key:
+        llm_cache.put(cache_key, result.provider, result.model, result.text)
+    return result
+
+
+def stream(system, messages, max_tokens, providers=None, temperature=None, deadline=None,
+           cache=False, fresh=False):
+    """Generator of text chunks for one completion. Falls back to the next provider if one fails
+    before producing any text; a failure mid-stream raises LLMError. Cache hits arrive as one chunk."""
+    order = available(providers)
+    if not order:
+        raise LLMError('No AI API key configured. Add ANTHROPIC_API_KEY or OPENAI_API_KEY.')
+    cache_key = _cache_key(order[0], system, messages, max_tokens, temperature) if cache else None
+    if cache_key:
+        text = llm_cache.get(cache_key, fresh=fresh)
+        if text is not None:
+            yield text
+            return
+    errors = []
+    for provider in order:
+        streamer = anthropic_stream if provider == 'anthropic' else openai_stream
+        parts = []
+        try:
+            for chunk in streamer(api_key(provider), MODELS[provider], system, messages, max_tokens,
+                                  timeout=_deadline(provider, deadline), **_sampling(temperature)):
+                parts.append(chunk)
+                yield chunk
+        except (LLMError, http_client.RequestException, ValueError) as e:
+            if parts:
+                raise LLMError(f'{LABELS[provider]} stream interrupted: {e}', provider)
+            print(f"[LLM] {provider} stream failed{', falling back' if provider != order[-1] else ''}: {e}")
+            errors.append(e if isinstance(e, LLMError) else LLMError(f'{LABELS[provider]} request failed: {e}', provider))
+            continue
+        if cache_key:
+            llm_cache.put(cache_key, provider, MODELS[provider], ''.join(parts))
+        return
+    raise errors[-1]
@@ -0,0 +1,93 @@
+"""
+LLM response cache for Forbidden Command Center.
+Completions from Anthropic/OpenAI are stored in the llm_cache table under a SHA-256
+of everything that shapes the output (provider, model, system prompt, user message,
+sampling params), so asking the same thing twice comes back from the database in
+milliseconds instead of another 5-60s round trip. Entries expire after LLM_CACHE_TTL
+and the least recently used ones are evicted past LLM_CACHE_MAX_BYTES. Callers pass
+fresh=True to skip the lookup (the new answer still replaces the cached one).
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+
+import database as db
+
+LLM_CACHE_TTL = float(os.environ.get('LLM_CACHE_TTL', str(7 * 86400)))                  # seconds an answer stays reusable
+LLM_CACHE_MAX_BYTES = int(os.environ.get('LLM_CACHE_MAX_BYTES', str(20 * 1024 * 1024)))  # total response text kept
+LLM_CACHE_PRUNE_INTERVAL = 600  # seconds between eviction passes per process
+
+_stats = {'hits': 0, 'misses': 0, 'bypassed': 0, 'stored': 0, 'errors': 0}
+_stats_lock = threading.Lock()
+_pruned_at = 0.0
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _normalize(text):
+    """Whitespace-only differences (trailing spaces, doubled blanks, CRLF) don't change the key"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def make_key(provider, model, system, user_message, **params):
+    """Hash of a completion request; params are the sampling settings (max_tokens, temperature, ...)."""
+    blob = json.dumps({
+        'provider': provider,
+        'model': model,
+        'system': _normalize(system),
+        'user': _normalize(user_message),
+        'params': params,
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def get(key, fresh=False):
+    """Cached completion for `key`, or None on a miss, a bypass, or a cache error."""
+    if fresh:
+        _count('bypassed')
+        return None
+    try:
+        text = db.get_llm_cache(key, LLM_CACHE_TTL)
+    except Exception as e:
+        print(f"[LLMCache] Lookup failed: {e}")
+        _count('errors')
+        return None
+    _count('hits' if text is not None else 'misses')
+    return text
+
+
+def put(key, provider, model, text):
+    """Store a successful completion; empty answers are never cached."""
+    global _pruned_at
+    if not text or not text.strip():
+        return
+    try:
+        db.put_llm_cache(key, provider, model, text)
+        _count('stored')
+        if time.monotonic() - _pruned_at > LLM_CACHE_PRUNE_INTERVAL:
+            _pruned_at = time.monotonic()
+            removed = db.prune_llm_cache(LLM_CACHE_TTL, LLM_CACHE_MAX_BYTES)
+            if removed:
+                print(f"[LLMCache] Evicted {removed} entries")
+    except Exception as e:
+        print(f"[LLMCache] Store failed: {e}")
+        _count('errors')
+
+
+def stats():
+    """This process's hit/miss counters plus the table's size and lifetime hit total."""
+    with _stats_lock:
+        result = dict(_stats)
+    lookups = result['hits'] + result['misses']
+    result['hit_rate'] = round(result['hits'] / lookups, 3) if lookups else 0.0
+    try:
+        result['table'] = db.get_llm_cache_stats()
+    except Exception as e:
+        result['table'] = {'error': str(e)}
+    return result
@@ -0,0 +1,194 @@
+"""
+Photo library index for Forbidden Command Center.
+Keeps metadata for static/photos and static/photos/gallery (category, hero flag,
+size, dimensions) in memory and in a JSON file, keyed on path + size + mtime, and
+refreshes it incrementally with os.scandir only when a directory's mtime changes.
+Content hashes are computed on first use (sha256()), never during a scan.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+# Directory mtimes don't move when a file is overwritten in place, so re-stat everything this often
+PHOTO_INDEX_RESCAN = float(os.environ.get('PHOTO_INDEX_RESCAN', '300'))
+
+
+def categorize(fname):
+    """Category for a gallery photo, based on filename patterns"""
+    fl = fname.lower()
+    if 'lightbg' in fl:
+        return 'Product (Light BG)'
+    elif 'singlebarrel' in fl:
+        if 'dark' in fl:
+            return 'Single Barrel (Dark)'
+        return 'Single Barrel'
+    elif 'smallbatch' in fl:
+        if 'dark' in fl:
+            return 'Small Batch (Dark)'
+        return 'Small Batch'
+    elif 'golden_front' in fl:
+        return 'Product (Light BG)'
+    elif 'black_front' in fl:
+        return 'Product (Light BG)'
+    elif '-edit' in fl or 'edit.' in fl:
+        return 'Lifestyle / Detail'
+    else:
+        return 'Photo Shoot'
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _dimensions(path):
+    try:
+        from PIL import Image
+        with Image.open(path) as img:  # reads the header only
+            return img.size
+    except Exception:
+        return None, None
+
+
+class PhotoIndex:
+    """Index of the image files under `root` (gallery/ subfolder first, then root-level brand assets).
+
+    entries() costs two os.stat calls when nothing changed. When a directory's
+    mtime moves (or every PHOTO_INDEX_RESCAN seconds) it is re-scanned with
+    os.scandir, and only files whose size/mtime changed are re-measured (a header read).
+    """
+
+    # (subfolder, url prefix, category for files there — None means categorize() by name)
+    SECTIONS = (
+        ('gallery', '/static/photos/gallery/', None),
+        ('', '/static/photos/', 'Brand Assets'),
+    )
+
+    def __init__(self, root, cache_path=None):
+        self.root = os.path.abspath(root)
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._dir_mtimes = {}
+        self._entries = []
+        self._by_url = {}
+        self._scanned_at = 0.0
+        self._load_cache()
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+            if cached.get('root') == self.root:
+                self._set_entries(cached.get('entries', []))
+                # Seed per-file stats only; dir mtimes stay empty so the first call re-checks the disk
+        except Exception as e:
+            print(f"[Photos] Ignoring unreadable index cache: {e}")
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp = f'{self.cache_path}.{os.getpid()}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump({'root': self.root, 'entries': self._entries}, f)
+            os.replace(tmp, self.cache_path)
+        except Exception as e:
+            print(f"[Photos] Could not write index cache: {e}")
+
+    def _set_entries(self, entries):
+        self._entries = entries
+        self._by_url = {e['url']: e for e in entries}
+
+    def _dir_mtime(self, subdir):
+        try:
+            return os.stat(os.path.join(self.root, subdir)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _stale(self):
+        if time.monotonic() - self._scanned_at > PHOTO_INDEX_RESCAN:
+            return True
+        return any(self._dir_mtimes.get(subdir) != self._dir_mtime(subdir) for subdir, _, _ in self.SECTIONS)
+
+    def _scan(self):
+        previous = self._by_url
+        entries = []
+        for subdir, prefix, category in self.SECTIONS:
+            self._dir_mtimes[subdir] = self._dir_mtime(subdir)
+            try:
+                with os.scandir(os.path.join(self.root, subdir)) as it:
+                    found = sorted((e for e in it if e.is_file() and e.name.lower().endswith(IMAGE_EXTENSIONS)),
+                                   key=lambda e: e.name)
+            except OSError:
+                continue
+            for dirent in found:
+                st = dirent.stat()
+                url = prefix + dirent.name
+                old = previous.get(url)
+                if old and old['size'] == st.st_size and old['mtime'] == int(st.st_mtime):
+                    entries.append(old)
+                    continue
+                width, height = _dimensions(dirent.path)
+                lower = dirent.name.lower()
+                entries.append({
+                    'filename': dirent.name,
+                    'url': url,
+                    'path': dirent.path,
+                    'category': category or categorize(dirent.name),
+                    'size': st.st_size,
+                    'mtime': int(st.st_mtime),
+                    'width': width,
+                    'height': height,
+                    'sha256': None,  # filled in by sha256() when someone needs it
+                    'is_png': lower.endswith('.png'),
+                    'is_hero': category is None and ('lightbg' in lower or 'black_front' in lower),
+                })
+        changed = [e['url'] for e in entries] != [e['url'] for e in self._entries] or \
+            any(e is not previous.get(e['url']) for e in entries)
+        self._set_entries(entries)
+        self._scanned_at = time.monotonic()
+        if changed:
+            self._save_cache()
+
+    def entries(self):
+        """All indexed photos (gallery first, then brand assets), refreshed if the disk changed."""
+        with self._lock:
+            if self._stale():
+                self._scan()
+            return self._entries
+
+    def lookup(self, ref):
+        """Entry for a '/static/photos/...' URL or an absolute path under root, or None if not on disk."""
+        if ref.startswith(self.root + os.sep):
+            rel = os.path.relpath(ref, self.root).replace(os.sep, '/')
+            ref = '/static/photos/' + rel
+        self.entries()
+        return self._by_url.get(ref)
+
+    def sha256(self, ref):
+        """Content hash of a photo (URL or absolute path), read once and then kept in the index; None if not on disk."""
+        entry = self.lookup(ref)
+        if entry is None:
+            return None
+        if not entry.get('sha256'):
+            digest = _file_sha256(entry['path'])
+            with self._lock:
+                entry['sha256'] = digest
+                self._save_cache()
+        return entry['sha256']
+
+    def first_existing(self, refs):
+        """First of `refs` (URLs or absolute paths) present in the library, or None."""
+        for ref in refs:
+            if self.lookup(ref):
+                return ref
+        return None
@@ -0,0 +1,150 @@
+"""
+Due-time tracking for scheduled posts in Forbidden Command Center.
+Keeps a min-heap of (due time, post id) for every scheduled post and sleeps until
+the earliest one falls due, instead of querying the posts table every minute.
+create_post/update_post wake it through a database hook. Changes made in the other
+gunicorn workers arrive by pg_notify on Postgres; on SQLite each change stamps a
+schedule version in app_meta, which is polled every SCHEDULE_POLL_INTERVAL seconds.
+The heap is rebuilt from the DB whenever a schedule changes, at startup, and every
+SCHEDULER_RECONCILE_INTERVAL seconds.
+"""
+import os
+import heapq
+import select
+import threading
+import time
+from datetime import datetime, timezone
+
+import database as db
+
+SCHEDULER_RECONCILE_INTERVAL = float(os.environ.get('SCHEDULER_RECONCILE_INTERVAL', '300'))
+SCHEDULE_POLL_INTERVAL = float(os.environ.get('SCHEDULE_POLL_INTERVAL', '3'))  # SQLite: seconds between version checks
+SCHEDULE_CHANNEL = 'post_schedule'
+# scheduled_at has one-second resolution; wake just after the second turns so get_due_posts() includes it
+_DUE_SLACK = 0.05
+
+_heap = []
+_lock = threading.Lock()
+_wake = threading.Event()
+_dirty = True            # rebuild from the DB before the next wait
+_reconciled_at = 0.0
+_listener_pid = None
+
+
+def _due_epoch(scheduled_at):
+    """Stored scheduled_at (naive UTC) -> epoch seconds; anything unparseable counts as due now."""
+    try:
+        dt = scheduled_at if isinstance(scheduled_at, datetime) else datetime.fromisoformat(str(scheduled_at).strip())
+    except ValueError:
+        return time.time()
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _mark_dirty():
+    global _dirty
+    _dirty = True
+    _wake.set()
+
+
+@db.on_schedule_change
+def _schedule_changed(post_id):
+    _mark_dirty()
+    # The scheduler may live in the other worker: it LISTENs on this channel, or polls the version
+    if db.USE_POSTGRES:
+        db.notify(SCHEDULE_CHANNEL, post_id)
+    else:
+        db.touch_schedule_version()
+
+
+def reconcile():
+    """Rebuild the heap from every scheduled post. Returns how many are pending."""
+    global _dirty, _reconciled_at
+    _dirty = False
+    entries = [(_due_epoch(r['scheduled_at']), r['id']) for r in db.get_schedule_times()]
+    heapq.heapify(entries)
+    with _lock:
+        _heap[:] = entries
+    _reconciled_at = time.monotonic()
+    return len(entries)
+
+
+def _pop_due(now):
+    due = []
+    with _lock:
+        while _heap and _heap[0][0] <= now:
+            due.append(heapq.heappop(_heap)[1])
+    return due
+
+
+def _seconds_until_next(now):
+    with _lock:
+        return _heap[0][0] - now + _DUE_SLACK if _heap else None
+
+
+def _listen_loop():
+    """Postgres only: turn NOTIFYs from any worker into a local wake-up."""
+    while True:
+        session = None
+        try:
+            session = db.open_listen_session(SCHEDULE_CHANNEL)
+            while True:
+                if select.select([session], [], [], 60) != ([], [], []):
+                    session.poll()
+                    if session.notifies:
+                        session.notifies.clear()
+                        _mark_dirty()
+        except Exception as e:
+            print(f"[Scheduler] LISTEN connection lost: {e}")
+            time.sleep(5)
+        finally:
+            if session is not None:
+                try:
+                    session.close()
+                except Exception:
+                    pass
+
+
+def _poll_loop():
+    """SQLite only: turn a schedule version stamped by any worker into a local wake-up."""
+    seen = None
+    while True:
+        try:
+            version = db.get_schedule_version()
+            if seen is not None and version != seen:
+                _mark_dirty()
+            seen = version
+        except Exception as e:
+            print(f"[Scheduler] Schedule version check failed: {e}")
+        time.sleep(SCHEDULE_POLL_INTERVAL)
+
+
+def _ensure_listener():
+    global _listener_pid
+    if _listener_pid != os.getpid():
+        _listener_pid = os.getpid()
+        target = _listen_loop if db.USE_POSTGRES else _poll_loop
+        threading.Thread(target=target, name='schedule-listener', daemon=True).start()
+
+
+def wait_for_due(max_wait):
+    """Block until at least one scheduled post is due and return the due post ids,
+    or return [] after max_wait seconds. Touches the DB only to reconcile."""
+    _ensure_listener()
+    deadline = time.monotonic() + max_wait
+    while True:
+        if _dirty or time.monotonic() - _reconciled_at > SCHEDULER_RECONCILE_INTERVAL:
+            reconcile()
+        due = _pop_due(time.time())
+        if due:
+            return due
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return []
+        timeout = min(remaining, SCHEDULER_RECONCILE_INTERVAL - (time.monotonic() - _reconciled_at))
+        until_next = _seconds_until_next(time.time())
+        if until_next is not None:
+            timeout = min(timeout, until_next)
+        _wake.wait(max(0.0, timeout))
+        _wake.clear()
@@ -4,17 +4,34 @@ Handles posting content to various social media platforms.
 """
 import os
 import json
-import requests
+import time
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import database as db
+import http_client
+import ratelimit
+
+
+# HTTP statuses worth another try later (rate limits, overload, gateway hiccups); anything else is permanent
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
 
 
 class PublishResult:
-    """Result from a publish attempt"""
-    def __init__(self, success=False, platform='', post_id='', url='', error=''):
+    """Result from a publish attempt.
+    retryable: the failure was transient (rate limit, 5xx, connection refused) and the scheduler may retry it.
+    retry_after: seconds the platform asked us to wait (Retry-After), if it said."""
+    def __init__(self, success=False, platform='', post_id='', url='', error='',
+                 status_code=None, retryable=False, retry_after=None):
         self.success = success
         self.platform = platform
         self.post_id = post_id
         self.url = url
         self.error = error
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
     
     def to_dict(self):
         return {
@@ -22,39 +39,214 @@ class PublishResult:
             'platform': self.platform,
             'post_id': self.post_id,
             'url': self.url,
-            'error': self.error
+            'error': self.error,
+            'retryable': self.retryable,
         }
 
 
+def retry_after_seconds(resp):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None"""
+    value = (resp.headers or {}).get('Retry-After', '') if resp is not None else ''
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def http_failure(platform, resp, error, limit_key=None):
+    """PublishResult for a non-2xx response, classified as retryable or permanent by status code.
+    A 429 also blocks the rate-limit bucket `limit_key` (default: the platform) for its Retry-After."""
+    retry_after = retry_after_seconds(resp)
+    ratelimit.observe(limit_key or platform, resp, retry_after)
+    return PublishResult(success=False, platform=platform, error=error, status_code=resp.status_code,
+                         retryable=resp.status_code in RETRYABLE_STATUSES, retry_after=retry_after)
+
+
+# Requests need at least this much of a publish's budget left to be worth starting
+PUBLISH_MIN_REQUEST = 3
+
+
+def time_left(deadline, cap):
+    """`cap` seconds, or fewer if `deadline` (a time.monotonic() value, None for no deadline) comes sooner"""
+    if deadline is None:
+        return cap
+    return max(0.0, min(cap, deadline - time.monotonic()))
+
+
+def rate_limited(platform, limit_key, deadline=None):
+    """Wait for a rate-limit token, but never so long that the request itself no longer fits before `deadline`.
+    Returns a retryable PublishResult if no token comes soon enough (nothing was sent), else None"""
+    max_wait = time_left(deadline, ratelimit.RATE_LIMIT_MAX_WAIT + PUBLISH_MIN_REQUEST) - PUBLISH_MIN_REQUEST
+    if max_wait < 0:
+        return PublishResult(success=False, platform=platform, error=f'Out of time before {limit_key}', retryable=True)
+    wait = ratelimit.acquire(limit_key, max_wait=max_wait)
+    if wait:
+        return PublishResult(success=False, platform=platform, error=f'Rate limited ({limit_key}): retry in {wait:.0f}s',
+                             retryable=True, retry_after=wait)
+    return None
+
+
+def exception_failure(platform, exc):
+    """PublishResult for a requests exception. Only failures where the post can't have reached the
+    platform (connect errors/timeouts) are retryable; a read timeout may have posted already."""
+    retryable = isinstance(exc, (http_client.exceptions.ConnectionError, http_client.exceptions.ConnectTimeout)) \
+        and not isinstance(exc, http_client.exceptions.ReadTimeout)
+    return PublishResult(success=False, platform=platform, error=str(exc), retryable=retryable)
+
+
+# Bluesky sessions: access JWTs last ~2h, refresh JWTs ~2 months
+BSKY_XRPC = 'https://bsky.social/xrpc'
+BSKY_REFRESH_MARGIN = 120  # seconds before expiry at which an access token is refreshed rather than used
+
+
+def _jwt_claims(token):
+    """Unverified JWT payload — only used to read exp/sub from tokens Bluesky just gave us"""
+    try:
+        payload = token.split('.')[1]
+        return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    except Exception:
+        return {}
+
+
+def _bsky_auth_error(resp):
+    """'expired' for an expired access token, 'invalid' for a rejected one (401), else None"""
+    if resp.status_code == 400:
+        try:
+            if resp.json().get('error') == 'ExpiredToken':
+                return 'expired'
+        except Exception:
+            pass
+    return 'invalid' if resp.status_code == 401 else None
+
+
 class BlueskyPublisher:
-    """Bluesky (AT Protocol) publisher"""
+    """Bluesky (AT Protocol) publisher.
+    Sessions are cached per handle in memory and in oauth_tokens ('bluesky:<handle>'), so a publish
+    normally costs no sign-in at all: expired access tokens go through refreshSession, and
+    createSession is only called when there is no usable session or Bluesky answers 401."""
+    
+    _sessions = {}
+    _session_locks = {}
+    _session_locks_guard = threading.Lock()
+    
+    @staticmethod
+    def _service(handle):
+        return f'bluesky:{handle.lower().lstrip("@")}'
     
     @staticmethod
-    def authenticate(handle, app_password):
-        """Authenticate with Bluesky and return session info"""
+    def _cache(handle, data, persist=True):
+        """Build a session dict from a createSession/refreshSession response and remember it"""
+        access = data.get('accessJwt', '')
+        claims = _jwt_claims(access)
+        session = {
+            'success': True,
+            'handle': data.get('handle', handle),
+            'did': data.get('did') or claims.get('sub', ''),
+            'access_jwt': access,
+            'refresh_jwt': data.get('refreshJwt', ''),
+            'expires': claims.get('exp') or time.time() + 600,
+            'refresh_expires': _jwt_claims(data.get('refreshJwt', '')).get('exp') or 0,
+        }
+        service = BlueskyPublisher._service(handle)
+        BlueskyPublisher._sessions[service] = session
+        if not persist:
+            return session
         try:
-            resp = requests.post(
-                'https://bsky.social/xrpc/com.atproto.server.createSession',
+            expires_at = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(session['expires']))
+            db.save_oauth_token(service, session['access_jwt'], session['refresh_jwt'], expires_at)
+        except Exception as e:
+            print(f"[Publisher] Could not persist Bluesky session: {e}")
+        return session
+    
+    @staticmethod
+    def _cached(handle):
+        service = BlueskyPublisher._service(handle)
+        session = BlueskyPublisher._sessions.get(service)
+        if session is None:
+            try:
+                token = db.get_oauth_token(service)
+            except Exception:
+                token = None
+            if token and token.get('refresh_token'):
+                session = BlueskyPublisher._cache(handle, {'accessJwt': token.get('access_token', ''),
+                                                           'refreshJwt': token['refresh_token'], 'handle': handle},
+                                                 persist=False)
+        return session
+    
+    @staticmethod
+    def authenticate(handle, app_password, deadline=None):
+        """Sign in with createSession and cache the new session; returns session info"""
+        limited = rate_limited('bluesky', 'bluesky:createSession', deadline)
+        if limited:
+            return {'success': False, 'error': f'Bluesky sign-in: {limited.error}', 'retryable': True,
+                    'retry_after': limited.retry_after}
+        try:
+            resp = http_client.post(
+                f'{BSKY_XRPC}/com.atproto.server.createSession',
                 json={'identifier': handle, 'password': app_password},
-                timeout=15
+                timeout=time_left(deadline, 15)
             )
             if resp.status_code == 200:
-                data = resp.json()
-                return {
-                    'success': True,
-                    'handle': data.get('handle', handle),
-                    'did': data.get('did', ''),
-                    'access_jwt': data.get('accessJwt', ''),
-                }
+                return BlueskyPublisher._cache(handle, resp.json())
             else:
                 error = resp.json().get('message', resp.text[:200]) if resp.text else 'Auth failed'
-                return {'success': False, 'error': f'Bluesky auth failed: {error}'}
+                return {'success': False, 'error': f'Bluesky auth failed: {error}', 'response': resp}
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return {'success': False, 'error': str(e), 'exception': e}
+    
+    @staticmethod
+    def refresh(handle, session, deadline=None):
+        """Trade the refresh JWT for a new session (refreshSession); None if Bluesky refuses it"""
+        if rate_limited('bluesky', 'bluesky:refreshSession', deadline):
+            return None
+        try:
+            resp = http_client.post(
+                f'{BSKY_XRPC}/com.atproto.server.refreshSession',
+                headers={'Authorization': f'Bearer {session["refresh_jwt"]}'},
+                timeout=time_left(deadline, 15)
+            )
+            if resp.status_code == 200:
+                return BlueskyPublisher._cache(handle, resp.json())
+            print(f"[Publisher] Bluesky refreshSession failed ({resp.status_code}), signing in again")
+        except http_client.exceptions.RequestException as e:
+            print(f"[Publisher] Bluesky refreshSession error: {e}")
+        return None
     
     @staticmethod
-    def publish(content, image_path=None, config=None):
-        """Publish a post to Bluesky"""
+    def get_session(handle, app_password, force_new=False, deadline=None):
+        """Usable session for `handle`: the cached one, a refreshed one if it is about to expire,
+        or (no refresh token left, or force_new after a 401) a brand-new createSession."""
+        with BlueskyPublisher._session_locks_guard:
+            lock = BlueskyPublisher._session_locks.setdefault(BlueskyPublisher._service(handle), threading.Lock())
+        with lock:
+            if not force_new:
+                session = BlueskyPublisher._cached(handle)
+                now = time.time()
+                if session and session['access_jwt'] and session['expires'] - now > BSKY_REFRESH_MARGIN:
+                    return session
+                if session and session['refresh_jwt'] and (not session['refresh_expires'] or session['refresh_expires'] > now):
+                    refreshed = BlueskyPublisher.refresh(handle, session, deadline)
+                    if refreshed:
+                        return refreshed
+            return BlueskyPublisher.authenticate(handle, app_password, deadline)
+    
+    @staticmethod
+    def renew(handle, app_password, session, auth_error, deadline=None):
+        """New session after Bluesky rejected `session`: refresh if it only expired, sign in again on a 401"""
+        if auth_error == 'expired':
+            session['expires'] = 0
+        return BlueskyPublisher.get_session(handle, app_password, force_new=auth_error == 'invalid', deadline=deadline)
+    
+    @staticmethod
+    def publish(content, image_path=None, config=None, deadline=None):
+        """Publish a post to Bluesky; every wait and request fits before `deadline` (time.monotonic())"""
         config = config or {}
         handle = config.get('username', '')
         app_password = config.get('api_key', '')
@@ -62,9 +254,7 @@ class BlueskyPublisher:
         if not handle or not app_password:
             return PublishResult(success=False, platform='bluesky', error='Bluesky handle and app password required')
         
-        auth = BlueskyPublisher.authenticate(handle, app_password)
-        if not auth['success']:
-            return PublishResult(success=False, platform='bluesky', error=auth['error'])
+        auth = BlueskyPublisher.get_session(handle, app_password, deadline=deadline)
         
         try:
             from datetime import datetime, timezone
@@ -76,38 +266,66 @@ class BlueskyPublisher:
                 'createdAt': datetime.now(timezone.utc).isoformat(),
             }
             
-            # Upload image if provided
-            if image_path and os.path.exists(image_path):
-                try:
-                    with open(image_path, 'rb') as f:
-                        img_resp = requests.post(
-                            'https://bsky.social/xrpc/com.atproto.repo.uploadBlob',
-                            headers={
-                                'Authorization': f'Bearer {auth["access_jwt"]}',
-                                'Content-Type': 'image/jpeg'
-                            },
-                            data=f.read(),
-                            timeout=30
-                        )
-                    if img_resp.status_code == 200:
-                        blob = img_resp.json().get('blob', {})
-                        post_data['embed'] = {
-                            '$type': 'app.bsky.embed.images',
-                            'images': [{'alt': 'Forbidden Bourbon', 'image': blob}]
-                        }
-                except Exception as img_err:
-                    print(f"[Publisher] Bluesky image upload error: {img_err}")
-            
-            resp = requests.post(
-                'https://bsky.social/xrpc/com.atproto.repo.createRecord',
-                headers={'Authorization': f'Bearer {auth["access_jwt"]}'},
-                json={
-                    'repo': auth['did'],
-                    'collection': 'app.bsky.feed.post',
-                    'record': post_data
-                },
-                timeout=15
-            )
+            # Second pass only after an auth failure: expired -> refresh, 401 -> sign in again
+            for attempt in (1, 2):
+                if not auth['success']:
+                    if auth.get('response') is not None:
+                        return http_failure('bluesky', auth['response'], auth['error'], limit_key='bluesky:createSession')
+                    if auth.get('retryable'):
+                        return PublishResult(success=False, platform='bluesky', error=auth['error'],
+                                             retryable=True, retry_after=auth['retry_after'])
+                    if auth.get('exception') is not None:
+                        return exception_failure('bluesky', auth['exception'])
+                    return PublishResult(success=False, platform='bluesky', error=auth['error'])
+                
+                # Upload image if provided
+                if image_path and os.path.exists(image_path) and 'embed' not in post_data:
+                    limited = rate_limited('bluesky', 'bluesky:uploadBlob', deadline)
+                    if limited:
+                        return limited
+                    try:
+                        with open(image_path, 'rb') as f:
+                            img_resp = http_client.post(
+                                f'{BSKY_XRPC}/com.atproto.repo.uploadBlob',
+                                headers={
+                                    'Authorization': f'Bearer {auth["access_jwt"]}',
+                                    'Content-Type': 'image/jpeg'
+                                },
+                                data=f.read(),
+                                timeout=time_left(deadline, 30)
+                            )
+                        ratelimit.observe('bluesky:uploadBlob', img_resp, retry_after_seconds(img_resp))
+                        auth_error = _bsky_auth_error(img_resp)
+                        if auth_error and attempt == 1:
+                            auth = BlueskyPublisher.renew(handle, app_password, auth, auth_error, deadline)
+                            continue
+                        if img_resp.status_code == 200:
+                            blob = img_resp.json().get('blob', {})
+                            post_data['embed'] = {
+                                '$type': 'app.bsky.embed.images',
+                                'images': [{'alt': 'Forbidden Bourbon', 'image': blob}]
+                            }
+                    except Exception as img_err:
+                        print(f"[Publisher] Bluesky image upload error: {img_err}")
+                
+                limited = rate_limited('bluesky', 'bluesky:createRecord', deadline)
+                if limited:
+                    return limited
+                resp = http_client.post(
+                    f'{BSKY_XRPC}/com.atproto.repo.createRecord',
+                    headers={'Authorization': f'Bearer {auth["access_jwt"]}'},
+                    json={
+                        'repo': auth['did'],
+                        'collection': 'app.bsky.feed.post',
+                        'record': post_data
+                    },
+                    timeout=time_left(deadline, 15)
+                )
+                auth_error = _bsky_auth_error(resp)
+                if auth_error and attempt == 1:
+                    auth = BlueskyPublisher.renew(handle, app_password, auth, auth_error, deadline)
+                    continue
+                break
             
             if resp.status_code == 200:
                 uri = resp.json().get('uri', '')
@@ -116,8 +334,10 @@ class BlueskyPublisher:
                 web_url = f'https://bsky.app/profile/{handle}/post/{rkey}' if rkey else ''
                 return PublishResult(success=True, platform='bluesky', post_id=uri, url=web_url)
             else:
-                return PublishResult(success=False, platform='bluesky', error=f'Post failed: {resp.text[:200]}')
+                return http_failure('bluesky', resp, f'Post failed: {resp.text[:200]}', limit_key='bluesky:createRecord')
                 
+        except http_client.exceptions.RequestException as e:
+            return exception_failure('bluesky', e)
         except Exception as e:
             return PublishResult(success=False, platform='bluesky', error=str(e))
 
@@ -126,7 +346,7 @@ class TwitterPublisher:
     """Twitter/X publisher (placeholder — requires OAuth 2.0)"""
     
     @staticmethod
-    def publish(content, image_path=None, config=None):
+    def publish(content, image_path=None, config=None, deadline=None):
         return PublishResult(success=False, platform='twitter', 
                            error='Twitter publishing requires OAuth setup. Set TWITTER_API_KEY in Render env vars.')
 
@@ -135,7 +355,7 @@ class FacebookPublisher:
     """Facebook publisher"""
     
     @staticmethod
-    def publish(content, image_path=None, config=None):
+    def publish(content, image_path=None, config=None, deadline=None):
         config = config or {}
         page_token = config.get('api_key', os.environ.get('FACEBOOK_PAGE_TOKEN', ''))
         page_id = config.get('page_id', os.environ.get('FACEBOOK_PAGE_ID', 'me'))
@@ -143,18 +363,23 @@ class FacebookPublisher:
         if not page_token:
             return PublishResult(success=False, platform='facebook', error='Facebook page token required')
         
+        limited = rate_limited('facebook', 'facebook:feed', deadline)
+        if limited:
+            return limited
         try:
-            resp = requests.post(
+            resp = http_client.post(
                 f'https://graph.facebook.com/v19.0/{page_id}/feed',
                 data={'message': content, 'access_token': page_token},
-                timeout=15
+                timeout=time_left(deadline, 15)
             )
             if resp.status_code == 200:
                 post_id = resp.json().get('id', '')
                 return PublishResult(success=True, platform='facebook', post_id=post_id, 
                                    url=f'https://facebook.com/{post_id}')
             else:
-                return PublishResult(success=False, platform='facebook', error=resp.text[:200])
+                return http_failure('facebook', resp, resp.text[:200], limit_key='facebook:feed')
+        except http_client.exceptions.RequestException as e:
+            return exception_failure('facebook', e)
         except Exception as e:
             return PublishResult(success=False, platform='facebook', error=str(e))
 
@@ -163,7 +388,7 @@ class LinkedInPublisher:
     """LinkedIn publisher (placeholder)"""
     
     @staticmethod
-    def publish(content, image_path=None, config=None):
+    def publish(content, image_path=None, config=None, deadline=None):
         return PublishResult(success=False, platform='linkedin',
                            error='LinkedIn publishing requires OAuth setup. Set LINKEDIN_ACCESS_TOKEN in Render env vars.')
 
@@ -172,7 +397,7 @@ class InstagramPublisher:
     """Instagram publisher (placeholder — requires Business API)"""
     
     @staticmethod
-    def publish(content, image_path=None, config=None):
+    def publish(content, image_path=None, config=None, deadline=None):
         return PublishResult(success=False, platform='instagram',
                            error='Instagram publishing requires Business API setup.')
 
@@ -187,7 +412,7 @@ PUBLISHERS = {
 }
 
 
-def publish_to_platform(platform_name, content, image_path=None, config=None):
+def publish_to_platform(platform_name, content, image_path=None, config=None, deadline=None):
     """
     Publish content to a specific platform.
     
@@ -196,6 +421,7 @@ def publish_to_platform(platform_name, content, image_path=None, config=None):
         content: Text content to publish
         image_path: Optional path to image file
         config: Dict with platform-specific config (api_key, username, etc.)
+        deadline: time.monotonic() by which rate-limit waits and requests must be done (None: no limit)
     
     Returns:
         PublishResult object
@@ -210,6 +436,62 @@ def publish_to_platform(platform_name, content, image_path=None, config=None):
         )
     
     try:
-        return publisher_class.publish(content, image_path, config)
+        return publisher_class.publish(content, image_path, config, deadline=deadline)
     except Exception as e:
         return PublishResult(success=False, platform=platform_name, error=f'Publisher error: {str(e)}')
+
+
+# Fan-out: one post goes to every target platform at once
+PUBLISH_WORKERS = int(os.environ.get('PUBLISH_WORKERS', '8'))     # shared across all concurrent publishes
+PUBLISH_TIMEOUT = float(os.environ.get('PUBLISH_TIMEOUT', '60'))  # per platform: sign-in + upload + post, rate-limit waits included
+PUBLISH_GRACE = 5  # publishers must be done this long before PUBLISH_TIMEOUT (connect retries, reading the response)
+
+_publish_pool = None
+_publish_pool_lock = threading.Lock()
+
+
+def _pool():
+    global _publish_pool
+    with _publish_pool_lock:
+        if _publish_pool is None:
+            _publish_pool = ThreadPoolExecutor(max_workers=PUBLISH_WORKERS, thread_name_prefix='publish')
+        return _publish_pool
+
+
+def publish_many(targets, content, image_path=None, timeout=PUBLISH_TIMEOUT, on_late=None):
+    """
+    Publish the same content to several platforms concurrently.
+    
+    Args:
+        targets: list of (platform_name, config) pairs
+        content, image_path: as for publish_to_platform
+        timeout: seconds to wait for each platform; publishers get a deadline PUBLISH_GRACE
+            earlier, so their rate-limit waits and request timeouts end before we stop waiting
+        on_late: called (from a pool thread) with the real PublishResult of any platform
+            that still answers after the timeout
+    
+    Returns:
+        list of PublishResult, in the same order as targets. Total latency is the
+        slowest platform's, not the sum of all of them. A platform that timed out is
+        reported retryable: its outcome is unknown, not failed.
+    """
+    if not targets:
+        return []
+    started = time.monotonic()
+    budget = started + max(0.0, timeout - PUBLISH_GRACE)
+    futures = [_pool().submit(publish_to_platform, name, content, image_path, config, budget)
+               for name, config in targets]
+    deadline = started + timeout
+    results = []
+    for (name, _), future in zip(targets, futures):
+        try:
+            results.append(future.result(timeout=max(0, deadline - time.monotonic())))
+        except FutureTimeout:
+            # Still running in its pool thread and may yet post, so this is not a failure we know of
+            results.append(PublishResult(success=False, platform=name, retryable=True,
+                                         error=f'No answer after {timeout:.0f}s, outcome unknown'))
+            if on_late:
+                future.add_done_callback(lambda f: on_late(f.result()))
+        except Exception as e:
+            results.append(PublishResult(success=False, platform=name, error=f'Publisher error: {str(e)}'))
+    return results
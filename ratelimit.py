@@ -0,0 +1,87 @@
+"""
+Outbound rate limiting for Forbidden Command Center.
+Token buckets per platform, plus per endpoint where a platform limits one call
+harder than the rest (Bluesky session creation, for example). Buckets live in the
+rate_limits table so every gunicorn worker draws from the same budget; callers
+acquire() before sending and report 429s through observe() so Retry-After is honoured.
+"""
+import os
+import json
+import time
+import threading
+
+import database as db
+
+# key -> (requests per second, burst). "<platform>:<endpoint>" keys also draw from the "<platform>" bucket.
+# Set a little under each platform's published limit so bursts queue instead of bouncing off 429s.
+RATE_LIMITS = {
+    'bluesky': (8.0, 40),                           # 3000 requests / 5 min per IP
+    'bluesky:createSession': (25 / 300, 25),        # 30 sessions / 5 min per account
+    'bluesky:createRecord': (1500 / 3600, 30),      # 5000 points / hour, 3 points per post
+    'facebook': (180 / 3600, 20),                   # ~200 Graph calls / hour per page token
+    'reddit': (0.9, 10),                            # 60 requests / min per OAuth client
+    'medium': (0.5, 5),
+}
+RATE_LIMITS.update({k: tuple(v) for k, v in json.loads(os.environ.get('RATE_LIMITS', '{}')).items()})
+RATE_LIMIT_MAX_WAIT = float(os.environ.get('RATE_LIMIT_MAX_WAIT', '30'))  # longer than this: give up, let the caller retry
+DEFAULT_BLOCK = 60  # seconds to back off after a 429 that didn't say how long
+
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+
+
+def _buckets(key):
+    platform = key.split(':', 1)[0]
+    keys = [platform, key] if platform != key else [key]
+    return [k for k in keys if k in RATE_LIMITS]
+
+
+def _lock_for(key):
+    with _key_locks_guard:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def acquire(key, max_wait=RATE_LIMIT_MAX_WAIT):
+    """Wait for a token from every bucket that applies to `key`.
+    Tokens are taken from all the buckets at once or not at all. Returns 0 once sending is allowed, or —
+    if that would take longer than max_wait — the number of seconds the caller should wait before
+    trying again (nothing is sent, nothing is owed)."""
+    buckets = [(bucket,) + tuple(RATE_LIMITS[bucket]) for bucket in _buckets(key)]
+    if not buckets:
+        return 0
+    deadline = time.monotonic() + max_wait
+    # One thread per process polls the DB for a key; the rest queue on the lock
+    with _lock_for(key):
+        while True:
+            try:
+                wait = db.take_rate_tokens(buckets)
+            except Exception as e:
+                print(f"[RateLimit] {key} unavailable, not throttling: {e}")
+                return 0
+            if not wait:
+                return 0
+            if time.monotonic() + wait > deadline:
+                print(f"[RateLimit] {key}: {wait:.0f}s until the next token, deferring")
+                return wait
+            time.sleep(wait)
+
+
+def penalize(key, seconds=None):
+    """Block `key` for `seconds` (default DEFAULT_BLOCK) after the platform said slow down.
+    Falls back to the platform bucket when the endpoint has no bucket of its own."""
+    seconds = DEFAULT_BLOCK if seconds is None else seconds
+    if key not in RATE_LIMITS:
+        key = key.split(':', 1)[0]
+    try:
+        db.block_rate_limit(key, seconds)
+        print(f"[RateLimit] {key} blocked for {seconds:.0f}s")
+    except Exception as e:
+        print(f"[RateLimit] Could not record block for {key}: {e}")
+
+
+def observe(key, resp, retry_after=None):
+    """Feed a response back: a 429 (or a 503 with Retry-After) blocks the bucket for as long as asked."""
+    if resp is None:
+        return
+    if resp.status_code == 429 or (resp.status_code == 503 and retry_after is not None):
+        penalize(key, retry_after)
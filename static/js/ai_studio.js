@@ -12,6 +12,27 @@ window.toast = (typeof window.showToast === "function")
   ? window.showToast
   : function () {};
 
+/* ── background jobs: poll /api/jobs/<id> until the job finishes ── */
+window.waitForJob = function (jobId, onProgress, intervalMs) {
+  intervalMs = intervalMs || 2000;
+  return new Promise(function (resolve) {
+    function poll() {
+      fetch("/api/jobs/" + jobId)
+        .then(window._sj)
+        .then(function (job) {
+          if (job.status === "succeeded") return resolve(job.result || {});
+          if (job.status === "failed" || !job.success) {
+            return resolve({ success: false, error: job.error || "Job failed" });
+          }
+          if (onProgress) onProgress(job);
+          setTimeout(poll, intervalMs);
+        })
+        .catch(function () { setTimeout(poll, intervalMs * 2); });
+    }
+    setTimeout(poll, intervalMs);
+  });
+};
+
 /* ── brand prompt prefixes ── */
 window.BRAND_PREFIX = "A premium bourbon whiskey in a distinctive heavy glass 8-pointed star-shaped geometric decanter bottle. The bottle has sharp angular facets, fluted ridges, and a dark metallic label that reads 'FORBIDDEN' in elegant gold art deco lettering. The bourbon inside is dark amber/copper colored. The bottle has a heavy square stopper top. ";
 
@@ -339,6 +360,12 @@ window.generateImage = function () {
     })
   })
     .then(window._sj)
+    .then(function (queued) {
+      if (!queued.job_id) return queued;
+      return window.waitForJob(queued.job_id, function (job) {
+        if (job.message) timeEl.textContent = job.message + " (" + job.progress + "%)";
+      });
+    })
     .then(function (data) {
       document.getElementById("imageLoading").classList.add("hidden");
       document.getElementById("generateImageBtn").disabled = false;
@@ -693,7 +720,9 @@ window.loadGallery = function (filter) {
           : "";
         return '<div style="position:relative;border-radius:var(--radius-md);overflow:hidden;background:var(--bg-card);border:1px solid var(--border);cursor:pointer;" onclick="window.open(\'' +
           item.url + '\')">' +
-          '<img src="' + item.url + '" loading="lazy" style="width:100%;height:180px;object-fit:cover;">' +
+          '<img src="' + (item.thumb || item.url) + '"' +
+          (item.srcset ? ' srcset="' + item.srcset + '" sizes="(max-width: 600px) 50vw, 320px"' : "") +
+          ' loading="lazy" style="width:100%;height:180px;object-fit:cover;">' +
           savedStar + bottleTag + saveBtn +
           '<div style="padding:6px 8px;font-size:0.8rem;color:var(--text-muted);">🎨 ' + shortPrompt + "</div></div>";
       }).join("");
@@ -755,7 +784,7 @@ window.loadRecentGallery = function () {
       if (images.length === 0) { wrapper.style.display = "none"; return; }
       wrapper.style.display = "";
       container.innerHTML = images.map(function (item) {
-        return '<img src="' + item.url + '" alt="Recent" title="' +
+        return '<img src="' + (item.thumb || item.url) + '" alt="Recent" title="' +
           (item.prompt || "").replace(/"/g, "&quot;") +
           '" style="width:72px;height:72px;object-fit:cover;border-radius:8px;border:1px solid var(--border);cursor:pointer;flex-shrink:0;" onclick="window.open(\'' +
           item.url + '\')" loading="lazy">';
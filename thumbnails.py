@@ -0,0 +1,164 @@
+"""
+Derived image variants for Forbidden Command Center.
+Generates WebP/AVIF thumbnails at a few fixed widths on first request and
+caches them on disk, keyed by the source's content hash (blobs) or path + mtime (files).
+A file's variants from before an edit are deleted when the new one is written.
+"""
+import os
+import io
+import hashlib
+import threading
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is in requirements.txt; without it callers fall back to the originals
+    Image = None
+
+# Grid cards render at ~180-320 CSS px, so 320/640 cover 1x/2x screens; 1024 is the lightbox size
+THUMB_WIDTHS = (320, 640, 1024)
+DEFAULT_WIDTH = THUMB_WIDTHS[0]
+QUALITY = {'webp': 80, 'avif': 60, 'jpeg': 82}
+MIMETYPES = {'webp': 'image/webp', 'avif': 'image/avif', 'jpeg': 'image/jpeg'}
+
+CACHE_DIR = os.environ.get('THUMB_CACHE_DIR',
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'uploads', 'thumb_cache'))
+
+_key_locks = {}  # digest -> [lock, threads holding or waiting on it]
+_key_locks_guard = threading.Lock()
+
+
+def available():
+    return Image is not None
+
+
+def _supports(fmt):
+    if Image is None:
+        return False
+    if fmt == 'jpeg':
+        return True
+    try:
+        return bool(features.check(fmt))
+    except Exception:
+        return False
+
+
+def pick_width(requested):
+    """Snap a requested width to the next fixed variant so the cache stays bounded."""
+    try:
+        requested = int(requested)
+    except (TypeError, ValueError):
+        return DEFAULT_WIDTH
+    for width in THUMB_WIDTHS:
+        if requested <= width:
+            return width
+    return THUMB_WIDTHS[-1]
+
+
+def pick_format(accept=''):
+    """Best format the browser accepts and this Pillow build can write."""
+    if 'image/avif' in (accept or '') and _supports('avif'):
+        return 'avif'
+    if _supports('webp'):
+        return 'webp'
+    return 'jpeg'
+
+
+def file_version(path):
+    """Cache-busting token for a file on disk (changes whenever the file does)."""
+    st = os.stat(path)
+    return f'{int(st.st_mtime)}-{st.st_size}'
+
+
+def variant_urls(base_url, version=''):
+    """{'thumb': ..., 'srcset': ...} for an image URL that accepts ?w= (see /api/thumb and the gallery image route)."""
+    if not available():
+        return {'thumb': '', 'srcset': ''}
+    sep = '&' if '?' in base_url else '?'
+    suffix = f'&v={version}' if version else ''
+    urls = {w: f'{base_url}{sep}w={w}{suffix}' for w in THUMB_WIDTHS}
+    return {
+        'thumb': urls[DEFAULT_WIDTH],
+        'srcset': ', '.join(f'{url} {w}w' for w, url in urls.items()),
+    }
+
+
+def _render(load_source, width, fmt):
+    img = Image.open(io.BytesIO(load_source()))
+    img = ImageOps.exif_transpose(img)
+    if img.width > width:
+        img.thumbnail((width, width * 4), Image.LANCZOS)
+    if fmt == 'jpeg' and img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    elif img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        img = img.convert('RGBA')
+    out = io.BytesIO()
+    options = {'quality': QUALITY[fmt]}
+    if fmt == 'webp':
+        options['method'] = 4
+    img.save(out, format=fmt.upper(), **options)
+    return out.getvalue()
+
+
+def _evict_stale(path, digest, fmt):
+    """Delete variants of the same source, width and format rendered from an older version of it"""
+    folder = os.path.dirname(path)
+    for name in os.listdir(folder):
+        stale = os.path.join(folder, name)
+        if name.startswith(digest) and name.endswith(f'.{fmt}') and stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def get_variant(source_key, load_source, width, fmt, version=''):
+    """Path of the cached variant for `source_key` at `version`, rendering it via load_source() -> bytes
+    on a miss (and dropping the variants of other versions). Returns None if Pillow is unavailable
+    or the source can't be decoded."""
+    if not available():
+        return None
+    digest = hashlib.sha1(f'{source_key}|{width}|{fmt}'.encode('utf-8')).hexdigest()
+    path = os.path.join(CACHE_DIR, digest[:2], f'{digest}-{version}.{fmt}' if version else f'{digest}.{fmt}')
+    if os.path.exists(path):
+        return path
+
+    # Per-key lock with a count of the threads holding or waiting on it; the entry goes away with the last one
+    with _key_locks_guard:
+        entry = _key_locks.setdefault(digest, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            # Another thread may have rendered it while we waited
+            if os.path.exists(path):
+                return path
+            try:
+                data = _render(load_source, width, fmt)
+            except Exception as e:
+                print(f"[Thumbs] Could not render {source_key} @{width} {fmt}: {e}")
+                return None
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+            if version:
+                _evict_stale(path, digest, fmt)
+    finally:
+        with _key_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _key_locks[digest]
+    return path
+
+
+def variant_for_file(path, width, fmt):
+    """Cached variant of an image file; keyed on path + mtime + size so edits regenerate it."""
+    def load():
+        with open(path, 'rb') as f:
+            return f.read()
+    return get_variant(f'file:{os.path.abspath(path)}', load, width, fmt, version=file_version(path))
+
+
+def variant_for_blob(sha256, load_bytes, width, fmt):
+    """Cached variant of a content-addressed blob (the hash alone identifies the source)."""
+    return get_variant(f'blob:{sha256}', load_bytes, width, fmt)